@@ -0,0 +1,10 @@
+"""Минимальное окружение для запуска бенчмарков без .env бота"""
+import os
+import tempfile
+
+# src.config читает настройки при импорте, поэтому задаем их заранее
+os.environ.setdefault('BOT_TOKEN', '123456:BENCHMARK-TOKEN')
+os.environ.setdefault('SUPER_ADMIN_ID', '1')
+os.environ.setdefault(
+    'DB_URL', f"sqlite+aiosqlite:///{os.path.join(tempfile.gettempdir(), 'bench_bot.db')}"
+)
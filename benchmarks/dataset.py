@@ -0,0 +1,313 @@
+"""Генератор синтетического набора данных для нагрузочных тестов.
+
+Заполняет базу по схеме models.py: категории (двухуровневые названия
+«Раздел / Подраздел» — в схеме категории плоские), товары, пользователи с
+профилями, корзины, избранное, заказы с позициями, отзывы (с агрегатами
+рейтинга) и транзакции Stars. Популярность товаров распределена по Zipf:
+небольшая доля товаров собирает большую часть корзин, заказов и отзывов.
+Объемы корзин и избранного выдерживаются в среднем (число строк на
+пользователя случайно). Вставка идет порциями через executemany, один и
+тот же --seed дает ту же базу.
+
+Запуск:
+    python -m benchmarks.dataset --db-url sqlite+aiosqlite:///big.db \\
+        --products 200000 --users 1000000 --carts 5000000 --favorites 5000000
+"""
+import asyncio
+import dataclasses
+import itertools
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence
+
+from . import _env  # noqa: F401
+
+import typer
+from sqlalchemy import func, insert, select, text, update
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.config import config as app_config
+from src.database import fts
+from src.database.database import Database
+from src.database.engine import create_engine
+from src.database.models import (Base, Cart, Category, Favorite, Order, OrderItem,
+                                 OrderStatus, PaymentMethod, Product, Review,
+                                 StarsTransaction, TransactionStatus, User, UserProfile)
+
+app = typer.Typer(add_completion=False, help=__doc__.splitlines()[0])
+
+FIRST_USER_ID = 100_000_000
+NOW = datetime(2026, 1, 1)
+
+SECTIONS = (
+    'Электроника', 'Дом и сад', 'Одежда', 'Обувь', 'Спорт', 'Книги', 'Игрушки',
+    'Красота', 'Продукты', 'Авто', 'Зоотовары', 'Канцелярия', 'Мебель', 'Туризм',
+)
+SYLLABLES = (
+    'ка ко ру ла ми на то ре ст пр ве ли до ны ск ша же чи бо гу '
+    'ме ти ро за па се ку вы по ле'
+).split()
+FIRST_NAMES = ('Анна', 'Иван', 'Мария', 'Петр', 'Ольга', 'Алексей', 'Елена', 'Дмитрий', 'Наталья', 'Сергей')
+CITIES = ((55.75, 37.62), (59.93, 30.31), (56.84, 60.61), (55.03, 82.92), (54.71, 20.51))
+REVIEW_TEXTS = ('Отлично', 'Хороший товар', 'Нормально', 'Не понравилось', 'Соответствует описанию', None)
+
+
+def _chunks(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(rows)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+class Zipf:
+    """Выбор товаров с весом 1 / rank^s; ранги перемешаны по ID"""
+
+    def __init__(self, product_ids: Sequence[int], s: float, rng: random.Random):
+        self.population = list(product_ids)
+        rng.shuffle(self.population)
+        self.cum_weights = list(itertools.accumulate(
+            1.0 / rank ** s for rank in range(1, len(self.population) + 1)
+        ))
+        self.rng = rng
+
+    def sample(self, k: int) -> List[int]:
+        return self.rng.choices(self.population, cum_weights=self.cum_weights, k=k)
+
+    def distinct(self, k: int) -> List[int]:
+        """k разных товаров (уникальные пары пользователь-товар)"""
+        k = min(k, len(self.population))
+        chosen = dict.fromkeys(self.sample(k))
+        while len(chosen) < k:
+            chosen.update(dict.fromkeys(self.sample(k - len(chosen))))
+        return list(chosen)
+
+
+def _counts(total: int, buckets: int, rng: random.Random) -> Iterator[int]:
+    """Число строк на пользователя с тяжелым хвостом; в сумме ~total"""
+    if not buckets:
+        return
+    mean = total / buckets
+    for _ in range(buckets):
+        yield int(rng.expovariate(1 / mean) + 0.5) if mean else 0
+
+
+class Generator:
+    def __init__(self, engine: AsyncEngine, seed: int, chunk_size: int, zipf_s: float):
+        self.engine = engine
+        self.rng = random.Random(seed)
+        self.chunk_size = chunk_size
+        self.zipf_s = zipf_s
+        self.words = sorted({
+            ''.join(self.rng.choice(SYLLABLES) for _ in range(self.rng.randint(2, 4)))
+            for _ in range(5000)
+        })
+        self.prices: Dict[int, float] = {}
+
+    async def insert(self, model, rows: Iterable[Dict[str, Any]], label: str) -> int:
+        """Вставка порциями, по транзакции на порцию"""
+        started = time.perf_counter()
+        count = 0
+        for chunk in _chunks(rows, self.chunk_size):
+            async with self.engine.begin() as conn:
+                await conn.execute(insert(model), chunk)
+            count += len(chunk)
+        elapsed = time.perf_counter() - started
+        typer.echo(f"{label:<18}{count:>12,} rows {elapsed:>8.1f}s {count / max(elapsed, 1e-9):>10,.0f} rows/s")
+        return count
+
+    def _phrase(self, length: int) -> str:
+        return ' '.join(self.rng.choice(self.words) for _ in range(length))
+
+    def _date(self, days: int = 365) -> datetime:
+        return NOW - timedelta(seconds=self.rng.randrange(days * 86400))
+
+    def categories(self, subcategories: int) -> Iterator[Dict[str, Any]]:
+        category_id = itertools.count(1)
+        for section in SECTIONS:
+            for _ in range(subcategories):
+                yield {'id': next(category_id), 'name': f"{section} / {self._phrase(1).capitalize()}"}
+
+    def products(self, count: int, categories: int) -> Iterator[Dict[str, Any]]:
+        for product_id in range(1, count + 1):
+            price = round(self.rng.lognormvariate(7, 1), 2)
+            self.prices[product_id] = price
+            yield {
+                'product_id': product_id,
+                'category_id': self.rng.randint(1, categories),
+                'name': self._phrase(self.rng.randint(2, 4)).capitalize(),
+                'description': self._phrase(self.rng.randint(10, 40)),
+                'price': price,
+                'quantity': 0 if self.rng.random() < 0.05 else self.rng.randint(1, 500),
+            }
+
+    def users(self, count: int) -> Iterator[Dict[str, Any]]:
+        for index in range(count):
+            user_id = FIRST_USER_ID + index
+            yield {
+                'user_id': user_id,
+                'username': f"user{user_id}",
+                'first_name': self.rng.choice(FIRST_NAMES),
+                'language': 'en' if self.rng.random() < 0.1 else 'ru',
+                'notifications': self.rng.random() > 0.15,
+                'reg_date': self._date(730),
+                'is_admin': False,
+            }
+
+    def profiles(self, users: int, ratio: float) -> Iterator[Dict[str, Any]]:
+        for index in range(users):
+            if self.rng.random() >= ratio:
+                continue
+            user_id = FIRST_USER_ID + index
+            lat, lon = self.rng.choice(CITIES)
+            yield {
+                'user_id': user_id,
+                'name': self.rng.choice(FIRST_NAMES),
+                'phone_number': f"+79{self.rng.randrange(10 ** 9):09d}",
+                'email': f"user{user_id}@example.com",
+                'location_lat': lat + self.rng.uniform(-0.2, 0.2),
+                'location_lon': lon + self.rng.uniform(-0.2, 0.2),
+                'age': self.rng.randint(16, 75),
+            }
+
+    def user_products(self, total: int, users: int, zipf: Zipf,
+                      row: Callable[[int, int], Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Пары пользователь-товар без повторов (корзина, избранное)"""
+        for index, count in enumerate(_counts(total, users, self.rng)):
+            if count:
+                for product_id in zipf.distinct(count):
+                    yield row(FIRST_USER_ID + index, product_id)
+
+    def orders(self, count: int, users: int, zipf: Zipf, items: List[Dict[str, Any]],
+               transactions: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Заказы; позиции и транзакции Stars копятся в items/transactions"""
+        statuses = [status.value for status in OrderStatus]
+        for order_id in range(1, count + 1):
+            user_id = FIRST_USER_ID + self.rng.randrange(users)
+            created_at = self._date()
+            total = 0.0
+            for product_id in zipf.distinct(self.rng.randint(1, 5)):
+                quantity = self.rng.randint(1, 3)
+                price = self.prices[product_id]
+                total += price * quantity
+                items.append({'order_id': order_id, 'product_id': product_id,
+                              'quantity': quantity, 'price': price})
+            payment_method = self.rng.choice((PaymentMethod.STARS.value, PaymentMethod.CARD.value))
+            # pending, completed, cancelled, processing
+            status = self.rng.choices(statuses, weights=(15, 60, 10, 15))[0]
+            if payment_method == PaymentMethod.STARS.value:
+                stars = max(1, round(total / float(app_config.STARS_RATE)))
+                transactions.append({
+                    'order_id': order_id, 'user_id': user_id, 'stars_amount': stars,
+                    'amount_rub': round(total, 2), 'status': TransactionStatus.COMPLETED,
+                    'created_at': created_at,
+                })
+            yield {
+                'order_id': order_id,
+                'user_id': user_id,
+                'total_amount': round(total, 2),
+                'payment_method': payment_method,
+                'status': status,
+                'created_at': created_at,
+            }
+
+    def reviews(self, count: int, users: int, zipf: Zipf) -> Iterator[Dict[str, Any]]:
+        for product_id in zipf.sample(count):
+            yield {
+                'user_id': FIRST_USER_ID + self.rng.randrange(users),
+                'product_id': product_id,
+                'rating': self.rng.choices((1, 2, 3, 4, 5), weights=(5, 5, 10, 30, 50))[0],
+                'text': self.rng.choice(REVIEW_TEXTS),
+                'created_at': self._date(),
+            }
+
+
+async def _prepare(engine: AsyncEngine, overwrite: bool):
+    async with engine.begin() as conn:
+        existing = await conn.run_sync(lambda sync: sync.dialect.has_table(sync, User.__tablename__))
+        if existing:
+            has_rows = (await conn.execute(select(func.count()).select_from(User))).scalar()
+            if has_rows and not overwrite:
+                raise typer.BadParameter("база уже содержит данные, используйте --overwrite", param_hint='--db-url')
+            if conn.dialect.name == 'sqlite':
+                for statement in fts.DROP:
+                    await conn.execute(text(statement))
+            await conn.run_sync(Base.metadata.drop_all)
+    await Database(engine).init_db()
+
+
+async def _generate(db_url: str, products: int, subcategories: int, users: int, profile_ratio: float,
+                    carts: int, favorites: int, orders: int, reviews: int, zipf_s: float,
+                    seed: int, chunk_size: int, overwrite: bool):
+    # Пакетные вставки по chunk_size строк заведомо дольше DB_SLOW_QUERY_MS:
+    # учет запросов здесь дал бы только поток предупреждений
+    engine = create_engine(dataclasses.replace(app_config, db_url=db_url, db_instrument=False))
+    started = time.perf_counter()
+    try:
+        await _prepare(engine, overwrite)
+        gen = Generator(engine, seed, chunk_size, zipf_s)
+
+        categories = await gen.insert(Category, gen.categories(subcategories), 'categories')
+        await gen.insert(Product, gen.products(products, categories), 'products')
+        await gen.insert(User, gen.users(users), 'users')
+        await gen.insert(UserProfile, gen.profiles(users, profile_ratio), 'user_profiles')
+
+        zipf = Zipf(range(1, products + 1), zipf_s, gen.rng)
+        await gen.insert(Cart, gen.user_products(
+            carts, users, zipf,
+            lambda user_id, product_id: {'user_id': user_id, 'product_id': product_id,
+                                         'quantity': gen.rng.randint(1, 3)}
+        ), 'cart')
+        await gen.insert(Favorite, gen.user_products(
+            favorites, users, zipf,
+            lambda user_id, product_id: {'user_id': user_id, 'product_id': product_id,
+                                         'added_at': gen._date()}
+        ), 'favorites')
+
+        items: List[Dict[str, Any]] = []
+        transactions: List[Dict[str, Any]] = []
+        await gen.insert(Order, gen.orders(orders, users, zipf, items, transactions), 'orders')
+        await gen.insert(OrderItem, items, 'order_items')
+        await gen.insert(StarsTransaction, transactions, 'stars_transactions')
+        await gen.insert(Review, gen.reviews(reviews, users, zipf), 'reviews')
+
+        # Агрегаты рейтинга в products (как после add_review)
+        review_stats = select(Review.product_id).where(Review.product_id == Product.product_id)
+        async with engine.begin() as conn:
+            await conn.execute(update(Product).values(
+                rating_sum=func.coalesce(
+                    review_stats.with_only_columns(func.sum(Review.rating)).scalar_subquery(), 0
+                ),
+                rating_count=review_stats.with_only_columns(func.count()).scalar_subquery(),
+            ))
+            if conn.dialect.name == 'sqlite':
+                await conn.execute(text('ANALYZE'))
+    finally:
+        await engine.dispose()
+    typer.echo(f"Готово за {time.perf_counter() - started:.1f}s: {db_url}")
+
+
+@app.command()
+def generate(
+    db_url: str = typer.Option('sqlite+aiosqlite:///dataset.db', help='база для заполнения (не рабочая!)'),
+    products: int = typer.Option(20_000, min=1),
+    subcategories: int = typer.Option(10, min=1, help='подкатегорий в каждом из разделов'),
+    users: int = typer.Option(100_000, min=1),
+    profile_ratio: float = typer.Option(0.6, min=0.0, max=1.0, help='доля пользователей с профилем'),
+    carts: int = typer.Option(500_000, min=0, help='строк корзины'),
+    favorites: int = typer.Option(500_000, min=0, help='строк избранного'),
+    orders: int = typer.Option(200_000, min=0),
+    reviews: int = typer.Option(100_000, min=0),
+    zipf_s: float = typer.Option(1.1, min=0.0, help='показатель Zipf популярности товаров'),
+    seed: int = typer.Option(42),
+    chunk_size: int = typer.Option(20_000, min=1, help='строк в одном executemany'),
+    overwrite: bool = typer.Option(False, help='пересоздать таблицы, если база не пуста'),
+):
+    """Заполнение базы синтетическими данными"""
+    asyncio.run(_generate(
+        db_url, products, subcategories, users, profile_ratio, carts, favorites,
+        orders, reviews, zipf_s, seed, chunk_size, overwrite
+    ))
+
+
+if __name__ == '__main__':
+    app()
@@ -0,0 +1,367 @@
+"""Локальный сервер, изображающий Bot API, для нагрузочного теста run.py.
+
+Сервер раздает через getUpdates апдейты тысяч симулированных пользователей
+(каталог, карточка товара, +/- в корзине, поиск, оплата Stars) и отвечает
+на вызовы бота с настраиваемой задержкой, иногда — ошибкой 429 с
+retry_after. Задержка ответа считается от выдачи апдейта боту до первого
+вызова API в тот же чат (или answerCallbackQuery/answerPreCheckoutQuery).
+
+Запуск (база бота должна содержать товары, например после
+python -m benchmarks.handlers или реальная копия):
+    python -m benchmarks.fake_bot_api --users 5000 --rate 300 --latency 40 --rate-limit 0.01
+    TELEGRAM_API_URL=http://127.0.0.1:8081 BOT_TOKEN=123456:LOAD-TEST python run.py
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, Optional
+
+from aiohttp import web
+
+FIRST_USER_ID = 100_000
+SEARCH_WORDS = ('чайник', 'кружка', 'лампа', 'рюкзак', 'зонт', 'плед', 'термос', 'блокнот')
+
+# Методы, которые возвращают Message
+MESSAGE_METHODS = {
+    'sendmessage', 'sendphoto', 'sendinvoice', 'editmessagetext',
+    'editmessagecaption', 'editmessagereplymarkup',
+}
+# Методы, которые считаются ответом пользователю (без getUpdates и служебных)
+REPLY_METHODS = MESSAGE_METHODS | {'answercallbackquery', 'answerprecheckoutquery', 'deletemessage'}
+
+
+class _Pending:
+    __slots__ = ('update', 'chat_id', 'delivered_at', 'answered')
+
+    def __init__(self, update: Dict[str, Any], chat_id: int):
+        self.update = update
+        self.chat_id = chat_id
+        self.delivered_at: Optional[float] = None
+        self.answered = False
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, round(q * (len(sorted_values) - 1)))]
+
+
+class FakeBotAPI:
+    def __init__(self, users: int = 1000, rate: float = 100.0, latency: float = 0.03,
+                 jitter: float = 0.01, rate_limit: float = 0.0, retry_after: int = 1,
+                 categories: int = 5, products: int = 200):
+        self.users = users
+        self.rate = rate
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit  # доля запросов, получающих 429
+        self.retry_after = retry_after
+        self.categories = categories
+        self.products = products
+
+        self._update_ids = itertools.count(1)
+        self._message_ids = itertools.count(1)
+        self._query_ids = itertools.count(1)
+        self._updates: Deque[_Pending] = deque()
+        self._new_updates = asyncio.Event()
+        # chat_id -> выданные боту апдейты, ждущие ответа
+        self._awaiting: Dict[int, Deque[_Pending]] = {}
+        # callback_query_id / pre_checkout_query_id -> апдейт
+        self._queries: Dict[str, _Pending] = {}
+
+        self.calls: Counter = Counter()
+        self.rate_limited = 0
+        self.generated = 0
+        self.delivered = 0
+        self.reply_latencies: List[float] = []
+
+    # HTTP
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_route('*', '/bot{token}/{method}', self.handle)
+        return app
+
+    async def handle(self, request: web.Request) -> web.Response:
+        method = request.match_info['method'].lower()
+        params = dict(request.query)
+        if request.method == 'POST':
+            params.update(await request.post())
+        self.calls[method] += 1
+
+        if method == 'getupdates':
+            return self._ok(await self._get_updates(params))
+
+        await asyncio.sleep(max(0.0, random.gauss(self.latency, self.jitter)))
+        if method in REPLY_METHODS and random.random() < self.rate_limit:
+            self.rate_limited += 1
+            return web.json_response({
+                'ok': False,
+                'error_code': 429,
+                'description': f'Too Many Requests: retry after {self.retry_after}',
+                'parameters': {'retry_after': self.retry_after},
+            }, status=429)
+
+        chat_id = self._observe_reply(method, params)
+        self._react(method, params, chat_id)
+        return self._ok(self._result(method, params, chat_id))
+
+    @staticmethod
+    def _ok(result: Any) -> web.Response:
+        return web.json_response({'ok': True, 'result': result})
+
+    async def _get_updates(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        offset = int(params.get('offset') or 0)
+        limit = int(params.get('limit') or 100)
+        timeout = float(params.get('timeout') or 0)
+        # Подтвержденные ботом апдейты удаляются
+        while self._updates and self._updates[0].update['update_id'] < offset:
+            self._updates.popleft()
+        if not self._updates and timeout:
+            self._new_updates.clear()
+            try:
+                await asyncio.wait_for(self._new_updates.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        now = time.perf_counter()
+        batch = []
+        for pending in itertools.islice(self._updates, limit):
+            # Повторная выдача (бот не подтвердил offset) задержку не сбрасывает
+            if pending.delivered_at is None:
+                pending.delivered_at = now
+                self._awaiting.setdefault(pending.chat_id, deque()).append(pending)
+                self.delivered += 1
+            batch.append(pending.update)
+        return batch
+
+    def _observe_reply(self, method: str, params: Dict[str, str]) -> Optional[int]:
+        """Учет первого ответа на апдейт, возвращает чат вызова"""
+        if method in ('answercallbackquery', 'answerprecheckoutquery'):
+            # Ответ на запрос точно указывает апдейт
+            query_id = params.get('callback_query_id') or params.get('pre_checkout_query_id')
+            pending = self._queries.pop(query_id, None)
+            if pending is None:
+                return None
+            self._answer(pending)
+            return pending.chat_id
+
+        try:
+            chat_id = int(params['chat_id'])
+        except (KeyError, ValueError):
+            return None
+        if method in REPLY_METHODS:
+            # Чат обрабатывается по порядку: ответ относится к самому старому апдейту
+            waiting = self._awaiting.get(chat_id)
+            while waiting and waiting[0].answered:
+                waiting.popleft()
+            if waiting:
+                self._answer(waiting.popleft())
+            if not waiting:
+                self._awaiting.pop(chat_id, None)
+        return chat_id
+
+    def _answer(self, pending: _Pending):
+        if not pending.answered:
+            pending.answered = True
+            self.reply_latencies.append(time.perf_counter() - pending.delivered_at)
+
+    def _react(self, method: str, params: Dict[str, str], chat_id: Optional[int]):
+        """Продолжение оплаты Stars: инвойс -> pre_checkout -> successful_payment"""
+        if method == 'sendinvoice' and chat_id is not None:
+            prices = json.loads(params.get('prices') or '[]')
+            amount = sum(price.get('amount', 0) for price in prices) or 1
+            self._push(chat_id, pre_checkout_query={
+                'id': str(next(self._query_ids)),
+                'from': self._user(chat_id),
+                'currency': 'XTR',
+                'total_amount': amount,
+                'invoice_payload': params.get('payload', ''),
+            })
+        elif method == 'answerprecheckoutquery' and chat_id is not None and params.get('ok') in ('true', 'True', '1'):
+            self._push(chat_id, message=self._message(chat_id, successful_payment={
+                'currency': 'XTR',
+                'total_amount': 1,
+                'invoice_payload': 'stars_payment',
+                'telegram_payment_charge_id': f'charge-{next(self._query_ids)}',
+                'provider_payment_charge_id': '',
+            }))
+
+    def _result(self, method: str, params: Dict[str, str], chat_id: Optional[int]) -> Any:
+        if method == 'getme':
+            return {'id': 123456, 'is_bot': True, 'first_name': 'LoadTest', 'username': 'load_test_bot'}
+        if method in MESSAGE_METHODS:
+            if chat_id is None:
+                return True  # inline-сообщение
+            message = {
+                'message_id': int(params.get('message_id') or next(self._message_ids)),
+                'date': int(time.time()),
+                'chat': {'id': chat_id, 'type': 'private'},
+                'from': {'id': 123456, 'is_bot': True, 'first_name': 'LoadTest'},
+            }
+            text = params.get('text') or params.get('caption')
+            if text:
+                message['text'] = text
+            return message
+        return True
+
+    # Симулированные пользователи
+
+    def _user(self, user_id: int) -> Dict[str, Any]:
+        return {'id': user_id, 'is_bot': False, 'first_name': f'User{user_id}', 'language_code': 'ru'}
+
+    def _message(self, user_id: int, **fields) -> Dict[str, Any]:
+        return {
+            'message_id': next(self._message_ids),
+            'date': int(time.time()),
+            'chat': {'id': user_id, 'type': 'private'},
+            'from': self._user(user_id),
+            **fields,
+        }
+
+    def _push(self, chat_id: int, **payload):
+        pending = _Pending({'update_id': next(self._update_ids), **payload}, chat_id)
+        self._updates.append(pending)
+        for kind in ('callback_query', 'pre_checkout_query'):
+            if kind in payload:
+                self._queries[payload[kind]['id']] = pending
+        self.generated += 1
+        self._new_updates.set()
+
+    def _text(self, user_id: int, text: str):
+        self._push(user_id, message=self._message(user_id, text=text))
+
+    def _callback(self, user_id: int, data: str, markup: Optional[dict] = None):
+        message = self._message(user_id, text='…')
+        message['from'] = {'id': 123456, 'is_bot': True, 'first_name': 'LoadTest'}
+        if markup is not None:
+            message['reply_markup'] = markup
+        self._push(user_id, callback_query={
+            'id': str(next(self._query_ids)),
+            'from': self._user(user_id),
+            'chat_instance': str(user_id),
+            'message': message,
+            'data': data,
+        })
+
+    def _simulate(self, user_id: int):
+        """Одно действие пользователя (веса примерно как у живого магазина)"""
+        product_id = random.randint(1, self.products)
+        quantity_markup = {'inline_keyboard': [[
+            {'text': '➖', 'callback_data': f'qty_minus_{product_id}'},
+            {'text': str(random.randint(1, 5)), 'callback_data': 'current_qty'},
+            {'text': '➕', 'callback_data': f'qty_plus_{product_id}'},
+        ]]}
+        action = random.choices(
+            ('start', 'catalog', 'category', 'product', 'qty', 'cart_add', 'search', 'cart', 'stars'),
+            weights=(2, 10, 15, 25, 15, 8, 10, 10, 5)
+        )[0]
+        if action == 'start':
+            self._text(user_id, '/start')
+        elif action == 'catalog':
+            self._text(user_id, '🛍️ Каталог')
+        elif action == 'category':
+            self._callback(user_id, f'category_{random.randint(1, self.categories)}')
+        elif action == 'product':
+            self._callback(user_id, f'product_{product_id}')
+        elif action == 'qty':
+            self._callback(user_id, f'qty_plus_{product_id}', quantity_markup)
+        elif action == 'cart_add':
+            self._callback(user_id, f'cart_add_{product_id}', quantity_markup)
+        elif action == 'search':
+            self._text(user_id, '🔍 Поиск')
+            self._text(user_id, random.choice(SEARCH_WORDS))
+        elif action == 'cart':
+            self._text(user_id, '🛒 Корзина')
+        else:
+            # Дальше сервер сам пришлет pre_checkout_query и successful_payment
+            self._callback(user_id, 'payment_stars')
+
+    async def generate(self, duration: float):
+        """Апдейты с частотой rate в секунду от случайных пользователей"""
+        started = time.perf_counter()
+        sent = 0
+        while time.perf_counter() - started < duration:
+            due = int((time.perf_counter() - started) * self.rate)
+            for _ in range(due - sent):
+                self._simulate(FIRST_USER_ID + random.randrange(self.users))
+            sent = max(sent, due)
+            await asyncio.sleep(0.01)
+
+    # Отчет
+
+    def report(self) -> Dict[str, Any]:
+        latencies = sorted(self.reply_latencies)
+        return {
+            'generated': self.generated,
+            'delivered': self.delivered,
+            'backlog': len(self._updates),
+            'replies': len(latencies),
+            'reply_p50_ms': round(_percentile(latencies, 0.50) * 1000, 1),
+            'reply_p95_ms': round(_percentile(latencies, 0.95) * 1000, 1),
+            'reply_p99_ms': round(_percentile(latencies, 0.99) * 1000, 1),
+            'rate_limited': self.rate_limited,
+            'calls': dict(self.calls.most_common()),
+        }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--users', type=int, default=1000, help='симулированных пользователей')
+    parser.add_argument('--rate', type=float, default=100.0, help='апдейтов в секунду')
+    parser.add_argument('--duration', type=float, default=60.0, help='длительность нагрузки, сек')
+    parser.add_argument('--latency', type=float, default=30.0, help='задержка ответа API, мс')
+    parser.add_argument('--jitter', type=float, default=10.0, help='разброс задержки, мс')
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='доля ответов 429 (0..1)')
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--categories', type=int, default=5)
+    parser.add_argument('--products', type=int, default=200)
+    parser.add_argument('--output', help='записать итог в JSON')
+    args = parser.parse_args()
+
+    api = FakeBotAPI(
+        users=args.users,
+        rate=args.rate,
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after,
+        categories=args.categories,
+        products=args.products,
+    )
+    runner = web.AppRunner(api.app())
+    await runner.setup()
+    await web.TCPSite(runner, args.host, args.port).start()
+    print(f"Bot API: http://{args.host}:{args.port}  (TELEGRAM_API_URL для бота)")
+    print("Ожидание первого getUpdates...")
+    try:
+        while not api.calls['getupdates']:
+            await asyncio.sleep(0.1)
+
+        generator = asyncio.create_task(api.generate(args.duration))
+        while not generator.done():
+            await asyncio.sleep(5)
+            r = api.report()
+            print(
+                f"generated={r['generated']} delivered={r['delivered']} backlog={r['backlog']} "
+                f"reply p50={r['reply_p50_ms']}ms p95={r['reply_p95_ms']}ms 429={r['rate_limited']}"
+            )
+        # Время боту на разбор хвоста очереди
+        await asyncio.sleep(5)
+    finally:
+        report = api.report()
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+        await runner.cleanup()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
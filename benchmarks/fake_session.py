@@ -0,0 +1,72 @@
+"""Сессия aiogram без сети: запоминает вызовы Bot API и отвечает заглушками.
+
+Ответ собирается как JSON от Telegram и разбирается штатным
+check_response, поэтому стоимость десериализации остается реальной.
+"""
+import asyncio
+import itertools
+import json
+import time
+import typing
+from collections import Counter
+from typing import Any, AsyncGenerator, Dict, Optional
+
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.methods import TelegramMethod
+from aiogram.types import Message, User
+
+
+class FakeSession(BaseSession):
+    def __init__(self, latency: float = 0.0):
+        super().__init__()
+        self.latency = latency  # имитация сетевой задержки, сек
+        self.calls: Counter = Counter()
+        self._message_ids = itertools.count(1000)
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def reset(self):
+        self.calls.clear()
+
+    async def make_request(self, bot: Bot, method: TelegramMethod, timeout: Optional[int] = None) -> Any:
+        self.calls[method.__api_method__] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        content = json.dumps({'ok': True, 'result': self._result(bot, method)})
+        return self.check_response(bot=bot, method=method, status_code=200, content=content).result
+
+    def _result(self, bot: Bot, method: TelegramMethod) -> Any:
+        returning = method.__returning__
+        types = typing.get_args(returning) or (returning,)
+        chat_id = getattr(method, 'chat_id', None)
+        if Message in types and (chat_id is not None or bool not in types):
+            return self._message(bot, method, chat_id)
+        if User in types:
+            return {'id': bot.id, 'is_bot': True, 'first_name': 'Benchmark', 'username': 'benchmark_bot'}
+        if typing.get_origin(returning) is list:
+            return []
+        return True
+
+    def _message(self, bot: Bot, method: TelegramMethod, chat_id: Any) -> Dict[str, Any]:
+        chat_id = chat_id if isinstance(chat_id, int) else 0
+        message = {
+            'message_id': getattr(method, 'message_id', None) or next(self._message_ids),
+            'date': int(time.time()),
+            'chat': {'id': chat_id, 'type': 'private'},
+            'from': {'id': bot.id, 'is_bot': True, 'first_name': 'Benchmark'},
+        }
+        text = getattr(method, 'text', None) or getattr(method, 'caption', None)
+        if text is not None:
+            message['text'] = text
+        return message
+
+    async def close(self) -> None:
+        pass
+
+    async def stream_content(self, url: str, headers: Optional[Dict[str, Any]] = None,
+                             timeout: int = 30, chunk_size: int = 65536,
+                             raise_for_status: bool = True) -> AsyncGenerator[bytes, None]:
+        yield b''
@@ -0,0 +1,424 @@
+"""Бенчмарк хендлеров: синтетические апдейты через настоящий Dispatcher.
+
+Диспетчер собирается так же, как в run.py (create_dispatcher: планировщик,
+FSM в базе, middleware, все роутеры), вызовы Bot API перехватывает
+FakeSession. Каждый запуск работает на новой временной базе SQLite.
+Для каждого сценария считаются p50/p95/p99 задержки апдейта, пропускная
+способность, SQL-запросы и вызовы Bot API на апдейт. Ошибки в хендлерах
+проваливают запуск: такие замеры и базовую линию сравнивать нельзя.
+
+Запуск:
+    python -m benchmarks.handlers                    # сравнение с базовой линией
+    python -m benchmarks.handlers --save-baseline    # записать базовую линию
+    python -m benchmarks.handlers --scenario cart_storm --sessions 500
+"""
+import os
+import tempfile
+
+# Новая база на каждый запуск; src.config читает настройки при импорте
+_DB_PATH = os.path.join(tempfile.mkdtemp(prefix='handlers-bench-'), 'bot.db')
+os.environ['DB_URL'] = f"sqlite+aiosqlite:///{_DB_PATH}"
+
+from . import _env  # noqa: E402,F401
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import itertools  # noqa: E402
+import json  # noqa: E402
+import logging  # noqa: E402
+import platform  # noqa: E402
+import statistics  # noqa: E402
+import sys  # noqa: E402
+import time  # noqa: E402
+from pathlib import Path  # noqa: E402
+from typing import Any, Awaitable, Callable, Dict, List, Optional  # noqa: E402
+
+from aiogram import Bot  # noqa: E402
+from aiogram.types import Update  # noqa: E402
+from sqlalchemy import event, insert  # noqa: E402
+
+from run import create_dispatcher  # noqa: E402
+from src.config import config as app_config  # noqa: E402
+from src.database.database import Database  # noqa: E402
+from src.database.engine import engine  # noqa: E402
+from src.database.fsm_storage import DatabaseStorage  # noqa: E402
+from src.database.query_log import query_log  # noqa: E402
+from src.database.models import Category, Product, User  # noqa: E402
+from src.utils.broadcast import BroadcastEngine  # noqa: E402
+from src.utils.i18n import get_translator  # noqa: E402
+from src.utils.outbox import NotificationOutbox  # noqa: E402
+from src.utils.reservations import ReservationManager  # noqa: E402
+
+from .fake_session import FakeSession  # noqa: E402
+
+BASELINE_PATH = Path(__file__).parent / 'baselines' / 'handlers.json'
+
+CATEGORIES = 5
+PRODUCTS_PER_CATEGORY = 40
+FIRST_USER_ID = 10_000
+SEARCH_WORDS = ('чайник', 'кружка', 'лампа', 'рюкзак', 'зонт', 'плед', 'термос', 'блокнот')
+
+t = get_translator('ru')
+
+
+class ErrorCounter(logging.Handler):
+    """Ошибки, залогированные хендлерами (они не пробрасываются наружу)"""
+
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord):
+        self.count += 1
+
+
+class Bench:
+    """Окружение бенчмарка: бот, диспетчер, счетчики"""
+
+    def __init__(self, bot: Bot, dp, db: Database, session: FakeSession):
+        self.bot = bot
+        self.dp = dp
+        self.db = db
+        self.session = session
+        self.statements = 0
+        self.latencies: List[float] = []
+        self._update_ids = itertools.count(1)
+        self._message_ids = itertools.count(1)
+        event.listen(engine.sync_engine, 'before_cursor_execute', self._on_statement)
+
+    def _on_statement(self, *args):
+        self.statements += 1
+
+    def reset(self):
+        self.statements = 0
+        self.latencies = []
+        self.session.reset()
+
+    async def feed(self, update: Dict[str, Any]):
+        update['update_id'] = next(self._update_ids)
+        update = Update.model_validate(update, context={'bot': self.bot})
+        started = time.perf_counter()
+        await self.dp.feed_update(self.bot, update)
+        self.latencies.append(time.perf_counter() - started)
+
+    # Фабрики апдейтов
+
+    def _user(self, user_id: int) -> Dict[str, Any]:
+        return {'id': user_id, 'is_bot': False, 'first_name': f'User{user_id}', 'language_code': 'ru'}
+
+    def _message(self, user_id: int, **fields) -> Dict[str, Any]:
+        return {
+            'message_id': next(self._message_ids),
+            'date': int(time.time()),
+            'chat': {'id': user_id, 'type': 'private'},
+            'from': self._user(user_id),
+            **fields,
+        }
+
+    async def message(self, user_id: int, text: str):
+        await self.feed({'message': self._message(user_id, text=text)})
+
+    async def callback(self, user_id: int, data: str, markup: Optional[dict] = None):
+        message = self._message(user_id, text='…')
+        message['from'] = {'id': self.bot.id, 'is_bot': True, 'first_name': 'Benchmark'}
+        if markup is not None:
+            message['reply_markup'] = markup
+        await self.feed({'callback_query': {
+            'id': str(next(self._update_ids)),
+            'from': self._user(user_id),
+            'chat_instance': str(user_id),
+            'message': message,
+            'data': data,
+        }})
+
+    async def pre_checkout(self, user_id: int, amount: int):
+        await self.feed({'pre_checkout_query': {
+            'id': str(next(self._update_ids)),
+            'from': self._user(user_id),
+            'currency': 'XTR',
+            'total_amount': amount,
+            'invoice_payload': 'stars_payment',
+        }})
+
+    async def successful_payment(self, user_id: int, amount: int):
+        await self.feed({'message': self._message(user_id, successful_payment={
+            'currency': 'XTR',
+            'total_amount': amount,
+            'invoice_payload': 'stars_payment',
+            'telegram_payment_charge_id': f'charge-{next(self._update_ids)}',
+            'provider_payment_charge_id': '',
+        })})
+
+
+def _product_id(n: int) -> int:
+    return n % (CATEGORIES * PRODUCTS_PER_CATEGORY) + 1
+
+
+def _qty_markup(product_id: int, quantity: int) -> dict:
+    """Клавиатура карточки товара: количество во второй кнопке первого ряда"""
+    return {'inline_keyboard': [[
+        {'text': '➖', 'callback_data': f'qty_minus_{product_id}'},
+        {'text': str(quantity), 'callback_data': 'current_qty'},
+        {'text': '➕', 'callback_data': f'qty_plus_{product_id}'},
+    ]]}
+
+
+# Сценарии: одна пользовательская сессия, n — номер сессии
+
+async def catalog_browse(bench: Bench, user_id: int, n: int):
+    await bench.message(user_id, t('btn_catalog'))
+    await bench.callback(user_id, f'category_{n % CATEGORIES + 1}')
+    await bench.callback(user_id, 'back_to_categories')
+
+
+async def product_card(bench: Bench, user_id: int, n: int):
+    await bench.callback(user_id, f'product_{_product_id(n)}')
+
+
+async def cart_storm(bench: Bench, user_id: int, n: int):
+    """Быстрые нажатия +/- в карточке товара и в корзине"""
+    product_id = _product_id(n)
+    await bench.callback(user_id, f'cart_add_{product_id}', _qty_markup(product_id, 1))
+    await asyncio.gather(
+        *(bench.callback(user_id, f'qty_plus_{product_id}', _qty_markup(product_id, 1 + i)) for i in range(5)),
+        *(bench.callback(user_id, f'cart_increase_{product_id}') for _ in range(5)),
+        *(bench.callback(user_id, f'cart_decrease_{product_id}') for _ in range(3)),
+    )
+
+
+async def search(bench: Bench, user_id: int, n: int):
+    await bench.message(user_id, t('btn_search'))
+    await bench.message(user_id, SEARCH_WORDS[n % len(SEARCH_WORDS)])
+
+
+async def checkout(bench: Bench, user_id: int, n: int):
+    product_id = _product_id(n)
+    await bench.db.add_to_cart(user_id, product_id, 2)
+    await bench.callback(user_id, 'checkout')
+    await bench.message(user_id, 'ул. Бенчмарковая, 1')
+    await bench.callback(user_id, 'delivery_courier')
+    await bench.callback(user_id, 'payment_card')
+    await bench.callback(user_id, 'confirm_order')
+    # Оформленный заказ очищает корзину; иначе сценарий ничего не измерил
+    if await bench.db.get_cart_item_quantity(user_id, product_id):
+        logging.error(f"Сценарий checkout: заказ пользователя {user_id} не оформлен")
+
+
+async def stars_payment(bench: Bench, user_id: int, n: int):
+    await bench.db.add_to_cart(user_id, _product_id(n), 1)
+    await bench.callback(user_id, 'payment_stars')
+    await bench.pre_checkout(user_id, 1)
+    await bench.successful_payment(user_id, 1)
+
+
+SCENARIOS: Dict[str, Callable[[Bench, int, int], Awaitable[None]]] = {
+    'catalog_browse': catalog_browse,
+    'product_card': product_card,
+    'cart_storm': cart_storm,
+    'search': search,
+    'checkout': checkout,
+    'stars_payment': stars_payment,
+}
+
+
+async def _seed(db: Database, users: int):
+    async with db.async_session() as session:
+        await session.execute(insert(Category), [
+            {'id': c, 'name': f'Категория {c}'} for c in range(1, CATEGORIES + 1)
+        ])
+        await session.execute(insert(Product), [
+            {
+                'product_id': p,
+                'category_id': (p - 1) // PRODUCTS_PER_CATEGORY + 1,
+                'name': f'{SEARCH_WORDS[p % len(SEARCH_WORDS)].capitalize()} №{p}',
+                'description': f'{SEARCH_WORDS[(p * 3) % len(SEARCH_WORDS)]} для дома',
+                'price': float(100 + p),
+                'quantity': 1_000_000,
+            }
+            for p in range(1, CATEGORIES * PRODUCTS_PER_CATEGORY + 1)
+        ])
+        await session.execute(insert(User), [
+            {'user_id': u, 'username': f'user{u}', 'first_name': f'User{u}', 'language': 'ru'}
+            for u in range(FIRST_USER_ID, FIRST_USER_ID + users)
+        ])
+        await session.commit()
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run_scenario(bench: Bench, errors: ErrorCounter, name: str,
+                       sessions: int, concurrency: int, warmup: int) -> Dict[str, Any]:
+    scenario = SCENARIOS[name]
+    # Каждый параллельный поток — отдельный пользователь (свой чат)
+    users = [FIRST_USER_ID + i for i in range(concurrency)]
+
+    for n in range(warmup):
+        await scenario(bench, users[n % len(users)], n)
+    bench.reset()
+    errors.count = 0
+
+    counter = itertools.count()
+
+    async def worker(user_id: int):
+        while (n := next(counter)) < sessions:
+            await scenario(bench, user_id, n)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(user_id) for user_id in users))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(bench.latencies)
+    updates = len(latencies)
+    return {
+        'updates': updates,
+        'p50_ms': round(_percentile(latencies, 0.50) * 1000, 3),
+        'p95_ms': round(_percentile(latencies, 0.95) * 1000, 3),
+        'p99_ms': round(_percentile(latencies, 0.99) * 1000, 3),
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 3),
+        'updates_per_sec': round(updates / elapsed, 1),
+        'statements_per_update': round(bench.statements / updates, 2),
+        'api_calls_per_update': round(bench.session.total_calls / updates, 2),
+        'api_calls': dict(sorted(bench.session.calls.items())),
+        'errors': errors.count,
+    }
+
+
+# Метрика -> True, если больше — хуже
+COMPARED_METRICS = {
+    'p50_ms': True,
+    'p95_ms': True,
+    'p99_ms': True,
+    'updates_per_sec': False,
+    'statements_per_update': True,
+    'api_calls_per_update': True,
+}
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Список регрессий относительно базовой линии"""
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get('scenarios', {}).get(name)
+        if base is None:
+            continue
+        for metric, higher_is_worse in COMPARED_METRICS.items():
+            old, new = base.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (change > threshold) if higher_is_worse else (change < -threshold):
+                regressions.append(f"{name}.{metric}: {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+def _print_results(results: Dict[str, Any]):
+    header = f"{'scenario':<16}{'updates':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'upd/s':>9}{'sql/upd':>9}{'api/upd':>9}{'errors':>8}"
+    print(header)
+    print('-' * len(header))
+    for name, r in results.items():
+        print(
+            f"{name:<16}{r['updates']:>8}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}"
+            f"{r['updates_per_sec']:>9.0f}{r['statements_per_update']:>9.2f}"
+            f"{r['api_calls_per_update']:>9.2f}{r['errors']:>8}"
+        )
+
+
+def _print_queries(stats: Dict[str, Any]):
+    print(f"\n{'хендлер':<40}{'апдейтов':>10}{'запр/апд':>10}{'макс':>6}{'N+1':>6}")
+    handlers = sorted(stats['handlers'].items(), key=lambda item: -item[1]['statements'])
+    for name, row in handlers:
+        print(f"{name:<40}{row['updates']:>10}{row['statements_avg']:>10.2f}"
+              f"{row['statements_max']:>6}{row['n_plus_one']:>6}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='сценарий (можно несколько раз), по умолчанию все')
+    parser.add_argument('--sessions', type=int, default=100, help='сессий на сценарий')
+    parser.add_argument('--concurrency', type=int, default=8, help='параллельных пользователей')
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='допустимое ухудшение относительно базовой линии (0.25 = 25%%)')
+    parser.add_argument('--output', type=Path, help='записать результаты в JSON')
+    parser.add_argument('--queries', action='store_true',
+                        help='показать запросы к базе по хендлерам (src/database/query_log.py)')
+    args = parser.parse_args()
+
+    # Логи хендлеров не печатаются, ошибки только считаются
+    errors = ErrorCounter()
+    logging.basicConfig(level=logging.ERROR, handlers=[errors], force=True)
+
+    session = FakeSession()
+    bot = Bot(token=app_config.token, session=session)
+    db = Database(engine)
+    await db.init_db()
+    await _seed(db, args.concurrency)
+
+    storage = DatabaseStorage(
+        ttl=app_config.fsm_state_ttl,
+        cache_size=app_config.fsm_cache_size
+    )
+    dp = create_dispatcher(app_config, db, storage)
+    reservations = ReservationManager(db, ttl=app_config.reservation_ttl)
+    await reservations.start()
+    dp['reservations'] = reservations
+    # Фоновые сервисы не запускаются: хендлерам нужны только объекты
+    dp['broadcasts'] = BroadcastEngine(bot, db)
+    dp['outbox'] = NotificationOutbox(bot, db)
+
+    bench = Bench(bot, dp, db, session)
+    results = {}
+    try:
+        await dp.emit_startup(bot=bot)
+        for name in args.scenario or SCENARIOS:
+            results[name] = await run_scenario(
+                bench, errors, name, args.sessions, args.concurrency, args.warmup
+            )
+        await dp.emit_shutdown(bot=bot)
+    finally:
+        await reservations.stop()
+        await engine.dispose()
+
+    _print_results(results)
+    if args.queries:
+        _print_queries(query_log.stats())
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'sessions': args.sessions,
+            'concurrency': args.concurrency,
+            'db': 'sqlite',
+        },
+        'scenarios': results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2) + '\n')
+
+    failed = [name for name, result in results.items() if result['errors']]
+    if failed:
+        print(f"\nОшибки в хендлерах: {', '.join(failed)} (запустите с --scenario и смотрите логи)")
+        sys.exit(1)
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, ensure_ascii=False, indent=2) + '\n')
+        print(f"\nБазовая линия записана: {args.baseline}")
+    elif args.baseline.exists():
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        if regressions:
+            print(f"\nРегрессии (порог {args.threshold:.0%}):")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nРегрессий нет (порог {args.threshold:.0%})")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
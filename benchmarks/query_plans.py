@@ -0,0 +1,117 @@
+"""Проверка, что горячие запросы используют индексы (EXPLAIN QUERY PLAN).
+
+Запуск:
+    python -m benchmarks.query_plans                 # схема из models.py во временной базе
+    python -m benchmarks.query_plans --db path.db    # база после alembic upgrade head
+
+Код возврата 1, если хотя бы один запрос сканирует таблицу целиком
+или сортирует результат во временном B-дереве.
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+
+from . import _env  # noqa: F401
+
+from sqlalchemy import create_engine, select, exists, func, tuple_, literal
+from sqlalchemy.dialects import sqlite
+
+from src.database.models import (Base, Cart, Favorite, Review, Order, OrderItem,
+                                 Product, StarsTransaction)
+
+# Запросы в том виде, в каком их выполняют requests.py и Database
+HOT_QUERIES = {
+    'get_cart_item_quantity': select(Cart.quantity).where(
+        Cart.user_id == 1, Cart.product_id == 1
+    ),
+    'is_favorite': select(Favorite).where(
+        Favorite.user_id == 1, Favorite.product_id == 1
+    ),
+    'get_product_reviews': select(Review).where(
+        Review.product_id == 1
+    ).order_by(Review.created_at.desc()),
+    'get_user_orders': select(Order).where(
+        Order.user_id == 1
+    ).order_by(Order.created_at.desc()),
+    'orders_by_status': select(Order).where(
+        Order.status == 'pending'
+    ).order_by(Order.created_at.desc()),
+    'get_stars_transactions': select(StarsTransaction).where(
+        StarsTransaction.user_id == 1
+    ).order_by(StarsTransaction.created_at.desc()).limit(10),
+    'get_products_by_category': select(Product).where(Product.category_id == 1),
+    'get_order_items': select(OrderItem).where(OrderItem.order_id == 1),
+    'get_products_page': select(Product.product_id, Product.name, Product.price).where(
+        Product.category_id == 1,
+        tuple_(Product.name, Product.product_id) > tuple_(literal('m'), literal(1))
+    ).order_by(Product.name, Product.product_id).limit(11),
+    'get_products_page_all': select(Product.product_id, Product.name, Product.price).where(
+        tuple_(Product.name, Product.product_id) > tuple_(literal('m'), literal(1))
+    ).order_by(Product.name, Product.product_id).limit(11),
+    'get_product_card': select(
+        Product,
+        exists().where(Favorite.user_id == 1, Favorite.product_id == Product.product_id),
+        func.coalesce(select(Cart.quantity).where(
+            Cart.user_id == 1, Cart.product_id == Product.product_id
+        ).scalar_subquery(), 0),
+    ).where(Product.product_id == 1),
+}
+
+# Признаки плохого плана: полный скан таблицы и сортировка без индекса
+BAD_PLAN_MARKERS = ('USE TEMP B-TREE',)
+
+
+def _compile(statement) -> str:
+    return str(statement.compile(
+        dialect=sqlite.dialect(),
+        compile_kwargs={'literal_binds': True}
+    ))
+
+
+def _is_full_scan(detail: str) -> bool:
+    return detail.startswith('SCAN ') and 'USING' not in detail
+
+
+def check_plans(db_path: str, queries: dict = HOT_QUERIES) -> list:
+    """Возвращает список (имя запроса, строка плана) для плохих планов"""
+    problems = []
+    connection = sqlite3.connect(db_path)
+    try:
+        for name, statement in queries.items():
+            plan = connection.execute(f"EXPLAIN QUERY PLAN {_compile(statement)}").fetchall()
+            details = [row[-1] for row in plan]
+            for detail in details:
+                if _is_full_scan(detail) or any(marker in detail for marker in BAD_PLAN_MARKERS):
+                    problems.append((name, detail))
+            print(f"{name:<28} {' | '.join(details)}")
+    finally:
+        connection.close()
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', help='путь к файлу SQLite (по умолчанию — новая база из models.py)')
+    args = parser.parse_args()
+
+    db_path = args.db
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix='query-plans-'), 'plans.db')
+        engine = create_engine(f"sqlite:///{db_path}")
+        Base.metadata.create_all(engine)
+        engine.dispose()
+
+    problems = check_plans(db_path)
+    if problems:
+        print("\nЗапросы без индекса:")
+        for name, detail in problems:
+            print(f"  {name}: {detail}")
+        return 1
+    print("\nВсе горячие запросы используют индексы")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""Отправка записанных апдейтов на webhook бота (локальная проверка режима webhook).
+
+Файл — JSON-массив апдейтов или по одному апдейту в строке (JSON Lines).
+Запуск (бот запущен с BOT_MODE=webhook):
+    python -m benchmarks.replay_updates updates.jsonl --secret $WEBHOOK_SECRET
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections import Counter
+
+import aiohttp
+
+
+def _load_updates(path: str) -> list:
+    with open(path, encoding='utf-8') as file:
+        content = file.read().strip()
+    if content.startswith('['):
+        return json.loads(content)
+    return [json.loads(line) for line in content.splitlines() if line.strip()]
+
+
+async def _replay(url: str, secret: str, updates: list, concurrency: int):
+    statuses = Counter()
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    headers = {'X-Telegram-Bot-Api-Secret-Token': secret} if secret else {}
+
+    async with aiohttp.ClientSession(headers=headers) as session:
+        async def post(update: dict):
+            async with semaphore:
+                started = time.perf_counter()
+                async with session.post(url, json=update) as response:
+                    await response.read()
+                    statuses[response.status] += 1
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(post(update) for update in updates))
+    return statuses, latencies
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('updates', help='файл с апдейтами (JSON или JSON Lines)')
+    parser.add_argument('--url', default='http://127.0.0.1:8080/webhook')
+    parser.add_argument('--secret', default='')
+    parser.add_argument('--concurrency', type=int, default=1)
+    args = parser.parse_args()
+
+    updates = _load_updates(args.updates)
+    statuses, latencies = await _replay(args.url, args.secret, updates, args.concurrency)
+    latencies.sort()
+    print(f"updates={len(updates)} statuses={dict(statuses)}")
+    if latencies:
+        print(
+            f"ack p50={statistics.median(latencies) * 1000:.2f}ms "
+            f"max={latencies[-1] * 1000:.2f}ms"
+        )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
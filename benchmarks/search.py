@@ -0,0 +1,107 @@
+"""Сравнение поиска товаров: ILIKE по всей таблице против FTS5 + BM25.
+
+Запуск:
+    python -m benchmarks.search --products 50000
+"""
+import argparse
+import asyncio
+import dataclasses
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from . import _env  # noqa: F401
+
+from sqlalchemy import insert, or_, select
+
+from src.config import config as app_config
+from src.database.database import Database
+from src.database.engine import create_engine
+from src.database.models import Category, Product
+
+SYLLABLES = (
+    'ка ко ру ла ми на то ре ст пр ве ли до ны ск ша же чи бо гу '
+    'ме ти ро за па се ку вы по ле'
+).split()
+
+# Словарь каталога: несколько тысяч «слов», как в реальных названиях и описаниях
+random.seed(1)
+WORDS = sorted({
+    ''.join(random.choice(SYLLABLES) for _ in range(random.randint(2, 4)))
+    for _ in range(5000)
+})
+
+
+def _phrase(length: int) -> str:
+    return ' '.join(random.choice(WORDS) for _ in range(length))
+
+
+async def _seed(db: Database, products: int):
+    async with db.async_session() as session:
+        await session.execute(insert(Category), [{'id': 1, 'name': 'Каталог'}])
+        for start in range(0, products, 5000):
+            await session.execute(insert(Product), [
+                {
+                    'product_id': i,
+                    'category_id': 1,
+                    'name': _phrase(3).capitalize(),
+                    'description': _phrase(60),
+                    'price': float(i % 1000),
+                    'quantity': 10,
+                }
+                for i in range(start + 1, min(start + 5000, products) + 1)
+            ])
+        await session.commit()
+
+
+async def _ilike(db: Database, query: str):
+    """Поиск в том виде, в каком он был до FTS5: без индекса и без лимита"""
+    async with db.async_session() as session:
+        result = await session.execute(
+            select(Product).where(or_(
+                Product.name.ilike(f"%{query}%"),
+                Product.description.ilike(f"%{query}%")
+            ))
+        )
+        return result.scalars().all()
+
+
+async def _measure(search, queries: list) -> str:
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        await search(query)
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return (
+        f"p50={statistics.median(latencies) * 1000:.2f}ms "
+        f"p95={latencies[int(len(latencies) * 0.95) - 1] * 1000:.2f}ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, default=50000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix='search-bench-'), 'search.db')
+    engine = create_engine(dataclasses.replace(app_config, db_url=f"sqlite+aiosqlite:///{path}"))
+    db = Database(engine)
+    try:
+        await db.init_db()
+        await _seed(db, args.products)
+        queries = [random.choice(WORDS)[:random.randint(4, 6)] for _ in range(args.queries)]
+
+        print(f"products={args.products} queries={args.queries}")
+        print(f"ILIKE  {await _measure(lambda q: _ilike(db, q), queries)}")
+        print(f"FTS5   {await _measure(lambda q: db.search_products(q, args.limit), queries)}")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,154 @@
+"""Сравнение профилей PRAGMA SQLite на смешанной нагрузке каталог + корзина.
+
+Запуск:
+    python -m benchmarks.sqlite_profiles --profiles default performance durable
+
+Для каждого профиля создается отдельная временная база, в которую
+параллельно ходят читатели (просмотр товаров категории) и писатели
+(изменение количества в корзине с коммитом на каждое нажатие).
+"""
+import argparse
+import asyncio
+import dataclasses
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from . import _env  # noqa: F401
+
+from sqlalchemy import select, update, insert
+from sqlalchemy.exc import OperationalError
+
+from src.config import config as app_config
+from src.database.engine import create_engine, create_session_factory, SQLITE_PROFILES
+from src.database.models import Base, User, Category, Product, Cart
+
+
+async def _seed(session_factory, categories: int, products: int, users: int):
+    async with session_factory() as session:
+        await session.execute(insert(Category), [
+            {'id': i, 'name': f'Категория {i}'} for i in range(1, categories + 1)
+        ])
+        await session.execute(insert(Product), [
+            {
+                'product_id': i,
+                'category_id': i % categories + 1,
+                'name': f'Товар {i}',
+                'description': 'Описание ' * 20,
+                'price': float(i % 1000),
+                'quantity': 1000,
+            }
+            for i in range(1, products + 1)
+        ])
+        await session.execute(insert(User), [
+            {'user_id': i, 'username': f'user{i}', 'first_name': 'Bench'}
+            for i in range(1, users + 1)
+        ])
+        await session.execute(insert(Cart), [
+            {'user_id': i, 'product_id': i % products + 1, 'quantity': 1}
+            for i in range(1, users + 1)
+        ])
+        await session.commit()
+
+
+async def _reader(session_factory, categories: int, deadline: float, latencies: list, errors: list):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            async with session_factory() as session:
+                category_id = random.randint(1, categories)
+                await session.scalars(select(Product).where(Product.category_id == category_id))
+            latencies.append(time.perf_counter() - started)
+        except OperationalError as e:
+            errors.append(str(e))
+
+
+async def _writer(session_factory, users: int, deadline: float, latencies: list, errors: list):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            async with session_factory() as session:
+                user_id = random.randint(1, users)
+                await session.execute(
+                    update(Cart)
+                    .where(Cart.user_id == user_id)
+                    .values(quantity=random.randint(1, 10))
+                )
+                await session.commit()
+            latencies.append(time.perf_counter() - started)
+        except OperationalError as e:
+            errors.append(str(e))
+
+
+def _summary(latencies: list) -> str:
+    if not latencies:
+        return 'n=0'
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1] if len(ordered) > 1 else ordered[0]
+    return (
+        f"n={len(ordered)} p50={statistics.median(ordered) * 1000:.2f}ms "
+        f"p95={p95 * 1000:.2f}ms"
+    )
+
+
+async def run_profile(profile: str, args) -> dict:
+    path = os.path.join(tempfile.mkdtemp(prefix='sqlite-bench-'), 'bench.db')
+    config = dataclasses.replace(
+        app_config,
+        db_url=f"sqlite+aiosqlite:///{path}",
+        sqlite_profile=profile,
+        db_pool_size=args.readers + args.writers,
+        db_connect_timeout=args.lock_timeout,
+    )
+    engine = create_engine(config)
+    session_factory = create_session_factory(engine)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await _seed(session_factory, args.categories, args.products, args.users)
+
+        read_latencies, write_latencies, errors = [], [], []
+        deadline = time.perf_counter() + args.duration
+        await asyncio.gather(
+            *(_reader(session_factory, args.categories, deadline, read_latencies, errors)
+              for _ in range(args.readers)),
+            *(_writer(session_factory, args.users, deadline, write_latencies, errors)
+              for _ in range(args.writers)),
+        )
+        return {
+            'profile': profile,
+            'reads': _summary(read_latencies),
+            'writes': _summary(write_latencies),
+            'throughput': (len(read_latencies) + len(write_latencies)) / args.duration,
+            'errors': len(errors),
+        }
+    finally:
+        await engine.dispose()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profiles', nargs='+', default=list(SQLITE_PROFILES))
+    parser.add_argument('--duration', type=float, default=5.0, help='секунд на профиль')
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--categories', type=int, default=20)
+    parser.add_argument('--products', type=int, default=5000)
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--lock-timeout', type=float, default=5.0,
+                        help='таймаут ожидания блокировки sqlite, сек')
+    args = parser.parse_args()
+
+    for profile in args.profiles:
+        result = await run_profile(profile, args)
+        print(
+            f"{result['profile']:<12} {result['throughput']:>9.1f} ops/s  "
+            f"reads[{result['reads']}]  writes[{result['writes']}]  "
+            f"locked={result['errors']}"
+        )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
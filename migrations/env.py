@@ -10,6 +10,7 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from alembic import context
 from src.database.models import Base
+from src.config import load_config
 
 config = context.config
 
@@ -32,7 +33,8 @@ def run_migrations_offline() -> None:
 
 async def run_async_migrations() -> None:
     configuration = config.get_section(config.config_ini_section)
-    configuration["sqlalchemy.url"] = "sqlite+aiosqlite:///bot_database.db"
+    # Миграции применяются к той же базе, что использует бот (DB_URL)
+    configuration["sqlalchemy.url"] = load_config().db_url
 
     connectable = async_engine_from_config(
         configuration,
@@ -0,0 +1,49 @@
+"""add performance indexes
+
+Revision ID: 007d04563c77
+Revises: f281daa6663f
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '007d04563c77'
+down_revision = 'f281daa6663f'
+branch_labels = None
+depends_on = None
+
+# (таблица, имя индекса, колонки, unique)
+INDEXES = [
+    ('cart', 'uq_cart_user_product', ['user_id', 'product_id'], True),
+    ('favorites', 'uq_favorites_user_product', ['user_id', 'product_id'], True),
+    ('products', 'ix_products_category_id', ['category_id'], False),
+    ('order_items', 'ix_order_items_order_id', ['order_id'], False),
+    ('reviews', 'ix_reviews_product_created', ['product_id', 'created_at'], False),
+    ('orders', 'ix_orders_user_created', ['user_id', 'created_at'], False),
+    ('orders', 'ix_orders_status_created', ['status', 'created_at'], False),
+    ('stars_transactions', 'ix_stars_transactions_user_created', ['user_id', 'created_at'], False),
+]
+
+def upgrade() -> None:
+    # Перед уникальными индексами убираем дубликаты, оставляя последнюю запись
+    op.execute(sa.text(
+        "DELETE FROM cart WHERE cart_id NOT IN "
+        "(SELECT MAX(cart_id) FROM cart GROUP BY user_id, product_id)"
+    ))
+    op.execute(sa.text(
+        "DELETE FROM favorites WHERE id NOT IN "
+        "(SELECT MAX(id) FROM favorites GROUP BY user_id, product_id)"
+    ))
+
+    # Используем batch режим для SQLite
+    for table, name, columns, unique in INDEXES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.create_index(name, columns, unique=unique)
+
+def downgrade() -> None:
+    # Используем batch режим для SQLite
+    for table, name, columns, unique in reversed(INDEXES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_index(name)
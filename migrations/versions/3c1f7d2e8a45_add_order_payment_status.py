@@ -0,0 +1,27 @@
+"""add order payment status
+
+Revision ID: 3c1f7d2e8a45
+Revises: e7a2c4b95f18
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '3c1f7d2e8a45'
+down_revision = 'e7a2c4b95f18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Используем batch режим для SQLite
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('payment_status', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    # Используем batch режим для SQLite
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.drop_column('payment_status')
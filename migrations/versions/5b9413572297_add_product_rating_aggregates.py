@@ -0,0 +1,36 @@
+"""add product rating aggregates
+
+Revision ID: 5b9413572297
+Revises: 007d04563c77
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '5b9413572297'
+down_revision = '007d04563c77'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Используем batch режим для SQLite
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rating_sum', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Заполняем агрегаты по уже существующим отзывам
+    op.execute(sa.text(
+        "UPDATE products SET "
+        "rating_sum = COALESCE((SELECT SUM(rating) FROM reviews "
+        "WHERE reviews.product_id = products.product_id), 0), "
+        "rating_count = (SELECT COUNT(*) FROM reviews "
+        "WHERE reviews.product_id = products.product_id)"
+    ))
+
+def downgrade() -> None:
+    # Используем batch режим для SQLite
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.drop_column('rating_count')
+        batch_op.drop_column('rating_sum')
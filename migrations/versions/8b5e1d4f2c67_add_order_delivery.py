@@ -0,0 +1,29 @@
+"""add order delivery
+
+Revision ID: 8b5e1d4f2c67
+Revises: 3c1f7d2e8a45
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '8b5e1d4f2c67'
+down_revision = '3c1f7d2e8a45'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Используем batch режим для SQLite
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('delivery_method', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('delivery_address', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    # Используем batch режим для SQLite
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.drop_column('delivery_address')
+        batch_op.drop_column('delivery_method')
@@ -0,0 +1,33 @@
+"""add reservations
+
+Revision ID: a81c4f2e9b37
+Revises: 5b9413572297
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = 'a81c4f2e9b37'
+down_revision = '5b9413572297'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'reservations',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.user_id', ondelete='CASCADE'), nullable=False),
+        sa.Column('product_id', sa.Integer(), sa.ForeignKey('products.product_id', ondelete='CASCADE'), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('uq_reservations_user_product', 'reservations', ['user_id', 'product_id'], unique=True)
+    op.create_index('ix_reservations_expires_at', 'reservations', ['expires_at'])
+
+def downgrade() -> None:
+    op.drop_index('ix_reservations_expires_at', table_name='reservations')
+    op.drop_index('uq_reservations_user_product', table_name='reservations')
+    op.drop_table('reservations')
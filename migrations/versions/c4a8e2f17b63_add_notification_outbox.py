@@ -0,0 +1,38 @@
+"""add notification outbox
+
+Revision ID: c4a8e2f17b63
+Revises: b7c3d9e41f20
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = 'c4a8e2f17b63'
+down_revision = 'b7c3d9e41f20'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'notification_outbox',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.Column('dedupe_key', sa.String(), nullable=True),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('locked_until', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('uq_notification_outbox_dedupe_key', 'notification_outbox', ['dedupe_key'], unique=True)
+    op.create_index('ix_notification_outbox_status_next', 'notification_outbox', ['status', 'next_attempt_at'])
+
+def downgrade() -> None:
+    op.drop_index('ix_notification_outbox_status_next', table_name='notification_outbox')
+    op.drop_index('uq_notification_outbox_dedupe_key', table_name='notification_outbox')
+    op.drop_table('notification_outbox')
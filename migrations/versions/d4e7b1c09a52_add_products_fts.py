@@ -0,0 +1,34 @@
+"""add products fts
+
+Revision ID: d4e7b1c09a52
+Revises: a81c4f2e9b37
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from src.database import fts
+
+# revision identifiers
+revision = 'd4e7b1c09a52'
+down_revision = 'a81c4f2e9b37'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # FTS5 есть только в SQLite, на других СУБД поиск работает через ILIKE
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute(sa.text(fts.CREATE_TABLE))
+    for statement in fts.CREATE_TRIGGERS:
+        op.execute(sa.text(statement))
+    # Индексируем уже существующие товары
+    for statement in fts.REBUILD:
+        op.execute(sa.text(statement))
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in fts.DROP:
+        op.execute(sa.text(statement))
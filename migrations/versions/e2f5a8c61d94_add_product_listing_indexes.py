@@ -0,0 +1,29 @@
+"""add product listing indexes
+
+Revision ID: e2f5a8c61d94
+Revises: d4e7b1c09a52
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+# revision identifiers
+revision = 'e2f5a8c61d94'
+down_revision = 'd4e7b1c09a52'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Используем batch режим для SQLite
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        # (category_id, name) покрывает и поиск по category_id
+        batch_op.drop_index('ix_products_category_id')
+        batch_op.create_index('ix_products_category_name', ['category_id', 'name'], unique=False)
+        batch_op.create_index('ix_products_name', ['name'], unique=False)
+
+def downgrade() -> None:
+    # Используем batch режим для SQLite
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.drop_index('ix_products_name')
+        batch_op.drop_index('ix_products_category_name')
+        batch_op.create_index('ix_products_category_id', ['category_id'], unique=False)
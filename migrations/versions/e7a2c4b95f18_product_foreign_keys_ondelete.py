@@ -0,0 +1,54 @@
+"""product foreign keys ondelete
+
+Revision ID: e7a2c4b95f18
+Revises: d9b1f6a3c285
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = 'e7a2c4b95f18'
+down_revision = 'd9b1f6a3c285'
+branch_labels = None
+depends_on = None
+
+# В SQLite внешние ключи без имени: batch-режим называет их по этому шаблону
+NAMING = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+
+# (таблица, колонка, ondelete) — ссылки на products, которые мешали удалять товары
+FOREIGN_KEYS = (
+    ('order_items', 'product_id', 'SET NULL'),
+    ('reviews', 'product_id', 'CASCADE'),
+)
+
+
+def _fk_name(table: str, column: str) -> str:
+    """Имя существующего ключа (PostgreSQL) или имя по шаблону NAMING (SQLite)"""
+    for fk in sa.inspect(op.get_bind()).get_foreign_keys(table):
+        if fk['constrained_columns'] == [column] and fk['name']:
+            return fk['name']
+    return NAMING['fk'] % {
+        'table_name': table, 'column_0_name': column, 'referred_table_name': 'products'
+    }
+
+
+def _recreate(ondelete_by_table: dict) -> None:
+    for table, column, _ in FOREIGN_KEYS:
+        name = _fk_name(table, column)
+        # Используем batch режим для SQLite
+        with op.batch_alter_table(table, schema=None, naming_convention=NAMING) as batch_op:
+            batch_op.drop_constraint(name, type_='foreignkey')
+            batch_op.create_foreign_key(
+                name, 'products', [column], ['product_id'],
+                ondelete=ondelete_by_table[table]
+            )
+
+
+def upgrade() -> None:
+    _recreate({table: ondelete for table, _, ondelete in FOREIGN_KEYS})
+
+
+def downgrade() -> None:
+    _recreate({table: None for table, _, _ in FOREIGN_KEYS})
@@ -3,14 +3,66 @@ import logging
 import os
 from pathlib import Path
 from aiogram import Bot, Dispatcher
-from src.config import load_config
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.fsm.storage.base import BaseStorage
+from src.config import Config, load_config
 from src.database.database import Database
+from src.database.engine import engine
+from src.database.admins import admins
+from src.database.fsm_storage import DatabaseStorage
 from src.middlewares.database import DatabaseMiddleware
+from src.middlewares.i18n import I18nMiddleware
+from src.middlewares.metrics import BotAPIMetricsMiddleware, setup_handler_metrics
+from src.middlewares.queries import setup_query_tracking
+from src.middlewares.scheduler import UpdateScheduler
+from src.utils.reservations import ReservationManager
+from src.utils.broadcast import BroadcastEngine
+from src.utils.outbox import NotificationOutbox
+from src.utils.rate_limit import TokenBucket
+from src.utils.metrics import LoopLagMonitor, loop_lag
+from src.monitoring import MetricsCollector, start_metrics_server
+from src.webhook import run_webhook
 from src.handlers import user, admin, errors, edit_profile, order, payment, settings  # Добавили settings
 
 # Получаем путь к корневой директории проекта
 BASE_DIR = Path(__file__).parent
 
+def create_dispatcher(config: Config, db: Database, storage: BaseStorage) -> Dispatcher:
+    """Диспетчер со всеми middleware и роутерами бота (без фоновых сервисов)"""
+    # FSM-middleware регистрируется вручную после планировщика: состояние
+    # читается, когда апдейт дождался своей очереди в чате
+    dp = Dispatcher(storage=storage, disable_fsm=True)
+    scheduler = UpdateScheduler(
+        concurrency=config.update_concurrency,
+        priority_concurrency=config.update_priority_concurrency,
+        max_pending=config.update_queue_size,
+        max_chat_pending=config.update_chat_queue_size,
+        policy=config.update_overflow_policy
+    )
+    dp.update.outer_middleware(scheduler)
+    if config.db_instrument:
+        # Запросы к базе учитываются по апдейтам и хендлерам
+        setup_query_tracking(dp)
+    dp.update.outer_middleware(dp.fsm)
+    dp["scheduler"] = scheduler
+    
+    dp.update.middleware(DatabaseMiddleware(db))
+    # Язык пользователя определяется один раз на апдейт (locale, t в хендлерах)
+    dp.update.middleware(I18nMiddleware())
+    if config.metrics_port:
+        # Время хендлеров с метками router/handler для /metrics
+        setup_handler_metrics(dp)
+    
+    dp.include_router(user.router)
+    dp.include_router(admin.router)
+    dp.include_router(errors.router)
+    dp.include_router(edit_profile.router)
+    dp.include_router(order.router)
+    dp.include_router(payment.router)
+    dp.include_router(settings.router)  # Добавили эту строку
+    return dp
+
 async def main():
     logging.basicConfig(
         level=logging.INFO,
@@ -19,28 +71,86 @@ async def main():
 
     config = load_config()
     
-    # Создаем путь к файлу БД относительно корневой директории
-    db_path = BASE_DIR / config.database_path
+    session = None
+    if config.telegram_api_url:
+        session = AiohttpSession(api=TelegramAPIServer.from_base(config.telegram_api_url))
+    bot = Bot(token=config.token, session=session)
+    if config.metrics_port:
+        bot.session.middleware(BotAPIMetricsMiddleware())
+    # Состояния FSM хранятся в базе и переживают перезапуск
+    storage = DatabaseStorage(
+        ttl=config.fsm_state_ttl,
+        sweep_interval=config.fsm_sweep_interval,
+        cache_size=config.fsm_cache_size
+    )
+    # Database работает через общий движок (DB_URL), что и requests.py
+    db = Database(engine)
+    await db.init_db()  # Инициализируем базу данных
+    await admins.load()  # Права администраторов проверяются по списку в памяти
+    storage.start()
+    
+    dp = create_dispatcher(config, db, storage)
     
-    bot = Bot(token=config.token)
-    dp = Dispatcher()
+    # Резервы товаров на время оплаты, доступны в хендлерах как reservations
+    reservations = ReservationManager(
+        db,
+        ttl=config.reservation_ttl,
+        sweep_interval=config.reservation_sweep_interval
+    )
+    await reservations.start()
+    dp["reservations"] = reservations
     
-    db = Database(str(db_path))
-    await db.init_db()  # Инициализируем базу данных
+    # Общий лимит исходящих сообщений для рассылок и уведомлений
+    send_bucket = TokenBucket(config.send_rate)
     
-    dp.update.middleware(DatabaseMiddleware(db))
+    # Фоновые рассылки (прерванные перезапуском продолжаются), доступны как broadcasts
+    broadcasts = BroadcastEngine(
+        bot,
+        db,
+        bucket=send_bucket,
+        concurrency=config.broadcast_concurrency,
+        batch_size=config.broadcast_batch_size
+    )
+    await broadcasts.start()
+    dp["broadcasts"] = broadcasts
     
-    dp.include_router(user.router)
-    dp.include_router(admin.router)
-    dp.include_router(errors.router)
-    dp.include_router(edit_profile.router)
-    dp.include_router(order.router)
-    dp.include_router(payment.router)
-    dp.include_router(settings.router)  # Добавили эту строку
+    # Воркеры очереди уведомлений (outbox), доступны как outbox
+    outbox = NotificationOutbox(
+        bot,
+        db,
+        bucket=send_bucket,
+        workers=config.outbox_workers,
+        batch_size=config.outbox_batch_size,
+        max_attempts=config.outbox_max_attempts
+    )
+    await outbox.start()
+    dp["outbox"] = outbox
+    
+    # Метрики для Prometheus на локальном порту (METRICS_PORT)
+    loop_monitor = metrics_runner = None
+    if config.metrics_port:
+        loop_monitor = LoopLagMonitor(loop_lag)
+        loop_monitor.start()
+        metrics_runner = await start_metrics_server(
+            MetricsCollector(dp, engine=engine, loop_monitor=loop_monitor),
+            config.metrics_host,
+            config.metrics_port
+        )
     
     try:
-        await dp.start_polling(bot)
+        if config.bot_mode == 'webhook':
+            await run_webhook(dp, bot, config)
+        else:
+            # Polling не работает, пока у бота зарегистрирован webhook
+            await bot.delete_webhook()
+            await dp.start_polling(bot)
     finally:
+        if metrics_runner is not None:
+            await metrics_runner.cleanup()
+            await loop_monitor.stop()
+        await outbox.stop()
+        await broadcasts.stop()
+        await reservations.stop()
         await bot.session.close()
         await db.close()
 
@@ -10,15 +10,88 @@ from decimal import Decimal
 class Config:
     token: str
     admin_ids: list[int]
-    database_path: str
     db_url: str
     super_admin_id: int
     
+    # Свой сервер Bot API (локальный telegram-bot-api или тестовый); пусто — api.telegram.org
+    telegram_api_url: str = ''
+    
+    # Режим получения апдейтов: polling или webhook
+    bot_mode: str = 'polling'
+    webhook_url: str = ''  # Публичный адрес; пусто — webhook регистрируется снаружи
+    webhook_path: str = '/webhook'
+    webhook_secret: str | None = None  # Заголовок X-Telegram-Bot-Api-Secret-Token
+    webhook_host: str = '0.0.0.0'
+    webhook_port: int = 8080
+    
+    # Эндпоинт метрик Prometheus (src/monitoring.py)
+    metrics_port: int = 0  # 0 — выключен
+    metrics_host: str = '127.0.0.1'
+    
+    # Настройки движка базы данных
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0  # Ожидание свободного соединения, сек
+    db_pool_recycle: int = 3600  # Пересоздание соединений, сек
+    db_connect_timeout: float = 30.0  # Таймаут подключения / блокировки, сек
+    
+    # Учет SQL-запросов по апдейтам (src/database/query_log.py)
+    db_instrument: bool = True
+    db_slow_query_ms: float = 100.0  # Запрос дольше — в журнал медленных
+    db_slow_update_ms: float = 500.0  # Суммарное время апдейта в базе дольше — в журнал
+    db_n_plus_one: int = 5  # Однотипных запросов на апдейт больше — предупреждение N+1 (0 — выкл.)
+    db_log_interval: float = 60.0  # Одинаковые предупреждения не чаще, сек
+    
+    # Профиль PRAGMA для SQLite (см. SQLITE_PROFILES в src/database/engine.py)
+    sqlite_profile: str = 'performance'
+    sqlite_busy_timeout: int | None = None  # мс, переопределяет значение профиля
+    sqlite_cache_size: int | None = None  # страницы (<0 — размер в КиБ)
+    sqlite_mmap_size: int | None = None  # байты
+    
+    # Резервирование товаров на время оплаты
+    reservation_ttl: float = 600.0  # Время жизни резерва, сек
+    reservation_sweep_interval: float = 30.0  # Период очистки просроченных резервов, сек
+    
+    # Хранилище состояний FSM в базе
+    fsm_state_ttl: float = 86400.0  # Брошенный сценарий удаляется через, сек
+    fsm_sweep_interval: float = 600.0  # Период очистки просроченных состояний, сек
+    fsm_cache_size: int = 10000  # Состояний в кэше процесса (0 — без кэша; в webhook-режиме по умолчанию 0)
+    
+    # Список администраторов в памяти (src/database/admins.py)
+    admin_cache_ttl: float = 30.0  # Перечитывать из базы не реже, сек (изменения других воркеров)
+    
+    # Кэши каталога и пользовательских настроек (src/database/catalog_cache.py, user_settings.py)
+    cache_ttl: float = 0.0  # Перечитывать из базы не реже, сек (0 — не перечитывать; в webhook-режиме по умолчанию 30)
+    
+    # Планировщик апдейтов (src/middlewares/scheduler.py)
+    update_concurrency: int = 32  # Хендлеров одновременно (по разным чатам)
+    update_priority_concurrency: int = 8  # Отдельные слоты для платежей и админов
+    update_queue_size: int = 1000  # Обычных апдейтов в очереди всего
+    update_chat_queue_size: int = 20  # Апдейтов в очереди одного чата
+    update_overflow_policy: str = 'drop'  # drop — отбросить новый, merge — вытеснить старый
+    
+    # Исходящие сообщения: общий лимит для рассылок и уведомлений
+    send_rate: float = 25.0  # Сообщений в секунду (лимит Telegram ~30)
+    
+    # Фоновые рассылки
+    broadcast_concurrency: int = 10  # Одновременных запросов к Bot API
+    broadcast_batch_size: int = 500  # Получателей в порции (шаг сохранения прогресса)
+    
+    # Очередь уведомлений (outbox)
+    outbox_workers: int = 2
+    outbox_batch_size: int = 50
+    outbox_max_attempts: int = 5
+    
     # Stars конфигурация
     STARS_RATE: Decimal = Decimal('1.35')  # Курс конвертации: 1 Star = 1.35 рубля
     MIN_STARS_AMOUNT: int = 1  # Минимальная сумма для оплаты Stars
 
 
+def _optional_int(value: str | None) -> int | None:
+    """Преобразование необязательной переменной окружения в int"""
+    return int(value) if value not in (None, '') else None
+
+
 def load_config() -> Config:
     load_dotenv()
     
@@ -27,10 +100,6 @@ def load_config() -> Config:
     if not token:
         raise ValueError("BOT_TOKEN is required")
     
-    database_path = getenv('DATABASE_PATH')
-    if not database_path:
-        raise ValueError("DATABASE_PATH is required")
-    
     db_url = getenv('DB_URL')
     if not db_url:
         raise ValueError("DB_URL is required")
@@ -58,6 +127,20 @@ def load_config() -> Config:
         logging.error(f"Error parsing SUPER_ADMIN_ID: {e}")
         raise ValueError("Invalid SUPER_ADMIN_ID format")
     
+    bot_mode = getenv('BOT_MODE', 'polling').lower()
+    if bot_mode not in ('polling', 'webhook'):
+        raise ValueError("BOT_MODE must be 'polling' or 'webhook'")
+    
+    webhook_secret = getenv('WEBHOOK_SECRET') or None
+    if bot_mode == 'webhook':
+        # Требования Telegram к secret_token: 1-256 символов A-Z, a-z, 0-9, _ и -
+        if not webhook_secret or not re.fullmatch(r'[A-Za-z0-9_-]{1,256}', webhook_secret):
+            raise ValueError("WEBHOOK_SECRET (1-256 chars: A-Z, a-z, 0-9, _, -) is required in webhook mode")
+    
+    update_overflow_policy = getenv('UPDATE_OVERFLOW_POLICY', 'drop').lower()
+    if update_overflow_policy not in ('drop', 'merge'):
+        raise ValueError("UPDATE_OVERFLOW_POLICY must be 'drop' or 'merge'")
+    
     # Добавляем super_admin_id в список admin_ids, если его там нет
     if super_admin_id not in admin_ids:
         admin_ids.append(super_admin_id)
@@ -65,9 +148,53 @@ def load_config() -> Config:
     config = Config(
         token=token,
         admin_ids=admin_ids,
-        database_path=database_path,
         db_url=db_url,
-        super_admin_id=super_admin_id
+        super_admin_id=super_admin_id,
+        telegram_api_url=getenv('TELEGRAM_API_URL', '').rstrip('/'),
+        bot_mode=bot_mode,
+        webhook_url=getenv('WEBHOOK_URL', ''),
+        webhook_path=getenv('WEBHOOK_PATH', '/webhook'),
+        webhook_secret=webhook_secret,
+        webhook_host=getenv('WEBHOOK_HOST', '0.0.0.0'),
+        webhook_port=int(getenv('WEBHOOK_PORT', '8080')),
+        metrics_port=int(getenv('METRICS_PORT', '0')),
+        metrics_host=getenv('METRICS_HOST', '127.0.0.1'),
+        db_pool_size=int(getenv('DB_POOL_SIZE', '5')),
+        db_max_overflow=int(getenv('DB_MAX_OVERFLOW', '10')),
+        db_pool_timeout=float(getenv('DB_POOL_TIMEOUT', '30')),
+        db_pool_recycle=int(getenv('DB_POOL_RECYCLE', '3600')),
+        db_connect_timeout=float(getenv('DB_CONNECT_TIMEOUT', '30')),
+        db_instrument=getenv('DB_INSTRUMENT', '1').lower() in ('1', 'true', 'yes'),
+        db_slow_query_ms=float(getenv('DB_SLOW_QUERY_MS', '100')),
+        db_slow_update_ms=float(getenv('DB_SLOW_UPDATE_MS', '500')),
+        db_n_plus_one=int(getenv('DB_N_PLUS_ONE', '5')),
+        db_log_interval=float(getenv('DB_LOG_INTERVAL', '60')),
+        sqlite_profile=getenv('SQLITE_PROFILE', 'performance'),
+        sqlite_busy_timeout=_optional_int(getenv('SQLITE_BUSY_TIMEOUT')),
+        sqlite_cache_size=_optional_int(getenv('SQLITE_CACHE_SIZE')),
+        sqlite_mmap_size=_optional_int(getenv('SQLITE_MMAP_SIZE')),
+        reservation_ttl=float(getenv('RESERVATION_TTL', '600')),
+        reservation_sweep_interval=float(getenv('RESERVATION_SWEEP_INTERVAL', '30')),
+        fsm_state_ttl=float(getenv('FSM_STATE_TTL', '86400')),
+        fsm_sweep_interval=float(getenv('FSM_SWEEP_INTERVAL', '600')),
+        # Long polling возможен только в одном процессе, а webhook может стоять
+        # за несколькими воркерами: там кэш отдал бы устаревшее состояние
+        fsm_cache_size=int(getenv('FSM_CACHE_SIZE', '0' if bot_mode == 'webhook' else '10000')),
+        admin_cache_ttl=float(getenv('ADMIN_CACHE_TTL', '30')),
+        # В одном процессе кэши обновляются вместе с базой; изменения,
+        # сделанные другими webhook-воркерами, видны только после перечитывания
+        cache_ttl=float(getenv('CACHE_TTL', '30' if bot_mode == 'webhook' else '0')),
+        update_concurrency=int(getenv('UPDATE_CONCURRENCY', '32')),
+        update_priority_concurrency=int(getenv('UPDATE_PRIORITY_CONCURRENCY', '8')),
+        update_queue_size=int(getenv('UPDATE_QUEUE_SIZE', '1000')),
+        update_chat_queue_size=int(getenv('UPDATE_CHAT_QUEUE_SIZE', '20')),
+        update_overflow_policy=update_overflow_policy,
+        send_rate=float(getenv('SEND_RATE', '25')),
+        broadcast_concurrency=int(getenv('BROADCAST_CONCURRENCY', '10')),
+        broadcast_batch_size=int(getenv('BROADCAST_BATCH_SIZE', '500')),
+        outbox_workers=int(getenv('OUTBOX_WORKERS', '2')),
+        outbox_batch_size=int(getenv('OUTBOX_BATCH_SIZE', '50')),
+        outbox_max_attempts=int(getenv('OUTBOX_MAX_ATTEMPTS', '5'))
     )
     
     return config
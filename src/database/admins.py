@@ -0,0 +1,96 @@
+"""Множество ID администраторов в памяти процесса.
+
+Загружается из базы (users.is_admin плюс SUPER_ADMIN_ID), дальше
+requests.add_admin/delete_admin обновляют его сразу после коммита.
+Изменения, сделанные другим воркером, видны после истечения ADMIN_CACHE_TTL:
+is_admin() перечитывает список, если он старше этого срока.
+"""
+import asyncio
+import logging
+import time
+from typing import FrozenSet, Set
+
+from sqlalchemy import select
+
+from src.config import config as app_config
+from .engine import async_session
+from .models import User
+
+
+class AdminRegistry:
+    def __init__(self, super_admin_id: int, session_factory=async_session, ttl: float = 30.0):
+        self.super_admin_id = super_admin_id
+        self.session_factory = session_factory
+        self.ttl = ttl  # 0 — перечитывать только после invalidate()
+        self.loads = 0
+        self._loaded = False
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        self._ids: Set[int] = set()
+
+    async def load(self) -> bool:
+        """(Пере)загрузка списка администраторов из базы"""
+        async with self._lock:
+            return await self._load()
+
+    async def _load(self) -> bool:
+        try:
+            async with self.session_factory() as session:
+                result = await session.scalars(
+                    select(User.user_id).where(User.is_admin == True)
+                )
+                self._ids = set(result)
+        except Exception as e:
+            logging.error(f"Ошибка при загрузке списка администраторов: {e}")
+            return False
+        self._loaded = True
+        self._loaded_at = time.monotonic()
+        self.loads += 1
+        logging.info(f"Загружено {len(self._ids)} администраторов")
+        return True
+
+    def _expired(self) -> bool:
+        if not self._loaded:
+            return True
+        return self.ttl > 0 and time.monotonic() - self._loaded_at >= self.ttl
+
+    async def is_admin(self, user_id: int) -> bool:
+        """Администратор или супер-администратор"""
+        if user_id == self.super_admin_id:
+            return True
+        if self._expired():
+            async with self._lock:
+                # Пока ждали блокировку, список мог перечитать другой апдейт
+                if self._expired():
+                    await self._load()
+        return user_id in self._ids
+
+    def __contains__(self, user_id: int) -> bool:
+        """Проверка без обращения к базе по последнему загруженному списку.
+
+        Используется только для приоритета в планировщике; права проверяет is_admin().
+        """
+        return user_id == self.super_admin_id or user_id in self._ids
+
+    def is_super_admin(self, user_id: int) -> bool:
+        return user_id == self.super_admin_id
+
+    def add(self, user_id: int):
+        """Флаг is_admin установлен в базе"""
+        self._ids.add(user_id)
+
+    def discard(self, user_id: int):
+        """Флаг is_admin снят в базе"""
+        self._ids.discard(user_id)
+
+    def ids(self) -> FrozenSet[int]:
+        """Текущие администраторы (без супер-администратора)"""
+        return frozenset(self._ids)
+
+    def invalidate(self):
+        """Перечитать из базы при следующей проверке (изменения в обход requests.py)"""
+        self._loaded = False
+
+
+# Единый список администраторов процесса
+admins = AdminRegistry(app_config.super_admin_id, ttl=app_config.admin_cache_ttl)
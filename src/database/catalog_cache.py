@@ -0,0 +1,195 @@
+"""Кэш каталога в памяти процесса.
+
+Категории и поля товаров, нужные для списков (название, цена, категория),
+загружаются из базы один раз. Админские операции в requests.py обновляют
+кэш сразу после коммита, поэтому просмотр каталога в базу не ходит.
+Каждое изменение увеличивает catalog.version — по нему сбрасываются
+производные кэши (например, готовые клавиатуры). При CACHE_TTL > 0 каталог
+целиком перечитывается не реже этого срока: так видны изменения, сделанные
+другими webhook-воркерами.
+"""
+import asyncio
+import logging
+import time
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from src.config import config as app_config
+from .engine import async_session
+from .models import Category, Product
+
+
+class CategoryRecord:
+    __slots__ = ('id', 'name')
+
+    def __init__(self, id: int, name: str):
+        self.id = id
+        self.name = name
+
+
+class ProductRecord:
+    __slots__ = ('product_id', 'category_id', 'name', 'price')
+
+    def __init__(self, product_id: int, category_id: Optional[int], name: str, price: float):
+        self.product_id = product_id
+        self.category_id = category_id
+        self.name = name
+        self.price = price
+
+    @property
+    def sort_key(self) -> Tuple[str, int]:
+        """Порядок листания, как в запросе get_products_page из benchmarks/query_plans.py"""
+        return (self.name or '', self.product_id)
+
+
+class CatalogCache:
+    def __init__(self, session_factory=async_session, ttl: float = 0.0):
+        self.session_factory = session_factory
+        self.ttl = ttl  # 0 — без срока
+        self.version = 0
+        self.hits = 0
+        self.loads = 0
+        self._loaded = False
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        self._categories: Dict[int, CategoryRecord] = {}
+        self._products: Dict[int, ProductRecord] = {}
+        # Отсортированные списки товаров по категориям (None — весь магазин),
+        # строятся при первом обращении и сбрасываются при изменении
+        self._sorted: Dict[Optional[int], Tuple[list, List[ProductRecord]]] = {}
+
+    def _fresh(self) -> bool:
+        if not self._loaded:
+            return False
+        return self.ttl <= 0 or time.monotonic() - self._loaded_at < self.ttl
+
+    async def _ensure_loaded(self):
+        if self._fresh():
+            self.hits += 1
+            return
+        async with self._lock:
+            if self._fresh():
+                self.hits += 1
+                return
+            async with self.session_factory() as session:
+                categories = (await session.execute(
+                    select(Category.id, Category.name).order_by(Category.id)
+                )).all()
+                products = (await session.execute(
+                    select(Product.product_id, Product.category_id, Product.name, Product.price)
+                )).all()
+            self._categories = {row.id: CategoryRecord(row.id, row.name) for row in categories}
+            self._products = {row.product_id: ProductRecord(*row) for row in products}
+            self._sorted.clear()
+            self._loaded = True
+            self._loaded_at = time.monotonic()
+            self.loads += 1
+            self.version += 1
+            logging.info(
+                f"Каталог загружен в кэш: {len(self._categories)} категорий, "
+                f"{len(self._products)} товаров"
+            )
+
+    async def get_categories(self) -> List[CategoryRecord]:
+        """Все категории в порядке ID"""
+        await self._ensure_loaded()
+        return list(self._categories.values())
+
+    async def get_products_page(self, category_id: Optional[int] = None,
+                                cursor_id: Optional[int] = None, backward: bool = False,
+                                limit: int = 10) -> Tuple[List[ProductRecord], bool]:
+        """Страница товаров с keyset пагинацией по (name, product_id), из памяти.
+
+        cursor_id — граничный товар предыдущей страницы: следующая страница
+        начинается после него, при backward=True — заканчивается перед ним.
+        Возвращает (товары, есть ли еще страница в этом направлении).
+        SQL-вариант того же запроса (для проверки индексов) — get_products_page
+        в benchmarks/query_plans.py.
+        """
+        await self._ensure_loaded()
+        keys, records = self._sorted_products(category_id)
+
+        if cursor_id is None:
+            return records[:limit], len(records) > limit
+        cursor = self._products.get(cursor_id)
+        if cursor is None:
+            return [], False
+        if backward:
+            end = bisect_left(keys, cursor.sort_key)
+            return records[max(0, end - limit):end], end > limit
+        start = bisect_right(keys, cursor.sort_key)
+        return records[start:start + limit], len(records) - start > limit
+
+    def _sorted_products(self, category_id: Optional[int]):
+        cached = self._sorted.get(category_id)
+        if cached is None:
+            records = sorted(
+                (
+                    record for record in self._products.values()
+                    if category_id is None or record.category_id == category_id
+                ),
+                key=lambda record: record.sort_key
+            )
+            cached = self._sorted[category_id] = ([record.sort_key for record in records], records)
+        return cached
+
+    def _changed(self, *category_ids):
+        for category_id in (None, *category_ids):
+            self._sorted.pop(category_id, None)
+        self.version += 1
+
+    def put_category(self, category_id: int, name: str):
+        """Категория добавлена или переименована"""
+        if self._loaded:
+            self._categories[category_id] = CategoryRecord(category_id, name)
+        self._changed()
+
+    def remove_category(self, category_id: int):
+        """Категория удалена вместе с товарами (ondelete CASCADE)"""
+        if self._loaded:
+            self._categories.pop(category_id, None)
+            for product_id in [
+                record.product_id for record in self._products.values()
+                if record.category_id == category_id
+            ]:
+                del self._products[product_id]
+        self._changed(category_id)
+
+    def put_product(self, product: Product):
+        """Товар добавлен или изменен"""
+        old = self._products.get(product.product_id)
+        if self._loaded:
+            self._products[product.product_id] = ProductRecord(
+                product.product_id, product.category_id, product.name, product.price
+            )
+        self._changed(product.category_id, old.category_id if old else None)
+
+    def remove_product(self, product_id: int):
+        """Товар удален"""
+        old = self._products.pop(product_id, None)
+        self._changed(old.category_id if old else None)
+
+    def invalidate(self):
+        """Полная перезагрузка при следующем обращении (изменения в обход requests.py)"""
+        self._loaded = False
+        self._categories.clear()
+        self._products.clear()
+        self._changed()
+        self._sorted.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.loads
+        return {
+            'version': self.version,
+            'hits': self.hits,
+            'loads': self.loads,
+            'hit_rate': self.hits / total if total else 0.0,
+            'categories': len(self._categories),
+            'products': len(self._products),
+        }
+
+
+# Единый кэш каталога процесса
+catalog = CatalogCache(ttl=app_config.cache_ttl)
@@ -2,64 +2,78 @@ from typing import Optional, List
 import logging
 from datetime import datetime
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import update, delete, or_
+from sqlalchemy import update, delete, insert, or_, exists, func
 from sqlalchemy.orm import joinedload
 
 from .models import Base, User, UserProfile, Product, Cart, Order, OrderItem
-from .models import DeliveryMethod, PaymentMethod, OrderStatus
-from .models import Favorite, Review
+from .models import OrderStatus
+from .models import Favorite, Review, ProductCard, Reservation
 from .models import StarsTransaction, TransactionStatus
+from .models import Broadcast, BroadcastStatus, OutboxMessage, OutboxStatus
+from . import engine as shared
+from .engine import upsert_insert
+from . import fts
+from .user_settings import user_settings
+
+class InsufficientStockError(Exception):
+    """Товара на складе меньше, чем в корзине: оформление заказа откатывается"""
+    def __init__(self, product_id: int, name: str, requested: int):
+        super().__init__(f"Insufficient stock for product {product_id}: requested {requested}")
+        self.product_id = product_id
+        self.name = name
+        self.requested = requested
 
 class Database:
-    def __init__(self, database_url: str):
-        self.database_url = f"sqlite+aiosqlite:///{database_url}"
-        self.engine = create_async_engine(
-            self.database_url,
-            echo=True,  # Логирование SQL запросов
-        )
-        self.async_session = sessionmaker(
-            self.engine,
-            class_=AsyncSession,
-            expire_on_commit=False
-        )
+    def __init__(self, engine: Optional[AsyncEngine] = None):
+        # По умолчанию работаем через общий движок, что и requests.py
+        if engine is None or engine is shared.engine:
+            self.engine = shared.engine
+            self.async_session = shared.async_session
+        else:
+            self.engine = engine
+            self.async_session = shared.create_session_factory(engine)
 
     async def init_db(self):
         """Инициализация базы данных"""
         async with self.engine.begin() as conn:
             # Создаем таблицы если их нет
             await conn.run_sync(Base.metadata.create_all)
+            if conn.dialect.name == 'sqlite':
+                # Полнотекстовый индекс товаров (FTS5)
+                await conn.run_sync(fts.create_product_fts)
 
     async def get_session(self) -> AsyncSession:
         """Получение сессии для работы с БД"""
         async with self.async_session() as session:
             return session
 
-    async def add_user(self, user_id: int, username: str, first_name: str) -> bool:
-        """Добавление нового пользователя"""
+    async def add_user(self, user_id: int, username: str, first_name: str,
+                       language: Optional[str] = None) -> bool:
+        """Добавление нового пользователя или обновление существующего.
+
+        language записывается только при создании: это язык, которым бот уже
+        говорит с новым пользователем (по языку клиента Telegram), иначе
+        после регистрации его сменил бы язык по умолчанию из базы.
+        """
         try:
             async with self.async_session() as session:
-                # Проверяем существование пользователя
-                stmt = select(User).where(User.user_id == user_id)
-                result = await session.execute(stmt)
-                existing_user = result.scalar_one_or_none()
-                
-                if existing_user:
-                    # Обновляем существующего пользователя
-                    existing_user.username = username
-                    existing_user.first_name = first_name
-                else:
-                    # Создаем нового пользователя
-                    user = User(
-                        user_id=user_id,
-                        username=username,
-                        first_name=first_name
-                    )
-                    session.add(user)
-                
+                values = {'user_id': user_id, 'username': username, 'first_name': first_name}
+                if language is not None:
+                    values['language'] = language
+                stmt = upsert_insert(session, User).values(**values)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[User.user_id],
+                    set_={
+                        'username': stmt.excluded.username,
+                        'first_name': stmt.excluded.first_name
+                    }
+                )
+                await session.execute(stmt)
                 await session.commit()
+                # Новый пользователь мог быть закэширован как отсутствующий
+                user_settings.invalidate(user_id)
                 return True
         except Exception as e:
             logging.error(f"Ошибка при добавлении пользователя: {e}")
@@ -125,37 +139,24 @@ class Database:
     async def register_user(self, user_id: int, name: str, phone: str, email: str,
                           location_lat: float, location_lon: float,
                           age: int, photo_id: str) -> bool:
-        """Регистрация профиля пользователя"""
+        """Регистрация профиля пользователя (создание или обновление)"""
         try:
             async with self.async_session() as session:
-                # Проверяем существование профиля
-                stmt = select(UserProfile).where(UserProfile.user_id == user_id)
-                result = await session.execute(stmt)
-                existing_profile = result.scalar_one_or_none()
-                
-                if existing_profile:
-                    # Обновляем существующий профиль
-                    existing_profile.name = name
-                    existing_profile.phone_number = phone
-                    existing_profile.email = email
-                    existing_profile.location_lat = location_lat
-                    existing_profile.location_lon = location_lon
-                    existing_profile.age = age
-                    existing_profile.photo_id = photo_id
-                else:
-                    # Создаем новый профиль
-                    profile = UserProfile(
-                        user_id=user_id,
-                        name=name,
-                        phone_number=phone,
-                        email=email,
-                        location_lat=location_lat,
-                        location_lon=location_lon,
-                        age=age,
-                        photo_id=photo_id
-                    )
-                    session.add(profile)
-                
+                profile = {
+                    'name': name,
+                    'phone_number': phone,
+                    'email': email,
+                    'location_lat': location_lat,
+                    'location_lon': location_lon,
+                    'age': age,
+                    'photo_id': photo_id
+                }
+                stmt = upsert_insert(session, UserProfile).values(user_id=user_id, **profile)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[UserProfile.user_id],
+                    set_={field: stmt.excluded[field] for field in profile}
+                )
+                await session.execute(stmt)
                 await session.commit()
                 return True
         except Exception as e:
@@ -173,35 +174,26 @@ class Database:
             logging.error(f"Ошибка при проверке регистрации: {e}")
             return False
 
-    async def add_to_cart(self, user_id: int, product_id: int, quantity: int = 1) -> bool:
-        """Добавление товара в корзину"""
+    async def add_to_cart(self, user_id: int, product_id: int, quantity: int = 1) -> Optional[int]:
+        """Установка количества товара в корзине, возвращает итоговое количество"""
         try:
             async with self.async_session() as session:
-                # Проверяем, есть ли уже товар в корзине
-                stmt = select(Cart).where(
-                    Cart.user_id == user_id,
-                    Cart.product_id == product_id
+                stmt = upsert_insert(session, Cart).values(
+                    user_id=user_id,
+                    product_id=product_id,
+                    quantity=quantity
                 )
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[Cart.user_id, Cart.product_id],
+                    set_={'quantity': stmt.excluded.quantity}
+                ).returning(Cart.quantity)
                 result = await session.execute(stmt)
-                cart_item = result.scalar_one_or_none()
-                
-                if cart_item:
-                    # Если товар уже есть, обновляем количество
-                    cart_item.quantity = quantity
-                else:
-                    # Если товара нет, создаем новую запись
-                    cart_item = Cart(
-                        user_id=user_id,
-                        product_id=product_id,
-                        quantity=quantity
-                    )
-                    session.add(cart_item)
-                
+                cart_quantity = result.scalar_one()
                 await session.commit()
-                return True
+                return cart_quantity
         except Exception as e:
             logging.error(f"Ошибка при добавлении в корзину: {e}")
-            return False
+            return None
 
     async def get_cart(self, user_id: int) -> List[tuple]:
         """Получение содержимого корзины пользователя"""
@@ -252,16 +244,46 @@ class Database:
         """Получение товара по ID"""
         try:
             async with self.async_session() as session:
-                # Добавляем joinedload для reviews
-                stmt = select(Product).options(
-                    joinedload(Product.reviews)
-                ).where(Product.product_id == product_id)
+                # Рейтинг берется из агрегатов товара, отзывы не загружаем
+                stmt = select(Product).where(Product.product_id == product_id)
                 result = await session.execute(stmt)
-                return result.unique().scalar_one_or_none()
+                return result.scalar_one_or_none()
         except Exception as e:
             logging.error(f"Ошибка при получении товара: {e}")
             return None
 
+    async def get_product_card(self, user_id: int, product_id: int) -> Optional[ProductCard]:
+        """Карточка товара одним запросом: товар, рейтинг, избранное и количество в корзине"""
+        try:
+            async with self.async_session() as session:
+                is_favorite = exists().where(
+                    Favorite.user_id == user_id,
+                    Favorite.product_id == Product.product_id
+                )
+                cart_quantity = select(Cart.quantity).where(
+                    Cart.user_id == user_id,
+                    Cart.product_id == Product.product_id
+                ).scalar_subquery()
+                stmt = select(
+                    Product.product_id,
+                    Product.category_id,
+                    Product.name,
+                    Product.description,
+                    Product.price,
+                    Product.photo_id,
+                    func.coalesce(Product.quantity, 0),
+                    Product.average_rating,
+                    is_favorite,
+                    func.coalesce(cart_quantity, 0)
+                ).where(Product.product_id == product_id)
+                row = (await session.execute(stmt)).first()
+                if row is None:
+                    return None
+                return ProductCard(*row)
+        except Exception as e:
+            logging.error(f"Ошибка при получении карточки товара: {e}")
+            return None
+
     async def remove_from_cart(self, user_id: int, product_id: int) -> bool:
         """Удаление товара из корзины"""
         try:
@@ -277,40 +299,355 @@ class Database:
             logging.error(f"Ошибка при удалении товара из корзины: {e}")
             return False
 
-    async def create_order(self, user_id: int, delivery_address: str, 
-                          delivery_method: str, payment_method: str,
-                          total_amount: float, items: list) -> Order:
-        """Создание нового заказа"""
+    async def checkout(self, user_id: int, total_amount: float, payment_method: str,
+                       status: str = "completed", transactions: tuple = (),
+                       delivery_method: Optional[str] = None,
+                       delivery_address: Optional[str] = None) -> Optional[int]:
+        """Оформление заказа из корзины одной транзакцией.
+
+        Создает заказ и его позиции, списывает остатки условным UPDATE,
+        записывает транзакции Stars (пары stars_amount, status) и очищает корзину.
+        При нехватке товара транзакция откатывается и выбрасывается
+        InsufficientStockError. Возвращает ID заказа или None при пустой корзине.
+        """
         try:
             async with self.async_session() as session:
-                # Создаем заказ
-                order = Order(
-                    user_id=user_id,
-                    delivery_address=delivery_address,
-                    delivery_method=DeliveryMethod(delivery_method),
-                    payment_method=PaymentMethod(payment_method),
-                    total_amount=total_amount,
-                    status=OrderStatus.NEW
-                )
-                session.add(order)
-                await session.flush()
-                
-                # Добавляем товары заказа
-                for product, quantity in items:
-                    order_item = OrderItem(
-                        order_id=order.order_id,
-                        product_id=product.product_id,
-                        quantity=quantity,
-                        price=product.price
+                async with session.begin():
+                    cart_items = (await session.execute(
+                        select(Product.product_id, Product.name, Product.price, Cart.quantity)
+                        .join(Cart, Product.product_id == Cart.product_id)
+                        .where(Cart.user_id == user_id)
+                    )).all()
+                    if not cart_items:
+                        return None
+
+                    order = Order(
+                        user_id=user_id,
+                        total_amount=total_amount,
+                        payment_method=payment_method,
+                        status=status,
+                        delivery_method=delivery_method,
+                        delivery_address=delivery_address
                     )
-                    session.add(order_item)
-                
+                    session.add(order)
+                    await session.flush()
+
+                    await session.execute(insert(OrderItem), [
+                        {
+                            'order_id': order.order_id,
+                            'product_id': product_id,
+                            'quantity': quantity,
+                            'price': price
+                        }
+                        for product_id, name, price, quantity in cart_items
+                    ])
+
+                    # Списываем остаток только если его хватает: без гонок и ухода в минус
+                    for product_id, name, price, quantity in cart_items:
+                        result = await session.execute(
+                            update(Product)
+                            .where(
+                                Product.product_id == product_id,
+                                Product.quantity >= quantity
+                            )
+                            .values(quantity=Product.quantity - quantity)
+                            .execution_options(synchronize_session=False)
+                        )
+                        if result.rowcount != 1:
+                            raise InsufficientStockError(product_id, name, quantity)
+
+                    if transactions:
+                        await session.execute(insert(StarsTransaction), [
+                            {
+                                'order_id': order.order_id,
+                                'user_id': user_id,
+                                'stars_amount': stars_amount,
+                                'amount_rub': total_amount,
+                                'status': transaction_status
+                            }
+                            for stars_amount, transaction_status in transactions
+                        ])
+
+                    await session.execute(delete(Cart).where(Cart.user_id == user_id))
+                    # Резерв превращен в списание остатков
+                    await session.execute(delete(Reservation).where(Reservation.user_id == user_id))
+                return order.order_id
+        except InsufficientStockError:
+            raise
+        except Exception as e:
+            logging.error(f"Ошибка при оформлении заказа: {e}")
+            return None
+
+    async def get_stock_levels(self, product_ids: Optional[list] = None) -> dict:
+        """Остатки товаров {product_id: quantity} (все товары, если ID не указаны)"""
+        try:
+            async with self.async_session() as session:
+                stmt = select(Product.product_id, Product.quantity)
+                if product_ids is not None:
+                    stmt = stmt.where(Product.product_id.in_(product_ids))
+                result = await session.execute(stmt)
+                return {product_id: quantity or 0 for product_id, quantity in result}
+        except Exception as e:
+            logging.error(f"Ошибка при получении остатков: {e}")
+            return {}
+
+    async def replace_reservations(self, user_id: int, items: dict, expires_at: datetime) -> bool:
+        """Замена резерва пользователя на новый {product_id: quantity}"""
+        try:
+            async with self.async_session() as session:
+                async with session.begin():
+                    await session.execute(delete(Reservation).where(Reservation.user_id == user_id))
+                    if items:
+                        await session.execute(insert(Reservation), [
+                            {
+                                'user_id': user_id,
+                                'product_id': product_id,
+                                'quantity': quantity,
+                                'expires_at': expires_at
+                            }
+                            for product_id, quantity in items.items()
+                        ])
+                return True
+        except Exception as e:
+            logging.error(f"Ошибка при сохранении резерва: {e}")
+            return False
+
+    async def extend_reservations(self, user_id: int, expires_at: datetime) -> bool:
+        """Продление резерва пользователя"""
+        try:
+            async with self.async_session() as session:
+                await session.execute(
+                    update(Reservation)
+                    .where(Reservation.user_id == user_id)
+                    .values(expires_at=expires_at)
+                )
+                await session.commit()
+                return True
+        except Exception as e:
+            logging.error(f"Ошибка при продлении резерва: {e}")
+            return False
+
+    async def delete_reservations(self, user_id: int) -> bool:
+        """Снятие резерва пользователя"""
+        try:
+            async with self.async_session() as session:
+                await session.execute(delete(Reservation).where(Reservation.user_id == user_id))
+                await session.commit()
+                return True
+        except Exception as e:
+            logging.error(f"Ошибка при снятии резерва: {e}")
+            return False
+
+    async def delete_expired_reservations(self, now: datetime) -> int:
+        """Удаление просроченных резервов, возвращает число удаленных строк"""
+        try:
+            async with self.async_session() as session:
+                result = await session.execute(
+                    delete(Reservation).where(Reservation.expires_at <= now)
+                )
                 await session.commit()
-                return order
+                return result.rowcount
+        except Exception as e:
+            logging.error(f"Ошибка при удалении просроченных резервов: {e}")
+            return 0
+
+    async def get_active_reservations(self, now: datetime,
+                                      user_id: Optional[int] = None) -> List[Reservation]:
+        """Действующие резервы (для восстановления после перезапуска) или резерв одного пользователя"""
+        try:
+            async with self.async_session() as session:
+                stmt = select(Reservation).where(Reservation.expires_at > now)
+                if user_id is not None:
+                    stmt = stmt.where(Reservation.user_id == user_id)
+                result = await session.execute(stmt)
+                return result.scalars().all()
         except Exception as e:
-            logging.error(f"Ошибка при создании заказа: {e}")
+            logging.error(f"Ошибка при получении резервов: {e}")
+            return []
+
+    async def create_broadcast(self, text: str) -> Optional[int]:
+        """Создание рассылки, возвращает ее ID"""
+        try:
+            async with self.async_session() as session:
+                broadcast = Broadcast(
+                    text=text,
+                    status=BroadcastStatus.PENDING,
+                    cursor_user_id=0,
+                    sent=0,
+                    failed=0,
+                    blocked=0
+                )
+                session.add(broadcast)
+                await session.commit()
+                return broadcast.id
+        except Exception as e:
+            logging.error(f"Ошибка при создании рассылки: {e}")
+            return None
+
+    async def get_broadcast(self, broadcast_id: int) -> Optional[Broadcast]:
+        """Получение рассылки по ID"""
+        try:
+            async with self.async_session() as session:
+                return await session.get(Broadcast, broadcast_id)
+        except Exception as e:
+            logging.error(f"Ошибка при получении рассылки {broadcast_id}: {e}")
             return None
 
+    async def get_broadcasts(self, limit: int = 10) -> List[Broadcast]:
+        """Последние рассылки, новые первыми"""
+        try:
+            async with self.async_session() as session:
+                result = await session.execute(
+                    select(Broadcast).order_by(Broadcast.id.desc()).limit(limit)
+                )
+                return result.scalars().all()
+        except Exception as e:
+            logging.error(f"Ошибка при получении рассылок: {e}")
+            return []
+
+    async def get_unfinished_broadcasts(self) -> List[Broadcast]:
+        """Рассылки, прерванные перезапуском или еще не начатые"""
+        try:
+            async with self.async_session() as session:
+                result = await session.execute(
+                    select(Broadcast)
+                    .where(Broadcast.status.in_((BroadcastStatus.PENDING, BroadcastStatus.RUNNING)))
+                    .order_by(Broadcast.id)
+                )
+                return result.scalars().all()
+        except Exception as e:
+            logging.error(f"Ошибка при получении незавершенных рассылок: {e}")
+            return []
+
+    async def update_broadcast(self, broadcast_id: int, **values) -> bool:
+        """Сохранение статуса и прогресса рассылки"""
+        try:
+            async with self.async_session() as session:
+                await session.execute(
+                    update(Broadcast)
+                    .where(Broadcast.id == broadcast_id)
+                    .values(**values)
+                )
+                await session.commit()
+                return True
+        except Exception as e:
+            logging.error(f"Ошибка при обновлении рассылки {broadcast_id}: {e}")
+            return False
+
+    async def get_broadcast_recipients(self, after_user_id: int, limit: int) -> List[int]:
+        """Следующая порция получателей рассылки (keyset по user_id)"""
+        try:
+            async with self.async_session() as session:
+                result = await session.scalars(
+                    select(User.user_id)
+                    .where(User.notifications == True, User.user_id > after_user_id)
+                    .order_by(User.user_id)
+                    .limit(limit)
+                )
+                return list(result)
+        except Exception as e:
+            logging.error(f"Ошибка при получении получателей рассылки: {e}")
+            return []
+
+    async def disable_notifications(self, user_ids: List[int]) -> bool:
+        """Отключение уведомлений пользователям, заблокировавшим бота"""
+        try:
+            async with self.async_session() as session:
+                await session.execute(
+                    update(User)
+                    .where(User.user_id.in_(user_ids))
+                    .values(notifications=False)
+                )
+                await session.commit()
+            for user_id in user_ids:
+                user_settings.set_notifications(user_id, False)
+            return True
+        except Exception as e:
+            logging.error(f"Ошибка при отключении уведомлений: {e}")
+            return False
+
+    async def claim_outbox(self, now: datetime, lease_until: datetime, limit: int) -> list:
+        """Захват порции готовых к отправке уведомлений до lease_until.
+
+        Возвращает строки (id, user_id, text, attempts). Захват — один UPDATE,
+        поэтому параллельные воркеры не получают одни и те же записи.
+        """
+        try:
+            async with self.async_session() as session:
+                ready = (
+                    (OutboxMessage.status == OutboxStatus.PENDING)
+                    & (OutboxMessage.next_attempt_at <= now)
+                    & (or_(OutboxMessage.locked_until.is_(None), OutboxMessage.locked_until < now))
+                )
+                candidates = (
+                    select(OutboxMessage.id)
+                    .where(ready)
+                    .order_by(OutboxMessage.id)
+                    .limit(limit)
+                    .scalar_subquery()
+                )
+                result = await session.execute(
+                    update(OutboxMessage)
+                    .where(OutboxMessage.id.in_(candidates), ready)
+                    .values(locked_until=lease_until)
+                    .returning(
+                        OutboxMessage.id, OutboxMessage.user_id,
+                        OutboxMessage.text, OutboxMessage.attempts
+                    )
+                )
+                rows = result.all()
+                await session.commit()
+                return sorted(rows, key=lambda row: row.id)
+        except Exception as e:
+            logging.error(f"Ошибка при получении уведомлений из очереди: {e}")
+            return []
+
+    async def complete_outbox(self, message_ids: List[int], status: OutboxStatus, now: datetime) -> bool:
+        """Завершение обработки уведомлений (отправлены или пропущены)"""
+        try:
+            async with self.async_session() as session:
+                await session.execute(
+                    update(OutboxMessage)
+                    .where(OutboxMessage.id.in_(message_ids))
+                    .values(status=status, sent_at=now, locked_until=None)
+                )
+                await session.commit()
+                return True
+        except Exception as e:
+            logging.error(f"Ошибка при обновлении очереди уведомлений: {e}")
+            return False
+
+    async def update_outbox_message(self, message_id: int, **values) -> bool:
+        """Перенос повторной попытки или пометка ошибки для одного уведомления"""
+        try:
+            async with self.async_session() as session:
+                await session.execute(
+                    update(OutboxMessage)
+                    .where(OutboxMessage.id == message_id)
+                    .values(locked_until=None, **values)
+                )
+                await session.commit()
+                return True
+        except Exception as e:
+            logging.error(f"Ошибка при обновлении уведомления {message_id}: {e}")
+            return False
+
+    async def purge_outbox(self, before: datetime) -> int:
+        """Удаление обработанных уведомлений старше before"""
+        try:
+            async with self.async_session() as session:
+                result = await session.execute(
+                    delete(OutboxMessage).where(
+                        OutboxMessage.status.in_((OutboxStatus.SENT, OutboxStatus.SKIPPED)),
+                        OutboxMessage.created_at < before
+                    )
+                )
+                await session.commit()
+                return result.rowcount
+        except Exception as e:
+            logging.error(f"Ошибка при очистке очереди уведомлений: {e}")
+            return 0
+
     async def get_user_orders(self, user_id: int) -> List[Order]:
         """Получение списка заказов пользователя"""
         try:
@@ -365,17 +702,29 @@ class Database:
             logging.error(f"Ошибка при получении товаров заказа: {e}")
             return []
 
-    async def search_products(self, query: str) -> List[Product]:
-        """Поиск товаров по названию или описанию"""
+    async def search_products(self, query: str, limit: int = 20) -> List[Product]:
+        """Поиск товаров по названию или описанию (FTS5 с ранжированием BM25)"""
         try:
             async with self.async_session() as session:
-                stmt = select(Product).where(
-                    or_(
-                        Product.name.ilike(f"%{query}%"),
-                        Product.description.ilike(f"%{query}%")
-                    )
+                if session.bind.dialect.name != 'sqlite':
+                    stmt = select(Product).where(
+                        or_(
+                            Product.name.ilike(f"%{query}%"),
+                            Product.description.ilike(f"%{query}%")
+                        )
+                    ).limit(limit)
+                    result = await session.execute(stmt)
+                    return result.scalars().all()
+
+                match = fts.build_match_query(query)
+                if match is None:
+                    return []
+                stmt = (
+                    select(Product)
+                    .join(fts.SEARCH, fts.SEARCH.c.product_id == Product.product_id)
+                    .order_by(fts.SEARCH.c.rank)
                 )
-                result = await session.execute(stmt)
+                result = await session.execute(stmt, {'match': match, 'limit': limit})
                 return result.scalars().all()
         except Exception as e:
             logging.error(f"Ошибка при поиске товаров: {e}")
@@ -406,8 +755,8 @@ class Database:
                 if sort_by == 'price':
                     order_by = Product.price.asc() if sort_order == 'asc' else Product.price.desc()
                 elif sort_by == 'rating':
-                    # Здесь можно добавить сортировку по рейтингу
-                    pass
+                    rating = Product.average_rating
+                    order_by = rating.asc() if sort_order == 'asc' else rating.desc()
                 else:  # по умолчанию по имени
                     order_by = Product.name.asc() if sort_order == 'asc' else Product.name.desc()
                 
@@ -418,28 +767,34 @@ class Database:
             logging.error(f"Ошибка при получении отфильтрованных товаров: {e}")
             return []
 
-    async def toggle_favorite(self, user_id: int, product_id: int) -> bool:
-        """Добавление/удаление товара из избранного"""
+    async def toggle_favorite(self, user_id: int, product_id: int) -> Optional[bool]:
+        """Добавление/удаление товара из избранного, возвращает новый статус"""
         try:
             async with self.async_session() as session:
-                stmt = select(Favorite).where(
-                    Favorite.user_id == user_id,
-                    Favorite.product_id == product_id
+                # Сначала пробуем удалить: если запись была, товар убран из избранного
+                deleted = await session.execute(
+                    delete(Favorite)
+                    .where(
+                        Favorite.user_id == user_id,
+                        Favorite.product_id == product_id
+                    )
+                    .returning(Favorite.id)
                 )
-                result = await session.execute(stmt)
-                favorite = result.scalar_one_or_none()
-                
-                if favorite:
-                    await session.delete(favorite)
-                else:
-                    favorite = Favorite(user_id=user_id, product_id=product_id)
-                    session.add(favorite)
+                is_favorite = deleted.first() is None
+                if is_favorite:
+                    stmt = upsert_insert(session, Favorite).values(
+                        user_id=user_id,
+                        product_id=product_id
+                    ).on_conflict_do_nothing(
+                        index_elements=[Favorite.user_id, Favorite.product_id]
+                    )
+                    await session.execute(stmt)
                 
                 await session.commit()
-                return True
+                return is_favorite
         except Exception as e:
             logging.error(f"Ошибка при работе с избранным: {e}")
-            return False
+            return None
 
     async def add_review(self, user_id: int, product_id: int, rating: int, text: str) -> bool:
         """Добавление отзыва о товаре"""
@@ -452,6 +807,15 @@ class Database:
                     text=text
                 )
                 session.add(review)
+                # Агрегаты рейтинга обновляем в той же транзакции
+                await session.execute(
+                    update(Product)
+                    .where(Product.product_id == product_id)
+                    .values(
+                        rating_sum=Product.rating_sum + rating,
+                        rating_count=Product.rating_count + 1
+                    )
+                )
                 await session.commit()
                 return True
         except Exception as e:
@@ -463,7 +827,7 @@ class Database:
         try:
             async with self.async_session() as session:
                 stmt = select(Favorite).options(
-                    joinedload(Favorite.product).joinedload(Product.reviews)
+                    joinedload(Favorite.product)
                 ).where(Favorite.user_id == user_id)
                 result = await session.execute(stmt)
                 return result.unique().scalars().all()
@@ -0,0 +1,140 @@
+import logging
+import time
+
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.config import Config, config as app_config
+from src.utils.metrics import db_pool_wait
+from .query_log import query_log
+
+# Профили PRAGMA, применяемые к каждому новому соединению SQLite.
+# Порядок важен: journal_mode должен выполняться первым.
+SQLITE_PROFILES = {
+    # Поведение SQLite по умолчанию (rollback journal) — для сравнения в бенчмарках
+    'default': {},
+    # WAL: читатели не блокируются писателями, fsync только на чекпоинтах
+    'performance': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'cache_size': -64000,  # ~64 МБ
+        'mmap_size': 268435456,  # 256 МБ
+        'temp_store': 'MEMORY',
+        # Ссылки на products объявлены с ondelete (models.py, миграция e7a2c4b95f18)
+        'foreign_keys': 'ON',
+    },
+    # WAL с fsync на каждый коммит — если важнее сохранность, чем скорость
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'busy_timeout': 5000,
+        'cache_size': -16000,
+        'mmap_size': 0,
+        'temp_store': 'MEMORY',
+        'foreign_keys': 'ON',
+    },
+}
+
+
+def _is_memory_sqlite(url) -> bool:
+    """Проверка, что URL указывает на SQLite в памяти (там нет пула соединений)"""
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def sqlite_pragmas(config: Config) -> dict:
+    """PRAGMA выбранного профиля с учетом переопределений из .env"""
+    if config.sqlite_profile not in SQLITE_PROFILES:
+        raise ValueError(
+            f"Unknown SQLITE_PROFILE: {config.sqlite_profile}. "
+            f"Available: {', '.join(SQLITE_PROFILES)}"
+        )
+    pragmas = dict(SQLITE_PROFILES[config.sqlite_profile])
+    overrides = {
+        'busy_timeout': config.sqlite_busy_timeout,
+        'cache_size': config.sqlite_cache_size,
+        'mmap_size': config.sqlite_mmap_size,
+    }
+    pragmas.update({name: value for name, value in overrides.items() if value is not None})
+    return pragmas
+
+
+def apply_sqlite_pragmas(engine: AsyncEngine, pragmas: dict) -> None:
+    """Регистрация хука, выполняющего PRAGMA на каждом новом соединении"""
+    if not pragmas:
+        return
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Пул, замеряющий ожидание свободного соединения (метрика db_pool_wait)"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_wait.observe(time.perf_counter() - started)
+
+
+def create_engine(config: Config) -> AsyncEngine:
+    """Создание асинхронного движка по настройкам из Config"""
+    url = make_url(config.db_url)
+    options = {
+        'connect_args': {'timeout': config.db_connect_timeout},
+    }
+    if not _is_memory_sqlite(url):
+        options.update(
+            poolclass=TimedQueuePool,
+            pool_size=config.db_pool_size,
+            max_overflow=config.db_max_overflow,
+            pool_timeout=config.db_pool_timeout,
+            pool_recycle=config.db_pool_recycle,
+            pool_pre_ping=url.get_backend_name() != 'sqlite',
+        )
+    engine = create_async_engine(url, **options)
+
+    if url.get_backend_name() == 'sqlite':
+        pragmas = sqlite_pragmas(config)
+        apply_sqlite_pragmas(engine, pragmas)
+        logging.info(f"SQLite профиль '{config.sqlite_profile}': {pragmas}")
+    if config.db_instrument:
+        # Вместо echo: счетчики по апдейтам, журнал медленных запросов, N+1
+        query_log.install(engine)
+    return engine
+
+
+def upsert_insert(session, table):
+    """INSERT диалекта сессии с поддержкой ON CONFLICT (SQLite / PostgreSQL)"""
+    dialect = session.bind.dialect.name
+    if dialect == 'sqlite':
+        return sqlite.insert(table)
+    if dialect == 'postgresql':
+        return postgresql.insert(table)
+    raise NotImplementedError(f"ON CONFLICT is not supported for dialect {dialect}")
+
+
+def create_session_factory(engine: AsyncEngine) -> sessionmaker:
+    """Фабрика асинхронных сессий для движка"""
+    return sessionmaker(
+        engine,
+        class_=AsyncSession,
+        expire_on_commit=False
+    )
+
+
+# Единый движок приложения: его используют и requests.py, и Database
+engine = create_engine(app_config)
+async_session = create_session_factory(engine)
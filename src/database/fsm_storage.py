@@ -0,0 +1,182 @@
+"""Хранилище FSM aiogram в базе магазина.
+
+Состояние и данные каждого диалога хранятся в таблице fsm_states (данные —
+компактный JSON) и переживают перезапуск бота. Запись живет ttl секунд с
+последнего изменения: брошенные сценарии удаляет фоновая очистка.
+Последние ключи лежат в LRU-кэше процесса с записью насквозь, поэтому
+проверка состояния на каждом апдейте не ходит в базу. Кэш не сверяется
+с базой, поэтому при нескольких процессах апдейты одного пользователя
+должны попадать в один процесс, иначе кэш нужно отключить (cache_size=0).
+В webhook-режиме он по умолчанию отключен (FSM_CACHE_SIZE, src/config.py).
+"""
+import asyncio
+import copy
+import json
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Mapping, Optional
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, KeyBuilder, StateType, StorageKey
+from sqlalchemy import delete, func, select
+
+from .engine import async_session, upsert_insert
+from .models import FSMRecord
+
+
+class _Entry:
+    __slots__ = ('state', 'data', 'expires_at')
+
+    def __init__(self, state: Optional[str], data: Dict[str, Any], expires_at: Optional[datetime]):
+        self.state = state
+        self.data = data
+        # None — записи в базе нет
+        self.expires_at = expires_at
+
+
+def _dumps(data: Mapping[str, Any]) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+class DatabaseStorage(BaseStorage):
+    def __init__(self, session_factory=async_session, ttl: float = 86400.0,
+                 sweep_interval: float = 600.0, cache_size: int = 10000,
+                 key_builder: Optional[KeyBuilder] = None):
+        self.session_factory = session_factory
+        self.ttl = timedelta(seconds=ttl)
+        self.sweep_interval = sweep_interval
+        self.cache_size = cache_size
+        self.key_builder = key_builder or DefaultKeyBuilder(with_bot_id=True, with_destiny=True)
+        self.hits = 0
+        self.loads = 0
+        self._cache: OrderedDict = OrderedDict()
+        self._sweeper: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Запуск фоновой очистки просроченных состояний"""
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_forever())
+
+    async def close(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        storage_key = self.key_builder.build(key)
+        entry = await self._load(storage_key)
+        await self._save(storage_key, state.state if isinstance(state, State) else state, entry.data)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        return (await self._load(self.key_builder.build(key))).state
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        if not isinstance(data, dict):
+            raise TypeError(f"Data must be a dict, got {type(data).__name__}")
+        storage_key = self.key_builder.build(key)
+        entry = await self._load(storage_key)
+        await self._save(storage_key, entry.state, copy.deepcopy(data))
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        return copy.deepcopy((await self._load(self.key_builder.build(key))).data)
+
+    async def _load(self, storage_key: str) -> _Entry:
+        now = datetime.utcnow()
+        entry = self._cache.get(storage_key)
+        if entry is not None and (entry.expires_at is None or entry.expires_at > now):
+            self._cache.move_to_end(storage_key)
+            self.hits += 1
+            return entry
+
+        async with self.session_factory() as session:
+            record = await session.get(FSMRecord, storage_key)
+        self.loads += 1
+        if record is not None and record.expires_at > now:
+            entry = _Entry(record.state, json.loads(record.data) if record.data else {}, record.expires_at)
+        else:
+            # Просроченную запись удалит фоновая очистка
+            entry = _Entry(None, {}, None)
+        self._remember(storage_key, entry)
+        return entry
+
+    async def _save(self, storage_key: str, state: Optional[str], data: Dict[str, Any]):
+        """Запись в базу, затем в кэш (при ошибке кэш остается согласованным с базой)"""
+        async with self.session_factory() as session:
+            if state is None and not data:
+                await session.execute(delete(FSMRecord).where(FSMRecord.key == storage_key))
+                entry = _Entry(None, {}, None)
+            else:
+                expires_at = datetime.utcnow() + self.ttl
+                stmt = upsert_insert(session, FSMRecord).values(
+                    key=storage_key,
+                    state=state,
+                    data=_dumps(data),
+                    expires_at=expires_at
+                )
+                await session.execute(stmt.on_conflict_do_update(
+                    index_elements=[FSMRecord.key],
+                    set_={
+                        'state': stmt.excluded.state,
+                        'data': stmt.excluded.data,
+                        'expires_at': stmt.excluded.expires_at
+                    }
+                ))
+                entry = _Entry(state, data, expires_at)
+            await session.commit()
+        self._remember(storage_key, entry)
+
+    def _remember(self, storage_key: str, entry: _Entry):
+        if self.cache_size <= 0:
+            return
+        self._cache[storage_key] = entry
+        self._cache.move_to_end(storage_key)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def sweep(self) -> int:
+        """Удаление просроченных состояний из базы и кэша"""
+        now = datetime.utcnow()
+        for storage_key in [
+            storage_key for storage_key, entry in self._cache.items()
+            if entry.expires_at is not None and entry.expires_at <= now
+        ]:
+            del self._cache[storage_key]
+        try:
+            async with self.session_factory() as session:
+                result = await session.execute(delete(FSMRecord).where(FSMRecord.expires_at <= now))
+                await session.commit()
+                return result.rowcount
+        except Exception as e:
+            logging.error(f"Ошибка при очистке состояний FSM: {e}")
+            return 0
+
+    async def count_states(self) -> Dict[Optional[str], int]:
+        """Число активных записей по состояниям (None — только данные без состояния)"""
+        async with self.session_factory() as session:
+            rows = (await session.execute(
+                select(FSMRecord.state, func.count())
+                .where(FSMRecord.expires_at > datetime.utcnow())
+                .group_by(FSMRecord.state)
+            )).all()
+        return {state: count for state, count in rows}
+
+    async def _sweep_forever(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            removed = await self.sweep()
+            if removed:
+                logging.info(f"Удалено просроченных состояний FSM: {removed}")
+
+    def stats(self) -> dict:
+        total = self.hits + self.loads
+        return {
+            'cached': len(self._cache),
+            'hits': self.hits,
+            'loads': self.loads,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
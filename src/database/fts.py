@@ -0,0 +1,87 @@
+"""Полнотекстовый поиск товаров через SQLite FTS5.
+
+Таблица products_fts хранит нормализованные название и описание товара
+(rowid = product_id) и синхронизируется с products триггерами.
+Токенизатор unicode61 приводит регистр (в т.ч. кириллицу) и убирает
+диакритику; «ё» заменяется на «е» при индексации и в запросе.
+"""
+import re
+from typing import Optional
+
+from sqlalchemy import Float, Integer, column, text
+
+# Вес названия в BM25 выше, чем вес описания
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+
+def _normalized(expression: str) -> str:
+    return f"replace(replace(coalesce({expression}, ''), 'ё', 'е'), 'Ё', 'Е')"
+
+
+CREATE_TABLE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5("
+    "name, description, "
+    "tokenize = 'unicode61 remove_diacritics 2', "
+    "prefix = '2 3')"
+)
+
+CREATE_TRIGGERS = (
+    "CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN "
+    "INSERT INTO products_fts(rowid, name, description) VALUES "
+    f"(new.product_id, {_normalized('new.name')}, {_normalized('new.description')}); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN "
+    "DELETE FROM products_fts WHERE rowid = old.product_id; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE OF name, description ON products BEGIN "
+    "DELETE FROM products_fts WHERE rowid = old.product_id; "
+    "INSERT INTO products_fts(rowid, name, description) VALUES "
+    f"(new.product_id, {_normalized('new.name')}, {_normalized('new.description')}); "
+    "END",
+)
+
+REBUILD = (
+    "DELETE FROM products_fts",
+    "INSERT INTO products_fts(rowid, name, description) "
+    f"SELECT product_id, {_normalized('name')}, {_normalized('description')} FROM products",
+)
+
+DROP = (
+    "DROP TRIGGER IF EXISTS products_fts_au",
+    "DROP TRIGGER IF EXISTS products_fts_ad",
+    "DROP TRIGGER IF EXISTS products_fts_ai",
+    "DROP TABLE IF EXISTS products_fts",
+)
+
+# Подзапрос: ID найденных товаров с рангом BM25 (меньше — релевантнее)
+SEARCH = text(
+    "SELECT rowid AS product_id, "
+    f"bm25(products_fts, {NAME_WEIGHT}, {DESCRIPTION_WEIGHT}) AS rank "
+    "FROM products_fts WHERE products_fts MATCH :match "
+    "ORDER BY rank LIMIT :limit"
+).columns(column('product_id', Integer), column('rank', Float)).subquery('fts_ranked')
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def create_product_fts(connection) -> None:
+    """Создание FTS-таблицы и триггеров (синхронное соединение, для run_sync)"""
+    exists = connection.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products_fts'"
+    )).first()
+    connection.execute(text(CREATE_TABLE))
+    for statement in CREATE_TRIGGERS:
+        connection.execute(text(statement))
+    if not exists:
+        # Индексируем уже существующие товары
+        for statement in REBUILD:
+            connection.execute(text(statement))
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """Запрос FTS5 из пользовательского ввода: все слова, каждое как префикс"""
+    words = _WORD.findall(query.replace('ё', 'е').replace('Ё', 'Е'))
+    if not words:
+        return None
+    return ' '.join(f'"{word}"*' for word in words)
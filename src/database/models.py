@@ -1,27 +1,15 @@
 import enum
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Text, CheckConstraint, Enum, text
-from sqlalchemy.orm import relationship, validates, sessionmaker
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Text, CheckConstraint, Enum, Index, text, case
+from sqlalchemy.orm import relationship, validates
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from dataclasses import dataclass
+from typing import Optional
 
 # Создаем базовый класс для моделей
 Base = declarative_base()
 
-# Создаем асинхронный движок
-engine = create_async_engine(
-    "sqlite+aiosqlite:///bot_database.db",
-    echo=True
-)
-
-# Создаем фабрику асинхронных сессий
-async_session = sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False
-)
-
 # Определяем Enum классы до их использования
 class OrderStatus(str, enum.Enum):
     PENDING = "pending"
@@ -38,6 +26,13 @@ class DeliveryMethod(enum.Enum):
     COURIER = "courier"
     PICKUP = "pickup"
 
+class BroadcastStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+    FAILED = "failed"
+
 # Далее идут модели
 class User(Base):
     __tablename__ = 'users'
@@ -88,6 +83,9 @@ class Product(Base):
     price = Column(Float)
     photo_id = Column(String)
     quantity = Column(Integer, default=0)
+    # Агрегаты отзывов, обновляются в той же транзакции, что и добавление отзыва
+    rating_sum = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_count = Column(Integer, nullable=False, default=0, server_default='0')
     
     category = relationship('Category', back_populates='products')
     cart_items = relationship('Cart', back_populates='product', cascade='all, delete-orphan')
@@ -97,6 +95,9 @@ class Product(Base):
     # Проверка, что количество товара не может быть отрицательным
     __table_args__ = (
         CheckConstraint(quantity >= 0, name='check_quantity_positive'),
+        # Листание каталога по (name, product_id): в категории и по всему магазину
+        Index('ix_products_category_name', 'category_id', 'name'),
+        Index('ix_products_name', 'name'),
     )
     
     @validates('quantity')
@@ -106,12 +107,33 @@ class Product(Base):
             raise ValueError("Количество товара не может быть отрицательным")
         return value
 
-    @property
+    @hybrid_property
     def average_rating(self):
-        """Вычисление среднего рейтинга товара"""
-        if not self.reviews:
+        """Средний рейтинг товара по сохраненным агрегатам"""
+        if not self.rating_count:
             return 0
-        return sum(review.rating for review in self.reviews) / len(self.reviews)
+        return self.rating_sum / self.rating_count
+
+    @average_rating.expression
+    def average_rating(cls):
+        return case(
+            (cls.rating_count > 0, cls.rating_sum * 1.0 / cls.rating_count),
+            else_=0
+        )
+
+@dataclass(frozen=True, slots=True)
+class ProductCard:
+    """Карточка товара для пользователя: данные товара, избранное и корзина"""
+    product_id: int
+    category_id: Optional[int]
+    name: str
+    description: str
+    price: float
+    photo_id: Optional[str]
+    quantity: int
+    average_rating: float
+    is_favorite: bool
+    cart_quantity: int
 
 class Cart(Base):
     __tablename__ = 'cart'
@@ -127,6 +149,7 @@ class Cart(Base):
     # Проверка, что количество в корзине положительное
     __table_args__ = (
         CheckConstraint(quantity > 0, name='check_cart_quantity_positive'),
+        Index('uq_cart_user_product', 'user_id', 'product_id', unique=True),
     )
     
     @validates('quantity')
@@ -152,12 +175,22 @@ class Order(Base):
     total_amount = Column(Float, nullable=False)
     payment_method = Column(String, nullable=False)
     status = Column(String, nullable=False, default=OrderStatus.PENDING)
+    # Статус оплаты, который админ выставляет вручную (payment_status_<id>_<статус>)
+    payment_status = Column(String, nullable=True)
+    # Доставка из оформления заказа (courier/pickup); у заказов Stars не указывается
+    delivery_method = Column(String, nullable=True)
+    delivery_address = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     user = relationship('User', back_populates='orders')
     items = relationship('OrderItem', back_populates='order')
     stars_transaction = relationship('StarsTransaction', back_populates='order')
 
+    __table_args__ = (
+        Index('ix_orders_user_created', 'user_id', 'created_at'),
+        Index('ix_orders_status_created', 'status', 'created_at'),
+    )
+
     @validates('status')
     def validate_status(self, key, value):
         if isinstance(value, OrderStatus):
@@ -179,13 +212,18 @@ class OrderItem(Base):
     
     id = Column(Integer, primary_key=True)
     order_id = Column(Integer, ForeignKey('orders.order_id'))
-    product_id = Column(Integer, ForeignKey('products.product_id'))
+    # Удаление товара не трогает историю заказов: позиция остается без ссылки
+    product_id = Column(Integer, ForeignKey('products.product_id', ondelete='SET NULL'))
     quantity = Column(Integer, nullable=False)
     price = Column(Float, nullable=False)
     
     order = relationship("Order", back_populates="items")
     product = relationship("Product")
 
+    __table_args__ = (
+        Index('ix_order_items_order_id', 'order_id'),
+    )
+
 class Favorite(Base):
     __tablename__ = 'favorites'
     
@@ -197,12 +235,100 @@ class Favorite(Base):
     user = relationship('User', back_populates='favorites')
     product = relationship('Product', back_populates='favorites')
 
+    __table_args__ = (
+        Index('uq_favorites_user_product', 'user_id', 'product_id', unique=True),
+    )
+
+class Reservation(Base):
+    """Резерв товара на время оплаты (восстанавливается после перезапуска)"""
+    __tablename__ = 'reservations'
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.user_id', ondelete='CASCADE'), nullable=False)
+    product_id = Column(Integer, ForeignKey('products.product_id', ondelete='CASCADE'), nullable=False)
+    quantity = Column(Integer, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('uq_reservations_user_product', 'user_id', 'product_id', unique=True),
+        Index('ix_reservations_expires_at', 'expires_at'),
+    )
+
+class Broadcast(Base):
+    """Рассылка всем пользователям с включенными уведомлениями.
+
+    cursor_user_id — последний обработанный получатель: после перезапуска
+    рассылка продолжается с пользователей с большим user_id.
+    """
+    __tablename__ = 'broadcasts'
+
+    id = Column(Integer, primary_key=True)
+    text = Column(Text, nullable=False)
+    status = Column(String, nullable=False, default=BroadcastStatus.PENDING)
+    cursor_user_id = Column(Integer, nullable=False, default=0)
+    sent = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    blocked = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    __table_args__ = (
+        Index('ix_broadcasts_status', 'status'),
+    )
+
+class OutboxStatus(str, enum.Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    SKIPPED = "skipped"  # Пользователь отключил уведомления
+    FAILED = "failed"
+
+class OutboxMessage(Base):
+    """Уведомление, ожидающее отправки (outbox).
+
+    Записывается в той же транзакции, что и изменение, о котором оно
+    сообщает; отправляют фоновые воркеры. locked_until — аренда записи
+    воркером: после падения процесса запись снова становится доступной.
+    """
+    __tablename__ = 'notification_outbox'
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    text = Column(Text, nullable=False)
+    dedupe_key = Column(String)
+    status = Column(String, nullable=False, default=OutboxStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_until = Column(DateTime)
+    last_error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime)
+
+    __table_args__ = (
+        Index('uq_notification_outbox_dedupe_key', 'dedupe_key', unique=True),
+        Index('ix_notification_outbox_status_next', 'status', 'next_attempt_at'),
+    )
+
+class FSMRecord(Base):
+    """Состояние и данные FSM одного пользователя в чате (см. fsm_storage.py)"""
+    __tablename__ = 'fsm_states'
+
+    key = Column(String, primary_key=True)
+    state = Column(String)
+    data = Column(Text)  # Компактный JSON
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index('ix_fsm_states_expires_at', 'expires_at'),
+    )
+
 class Review(Base):
     __tablename__ = 'reviews'
     
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey('users.user_id'))
-    product_id = Column(Integer, ForeignKey('products.product_id'))
+    product_id = Column(Integer, ForeignKey('products.product_id', ondelete='CASCADE'))
     rating = Column(Integer, nullable=False)
     text = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -210,6 +336,10 @@ class Review(Base):
     user = relationship('User', back_populates='reviews')
     product = relationship('Product', back_populates='reviews')
 
+    __table_args__ = (
+        Index('ix_reviews_product_created', 'product_id', 'created_at'),
+    )
+
     @validates('rating')
     def validate_rating(self, key, value):
         if not 1 <= value <= 5:
@@ -236,5 +366,9 @@ class StarsTransaction(Base):
     order = relationship('Order', back_populates='stars_transaction')
     user = relationship('User')
 
+    __table_args__ = (
+        Index('ix_stars_transactions_user_created', 'user_id', 'created_at'),
+    )
+
     def __repr__(self):
         return f"<StarsTransaction(id={self.id}, stars={self.stars_amount}, amount={self.amount_rub})>"
\ No newline at end of file
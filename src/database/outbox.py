@@ -0,0 +1,29 @@
+"""Запись уведомлений в outbox (таблица notification_outbox).
+
+enqueue_notification вызывается внутри транзакции, меняющей состояние
+(статус заказа, оплаты и т.п.): уведомление сохраняется вместе с изменением
+или не сохраняется вовсе. Отправкой занимается src/utils/outbox.py.
+"""
+from datetime import datetime
+from typing import Optional
+
+from .engine import upsert_insert
+from .models import OutboxMessage, OutboxStatus
+
+
+async def enqueue_notification(session, user_id: int, text: str,
+                               dedupe_key: Optional[str] = None) -> None:
+    """Добавление уведомления в outbox текущей сессии (без commit).
+
+    Повторная запись с тем же dedupe_key игнорируется.
+    """
+    stmt = upsert_insert(session, OutboxMessage).values(
+        user_id=user_id,
+        text=text,
+        dedupe_key=dedupe_key,
+        status=OutboxStatus.PENDING,
+        attempts=0,
+        next_attempt_at=datetime.utcnow(),
+        created_at=datetime.utcnow()
+    )
+    await session.execute(stmt.on_conflict_do_nothing(index_elements=[OutboxMessage.dedupe_key]))
@@ -0,0 +1,264 @@
+"""Учет SQL-запросов по апдейтам и хендлерам.
+
+Хуки before/after_cursor_execute движка считают каждый запрос и время его
+выполнения. Запрос приписывается текущему апдейту через contextvar: область
+учета открывает UpdateQueriesMiddleware, имя хендлера проставляет
+HandlerQueriesMiddleware (src/middlewares/queries.py). Запросы фоновых задач
+(outbox, рассылки, очистка резервов) идут в общий счетчик без апдейта.
+
+Поверх учета:
+- журнал медленных запросов (DB_SLOW_QUERY_MS) и медленных апдейтов по
+  суммарному времени в базе (DB_SLOW_UPDATE_MS); строковые параметры в журнал
+  не попадают, только их тип и длина;
+- детектор N+1: предупреждение, если апдейт выполнил больше DB_N_PLUS_ONE
+  запросов одной формы (текст запроса без значений и длины IN-списков).
+
+Одинаковые предупреждения (тот же хендлер и та же форма запроса) пишутся не
+чаще раза в DB_LOG_INTERVAL секунд с числом пропущенных повторов.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Hashable, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.config import config as app_config
+from src.utils.metrics import db_statement_latency
+
+UNHANDLED = '<unhandled>'
+OPERATIONS = frozenset(('select', 'insert', 'update', 'delete'))
+
+_IN_LIST = re.compile(r'\((?:\s*(?:\?|%s|\$\d+|%\(\w+\)s|:\w+)\s*,)+\s*(?:\?|%s|\$\d+|%\(\w+\)s|:\w+)\s*\)')
+_NUMBER = re.compile(r'\b\d+\b')
+_SPACES = re.compile(r'\s+')
+
+
+def statement_shape(statement: str) -> str:
+    """Форма запроса: без лишних пробелов, чисел и длины IN-списков"""
+    shape = _SPACES.sub(' ', statement).strip()
+    shape = _IN_LIST.sub('(?...)', shape)
+    return _NUMBER.sub('N', shape)
+
+
+def _redact_value(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, Decimal, date, datetime)):
+        return value
+    if isinstance(value, str):
+        return f'<str:{len(value)}>'
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f'<bytes:{len(value)}>'
+    return f'<{type(value).__name__}>'
+
+
+def redact_parameters(parameters: Any, executemany: bool = False) -> Any:
+    """Параметры для журнала: числа и даты как есть, строки и байты — только длина"""
+    if executemany and isinstance(parameters, (list, tuple)):
+        first = redact_parameters(parameters[0]) if parameters else None
+        return f'<{len(parameters)} rows, first: {first}>'
+    if isinstance(parameters, dict):
+        return {name: _redact_value(value) for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return tuple(_redact_value(value) for value in parameters)
+    return _redact_value(parameters)
+
+
+def _short(statement: str, limit: int = 500) -> str:
+    statement = _SPACES.sub(' ', statement).strip()
+    return statement if len(statement) <= limit else statement[:limit] + '...'
+
+
+def handler_name(callback: Any) -> str:
+    """Имя хендлера для журнала: модуль.функция (user.cart_increase_quantity)"""
+    module = getattr(callback, '__module__', None) or ''
+    name = getattr(callback, '__name__', None) or type(callback).__name__
+    return f"{module.rsplit('.', 1)[-1]}.{name}" if module else name
+
+
+class UpdateQueries:
+    """Запросы одного апдейта"""
+    __slots__ = ('update_id', 'handler', 'statements', 'db_time', 'shapes', 'samples', 'token')
+
+    def __init__(self, update_id: Optional[int]):
+        self.update_id = update_id
+        self.handler: Optional[str] = None
+        self.statements = 0
+        self.db_time = 0.0
+        self.shapes: Counter = Counter()
+        self.samples: Dict[str, str] = {}  # форма -> первый текст запроса
+        self.token = None
+
+
+class _HandlerQueries:
+    __slots__ = ('updates', 'statements', 'db_time', 'max_statements', 'slow_updates', 'n_plus_one')
+
+    def __init__(self):
+        self.updates = 0
+        self.statements = 0
+        self.db_time = 0.0
+        self.max_statements = 0
+        self.slow_updates = 0
+        self.n_plus_one = 0  # апдейтов с повторяющимися запросами
+
+    def as_dict(self) -> dict:
+        return {
+            'updates': self.updates,
+            'statements': self.statements,
+            'statements_avg': self.statements / self.updates if self.updates else 0.0,
+            'statements_max': self.max_statements,
+            'db_time': self.db_time,
+            'slow_updates': self.slow_updates,
+            'n_plus_one': self.n_plus_one,
+        }
+
+
+current_update: ContextVar[Optional[UpdateQueries]] = ContextVar('current_update', default=None)
+
+
+class QueryLog:
+    def __init__(self, slow_query_ms: float = 100.0, slow_update_ms: float = 500.0,
+                 n_plus_one: int = 5, log_interval: float = 60.0):
+        self.slow_query = slow_query_ms / 1000
+        self.slow_update = slow_update_ms / 1000
+        self.n_plus_one = n_plus_one  # 0 — детектор выключен
+        self.log_interval = log_interval
+        self._logged: Dict[Hashable, float] = {}
+        self._suppressed: Counter = Counter()
+        self._handlers: Dict[str, _HandlerQueries] = {}
+
+        # Метрики
+        self.statements = 0
+        self.background_statements = 0  # вне апдейтов
+        self.db_time = 0.0
+        self.slow_queries = 0
+
+    def install(self, engine: AsyncEngine) -> None:
+        """Регистрация хуков учета на движке"""
+        event.listen(engine.sync_engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine.sync_engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started: List[float] = conn.info.get('query_started')
+        if not started:
+            return
+        elapsed = time.perf_counter() - started.pop()
+        self.statements += 1
+        self.db_time += elapsed
+        operation = statement[:7].lstrip().split(' ', 1)[0].lower()
+        db_statement_latency.observe(elapsed, operation if operation in OPERATIONS else 'other')
+
+        scope = current_update.get()
+        if scope is None:
+            self.background_statements += 1
+        else:
+            scope.statements += 1
+            scope.db_time += elapsed
+            if self.n_plus_one:
+                shape = statement_shape(statement)
+                scope.shapes[shape] += 1
+                scope.samples.setdefault(shape, statement)
+
+        if elapsed >= self.slow_query:
+            self.slow_queries += 1
+            handler = (scope.handler or UNHANDLED) if scope is not None else None
+            key = ('slow_query', handler, statement_shape(statement))
+            if self._should_log(key):
+                where = f"апдейт {scope.update_id}, {handler}" if scope is not None else "вне апдейта"
+                logging.warning(
+                    f"Медленный запрос {elapsed * 1000:.1f} мс ({where}{self._repeats(key)}): "
+                    f"{_short(statement)} параметры={redact_parameters(parameters, executemany)}"
+                )
+
+    def begin(self, update_id: Optional[int] = None) -> UpdateQueries:
+        """Открытие области учета для апдейта текущей задачи"""
+        scope = UpdateQueries(update_id)
+        scope.token = current_update.set(scope)
+        return scope
+
+    def finish(self, scope: UpdateQueries) -> None:
+        """Закрытие области: статистика хендлера и предупреждения по апдейту"""
+        current_update.reset(scope.token)
+        handler = scope.handler or UNHANDLED
+        stats = self._handlers.get(handler)
+        if stats is None:
+            stats = self._handlers[handler] = _HandlerQueries()
+        stats.updates += 1
+        stats.statements += scope.statements
+        stats.db_time += scope.db_time
+        stats.max_statements = max(stats.max_statements, scope.statements)
+
+        if scope.db_time >= self.slow_update:
+            stats.slow_updates += 1
+            key = ('slow_update', handler)
+            if self._should_log(key):
+                logging.warning(
+                    f"Медленный апдейт {scope.update_id} ({handler}{self._repeats(key)}): "
+                    f"{scope.statements} запросов, {scope.db_time * 1000:.1f} мс в базе"
+                )
+
+        if self.n_plus_one:
+            repeated = [(shape, count) for shape, count in scope.shapes.items() if count > self.n_plus_one]
+            if repeated:
+                stats.n_plus_one += 1
+            for shape, count in repeated:
+                key = ('n_plus_one', handler, shape)
+                if self._should_log(key):
+                    logging.warning(
+                        f"Возможный N+1: апдейт {scope.update_id} ({handler}{self._repeats(key)}) "
+                        f"выполнил {count} однотипных запросов из {scope.statements}: "
+                        f"{_short(scope.samples[shape])}"
+                    )
+
+        logging.debug(
+            f"Апдейт {scope.update_id} ({handler}): {scope.statements} запросов, "
+            f"{scope.db_time * 1000:.1f} мс в базе"
+        )
+
+    def _should_log(self, key: Hashable) -> bool:
+        """Одно и то же предупреждение — не чаще раза в log_interval"""
+        now = time.monotonic()
+        last = self._logged.get(key)
+        if last is not None and now - last < self.log_interval:
+            self._suppressed[key] += 1
+            return False
+        self._logged[key] = now
+        return True
+
+    def _repeats(self, key: Hashable) -> str:
+        suppressed = self._suppressed.pop(key, 0)
+        return f", еще {suppressed} повторов за {self.log_interval:.0f} с" if suppressed else ''
+
+    def reset(self):
+        self._handlers.clear()
+        self._logged.clear()
+        self._suppressed.clear()
+        self.statements = 0
+        self.background_statements = 0
+        self.db_time = 0.0
+        self.slow_queries = 0
+
+    def stats(self) -> dict:
+        return {
+            'statements': self.statements,
+            'background_statements': self.background_statements,
+            'db_time': self.db_time,
+            'slow_queries': self.slow_queries,
+            'handlers': {name: stats.as_dict() for name, stats in sorted(self._handlers.items())},
+        }
+
+
+# Общий журнал запросов приложения: хуки ставит engine.create_engine
+query_log = QueryLog(
+    slow_query_ms=app_config.db_slow_query_ms,
+    slow_update_ms=app_config.db_slow_update_ms,
+    n_plus_one=app_config.db_n_plus_one,
+    log_interval=app_config.db_log_interval
+)
@@ -1,6 +1,12 @@
-from .models import async_session, User, UserProfile, Category, Product, Cart
+from .engine import async_session, upsert_insert
+from .catalog_cache import catalog
+from .user_settings import user_settings
+from .admins import admins
+from .outbox import enqueue_notification
+from .models import User, UserProfile, Category, Product, Cart
 from .models import Order, OrderItem, StarsTransaction, OrderStatus, PaymentMethod, Review
 from sqlalchemy import select, insert, update, delete, or_
+from sqlalchemy.exc import IntegrityError
 import functools
 import logging
 from typing import List, Optional
@@ -34,14 +40,22 @@ async def add_category(session, name: str):
     session.add(category)
     await session.commit()
     await session.refresh(category)
+    catalog.put_category(category.id, category.name)
     return category
 
 @connection
 async def delete_category(session, category_id: int):
     category = await session.get(Category, category_id)
     if category:
-        await session.delete(category)
-        await session.commit()
+        try:
+            await session.delete(category)
+            await session.commit()
+        except IntegrityError as e:
+            # Внешний ключ, не рассчитанный на удаление (см. ondelete в models.py)
+            await session.rollback()
+            logging.error(f"Ошибка при удалении категории {category_id}: {e}")
+            return False
+        catalog.remove_category(category_id)
         return True
     return False
 
@@ -59,6 +73,7 @@ async def add_product(session, name: str, description: str, price: float, catego
         session.add(product)
         await session.commit()
         await session.refresh(product)
+        catalog.put_product(product)
         return product
     except ValueError:
         return None
@@ -67,8 +82,14 @@ async def add_product(session, name: str, description: str, price: float, catego
 async def delete_product(session, product_id: int):
     product = await session.get(Product, product_id)
     if product:
-        await session.delete(product)
-        await session.commit()
+        try:
+            await session.delete(product)
+            await session.commit()
+        except IntegrityError as e:
+            await session.rollback()
+            logging.error(f"Ошибка при удалении товара {product_id}: {e}")
+            return False
+        catalog.remove_product(product_id)
         return True
     return False
 
@@ -98,6 +119,7 @@ async def delete_admin(session, admin_id: int):
             # Снимаем флаг администратора
             admin.is_admin = False
             await session.commit()
+            admins.discard(admin_id)
             logging.info(f"Администратор {admin_id} успешно удален")
             return True
         logging.warning(f"Администратор {admin_id} не найден")
@@ -120,6 +142,7 @@ async def add_admin(session, admin_id: int) -> bool:
         # Устанавливаем флаг is_admin
         user.is_admin = True
         await session.commit()
+        admins.add(admin_id)
         return True
     except Exception as e:
         logging.error(f"Ошибка при добавлении администратора: {e}")
@@ -157,6 +180,7 @@ async def edit_product(session, product_id: int, **kwargs) -> bool:
                 logging.info(f"Обновлено поле {field} у товара {product_id}: {value}")
         
         await session.commit()
+        catalog.put_product(product)
         logging.info(f"Товар {product_id} успешно обновлен")
         return True
     except Exception as e:
@@ -186,30 +210,24 @@ async def get_cart_item_quantity(session, user_id: int, product_id: int) -> int:
     return quantity or 0
 
 @connection
-async def add_to_cart(session, user_id: int, product_id: int, quantity: int) -> bool:
-    """Добавление/обновление товара в корзине"""
+async def add_to_cart(session, user_id: int, product_id: int, quantity: int) -> Optional[int]:
+    """Добавление/обновление товара в корзине, возвращает итоговое количество"""
     try:
-        cart_item = await session.scalar(
-            select(Cart)
-            .where(Cart.user_id == user_id)
-            .where(Cart.product_id == product_id)
+        stmt = upsert_insert(session, Cart).values(
+            user_id=user_id,
+            product_id=product_id,
+            quantity=quantity
         )
-        
-        if cart_item:
-            cart_item.quantity = quantity
-        else:
-            cart_item = Cart(
-                user_id=user_id,
-                product_id=product_id,
-                quantity=quantity
-            )
-            session.add(cart_item)
-            
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Cart.user_id, Cart.product_id],
+            set_={'quantity': stmt.excluded.quantity}
+        ).returning(Cart.quantity)
+        cart_quantity = (await session.execute(stmt)).scalar_one()
         await session.commit()
-        return True
+        return cart_quantity
     except Exception as e:
         logging.error(f"Ошибка при добавлении в корзину: {e}")
-        return False
+        return None
 
 @connection
 async def clear_cart(session, user_id: int) -> bool:
@@ -372,6 +390,15 @@ async def add_review(session, user_id: int, product_id: int, rating: int, text:
             text=text
         )
         session.add(review)
+        # Агрегаты рейтинга обновляем в той же транзакции
+        await session.execute(
+            update(Product)
+            .where(Product.product_id == product_id)
+            .values(
+                rating_sum=Product.rating_sum + rating,
+                rating_count=Product.rating_count + 1
+            )
+        )
         await session.commit()
         return True
     except Exception as e:
@@ -389,6 +416,7 @@ async def update_user_language(session, user_id: int, language: str) -> bool:
             .values(language=language)
         )
         await session.commit()
+        user_settings.set_language(user_id, language)
         return True
     except Exception as e:
         logging.error(f"Ошибка при обновлении языка: {e}")
@@ -404,6 +432,7 @@ async def update_user_notifications(session, user_id: int, enabled: bool) -> boo
             .values(notifications=enabled)
         )
         await session.commit()
+        user_settings.set_notifications(user_id, enabled)
         return True
     except Exception as e:
         logging.error(f"Ошибка при обновлении настроек уведомлений: {e}")
@@ -463,14 +492,22 @@ async def get_review(session, review_id: int) -> Optional[Review]:
         return None
 
 @connection
-async def update_order_status(session, order_id: int, new_status: str) -> bool:
-    """Обновление статуса заказа"""
+async def update_order_status(session, order_id: int, new_status: str,
+                              notification: Optional[str] = None,
+                              dedupe_key: Optional[str] = None) -> bool:
+    """Обновление статуса заказа.
+
+    notification — текст уведомления покупателю: записывается в outbox
+    в той же транзакции, если статус действительно изменился.
+    """
     try:
-        await session.execute(
-            update(Order)
-            .where(Order.order_id == order_id)
-            .values(status=new_status)
-        )
+        order = await session.get(Order, order_id)
+        if order is None:
+            return False
+        if order.status != new_status:
+            order.status = new_status
+            if notification:
+                await enqueue_notification(session, order.user_id, notification, dedupe_key)
         await session.commit()
         return True
     except Exception as e:
@@ -479,14 +516,22 @@ async def update_order_status(session, order_id: int, new_status: str) -> bool:
         return False
 
 @connection
-async def update_payment_status(session, order_id: int, status: str) -> bool:
-    """Обновление статуса оплаты"""
+async def update_payment_status(session, order_id: int, status: str,
+                                notification: Optional[str] = None,
+                                dedupe_key: Optional[str] = None) -> bool:
+    """Обновление статуса оплаты (уведомление — как в update_order_status)"""
     try:
-        await session.execute(
+        result = await session.execute(
             update(Order)
             .where(Order.order_id == order_id)
             .values(payment_status=status)
+            .returning(Order.user_id)
         )
+        user_id = result.scalar_one_or_none()
+        if user_id is None:
+            return False
+        if notification:
+            await enqueue_notification(session, user_id, notification, dedupe_key)
         await session.commit()
         return True
     except Exception as e:
@@ -494,6 +539,19 @@ async def update_payment_status(session, order_id: int, status: str) -> bool:
         await session.rollback()
         return False
 
+@connection
+async def add_notification(session, user_id: int, text: str,
+                           dedupe_key: Optional[str] = None) -> bool:
+    """Постановка уведомления в outbox без изменения состояния"""
+    try:
+        await enqueue_notification(session, user_id, text, dedupe_key)
+        await session.commit()
+        return True
+    except Exception as e:
+        logging.error(f"Ошибка при постановке уведомления в очередь: {e}")
+        await session.rollback()
+        return False
+
 @connection
 async def get_order(session, order_id: int):
     """Получение заказа по ID"""
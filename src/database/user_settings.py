@@ -0,0 +1,101 @@
+"""Кэш пользовательских настроек (язык и уведомления) в памяти процесса.
+
+Настройки читаются из базы один раз на пользователя и дальше берутся из
+LRU-кэша. requests.update_user_language/update_user_notifications обновляют
+кэш сразу после коммита, регистрация пользователя сбрасывает его запись.
+При CACHE_TTL > 0 запись старше этого срока перечитывается: так видны
+изменения, сделанные другими webhook-воркерами.
+"""
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import select
+
+from src.config import config as app_config
+from .engine import async_session
+from .models import User
+
+
+class UserSettings:
+    __slots__ = ('language', 'notifications', 'loaded_at')
+
+    def __init__(self, language: Optional[str], notifications: bool):
+        # language=None — пользователя нет в базе, язык еще не выбран
+        self.language = language
+        self.notifications = notifications
+        self.loaded_at = time.monotonic()
+
+
+class UserSettingsStore:
+    def __init__(self, session_factory=async_session, maxsize: int = 10000, ttl: float = 0.0):
+        self.session_factory = session_factory
+        self.maxsize = maxsize
+        self.ttl = ttl  # 0 — без срока
+        self.hits = 0
+        self.loads = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    async def get(self, user_id: int) -> UserSettings:
+        """Настройки пользователя; при промахе — один запрос к базе"""
+        settings = self._entries.get(user_id)
+        if settings is not None and not self._expired(settings):
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return settings
+        try:
+            async with self.session_factory() as session:
+                row = (await session.execute(
+                    select(User.language, User.notifications).where(User.user_id == user_id)
+                )).first()
+        except Exception as e:
+            logging.error(f"Ошибка при загрузке настроек пользователя: {e}")
+            # Не кэшируем: при следующем апдейте попробуем снова
+            return UserSettings(None, False)
+        self.loads += 1
+        settings = UserSettings(row.language, bool(row.notifications)) if row else UserSettings(None, False)
+        self._put(user_id, settings)
+        return settings
+
+    def _expired(self, settings: UserSettings) -> bool:
+        return self.ttl > 0 and time.monotonic() - settings.loaded_at >= self.ttl
+
+    def _put(self, user_id: int, settings: UserSettings):
+        self._entries[user_id] = settings
+        self._entries.move_to_end(user_id)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def set_language(self, user_id: int, language: str):
+        """Язык изменен в базе"""
+        settings = self._entries.get(user_id)
+        if settings is not None:
+            settings.language = language
+
+    def set_notifications(self, user_id: int, enabled: bool):
+        """Настройка уведомлений изменена в базе"""
+        settings = self._entries.get(user_id)
+        if settings is not None:
+            settings.notifications = enabled
+
+    def invalidate(self, user_id: Optional[int] = None):
+        """Сброс записи пользователя (или всего кэша) — перечитать из базы"""
+        if user_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(user_id, None)
+
+    def stats(self) -> dict:
+        total = self.hits + self.loads
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'loads': self.loads,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+# Единый кэш настроек процесса
+user_settings = UserSettingsStore(ttl=app_config.cache_ttl)
@@ -1,7 +1,7 @@
 from aiogram import F, Router, Bot
 from aiogram.types import Message, CallbackQuery, ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.filters import Command, CommandStart, BaseFilter
-from src.config import admin_ids, super_admin_id, Config
+from src.config import super_admin_id
 from src.database.database import Database
 import src.state as st
 import src.keyboards as kb
@@ -9,13 +9,17 @@ import src.database.requests as db
 from aiogram.fsm.context import FSMContext
 import logging
 from ..database.models import StarsTransaction
-from src.utils.notifications import NotificationManager
+from src.utils.notifications import NotificationManager, order_status_text, payment_status_text
+from src.utils.outbox import NotificationOutbox
+from src.database.admins import admins
+from src.database.models import BroadcastStatus
+from src.utils.broadcast import BroadcastEngine
 
 router = Router()
 
 async def check_admin(message: Message) -> bool:
     """Проверка является ли пользователь администратором"""
-    if message.from_user.id not in Config.admin_ids:
+    if not await admins.is_admin(message.from_user.id):
         await message.answer("⛔️ У вас нет прав администратора")
         return False
     return True
@@ -145,19 +149,23 @@ async def process_admin_deletion(callback: CallbackQuery, state: FSMContext):
 class AdminFilter(BaseFilter):
     """Фильтр для проверки прав администратора"""
     async def __call__(self, message: Message) -> bool:
-        user_id = message.from_user.id
-        return user_id == super_admin_id or await db.is_admin(user_id)
+        return await admins.is_admin(message.from_user.id)
 
 admin_filter = AdminFilter()
 
+@router.callback_query(admin_filter, F.data.startswith(kb.ADMIN_PAGE_PREFIXES))
+async def paginate_admin_products(callback: CallbackQuery):
+    """Листание списков товаров в админке (состояние FSM не меняется)"""
+    scope, category_id, cursor_id, backward = kb.parse_page_callback(callback.data)
+    keyboard = await kb.product_list_page(scope, category_id, cursor_id, backward)
+    if keyboard:
+        await callback.message.edit_reply_markup(reply_markup=keyboard)
+    await callback.answer()
+
 @router.message(Command('admin'))
 async def cmd_admin(message: Message):
     """Обработчик команды администратора"""
-    user_id = message.from_user.id
-    is_super_admin = user_id == super_admin_id
-    is_admin = await db.is_admin(user_id)
-    
-    if is_admin or is_super_admin:
+    if await admins.is_admin(message.from_user.id):
         await message.answer(
             "👋 Добро пожаловать в панель администратора!",
             reply_markup=kb.admin_main
@@ -170,7 +178,7 @@ async def exit_admin(message: Message):
     """Выход из режима администратора"""
     await message.answer(
         "👋 Вы вышли из режима администратора",
-        reply_markup=kb.main
+        reply_markup=kb.main_menu()
     )
 
 @router.message(admin_filter, F.text == '➕ Добавить категорию')
@@ -232,11 +240,16 @@ async def process_category_selection(callback: CallbackQuery, state: FSMContext)
 @router.callback_query(admin_filter, F.data == 'ok-sure', st.DeleteCategory.confirm)
 async def delete_category_callback(callback: CallbackQuery, state: FSMContext):
     data = await state.get_data()
-    await db.delete_category(data['category_id'])
-    await callback.message.answer(
-        "Категория удалена",
-        reply_markup=kb.admin_main
-    )
+    if await db.delete_category(data['category_id']):
+        await callback.message.answer(
+            "Категория удалена",
+            reply_markup=kb.admin_main
+        )
+    else:
+        await callback.message.answer(
+            "❌ Ошибка при удалении категории",
+            reply_markup=kb.admin_main
+        )
     await state.clear()
 
 @router.message(admin_filter, F.text == '✏️ Редактировать товар')
@@ -391,7 +404,7 @@ async def edit_product_photo(callback: CallbackQuery, state: FSMContext):
     """Редактирование фото товара"""
     await callback.message.answer(
         "🖼 Отправьте новое фото товара:",
-        reply_markup=kb.cancel_keyboard
+        reply_markup=kb.cancel_keyboard()
     )
     await state.set_state(st.EditProduct.edit_photo)
 
@@ -696,7 +709,7 @@ async def edit_product_name(callback: CallbackQuery, state: FSMContext):
     """Редактирование названия товара"""
     await callback.message.answer(
         "📝 Введите новое название товара:",
-        reply_markup=kb.cancel_keyboard
+        reply_markup=kb.cancel_keyboard()
     )
     await state.set_state(st.EditProduct.edit_name)
 
@@ -705,7 +718,7 @@ async def edit_product_description(callback: CallbackQuery, state: FSMContext):
     """Редактирование описания товара"""
     await callback.message.answer(
         "📝 Введите новое описание товара:",
-        reply_markup=kb.cancel_keyboard
+        reply_markup=kb.cancel_keyboard()
     )
     await state.set_state(st.EditProduct.edit_description)
 
@@ -714,7 +727,7 @@ async def edit_product_price(callback: CallbackQuery, state: FSMContext):
     """Редактирование цены товара"""
     await callback.message.answer(
         "💰 Введите новую цену товара:",
-        reply_markup=kb.cancel_keyboard
+        reply_markup=kb.cancel_keyboard()
     )
     await state.set_state(st.EditProduct.edit_price)
 
@@ -723,7 +736,7 @@ async def edit_product_photo(callback: CallbackQuery, state: FSMContext):
     """Редактирование фото товара"""
     await callback.message.answer(
         "🖼 Отправьте новое фото товара:",
-        reply_markup=kb.cancel_keyboard
+        reply_markup=kb.cancel_keyboard()
     )
     await state.set_state(st.EditProduct.edit_photo)
 
@@ -748,7 +761,7 @@ async def save_product_photo(message: Message, state: FSMContext):
         )
 
 @router.callback_query(admin_filter, F.data == "ok-sure", st.AddProduct.confirm)
-async def add_product_finish(callback: CallbackQuery, state: FSMContext):
+async def add_product_finish(callback: CallbackQuery, state: FSMContext, broadcasts: BroadcastEngine):
     """Подтверждение добавления товара"""
     data = await state.get_data()
     
@@ -761,14 +774,14 @@ async def add_product_finish(callback: CallbackQuery, state: FSMContext):
             photo_id=data.get('photo')  # Используем get() тк фото может отсутствовать
         )
         if product:
-            # Отправляем уведомление всем пользователям
-            notifications = NotificationManager(callback.bot)  # Используем callback.bot
-            await notifications.notify_new_product(product.product_id)
+            # Уведомление всем пользователям уходит фоновой рассылкой
+            notifications = NotificationManager(callback.bot, broadcasts)
+            broadcast_id = await notifications.notify_new_product(product.product_id)
             
-            await callback.message.answer(
-                "✅ Товар успешно добавлен",
-                reply_markup=kb.admin_main
-            )
+            text = "✅ Товар успешно добавлен"
+            if broadcast_id is not None:
+                text += f"\n📣 Рассылка #{broadcast_id} запущена, статус: /broadcasts"
+            await callback.message.answer(text, reply_markup=kb.admin_main)
         else:
             await callback.message.answer(
                 "❌ Ошибка при добавлении товара",
@@ -810,7 +823,7 @@ async def add_product_name(callback: CallbackQuery, state: FSMContext):
     await state.set_state(st.AddProduct.name)
     await callback.message.answer(
         "📝 Введите название товара:",
-        reply_markup=kb.cancel_keyboard
+        reply_markup=kb.cancel_keyboard()
     )
 
 @router.message(admin_filter, st.AddProduct.name)
@@ -820,7 +833,7 @@ async def add_product_description(message: Message, state: FSMContext):
     await state.set_state(st.AddProduct.description)
     await message.answer(
         "📝 Введите описание товара:",
-        reply_markup=kb.cancel_keyboard
+        reply_markup=kb.cancel_keyboard()
     )
 
 @router.message(admin_filter, st.AddProduct.description)
@@ -830,7 +843,7 @@ async def add_product_price(message: Message, state: FSMContext):
     await state.set_state(st.AddProduct.price)
     await message.answer(
         "💰 Введите цену товара:",
-        reply_markup=kb.cancel_keyboard
+        reply_markup=kb.cancel_keyboard()
     )
 
 @router.message(admin_filter, st.AddProduct.price)
@@ -950,8 +963,7 @@ async def show_stars_history(message: Message):
     """Показать историю транзакций Stars"""
     try:
         # Проверяем права через существующую систему и super_admin
-        admins = await db.get_admins()
-        if message.from_user.id not in [admin.user_id for admin in admins] and message.from_user.id != super_admin_id:
+        if not await admins.is_admin(message.from_user.id):
             await message.answer("⛔️ У вас нет прав администратора")
             return
             
@@ -983,17 +995,23 @@ async def show_stars_history(message: Message):
 
 # Для изменения статуса заказа
 @router.callback_query(F.data.startswith("order_status_"))
-async def change_order_status(callback: CallbackQuery, state: FSMContext):
+async def change_order_status(callback: CallbackQuery, state: FSMContext, outbox: NotificationOutbox):
     """Изменение статуса заказа"""
     try:
         order_id = int(callback.data.split("_")[2])
         new_status = callback.data.split("_")[3]
+        order = await db.get_order(order_id)
+        if order is None:
+            await callback.answer("❌ Заказ не найден")
+            return
         
-        if await db.update_order_status(order_id, new_status):
-            # Отправляем уведомление о смене статуса
-            notifications = NotificationManager(callback.bot)
-            await notifications.notify_order_status(order_id, new_status)
-            
+        # Уведомление покупателю записывается в outbox вместе со статусом
+        if await db.update_order_status(
+            order_id, new_status,
+            notification=await order_status_text(order.user_id, order_id, new_status),
+            dedupe_key=f"callback:{callback.id}"
+        ):
+            outbox.wake()
             await callback.answer("✅ Статус заказа обновлен")
         else:
             await callback.answer("❌ Ошибка при обновлении статуса")
@@ -1003,17 +1021,19 @@ async def change_order_status(callback: CallbackQuery, state: FSMContext):
 
 # Для обновления статуса оплаты
 @router.callback_query(F.data.startswith("payment_status_"))
-async def update_payment_status(callback: CallbackQuery):
+async def update_payment_status(callback: CallbackQuery, outbox: NotificationOutbox):
     """Обновление статуса оплаты"""
     try:
         order_id = int(callback.data.split("_")[2])
         status = callback.data.split("_")[3]
         
-        if await db.update_payment_status(order_id, status):
-            # Отправляем уведомление о статусе оплаты
-            notifications = NotificationManager(callback.bot)
-            await notifications.notify_payment_status(order_id, status)
-            
+        # Уведомление покупателю записывается в outbox вместе со статусом
+        if await db.update_payment_status(
+            order_id, status,
+            notification=payment_status_text(order_id, status),
+            dedupe_key=f"callback:{callback.id}"
+        ):
+            outbox.wake()
             await callback.answer("✅ Статус оплаты обновлен")
         else:
             await callback.answer("❌ Ошибка при обновлении статуса")
@@ -1023,17 +1043,67 @@ async def update_payment_status(callback: CallbackQuery):
 
 # Для ответа на отзыв
 @router.callback_query(F.data.startswith("reply_review_"))
-async def reply_to_review(callback: CallbackQuery, state: FSMContext):
+async def reply_to_review(callback: CallbackQuery, state: FSMContext, outbox: NotificationOutbox):
     """Ответ на отзыв"""
     try:
         review_id = int(callback.data.split("_")[2])
         response = "Спасибо за ваш отзыв!"  # Здесь можно добавить форму для ввода ответа
         
-        # Отправляем уведомление об ответе на отзыв
+        # Уведомление об ответе уходит через outbox
         notifications = NotificationManager(callback.bot)
-        await notifications.notify_review_response(review_id, response)
+        if not await notifications.notify_review_response(review_id, response):
+            await callback.answer("❌ Ошибка при отправке ответа")
+            return
+        outbox.wake()
         
         await callback.answer("✅ Ответ на отзыв отправлен")
     except Exception as e:
         logging.error(f"Ошибка при ответе на отзыв: {e}")
-        await callback.answer("Произошла ошибка")
\ No newline at end of file
+        await callback.answer("Произошла ошибка")
+
+# Для управления рассылками
+BROADCAST_STATUS_NAMES = {
+    BroadcastStatus.PENDING: "⏳ в очереди",
+    BroadcastStatus.RUNNING: "📤 отправляется",
+    BroadcastStatus.COMPLETED: "✅ завершена",
+    BroadcastStatus.CANCELLED: "🚫 отменена",
+    BroadcastStatus.FAILED: "❌ ошибка",
+}
+
+@router.message(admin_filter, Command("broadcasts"))
+async def show_broadcasts(message: Message, broadcasts: BroadcastEngine):
+    """Статус последних рассылок"""
+    try:
+        recent = await broadcasts.db.get_broadcasts(limit=10)
+        if not recent:
+            await message.answer("📣 Рассылок пока не было")
+            return
+
+        report = "📣 Последние рассылки:\n\n"
+        for broadcast in recent:
+            status = BROADCAST_STATUS_NAMES.get(broadcast.status, broadcast.status)
+            report += (
+                f"#{broadcast.id} {status}\n"
+                f"Отправлено: {broadcast.sent}, ошибок: {broadcast.failed}, "
+                f"заблокировали бота: {broadcast.blocked}\n"
+                f"Создана: {broadcast.created_at.strftime('%d.%m.%Y %H:%M')}\n\n"
+            )
+        report += "Отменить рассылку: /broadcast_cancel <ID>"
+        await message.answer(report)
+    except Exception as e:
+        logging.error(f"Ошибка при получении статуса рассылок: {e}")
+        await message.answer("❌ Ошибка при получении статуса рассылок")
+
+@router.message(admin_filter, Command("broadcast_cancel"))
+async def cancel_broadcast(message: Message, broadcasts: BroadcastEngine):
+    """Отмена рассылки по ID"""
+    parts = message.text.split()
+    if len(parts) != 2 or not parts[1].isdigit():
+        await message.answer("Использование: /broadcast_cancel <ID>")
+        return
+
+    broadcast_id = int(parts[1])
+    if await broadcasts.cancel(broadcast_id):
+        await message.answer(f"🚫 Рассылка #{broadcast_id} отменена")
+    else:
+        await message.answer(f"❌ Рассылка #{broadcast_id} не найдена или уже завершена")
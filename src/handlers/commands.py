@@ -1,5 +1,8 @@
 from aiogram import Bot
 from aiogram.types import BotCommand
+from ..utils.i18n import DEFAULT_LOCALE, SUPPORTED_LOCALES, get_translator
+
+COMMANDS = ('start', 'menu', 'help', 'profile', 'settings', 'register', 'catalog')
 
 async def set_commands(bot: Bot):
     """
@@ -13,14 +16,16 @@ async def set_commands(bot: Bot):
     - /settings - Настройки пользователя
     - /register - Регистрация нового пользователя
     - /catalog - Просмотр каталога товаров
+
+    Описания — на каждом поддерживаемом языке, по умолчанию русские.
     """
-    commands = [
-        BotCommand(command='start', description='Запустить бота'),
-        BotCommand(command='menu', description='Показать меню команд'),
-        BotCommand(command='help', description='Получить помощь'),
-        BotCommand(command='profile', description='Мой профиль'),
-        BotCommand(command='settings', description='Настройки'),
-        BotCommand(command='register', description='Регистрация в боте'),
-        BotCommand(command='catalog', description='Просмотр каталога товаров')
-    ]
-    await bot.set_my_commands(commands)
\ No newline at end of file
+    for locale in SUPPORTED_LOCALES:
+        t = get_translator(locale)
+        commands = [
+            BotCommand(command=command, description=t(f'cmd_{command}'))
+            for command in COMMANDS
+        ]
+        if locale == DEFAULT_LOCALE:
+            await bot.set_my_commands(commands)
+        else:
+            await bot.set_my_commands(commands, language_code=locale)
\ No newline at end of file
@@ -6,26 +6,18 @@ import re
 import logging
 from ..database.database import Database
 from ..keyboards import (profile_keyboard, send_contact, 
-                        send_location, main, confirm_keyboard,
+                        send_location, main_menu, confirm_keyboard,
                         cancel_keyboard)
 from ..state import EditProfile
+from ..utils.i18n import Translator, variants
 from .user import cmd_profile
 
 router = Router()
 
 @router.callback_query(F.data.startswith('edit_'))
-async def process_edit_profile(callback: CallbackQuery, state: FSMContext):
+async def process_edit_profile(callback: CallbackQuery, state: FSMContext, t: Translator):
     edit_type = callback.data.split('_')[1]
     
-    edit_messages = {
-        'name': 'Введите новое имя:',
-        'email': 'Введите новый email:',
-        'phone': 'Отправьте новый номер телефона:',
-        'age': 'Введите новый возраст:',
-        'photo': 'Отправьте новое фото:',
-        'location': 'Отправьте новую локацию:'
-    }
-    
     states = {
         'name': EditProfile.edit_name,
         'email': EditProfile.edit_email,
@@ -39,28 +31,28 @@ async def process_edit_profile(callback: CallbackQuery, state: FSMContext):
     await state.update_data(edit_mode=True, edit_type=edit_type)
     
     if edit_type == 'phone':
-        kb = send_contact
+        kb = send_contact()
     elif edit_type == 'location':
-        kb = send_location
+        kb = send_location()
     else:
-        kb = cancel_keyboard
+        kb = cancel_keyboard()
     
     await callback.message.answer(
-        edit_messages[edit_type],
+        t(f'edit_prompt_{edit_type}'),
         reply_markup=kb
     )
     await callback.answer()
 
 # Обработчик отмены редактирования
-@router.message(F.text == "Отменить редактирование")
-async def cancel_edit(message: Message, state: FSMContext, db: Database):
+@router.message(F.text.in_(variants('btn_cancel_edit')))
+async def cancel_edit(message: Message, state: FSMContext, db: Database, t: Translator):
     await state.clear()
-    await message.answer("Редактирование отменено", reply_markup=main)
+    await message.answer(t('edit_cancelled'), reply_markup=main_menu())
     await cmd_profile(message, db)
 
 # Обработчик подтверждения изменений
-@router.message(F.text == "Подтвердить")
-async def confirm_edit(message: Message, state: FSMContext, db: Database):
+@router.message(F.text.in_(variants('btn_confirm')))
+async def confirm_edit(message: Message, state: FSMContext, db: Database, t: Translator):
     data = await state.get_data()
     if not data.get('edit_mode'):
         return
@@ -86,18 +78,18 @@ async def confirm_edit(message: Message, state: FSMContext, db: Database):
             success = await db.update_user_field(message.from_user.id, field_mapping[edit_type], new_value)
         
         if success:
-            await message.answer(f'{edit_type.capitalize()} успешно обновлен!', reply_markup=main)
+            await message.answer(t('edit_saved', field=t(f'field_{edit_type}')), reply_markup=main_menu())
             await cmd_profile(message, db)
         else:
-            await message.answer('Произошла ошибка при обновлении.', reply_markup=main)
+            await message.answer(t('edit_error'), reply_markup=main_menu())
     except Exception as e:
         logging.error(f"Ошибка при обновлении: {e}")
-        await message.answer('Произошла ошибка при обновлении.', reply_markup=main)
+        await message.answer(t('edit_error'), reply_markup=main_menu())
     finally:
         await state.clear()
 
 @router.message(EditProfile.edit_photo, F.photo)
-async def process_photo(message: Message, state: FSMContext):
+async def process_photo(message: Message, state: FSMContext, t: Translator):
     """Обработка нового фото профиля"""
     try:
         photo_id = message.photo[-1].file_id
@@ -105,80 +97,80 @@ async def process_photo(message: Message, state: FSMContext):
         
         # Сначала отправляем сообщение с подтверждением
         await message.answer(
-            'Установить это фото в качестве фото профиля?',
-            reply_markup=confirm_keyboard
+            t('edit_photo_confirm'),
+            reply_markup=confirm_keyboard()
         )
         # Затем отправляем фото
         await message.answer_photo(photo=photo_id)
     except Exception as e:
         logging.error(f"Ошибка при обработке фото: {e}")
         await message.answer(
-            "Произошла ошибка при обработке фото. Попробуйте еще раз или отмените редактирование.",
-            reply_markup=cancel_keyboard
+            t('edit_photo_error'),
+            reply_markup=cancel_keyboard()
         )
 
 @router.message(EditProfile.edit_photo)
-async def wrong_photo(message: Message):
-    await message.answer("Пожалуйста, отправьте фото", reply_markup=cancel_keyboard)
+async def wrong_photo(message: Message, t: Translator):
+    await message.answer(t('edit_send_photo'), reply_markup=cancel_keyboard())
 
 @router.message(EditProfile.edit_contact, F.contact)
-async def process_contact(message: Message, state: FSMContext):
+async def process_contact(message: Message, state: FSMContext, t: Translator):
     """Обработка нового номера телефона"""
     try:
         await state.update_data(new_value=message.contact.phone_number, edit_mode=True, edit_type='phone')
         await message.answer(
-            f'Вы хотите изменить номер телефона на {message.contact.phone_number}?',
-            reply_markup=confirm_keyboard
+            t('edit_phone_confirm', phone=message.contact.phone_number),
+            reply_markup=confirm_keyboard()
         )
     except Exception as e:
         logging.error(f"Ошибка при обработке контакта: {e}")
         await message.answer(
-            "Произошла ошибка. Попробуйте еще раз или отмените редактирование.",
-            reply_markup=cancel_keyboard
+            t('edit_retry_error'),
+            reply_markup=cancel_keyboard()
         )
 
 @router.message(EditProfile.edit_contact)
-async def wrong_contact(message: Message):
-    await message.answer("Пожалуйста, используйте кнопку для отправки контакта", reply_markup=send_contact)
+async def wrong_contact(message: Message, t: Translator):
+    await message.answer(t('edit_use_contact_button'), reply_markup=send_contact())
 
 @router.message(EditProfile.edit_location)
-async def wrong_location(message: Message):
+async def wrong_location(message: Message, t: Translator):
     if not message.location:
-        await message.answer("Пожалуйста, используйте кнопку для отправки локации", reply_markup=send_location)
+        await message.answer(t('edit_use_location_button'), reply_markup=send_location())
 
 @router.message(EditProfile.edit_name)
-async def process_name(message: Message, state: FSMContext):
-    if message.text == "Отменить редактирование":
-        await cancel_edit(message, state)
+async def process_name(message: Message, state: FSMContext, db: Database, t: Translator):
+    if message.text in variants('btn_cancel_edit'):
+        await cancel_edit(message, state, db, t)
         return
     
     await state.update_data(new_value=message.text)
-    await message.answer(f'Вы хотите изменить имя на "{message.text}"?', reply_markup=confirm_keyboard)
+    await message.answer(t('edit_name_confirm', value=message.text), reply_markup=confirm_keyboard())
 
 @router.message(EditProfile.edit_email)
-async def process_email(message: Message, state: FSMContext):
-    if message.text == "Отменить редактирование":
-        await cancel_edit(message, state)
+async def process_email(message: Message, state: FSMContext, db: Database, t: Translator):
+    if message.text in variants('btn_cancel_edit'):
+        await cancel_edit(message, state, db, t)
         return
 
     email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
     if re.match(email_pattern, message.text):
         await state.update_data(new_value=message.text)
-        await message.answer(f'Вы хотите изменить email на "{message.text}"?', reply_markup=confirm_keyboard)
+        await message.answer(t('edit_email_confirm', value=message.text), reply_markup=confirm_keyboard())
     else:
-        await message.answer('Пожалуйста, введите корректный email адрес.', reply_markup=cancel_keyboard)
+        await message.answer(t('edit_invalid_email'), reply_markup=cancel_keyboard())
 
 @router.message(EditProfile.edit_age)
-async def process_age(message: Message, state: FSMContext):
-    if message.text == "Отменить редактирование":
-        await cancel_edit(message, state)
+async def process_age(message: Message, state: FSMContext, db: Database, t: Translator):
+    if message.text in variants('btn_cancel_edit'):
+        await cancel_edit(message, state, db, t)
         return
 
     if message.text.isdigit():
         await state.update_data(new_value=int(message.text))
-        await message.answer(f'Вы хотите изменить возраст на {message.text}?', reply_markup=confirm_keyboard)
+        await message.answer(t('edit_age_confirm', value=message.text), reply_markup=confirm_keyboard())
     else:
-        await message.answer('Пожалуйста, введите корректный возраст (целое число).', reply_markup=cancel_keyboard)
+        await message.answer(t('edit_invalid_age'), reply_markup=cancel_keyboard())
 
 @router.callback_query(F.data == "back")
 async def back_to_profile(callback: CallbackQuery, db: Database):
@@ -186,7 +178,7 @@ async def back_to_profile(callback: CallbackQuery, db: Database):
     await cmd_profile(callback.message, db)
 
 @router.message(EditProfile.edit_location, F.location)
-async def process_location(message: Message, state: FSMContext):
+async def process_location(message: Message, state: FSMContext, t: Translator):
     """Обработка новой локации"""
     try:
         await state.update_data(
@@ -196,13 +188,13 @@ async def process_location(message: Message, state: FSMContext):
             edit_type='location'
         )
         await message.answer(
-            'Вы хотите установить эту локацию?',
-            reply_markup=confirm_keyboard
+            t('edit_location_confirm'),
+            reply_markup=confirm_keyboard()
         )
     except Exception as e:
         logging.error(f"Ошибка при обработке локации: {e}")
         await message.answer(
-            "Произошла ошибка. Попробуйте еще раз или отмените редактирование.",
-            reply_markup=cancel_keyboard
+            t('edit_retry_error'),
+            reply_markup=cancel_keyboard()
         )
  
\ No newline at end of file
@@ -7,8 +7,11 @@ from ..database.models import OrderStatus, PaymentMethod, DeliveryMethod
 import logging
 from typing import List
 from ..database import requests as db
-from ..utils.notifications import NotificationManager
-from aiogram import Bot
+from ..database.database import Database, InsufficientStockError
+from ..utils.i18n import Translator, variants
+from ..utils.notifications import order_status_text
+from ..utils.outbox import NotificationOutbox
+from ..utils.reservations import ReservationManager
 
 router = Router()
 
@@ -19,46 +22,47 @@ class OrderState(StatesGroup):
     confirming = State()
 
 @router.callback_query(F.data == "checkout")
-async def start_checkout(callback: CallbackQuery, state: FSMContext):
+async def start_checkout(callback: CallbackQuery, state: FSMContext, t: Translator):
     """Начало оформления заказа"""
     try:
         cart_items = await db.get_cart(callback.from_user.id)
         if not cart_items:
-            await callback.answer("Корзина пуста!")
+            await callback.answer(t('checkout_cart_empty'))
             return
 
         await state.set_state(OrderState.waiting_for_address)
         await callback.message.answer(
-            "📍 Пожалуйста, введите адрес достаки:",
-            reply_markup=kb.cancel_keyboard
+            t('enter_address'),
+            reply_markup=kb.cancel_keyboard()
         )
     except Exception as e:
         logging.error(f"Ошибка при начале оформления заказа: {e}")
-        await callback.answer("Произошла ошибка")
+        await callback.answer(t('error'))
 
 @router.message(OrderState.waiting_for_address)
-async def process_address(message: Message, state: FSMContext):
+async def process_address(message: Message, state: FSMContext, t: Translator):
     """Обработка адреса доставки"""
     await state.update_data(delivery_address=message.text)
     await state.set_state(OrderState.waiting_for_delivery)
     await message.answer(
-        "🚚 Выберите способ доставки:",
+        t('choose_delivery'),
         reply_markup=kb.delivery_method_keyboard()
     )
 
-@router.callback_query(OrderState.waiting_for_delivery)
-async def process_delivery(callback: CallbackQuery, state: FSMContext):
+@router.callback_query(OrderState.waiting_for_delivery, F.data.startswith('delivery_'))
+async def process_delivery(callback: CallbackQuery, state: FSMContext, t: Translator):
     """Обработка выбора способа доставки"""
     delivery_method = callback.data.split('_')[1]
     await state.update_data(delivery_method=delivery_method)
     await state.set_state(OrderState.waiting_for_payment)
     await callback.message.edit_text(
-        "💳 Выберите способ оплаты:",
+        t('choose_payment'),
         reply_markup=kb.payment_method_keyboard()
     )
 
-@router.callback_query(OrderState.waiting_for_payment)
-async def process_payment(callback: CallbackQuery, state: FSMContext):
+@router.callback_query(OrderState.waiting_for_payment, F.data.startswith('payment_'))
+async def process_payment(callback: CallbackQuery, state: FSMContext,
+                          reservations: ReservationManager, t: Translator):
     """Обработка выбора способа оплаты"""
     try:
         payment_method = callback.data.split('_')[1]
@@ -75,135 +79,150 @@ async def process_payment(callback: CallbackQuery, state: FSMContext):
             'delivery_method': data['delivery_method'],
             'payment_method': payment_method,
             'total_amount': total,
-            'cart_items': cart_items
+            # Состояние FSM хранится в базе в JSON: только ID товаров и количества
+            'cart_items': [[product.product_id, quantity] for product, quantity in cart_items]
         }
         await state.update_data(order_details=order_details)
         
         if payment_method == 'card':
             await state.set_state(OrderState.confirming)
             await callback.message.edit_text(
-                f"💳 Оплата картой\nСумма к оплате: {total}₽\n",
+                t('card_payment', total=total),
                 reply_markup=kb.payment_confirm_keyboard()
             )
         elif payment_method == 'stars':
             from .payment import process_stars_payment
-            await process_stars_payment(callback, state)
+            await process_stars_payment(callback, state, reservations)
             await state.clear()
         
     except Exception as e:
         logging.error(f"Ошибка при обработке способа оплаты: {e}")
-        await callback.answer("Произошла ошибка")
+        await callback.answer(t('error'))
 
 @router.callback_query(OrderState.confirming, F.data == "confirm_order")
-async def confirm_order(callback: CallbackQuery, state: FSMContext):
+async def confirm_order(callback: CallbackQuery, state: FSMContext, db: Database,
+                        reservations: ReservationManager, t: Translator):
     """Подтверждение и создание заказа"""
     try:
         data = await state.get_data()
         cart_items = await db.get_cart(callback.from_user.id)
         total = sum(product.price * quantity for product, quantity in cart_items)
         
-        order = await db.create_order(
-            user_id=callback.from_user.id,
-            delivery_address=data['delivery_address'],
-            delivery_method=data['delivery_method'],
-            payment_method=data['payment_method'],
-            total_amount=total,
-            items=cart_items
-        )
+        # Товар, зарезервированный под открытые счета Stars, продавать нельзя
+        items = {product.product_id: quantity for product, quantity in cart_items}
+        if not await reservations.hold(callback.from_user.id, items):
+            await callback.answer(t('not_enough_stock'), show_alert=True)
+            return
         
-        if order:
-            await db.clear_cart(callback.from_user.id)
-            text = (
-                f"✅ Заказ №{order.order_id} успешно создан!\n"
-                "Мы свяжемся с вами для подтверждения."
+        # Заказ, позиции, списание остатков и очистка корзины — одной транзакцией
+        try:
+            order_id = await db.checkout(
+                user_id=callback.from_user.id,
+                total_amount=total,
+                payment_method=data['payment_method'],
+                status=OrderStatus.PENDING.value,
+                delivery_method=data['delivery_method'],
+                delivery_address=data['delivery_address']
+            )
+        except InsufficientStockError as stock_error:
+            await reservations.release(callback.from_user.id)
+            await callback.message.answer(
+                t('stock_short_named', name=stock_error.name),
+                reply_markup=kb.main_menu()
             )
+            await state.clear()
+            return
+        
+        if order_id:
+            await reservations.confirm(callback.from_user.id)
+            text = t('order_created', order_id=order_id)
             # Отправляем новое сообщение вместо редактирования
-            await callback.message.answer(text, reply_markup=kb.main)
+            await callback.message.answer(text, reply_markup=kb.main_menu())
             # Удаляем старое сообщение
             await callback.message.delete()
-            await callback.answer("Заказ успешно создан!")
+            await callback.answer(t('order_created_short'))
         else:
-            await callback.answer("Ошибка при создании заказа")
+            await reservations.release(callback.from_user.id)
+            await callback.answer(t('order_create_error'))
         
         await state.clear()
     except Exception as e:
         logging.error(f"Ошибка при создании заказа: {e}")
-        await callback.answer("Произошла ошибка при создании заказа")
+        await callback.answer(t('checkout_error'))
 
-@router.message(F.text == "❌ Отменить")
-async def cancel_order_reply(message: Message, state: FSMContext):
+@router.message(F.text.in_(variants('btn_cancel')))
+async def cancel_order_reply(message: Message, state: FSMContext, t: Translator):
     """Отмена через reply клавиатуру"""
     await state.clear()
     await message.answer(
-        "❌ Оформление заказа отменено",
-        reply_markup=kb.main
+        t('checkout_cancelled'),
+        reply_markup=kb.main_menu()
     )
 
 @router.callback_query(F.data == "cancel_checkout")
-async def cancel_checkout(callback: CallbackQuery, state: FSMContext):
+async def cancel_checkout(callback: CallbackQuery, state: FSMContext, t: Translator):
     """Отмена через inline кнопку"""
     await state.clear()
     await callback.message.edit_text(
-        "❌ Оформление заказа отменено",
-        reply_markup=kb.main_inline
+        t('checkout_cancelled'),
+        reply_markup=kb.main_inline()
     )
 
 @router.callback_query(F.data == "show_orders")
-async def show_orders(callback: CallbackQuery):
+async def show_orders(callback: CallbackQuery, t: Translator):
     """Показать заказы пользователя"""
     try:
         orders = await db.get_user_orders(callback.from_user.id)
         if not orders:
             await callback.message.edit_text(
-                "У вас пока нет заказов",
-                reply_markup=kb.main_inline
+                t('no_orders'),
+                reply_markup=kb.main_inline()
             )
             return
 
         # Форматируем каждый заказ
-        orders_text = []
-        for order in orders:
-            status_emoji = kb.get_order_status_emoji(order.status)
-            order_text = (
-                f"🆔 Заказ #{order.order_id}\n"
-                f"💰 Сумма: {order.total_amount}₽\n"
-                f"📅 Дата: {order.created_at.strftime('%d.%m.%Y %H:%M')}\n"
-                f"Статус: {status_emoji} {order.status}"
-            )
-            orders_text.append(order_text)
+        orders_text = [kb.format_order_info(order) for order in orders]
 
         await callback.message.edit_text(
-            f"📋 Ваши заказы:\n\n" + "\n\n".join(orders_text),
-            reply_markup=kb.main_inline
+            f"{t('orders_title')}\n\n" + "\n\n".join(orders_text),
+            reply_markup=kb.main_inline()
         )
     except Exception as e:
         logging.error(f"Ошибка при показе заказов: {e}")
         await callback.message.edit_text(
-            "Произошла ошибка при получении заказов",
-            reply_markup=kb.main_inline
+            t('orders_error'),
+            reply_markup=kb.main_inline()
         )
 
 @router.callback_query(F.data == "main_menu")
-async def back_to_main(callback: CallbackQuery):
+async def back_to_main(callback: CallbackQuery, t: Translator):
     """Возврат в главное меню"""
     try:
         await callback.message.edit_text(
-            "🏠 Главное меню",
-            reply_markup=kb.main_inline
+            t('main_menu'),
+            reply_markup=kb.main_inline()
         )
     except Exception as e:
         logging.error(f"Ошибка при возврате в главное меню: {e}")
-        await callback.answer("Произошла ошибка")
+        await callback.answer(t('error'))
 
 @router.callback_query(F.data.startswith("order_status_"))
-async def change_order_status(callback: CallbackQuery, bot: Bot):
+async def change_order_status(callback: CallbackQuery, outbox: NotificationOutbox):
     try:
         order_id = int(callback.data.split("_")[2])
         new_status = callback.data.split("_")[3]
+        order = await db.get_order(order_id)
+        if order is None:
+            await callback.answer("Заказ не найден")
+            return
         
-        if await db.update_order_status(order_id, new_status):
-            notifications = NotificationManager(bot)
-            await notifications.notify_order_status(order_id, new_status)
+        # Уведомление покупателю записывается в outbox вместе со статусом
+        if await db.update_order_status(
+            order_id, new_status,
+            notification=await order_status_text(order.user_id, order_id, new_status),
+            dedupe_key=f"callback:{callback.id}"
+        ):
+            outbox.wake()
             await callback.answer("Статус заказа обновлен")
         else:
             await callback.answer("Ошибка при обновлении статуса")
@@ -5,11 +5,13 @@ from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 import src.keyboards as kb
 from ..database import requests as db
-from ..database.database import Database
+from ..database.database import Database, InsufficientStockError
 import logging
 import math
 from src.config import STARS_CHANNEL_ID, Config
 from ..database.models import OrderStatus, PaymentMethod
+from ..utils.i18n import Translator, get_translator
+from ..utils.reservations import ReservationManager
 
 router = Router()
 
@@ -23,59 +25,47 @@ class PaymentStates(StatesGroup):
     confirming_payment = State()
 
 @router.callback_query(F.data == "payment_method")
-async def choose_payment_method(callback: CallbackQuery):
+async def choose_payment_method(callback: CallbackQuery, t: Translator):
     """Выбор способа оплаты"""
-    keyboard = kb.InlineKeyboardMarkup(inline_keyboard=[
-        [
-            kb.InlineKeyboardButton(text="💳 Перевод на карту", callback_data="payment_card"),
-            kb.InlineKeyboardButton(text="⭐ Telegram Stars", callback_data="payment_stars")
-        ],
-        [kb.InlineKeyboardButton(text="❌ Отменить", callback_data="cancel_payment")]
-    ])
-    
     await callback.message.edit_text(
-        "Выберите способ оплаты:",
-        reply_markup=keyboard
+        t('choose_payment'),
+        reply_markup=kb.payment_method_keyboard('cancel_payment', 'btn_pay_transfer_card')
     )
 
 @router.callback_query(F.data == "payment_card")
-async def process_tinkoff_payment(callback: CallbackQuery, db: Database, state: FSMContext):
+async def process_tinkoff_payment(callback: CallbackQuery, db: Database, state: FSMContext,
+                                  t: Translator):
     """Обработка оплаты через Тинькофф"""
     try:
         cart_items = await db.get_cart(callback.from_user.id)
         if not cart_items:
-            await callback.answer("Корзина пуста")
+            await callback.answer(t('cart_empty_short'))
             return
     
-        total_amount = sum(item.price * item.quantity for item in cart_items)
+        total_amount = sum(product.price * quantity for product, quantity in cart_items)
         
         # Сохраняем сумму в состоянии
         await state.update_data(amount=total_amount)
         
         # Отправляем инструкции для оплаты
-        payment_text = (
-            f"💳 Оплата через Тинькофф\n\n"
-            f"Сумма к оплате: {total_amount}₽\n\n"
-            f"Для оплаты переведите указанную сумму:\n"
-            f"💳 На карту: {TINKOFF_CARD}\n"
-            f"📱 Или по номеру телефона: {TINKOFF_PHONE}\n\n"
-            f"❗️ Важно: В комментарии к переводу укажите код: {callback.from_user.id}\n\n"
-            f"После оплаты нажмите кнопку 'Подтвердить оплату'"
+        payment_text = t(
+            'tinkoff_payment',
+            amount=total_amount,
+            card=TINKOFF_CARD,
+            phone=TINKOFF_PHONE,
+            code=callback.from_user.id
         )
         
         await callback.message.edit_text(
             payment_text,
-            reply_markup=kb.InlineKeyboardMarkup(inline_keyboard=[
-                [kb.InlineKeyboardButton(text="✅ Подтвердить оплату", callback_data="confirm_payment")],
-                [kb.InlineKeyboardButton(text="❌ Отменить", callback_data="cancel_payment")]
-            ])
+            reply_markup=kb.payment_confirm_keyboard()
         )
         
         await state.set_state(PaymentStates.waiting_for_payment)
         
     except Exception as e:
         logging.error(f"Ошибка при создании платежа: {e}")
-        await callback.answer("Произошла ошибка при создании платежа")
+        await callback.answer(t('payment_create_error'))
 
 async def get_current_stars_rate(db: Database) -> float:
     """Получение актуального курса из базы данных"""
@@ -86,12 +76,21 @@ async def get_current_stars_rate(db: Database) -> float:
         return 1.9  # Дефолтное значение при ошибке
 
 @router.callback_query(F.data == "payment_stars")
-async def process_stars_payment(callback: CallbackQuery, state: FSMContext):
+async def process_stars_payment(callback: CallbackQuery, state: FSMContext,
+                                reservations: ReservationManager):
     """Обработка оплаты через Stars"""
+    # Вызывается и из order.py, поэтому язык берется из текущего апдейта
+    t = get_translator()
     try:
         cart_items = await db.get_cart(callback.from_user.id)
         if not cart_items:
-            await callback.answer("Корзина пуста")
+            await callback.answer(t('cart_empty_short'))
+            return
+
+        # Резервируем товары на время оплаты инвойса
+        items = {product.product_id: quantity for product, quantity in cart_items}
+        if not await reservations.hold(callback.from_user.id, items):
+            await callback.answer(t('not_enough_stock'), show_alert=True)
             return
 
         # Считаем общую сумму
@@ -102,19 +101,19 @@ async def process_stars_payment(callback: CallbackQuery, state: FSMContext):
 
         # Формируем описание товаров
         items_description = "\n".join(
-            f"📦 {product.name} x {quantity} шт." 
+            t('stars_invoice_item', name=product.name, quantity=quantity)
             for product, quantity in cart_items
         )
         
         # Создаем инвойс для оплаты Stars
         await callback.message.answer_invoice(
-            title="Оплата заказа Stars",
-            description=f"Товары в заказе:\n{items_description}",
+            title=t('stars_invoice_title'),
+            description=t('stars_invoice_description', items=items_description),
             payload="stars_payment",
             currency="XTR",  # Валюта для Stars
             prices=[
                 LabeledPrice(
-                    label="Оплата Stars",
+                    label=t('stars_price_label'),
                     amount=stars_amount
                 )
             ],
@@ -134,55 +133,79 @@ async def process_stars_payment(callback: CallbackQuery, state: FSMContext):
     except Exception as e:
         logging.error(f"Ошибка при создании платежа Stars: {e}")
         await callback.message.answer(
-            "❌ Произошла ошибка при создании платежа",
-            reply_markup=kb.main_inline
+            t('payment_create_error'),
+            reply_markup=kb.main_inline()
         )
 
 @router.callback_query(F.data == "confirm_payment", PaymentStates.waiting_for_payment)
-async def confirm_p2p_payment(callback: CallbackQuery, state: FSMContext, db: Database):
+async def confirm_p2p_payment(callback: CallbackQuery, state: FSMContext, db: Database,
+                              reservations: ReservationManager, t: Translator):
     """Подтверждение P2P оплаты"""
     try:
         data = await state.get_data()
         amount = data.get('amount')
         
-        order_id = await db.create_order(
-            user_id=callback.from_user.id,
-            total_amount=amount,
-            payment_method="tinkoff_p2p",
-            status="pending"
-        )
+        # Товар, зарезервированный под открытые счета Stars, продавать нельзя
+        cart_items = await db.get_cart(callback.from_user.id)
+        items = {product.product_id: quantity for product, quantity in cart_items}
+        if not await reservations.hold(callback.from_user.id, items):
+            await callback.answer(t('not_enough_stock'), show_alert=True)
+            return
+        
+        # Заказ, позиции, списание остатков и очистка корзины — одной транзакцией
+        try:
+            order_id = await db.checkout(
+                user_id=callback.from_user.id,
+                total_amount=amount,
+                payment_method=PaymentMethod.TINKOFF.value,
+                status=OrderStatus.PENDING.value
+            )
+        except InsufficientStockError as stock_error:
+            await reservations.release(callback.from_user.id)
+            await callback.message.edit_text(
+                t('stock_short_named', name=stock_error.name),
+                reply_markup=kb.main_inline()
+            )
+            return
         
         if order_id:
+            await reservations.confirm(callback.from_user.id)
             await callback.message.edit_text(
-                "✅ Спасибо за оплату!\n"
-                "Ваш заказ принят в обработку.\n"
-                f"Номер заказа: {order_id}",
+                t('p2p_thanks', order_id=order_id),
                 reply_markup=kb.InlineKeyboardMarkup(inline_keyboard=[
-                    [kb.InlineKeyboardButton(text="📋 Мои заказы", callback_data="show_orders")]
+                    [kb.InlineKeyboardButton(text=t('btn_orders'), callback_data="show_orders")]
                 ])
             )
-            
-            await db.clear_cart(callback.from_user.id)
-            
         else:
+            await reservations.release(callback.from_user.id)
             await callback.message.edit_text(
-                "❌ Ошибка при создании заказа",
-                reply_markup=kb.main_inline
+                t('order_create_error'),
+                reply_markup=kb.main_inline()
             )
             
     except Exception as e:
         logging.error(f"Ошибка при подтверждении платежа: {e}")
-        await callback.answer("Произошла ошибка при подтверждении платежа")
+        await callback.answer(t('payment_confirm_error'))
     finally:
         await state.clear()
 
 @router.pre_checkout_query()
-async def pre_checkout_query(pre_checkout_query: PreCheckoutQuery):
+async def pre_checkout_query(pre_checkout_query: PreCheckoutQuery, reservations: ReservationManager,
+                             t: Translator):
     """Подтверждение возможности оплаты"""
-    await pre_checkout_query.answer(ok=True)
+    # Telegram ждет ответа не дольше 10 секунд: резерв из памяти проверяется
+    # без базы, в таблицу резервов идем только при промахе
+    if await reservations.extend(pre_checkout_query.from_user.id):
+        await pre_checkout_query.answer(ok=True)
+    else:
+        await pre_checkout_query.answer(
+            ok=False,
+            error_message=t('reservation_expired')
+        )
 
 @router.message(F.successful_payment)
-async def successful_payment(message: Message, state: FSMContext):
+async def successful_payment(message: Message, state: FSMContext, db: Database,
+                             reservations: ReservationManager, t: Translator):
     """Обработка успешного платежа Stars"""
     try:
         # Возвращаем Stars пользователю
@@ -193,74 +216,60 @@ async def successful_payment(message: Message, state: FSMContext):
         
         data = await state.get_data()
         order_details = data.get('order_details', {})
-        
-        # Создаем заказ
-        order_id = await db.create_order(
-            user_id=message.from_user.id,
-            total_amount=order_details['total_amount'],
-            payment_method=PaymentMethod.STARS.value,
-            status="completed"
-        )
+        stars_to_return = int(order_details['total_amount'])
 
-        # Получаем товары из корзины
-        cart_items = await db.get_cart(message.from_user.id)
-        
-        # Обновляем количество товаров и создаем записи order_items
-        for product, quantity in cart_items:
-            # Обновляем количество товара
-            await db.update_product_quantity(
-                product_id=product.product_id,
-                quantity=product.quantity - quantity
+        # Заказ, позиции, списание остатков, транзакции Stars и очистка корзины —
+        # одной транзакцией
+        try:
+            order_id = await db.checkout(
+                user_id=message.from_user.id,
+                total_amount=order_details['total_amount'],
+                payment_method=PaymentMethod.STARS.value,
+                status="completed",
+                transactions=(
+                    (order_details['stars_amount'], 'completed'),
+                    (stars_to_return, 'returned'),
+                )
             )
-            
-            # Добавляем запись в order_items
-            await db.add_order_item(
-                order_id=order_id,
-                product_id=product.product_id,
-                quantity=quantity,
-                price=product.price
+        except InsufficientStockError as stock_error:
+            await reservations.release(message.from_user.id)
+            await message.answer(
+                t('stock_short_named', name=stock_error.name),
+                reply_markup=kb.main_menu()
             )
+            await state.clear()
+            return
 
-        # Записываем транзакцию Stars
-        await db.add_stars_transaction(
-            order_id=order_id,
-            user_id=message.from_user.id,
-            stars_amount=order_details['stars_amount'],
-            amount_rub=order_details['total_amount'],
-            status='completed'
-        )
+        if order_id is None:
+            await reservations.release(message.from_user.id)
+            await message.answer(
+                t('order_create_error'),
+                reply_markup=kb.main_menu()
+            )
+            await state.clear()
+            return
+
+        await reservations.confirm(message.from_user.id)
 
-        # Возвращаем Stars пользователю
-        stars_to_return = int(order_details['total_amount'])
-        
         try:
             await message.bot.send_message(
                 message.from_user.id,
-                f"⭐ Вам начислено {stars_to_return} Stars за покупку!"
-            )
-            
-            await db.add_stars_transaction(
-                order_id=order_id,
-                user_id=message.from_user.id,
-                stars_amount=stars_to_return,
-                amount_rub=order_details['total_amount'],
-                status='returned'
+                t('stars_credited', stars=stars_to_return)
             )
         except Exception as stars_error:
             logging.error(f"Ошибка при возврате Stars: {stars_error}")
 
-        # Очищаем корзину
-        await db.clear_cart(message.from_user.id)
-
         # Отправляем подтверждение пользователю с reply клавиатурой
         await message.answer(
-            f"✅ Оплата Stars прошла успешно!\n\n"
-            f"🆔 Заказ #{order_id}\n"
-            f"⭐ Списано Stars: {order_details['stars_amount']}\n"
-            f"⭐ Начислено Stars: {stars_to_return}\n"
-            f"💰 Сумма: {order_details['total_amount']}₽\n\n"
-            f"ID транзакции: {message.successful_payment.telegram_payment_charge_id}",
-            reply_markup=kb.main  # Используем основную reply клавиатуру
+            t(
+                'stars_paid',
+                order_id=order_id,
+                spent=order_details['stars_amount'],
+                returned=stars_to_return,
+                total=order_details['total_amount'],
+                charge_id=message.successful_payment.telegram_payment_charge_id
+            ),
+            reply_markup=kb.main_menu()  # Используем основную reply клавиатуру
         )
 
         # Пробуем отправить уведомление в канал Stars
@@ -283,17 +292,19 @@ async def successful_payment(message: Message, state: FSMContext):
     except Exception as e:
         logging.error(f"Ошибка при обработке платежа Stars: {e}")
         await message.answer(
-            "❌ Произошла ошибка при обработке платежа",
-            reply_markup=kb.main  # В случае ошибки тоже используем reply клавиатуру
+            t('payment_process_error'),
+            reply_markup=kb.main_menu()  # В случае ошибки тоже используем reply клавиатуру
         )
 
 @router.callback_query(F.data == "cancel_payment")
-async def cancel_payment(callback: CallbackQuery, state: FSMContext):
+async def cancel_payment(callback: CallbackQuery, state: FSMContext,
+                         reservations: ReservationManager, t: Translator):
     """Отмена платежа"""
+    await reservations.release(callback.from_user.id)
     await state.clear() 
     await callback.message.edit_text(
-        "❌ Оплата отменена",
-        reply_markup=kb.main_inline
+        t('payment_cancelled'),
+        reply_markup=kb.main_inline()
     ) 
 
 # Функция для безопасной конвертации с округлением вверх
@@ -302,7 +313,7 @@ def convert_to_stars(amount_rub: float) -> int:
     return math.ceil(stars)  # Округляем вверх до целого числа Stars 
 
 @router.message(Command("stars"))
-async def check_stars_balance(message: Message, bot):
+async def check_stars_balance(message: Message, bot, t: Translator):
     """Проверка баланса Stars"""
     try:
         # Получаем информацию о канале
@@ -310,13 +321,14 @@ async def check_stars_balance(message: Message, bot):
         
         # Получаем баланс Stars (если доступно через API)
         # Примечание: не все методы могут быть доступны
-        balance_text = (
-            f"⭐ Баланс Stars канала {channel_info.title}:\n"
-            f"💰 Доступно для вывода: {channel_info.stars_balance}\n"
-            f"📊 Курс конвертации: 1 Star = {STARS_RATE}₽"
+        balance_text = t(
+            'stars_channel_balance',
+            title=channel_info.title,
+            balance=channel_info.stars_balance,
+            rate=STARS_RATE
         )
         
         await message.answer(balance_text)
     except Exception as e:
         logging.error(f"Ошибка при проверке баланса Stars: {e}")
-        await message.answer("❌ Не удалось получить информацию о балансе Stars") 
\ No newline at end of file
+        await message.answer(t('stars_balance_error')) 
\ No newline at end of file
@@ -1,101 +1,88 @@
 from aiogram import Router, F
-from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
+from aiogram.types import Message, CallbackQuery
 from aiogram.filters import Command
 import src.keyboards as kb
 from ..database import requests as db
 import logging
-from ..utils.i18n import get_text
+from ..utils.i18n import Translator, SUPPORTED_LOCALES, current_locale, get_translator
 
 router = Router()
 
 @router.message(Command("settings"))
-async def show_settings(message: Message):
+async def show_settings(message: Message, t: Translator):
     """Показ настроек пользователя"""
-    settings_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [
-            InlineKeyboardButton(
-                text=await get_text('btn_notifications', message.from_user.id),
-                callback_data="settings_notifications"
-            ),
-            InlineKeyboardButton(
-                text=await get_text('btn_language', message.from_user.id),
-                callback_data="settings_language"
-            )
-        ],
-        [InlineKeyboardButton(
-            text=await get_text('btn_back', message.from_user.id),
-            callback_data="back_to_main"
-        )]
-    ])
-    
-    await message.answer(
-        await get_text('settings_title', message.from_user.id),
-        reply_markup=settings_keyboard
-    )
+    await message.answer(t('settings_title'), reply_markup=kb.settings_keyboard())
 
 @router.callback_query(F.data == "settings_notifications")
-async def show_notifications_settings(callback: CallbackQuery):
+async def show_notifications_settings(callback: CallbackQuery, t: Translator):
     """Настройки уведомлений"""
     try:
         await callback.message.edit_text(
-            await get_text('notifications_settings', callback.from_user.id),
-            reply_markup=kb.notifications_keyboard
+            t('notifications_settings'),
+            reply_markup=kb.notifications_keyboard()
         )
     except Exception as e:
         logging.error(f"Ошибка при показе настроек уведомлений: {e}")
-        await callback.answer(await get_text('error', callback.from_user.id))
+        await callback.answer(t('error'))
 
 @router.callback_query(F.data == "settings_language")
-async def show_language_settings(callback: CallbackQuery):
+async def show_language_settings(callback: CallbackQuery, t: Translator):
     """Настройки языка"""
     try:
         await callback.message.edit_text(
-            await get_text('language_settings', callback.from_user.id),
-            reply_markup=kb.language_keyboard
+            t('language_settings'),
+            reply_markup=kb.language_keyboard()
         )
     except Exception as e:
         logging.error(f"Ошибка при показе настроек языка: {e}")
-        await callback.answer(await get_text('error', callback.from_user.id))
+        await callback.answer(t('error'))
 
 @router.callback_query(F.data.startswith("notif_"))
-async def process_notification_setting(callback: CallbackQuery):
+async def process_notification_setting(callback: CallbackQuery, t: Translator):
     """Обработка настройки уведомлений"""
     try:
         setting = callback.data.split("_")[1]  # on/off
-        user_id = callback.from_user.id
         enabled = setting == "on"
-        
-        if await db.update_user_notifications(user_id, enabled):
+
+        # requests.update_user_notifications обновляет и кэш настроек
+        if await db.update_user_notifications(callback.from_user.id, enabled):
             await callback.message.edit_text(
-                await get_text('notifications_on' if enabled else 'notifications_off', user_id),
-                reply_markup=kb.settings_keyboard
+                t('notifications_on' if enabled else 'notifications_off'),
+                reply_markup=kb.settings_keyboard()
             )
         else:
-            await callback.answer(await get_text('error', user_id))
-        
+            await callback.answer(t('error'))
+
     except Exception as e:
         logging.error(f"Ошибка при настройке уведомлений: {e}")
-        await callback.answer(await get_text('error', user_id))
+        await callback.answer(t('error'))
 
 @router.callback_query(F.data.startswith("lang_"))
-async def process_language_setting(callback: CallbackQuery):
+async def process_language_setting(callback: CallbackQuery, t: Translator):
     """Обработка выбора языка"""
     try:
         lang = callback.data.split("_")[1]
-        user_id = callback.from_user.id
-        
-        if await db.update_user_language(user_id, lang):
-            # Используем текст в зависимости от выбранного языка
-            text = "🌍 Language changed to English" if lang == "en" else "🌍 Язык изменен на русский"
-            await callback.message.edit_text(text, reply_markup=kb.settings_keyboard)
+        if lang not in SUPPORTED_LOCALES:
+            await callback.answer(t('error'))
+            return
+
+        # requests.update_user_language обновляет и кэш настроек,
+        # следующие апдейты пользователя сразу получат новый язык
+        if await db.update_user_language(callback.from_user.id, lang):
+            # Остаток апдейта отвечаем уже на выбранном языке
+            current_locale.set(lang)
+            await callback.message.edit_text(
+                get_translator(lang)('language_changed'),
+                reply_markup=kb.settings_keyboard()
+            )
         else:
-            await callback.answer("Error" if lang == "en" else "Ошибка")
-        
+            await callback.answer(t('error'))
+
     except Exception as e:
         logging.error(f"Ошибка при смене языка: {e}")
-        await callback.answer("Error occurred" if lang == "en" else "Произошла ошибка")
+        await callback.answer(t('error'))
 
 @router.callback_query(F.data == "back_to_settings")
-async def back_to_settings(callback: CallbackQuery):
+async def back_to_settings(callback: CallbackQuery, t: Translator):
     """Возврат к основным настройкам"""
-    await show_settings(callback.message) 
\ No newline at end of file
+    await show_settings(callback.message, t)
@@ -1,7 +1,6 @@
 from aiogram import Router, F, Bot
 from aiogram.types import (Message, CallbackQuery, ReplyKeyboardRemove,
-                            ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardMarkup,
-                            InlineKeyboardButton)
+                            InlineKeyboardMarkup, InlineKeyboardButton)
 from aiogram.filters import CommandStart, Command
 from aiogram.fsm.context import FSMContext
 from ..database.database import Database
@@ -14,6 +13,7 @@ import re
 from typing import Union
 from aiogram.fsm.state import State, StatesGroup
 from src.config import Config
+from ..utils.i18n import Translator, get_translator, variants
 
 router = Router()
 
@@ -32,33 +32,34 @@ async def send_with_inline_kb(message: Message, text: str, inline_kb: InlineKeyb
     )
 
 @router.message(CommandStart())
-async def cmd_start(message: Message, db: Database):
+async def cmd_start(message: Message, db: Database, t: Translator, locale: str):
     if isinstance(message, Message):
         user = message.from_user
         await db.add_user(
             user_id=user.id,
             username=user.username,
-            first_name=user.first_name
+            first_name=user.first_name,
+            language=locale  # Язык, определенный по клиенту Telegram
         )
-        await message.answer('Добро пожаловать', reply_markup=kb.main)
+        await message.answer(t('welcome'), reply_markup=kb.main_menu())
     else:
         await message.message.delete()
-        await message.message.answer('Добро пожаловать', reply_markup=main)
+        await message.message.answer(t('welcome'), reply_markup=kb.main_menu())
 
-@router.message(F.text.in_({'🛒 Корзина', 'Корзина'}))
+@router.message(F.text.in_(variants('btn_cart') | {'Корзина'}))
 @router.callback_query(F.data == "show_cart")
-async def show_cart(event: Union[Message, CallbackQuery], db: Database):
+async def show_cart(event: Union[Message, CallbackQuery], db: Database, t: Translator):
     """Показ корзины"""
     try:
         user_id = event.from_user.id
         cart_items = await db.get_cart(user_id)
         
         if not cart_items:
-            text = "🛒 Ваша корзина пуста"
+            text = t('cart_empty')
             if isinstance(event, CallbackQuery):
-                await event.message.edit_text(text, reply_markup=kb.main)
+                await event.message.edit_text(text, reply_markup=kb.main_menu())
             else:
-                await event.answer(text, reply_markup=kb.main)
+                await event.answer(text, reply_markup=kb.main_menu())
             return
         
         total = 0
@@ -67,10 +68,8 @@ async def show_cart(event: Union[Message, CallbackQuery], db: Database):
             item_total = product.price * quantity
             total += item_total
             
-            text = (
-                f"📦 {product.name}\n"
-                f"💰 {product.price}₽ x {quantity} шт. = {item_total}₽"
-            )
+            text = t('cart_item', name=product.name, price=product.price,
+                     quantity=quantity, total=item_total)
             
             if isinstance(event, CallbackQuery):
                 message = event.message
@@ -91,89 +90,91 @@ async def show_cart(event: Union[Message, CallbackQuery], db: Database):
         
         # В конце показываем итоговую сумму и общие кнопки корзины
         await message.answer(
-            f"💰 Итого: {total}₽",
+            t('cart_total', total=total),
             reply_markup=kb.cart_summary_keyboard()
         )
             
     except Exception as e:
         logging.error(f"Ошибка при отображении корзины: {e}")
-        error_text = "Произошла ошибка при загрузке корзины"
+        error_text = t('cart_error')
         if isinstance(event, CallbackQuery):
-            await event.message.edit_text(error_text, reply_markup=kb.main)
+            await event.message.edit_text(error_text, reply_markup=kb.main_menu())
         else:
-            await event.answer(error_text, reply_markup=kb.main)
+            await event.answer(error_text, reply_markup=kb.main_menu())
 
 @router.message(Command('menu'))
-async def cmd_menu(message: Message):
+async def cmd_menu(message: Message, t: Translator):
     """Показ главного меню вместо списка команд"""
     await message.answer(
-        text='🏠 Главное меню',
-        reply_markup=kb.main  # Используем основную reply-клавиатуру вместо menu_commands
+        text=t('main_menu'),
+        reply_markup=kb.main_menu()  # Используем основную reply-клавиатуру вместо menu_commands
     )
 
 @router.message(Command('catalog'))
-async def cmd_catalog(message: Message):
-    keyboard = await kb.categories()
-    if keyboard:
-        await message.answer(
-            text='Выберите категорию:',
-            reply_markup=keyboard
-        )
-    else:
-        await message.answer("К сожалению, категории сейчас недоступны")
+async def cmd_catalog(message: Message, t: Translator):
+    await catalog(message, t)
 
-@router.message(F.text.in_({'🏠 В главное меню', 'В главное меню'}))
-async def back_to_main_menu(message: Message):
+@router.message(F.text.in_(variants('btn_main_menu') | {'В главное меню'}))
+async def back_to_main_menu(message: Message, t: Translator):
     """Возврат в главное меню"""
-    await message.answer('🏠 Вы вернулись в главное меню', reply_markup=kb.main)
+    await message.answer(t('back_to_main_menu'), reply_markup=kb.main_menu())
 
-@router.message(F.text.in_({'🛍️ Каталог', 'Каталог'}))
-async def catalog(message: Message):
+@router.message(F.text.in_(variants('btn_catalog') | {'Каталог'}))
+async def catalog(message: Message, t: Translator):
     """Показывает каталог товаров"""
     keyboard = await kb.categories()
     if keyboard:
         await message.answer(
-            text='📋 Выберите категорию:',
+            text=t('choose_category'),
             reply_markup=keyboard
         )
     else:
-        await message.answer("❌ К сожалению, категории сейчас недоступны")
+        await message.answer(t('categories_unavailable'))
+
+@router.callback_query(F.data.startswith('pg_cat_'))
+async def paginate_category_products(callback: CallbackQuery):
+    """Листание товаров категории"""
+    scope, category_id, cursor_id, backward = kb.parse_page_callback(callback.data)
+    keyboard = await kb.product_list_page(scope, category_id, cursor_id, backward)
+    if keyboard:
+        await callback.message.edit_reply_markup(reply_markup=keyboard)
+    await callback.answer()
 
 @router.callback_query(F.data.startswith('category_'))
-async def show_category_products(callback: CallbackQuery):
+async def show_category_products(callback: CallbackQuery, t: Translator):
     category_id = int(callback.data.split('_')[1])
     keyboard = await kb.category_products(category_id)
     if keyboard:
         await callback.message.edit_text(
-            text='Выберите товар:',
+            text=t('choose_product'),
             reply_markup=keyboard
         )
     else:
-        await callback.answer("В этой категории пока нет товаров")
+        await callback.answer(t('category_empty'))
 
 @router.callback_query(F.data.startswith('product_'))
-async def show_product_details(callback: CallbackQuery, db: Database):
+async def show_product_details(callback: CallbackQuery, db: Database, t: Translator):
     """Показ деталей товара"""
     try:
         product_id = int(callback.data.split("_")[1])
-        product = await db.get_product_by_id(product_id)
+        product = await db.get_product_card(callback.from_user.id, product_id)
         
         if product:
-            is_favorite = await db.is_favorite(callback.from_user.id, product_id)
-            cart_quantity = await db.get_cart_item_quantity(callback.from_user.id, product_id)
+            is_favorite = product.is_favorite
+            cart_quantity = product.cart_quantity
             
-            rating = product.average_rating if product.reviews else 0
+            rating = product.average_rating
             rating_stars = "⭐" * round(rating)
             
             text = (
                 f"📦 {product.name}\n"
-                f"💰 Цена: {product.price}₽\n"
-                f"📝 Описание: {product.description}\n"
-                f"{rating_stars} Рейтинг: {rating:.1f}\n"
-                f"{'❤️ В избранном' if is_favorite else '🤍 Не в избранном'}\n"
-                f"📦 В наличии: {product.quantity} шт.\n"
-                f"🛒 Выбрано: {cart_quantity} шт.\n\n"
-                f"💰 Итого: {product.price * cart_quantity}₽"
+                f"{t('product_price', price=product.price)}\n"
+                f"{t('product_description', description=product.description)}\n"
+                f"{t('product_rating', stars=rating_stars, rating=rating)}\n"
+                f"{t('product_favorite' if is_favorite else 'product_not_favorite')}\n"
+                f"{t('product_in_stock', quantity=product.quantity)}\n"
+                f"{t('product_selected', quantity=cart_quantity)}\n\n"
+                f"{t('cart_total', total=product.price * cart_quantity)}"
             )
             
             keyboard = kb.product_keyboard(product_id, is_favorite)
@@ -223,13 +224,13 @@ async def show_product_details(callback: CallbackQuery, db: Database):
                         reply_markup=keyboard
                     )
         else:
-            await callback.answer("Товар не найден")
+            await callback.answer(t('product_not_found'))
     except Exception as e:
         logging.error(f"Ошибка при показе товара: {e}")
-        await callback.answer("Произошла ошибка при загрузке товара")
+        await callback.answer(t('product_load_error'))
 
 @router.callback_query(F.data == "back_to_categories")
-async def back_to_categories(callback: CallbackQuery):
+async def back_to_categories(callback: CallbackQuery, t: Translator):
     """Возврат к категориям"""
     try:
         keyboard = await kb.categories()
@@ -242,129 +243,119 @@ async def back_to_categories(callback: CallbackQuery):
             
             # Отправляем новое сообщение с категориями
             await callback.message.answer(
-                text='📋 Выберите категорию:',
+                text=t('choose_category'),
                 reply_markup=keyboard
             )
         else:
-            await callback.answer("❌ К сожалению, категории сейчас недоступны")
+            await callback.answer(t('categories_unavailable'))
     except Exception as e:
         logging.error(f"Ошибка при возврате к категориям: {e}")
-        await callback.answer("Произошла ошибка")
+        await callback.answer(t('error'))
 
 # Регистрация
-@router.message(F.text.in_({'👤 Регистрация', 'Регистрация'}))
-async def start_registration(message: Message, state: FSMContext, db: Database):
+@router.message(F.text.in_(variants('btn_register') | {'Регистрация'}))
+async def start_registration(message: Message, state: FSMContext, db: Database, t: Translator):
     """Начало процесса регистрации"""
     if await db.is_user_registered(message.from_user.id):
-        await message.answer("✅ Вы уже зарегистрированы!")
+        await message.answer(t('already_registered'))
         return
     
     await state.set_state(Register.name)
-    await message.answer('👤 Введите ваше имя')
+    await message.answer(t('reg_enter_name'))
 
 @router.message(Register.name)
-async def reg_contact(message: Message, state: FSMContext):
+async def reg_contact(message: Message, state: FSMContext, t: Translator):
     await state.update_data(name=message.text)
     await state.set_state(Register.contact)
-    await message.answer('Отправьте контакт', reply_markup=kb.send_contact)
+    await message.answer(t('reg_send_contact'), reply_markup=kb.send_contact())
 
 @router.message(Register.contact, F.contact)
-async def reg_location(message: Message, state: FSMContext):
+async def reg_location(message: Message, state: FSMContext, t: Translator):
     await state.update_data(contact=message.contact.phone_number)
     await state.set_state(Register.location)
-    await message.answer('Отправьте локацию или пропустите этот шаг',
-                        reply_markup=kb.skip_location)
+    await message.answer(t('reg_send_location'),
+                        reply_markup=kb.skip_location())
 
-@router.message(Register.location, F.text == "⏩ Пропустить")
-async def skip_location(message: Message, state: FSMContext):
+@router.message(Register.location, F.text.in_(variants('btn_skip')))
+async def skip_location(message: Message, state: FSMContext, t: Translator):
     """Пропуск отправки геолокации"""
     await state.update_data(location=[None, None])
     await state.set_state(Register.email)
-    await message.answer('Введите e-mail', reply_markup=ReplyKeyboardRemove())
+    await message.answer(t('reg_enter_email'), reply_markup=ReplyKeyboardRemove())
 
 @router.message(Register.location, F.location)
-async def reg_email(message: Message, state: FSMContext):
+async def reg_email(message: Message, state: FSMContext, t: Translator):
     await state.update_data(location=[message.location.latitude,
                             message.location.longitude])
     await state.set_state(Register.email)
-    await message.answer('Введите e-mail', reply_markup=ReplyKeyboardRemove())
+    await message.answer(t('reg_enter_email'), reply_markup=ReplyKeyboardRemove())
 
 @router.message(Register.email)
-async def reg_age(message: Message, state: FSMContext):
+async def reg_age(message: Message, state: FSMContext, t: Translator):
     email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
     if re.match(email_pattern, message.text):
         await state.update_data(email=message.text)
         await state.set_state(Register.age)
-        await message.answer('Введите возраст', reply_markup=ReplyKeyboardRemove())
+        await message.answer(t('reg_enter_age'), reply_markup=ReplyKeyboardRemove())
     else:
-        await message.answer('Пожалуйста, введите корректный e-mail адрес.')
+        await message.answer(t('reg_invalid_email'))
 
 @router.message(Register.age)
-async def reg_photo(message: Message, state: FSMContext):
+async def reg_photo(message: Message, state: FSMContext, t: Translator):
     if message.text.isdigit():
         await state.update_data(age=message.text)
         await state.set_state(Register.photo)
-        await message.answer('Отправьте ваше фото', reply_markup=ReplyKeyboardRemove())
+        await message.answer(t('reg_send_photo'), reply_markup=ReplyKeyboardRemove())
     else:
-        await message.answer('Введите возраст целым числом')
+        await message.answer(t('reg_invalid_age'))
 
 @router.message(Register.photo, F.photo)
-async def confirm_registration(message: Message, state: FSMContext):
+async def confirm_registration(message: Message, state: FSMContext, t: Translator):
     await state.update_data(photo=message.photo[-1].file_id)
     data = await state.get_data()
     
-    confirm_text = (
-        "Пожалуйста, проверьте введенные данные:\n"
-        f"Имя: {data['name']}\n"
-        f"Телефон: {data['contact']}\n"
-        f"Email: {data['email']}\n"
-        f"Возраст: {data['age']}\n"
-        "Локация и фото получены\n\n"
-        "Все верно?"
-    )
-    
-    confirm_kb = ReplyKeyboardMarkup(
-        keyboard=[
-            [KeyboardButton(text="Подтвердить")],
-            [KeyboardButton(text="Отменить")]
-        ],
-        resize_keyboard=True
+    confirm_text = t(
+        'reg_confirm',
+        name=data['name'],
+        phone=data['contact'],
+        email=data['email'],
+        age=data['age']
     )
     
     await state.set_state(Register.confirm)
-    await message.answer(confirm_text, reply_markup=confirm_kb)
+    await message.answer(confirm_text, reply_markup=kb.registration_confirm_keyboard())
 
 @router.message(Register.photo)
-async def reg_no_photo(message: Message):
-    await message.answer('отправьте фото')
+async def reg_no_photo(message: Message, t: Translator):
+    await message.answer(t('reg_no_photo'))
 
-@router.message(F.text.in_({'🔑 Авторизация', 'Авторизация'}))
-async def authorization(message: Message, db: Database):
+@router.message(F.text.in_(variants('btn_auth') | {'Авторизация'}))
+async def authorization(message: Message, db: Database, t: Translator):
     """Авторизация пользователя"""
     if await db.is_user_registered(message.from_user.id):
-        await message.answer("✅ Вы успешно авторизованы!")
+        await message.answer(t('auth_ok'))
     else:
         await message.answer(
-            "❌ Вы не зарегистрированы. Пожалуйста, сначала пройдите регистрацию.", 
-            reply_markup=kb.main
+            t('auth_not_registered'), 
+            reply_markup=kb.main_menu()
         )
 
 @router.message(Command("cancel"))
-@router.message(F.text.lower() == "отмена")
-async def cancel_registration(message: Message, state: FSMContext):
+@router.message(F.text.lower().in_(variants('cancel_word')))
+async def cancel_registration(message: Message, state: FSMContext, t: Translator):
     current_state = await state.get_state()
     if current_state is None:
         return
     
     await state.clear()
     await message.answer(
-        "Регистрация отменена. Вы можете начать заново.",
-        reply_markup=kb.main
+        t('reg_cancelled'),
+        reply_markup=kb.main_menu()
     )
 
 @router.message(Register.confirm)
-async def process_confirm(message: Message, state: FSMContext, db: Database):
-    if message.text == "Подтвердить":
+async def process_confirm(message: Message, state: FSMContext, db: Database, t: Translator):
+    if message.text in variants('btn_confirm'):
         data = await state.get_data()
         try:
             if await db.register_user(
@@ -377,54 +368,56 @@ async def process_confirm(message: Message, state: FSMContext, db: Database):
                 age=int(data['age']),
                 photo_id=data['photo']
             ):
-                await message.answer('Регистрация успешно завершена!', reply_markup=kb.main)
+                await message.answer(t('reg_done'), reply_markup=kb.main_menu())
             else:
-                await message.answer('Произошла ошибка при регистрации. Попробуйте позже.')
+                await message.answer(t('reg_error'))
         except Exception as e:
             logging.error(f"Ошибка при регистрации: {e}")
-            await message.answer('Произошла ошибка при регистрации. Попробуйте позже.')
+            await message.answer(t('reg_error'))
         finally:
             await state.clear()
-    elif message.text == "Отменить":
+    elif message.text in variants('btn_cancel_plain'):
         await state.clear()
         await message.answer(
-            "Регистрация отменена. Вы можете начать заново.",
-            reply_markup=kb.main
+            t('reg_cancelled'),
+            reply_markup=kb.main_menu()
         )
     else:
-        await message.answer("Пожалуйста, используйте кнопки для подтверждения или отмены")
+        await message.answer(t('reg_use_buttons'))
 
 @router.message(Command("register"))
-async def cmd_register(message: Message, state: FSMContext, db: Database):
+async def cmd_register(message: Message, state: FSMContext, db: Database, t: Translator):
     """Обработчик команды /register"""
     if await db.is_user_registered(message.from_user.id):
-        await message.answer("Вы уже зарегистрированы!")
+        await message.answer(t('already_registered'))
         return
     
     # Начинаем процесс регистрации
     await state.set_state(Register.name)
-    await message.answer('Введите ваше имя')
+    await message.answer(t('reg_enter_name'))
 
 @router.callback_query(F.data == 'back')
-async def back_to_menu(callback: CallbackQuery):
+async def back_to_menu(callback: CallbackQuery, t: Translator):
     await callback.message.delete()
     await callback.message.answer(
-        'Вы вернулись в главное меню',
-        reply_markup=kb.main
+        t('back_to_main_menu'),
+        reply_markup=kb.main_menu()
     )
 
 @router.message(Command("profile"))
 async def cmd_profile(message: Message, db: Database):
     """Показ профиля пользователя"""
     logging.info(f"Получен запрос на профиль от пользователя {message.from_user.id}")
+    # Вызывается и из других хендлеров: язык берем из текущего апдейта
+    t = get_translator()
     try:
         user_data = await db.get_user_profile(message.from_user.id)
         logging.info(f"Получены данные профиля: {user_data}")
         
         if not user_data:
             await message.answer(
-                "Вы не зарегистрированы. Используйте /register для регистрации.",
-                reply_markup=kb.main
+                t('profile_not_registered'),
+                reply_markup=kb.main_menu()
             )
             return
 
@@ -433,18 +426,18 @@ async def cmd_profile(message: Message, db: Database):
          age, photo_id, reg_date, username) = user_data
         
         # Форматируем дату регистрации
-        reg_date_formatted = reg_date.split('.')[0] if reg_date else 'Не указана'
+        reg_date_formatted = reg_date.split('.')[0] if reg_date else t('not_specified_f')
         
         # Формируем текст профиля
-        profile_text = (
-            f"👤 <b>Ваш профиль</b>\n\n"
-            f"Имя: {name or 'Не указано'}\n"
-            f"📱 Телефон: {phone or 'Не указан'}\n"
-            f"📧 Email: {email or 'Не указан'}\n"
-            f"🎂 Возраст: {age or 'Не указан'}\n"
-            f"📍 Локация: {'Указана' if lat and lon else 'Не указана'}\n"
-            f"📅 Дата регистрации: {reg_date_formatted}\n"
-            f"🆔 Username: @{username or 'Не указан'}"
+        profile_text = t(
+            'profile',
+            name=name or t('not_specified_n'),
+            phone=phone or t('not_specified_m'),
+            email=email or t('not_specified_m'),
+            age=age or t('not_specified_m'),
+            location=t('location_specified') if lat and lon else t('not_specified_f'),
+            reg_date=reg_date_formatted,
+            username=username or t('not_specified_m')
         )
         
         # Отправляем фото профиля с информацией, если оно есть
@@ -454,64 +447,64 @@ async def cmd_profile(message: Message, db: Database):
                     photo=photo_id,
                     caption=profile_text,
                     parse_mode="HTML",
-                    reply_markup=kb.profile_keyboard
+                    reply_markup=kb.profile_keyboard()
                 )
             except Exception as e:
                 logging.error(f"Ошибка при отправке фото профиля: {e}")
                 await message.answer(
                     profile_text,
                     parse_mode="HTML",
-                    reply_markup=kb.profile_keyboard
+                    reply_markup=kb.profile_keyboard()
                 )
         else:
             await message.answer(
                 profile_text,
                 parse_mode="HTML",
-                reply_markup=kb.profile_keyboard
+                reply_markup=kb.profile_keyboard()
             )
             
     except Exception as e:
         logging.error(f"Ошибка при отбражении профиля: {e}")
         await message.answer(
-            "Произошла ошибка при загрузке профиля. Попробуйте позже.",
-            reply_markup=kb.main
+            t('profile_error'),
+            reply_markup=kb.main_menu()
         )
 
 @router.callback_query(F.data.startswith('cart_add_'))
-async def add_to_cart(callback: CallbackQuery, db: Database):
+async def add_to_cart(callback: CallbackQuery, db: Database, t: Translator):
     """Добавление товара в корзину"""
     try:
         product_id = int(callback.data.split('_')[2])
-        product = await db.get_product_by_id(product_id)
+        product = await db.get_product_card(callback.from_user.id, product_id)
         
         if not product:
-            await callback.answer("❌ Товар не найден")
+            await callback.answer(t('product_not_found'))
             return
             
         if product.quantity <= 0:
-            await callback.answer("❌ Товар закончился")
+            await callback.answer(t('out_of_stock'))
             return
         
         current_qty = int(callback.message.reply_markup.inline_keyboard[0][1].text)
             
         if current_qty > product.quantity:
-            await callback.answer("❌ Недостаточно товара на складе")
+            await callback.answer(t('not_enough_stock'))
             return
         
-        if await db.add_to_cart(callback.from_user.id, product_id, current_qty):
-            await callback.answer("✅ Товар добавлен в корзину")
+        cart_quantity = await db.add_to_cart(callback.from_user.id, product_id, current_qty)
+        if cart_quantity is not None:
+            await callback.answer(t('cart_added'))
             # Обновляем отображение товара с актуальным количеством
-            is_favorite = await db.is_favorite(callback.from_user.id, product_id)
-            cart_quantity = await db.get_cart_item_quantity(callback.from_user.id, product_id)
+            is_favorite = product.is_favorite
             
             text = (
                 f"📦 {product.name}\n"
-                f"💰 Цена: {product.price}₽\n"
-                f"📝 Описание: {product.description}\n"
-                f"⭐ Рейтинг: {product.average_rating:.1f}\n"
-                f"{'❤️ В избранном' if is_favorite else '🤍 Не в избранном'}\n"
-                f"📦 В наличии: {product.quantity} шт.\n"
-                f"🛒 В корзине: {cart_quantity} шт."
+                f"{t('product_price', price=product.price)}\n"
+                f"{t('product_description', description=product.description)}\n"
+                f"{t('product_rating', stars='⭐', rating=product.average_rating)}\n"
+                f"{t('product_favorite' if is_favorite else 'product_not_favorite')}\n"
+                f"{t('product_in_stock', quantity=product.quantity)}\n"
+                f"{t('product_in_cart', quantity=cart_quantity)}"
             )
             
             keyboard = kb.product_keyboard(product_id, is_favorite)
@@ -521,13 +514,13 @@ async def add_to_cart(callback: CallbackQuery, db: Database):
             else:
                 await callback.message.edit_text(text, reply_markup=keyboard)
         else:
-            await callback.answer("❌ Ошибка при добавлении в корзину")
+            await callback.answer(t('cart_add_error'))
     except Exception as e:
         logging.error(f"Ошибка при добавлении в корзину: {e}")
-        await callback.answer("Произошла ошибка")
+        await callback.answer(t('error'))
 
 @router.callback_query(F.data.startswith('qty_minus_'))
-async def decrease_quantity(callback: CallbackQuery, db: Database):
+async def decrease_quantity(callback: CallbackQuery, db: Database, t: Translator):
     """Уменьшение количества товара"""
     try:
         product_id = int(callback.data.split('_')[2])
@@ -535,80 +528,49 @@ async def decrease_quantity(callback: CallbackQuery, db: Database):
         
         if current_qty > 1:
             new_qty = current_qty - 1
-            if await db.add_to_cart(callback.from_user.id, product_id, new_qty):
+            if await db.add_to_cart(callback.from_user.id, product_id, new_qty) is not None:
                 await update_product_view(callback, db, product_id, new_qty)
             else:
-                await callback.answer("❌ Ошибка при обновлении количества")
+                await callback.answer(t('qty_update_error'))
         else:
-            await callback.answer("❌ Минимальное количество: 1")
+            await callback.answer(t('qty_min'))
     except Exception as e:
         logging.error(f"Ошибка при уменьшении количества: {e}")
-        await callback.answer("Произошла ошибка")
+        await callback.answer(t('error'))
 
 @router.callback_query(F.data.startswith('qty_plus_'))
-async def increase_quantity(callback: CallbackQuery, db: Database):
+async def increase_quantity(callback: CallbackQuery, db: Database, t: Translator):
     """Увеличение количества товара"""
     try:
         product_id = int(callback.data.split('_')[2])
         current_qty = int(callback.message.reply_markup.inline_keyboard[0][1].text)
         new_qty = current_qty + 1
         
-        if await db.add_to_cart(callback.from_user.id, product_id, new_qty):
+        if await db.add_to_cart(callback.from_user.id, product_id, new_qty) is not None:
             await update_product_view(callback, db, product_id, new_qty)
         else:
-            await callback.answer("❌ Ошибка при обновлении количества")
+            await callback.answer(t('qty_update_error'))
     except Exception as e:
         logging.error(f"Ошибка при увеличении количества: {e}")
-        await callback.answer("Произошла ошибка")
+        await callback.answer(t('error'))
 
 async def update_product_view(callback: CallbackQuery, db: Database, product_id: int, quantity: int):
     """Обновление отображения товара с новым количеством"""
-    product = await db.get_product_by_id(product_id)
-    is_favorite = await db.is_favorite(callback.from_user.id, product_id)
+    t = get_translator()
+    product = await db.get_product_card(callback.from_user.id, product_id)
+    is_favorite = product.is_favorite
     
     text = (
         f"📦 {product.name}\n"
-        f"💰 Цена: {product.price}₽\n"
-        f"📝 Описание: {product.description}\n"
-        f"⭐ Рейтинг: {product.average_rating:.1f}\n"
-        f"{'❤️ В избранном' if is_favorite else '🤍 Не в избранном'}\n"
-        f"🛒 В корзине: {quantity} шт.\n\n"
-        f"💰 Итого: {product.price * quantity}₽"
+        f"{t('product_price', price=product.price)}\n"
+        f"{t('product_description', description=product.description)}\n"
+        f"{t('product_rating', stars='⭐', rating=product.average_rating)}\n"
+        f"{t('product_favorite' if is_favorite else 'product_not_favorite')}\n"
+        f"{t('product_in_cart', quantity=quantity)}\n\n"
+        f"{t('cart_total', total=product.price * quantity)}"
     )
     
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [
-            InlineKeyboardButton(text="➖", callback_data=f"qty_minus_{product_id}"),
-            InlineKeyboardButton(text=str(quantity), callback_data="current_qty"),
-            InlineKeyboardButton(text="➕", callback_data=f"qty_plus_{product_id}")
-        ],
-        [
-            InlineKeyboardButton(
-                text="❤️" if is_favorite else "🤍",
-                callback_data=f"toggle_favorite_{product_id}"
-            ),
-            InlineKeyboardButton(
-                text="🛒 В корзину",
-                callback_data=f"cart_add_{product_id}"
-            )
-        ],
-        [
-            InlineKeyboardButton(
-                text="📝 Отзывы",
-                callback_data=f"show_reviews_{product_id}"
-            ),
-            InlineKeyboardButton(
-                text="✍️ Написать отзыв",
-                callback_data=f"review_{product_id}"
-            )
-        ],
-        [
-            InlineKeyboardButton(
-                text="◀️ Назад к категориям",
-                callback_data="back_to_categories"
-            )
-        ]
-    ])
+    keyboard = kb.product_keyboard(product_id, is_favorite, quantity)
     
     if product.photo_id:
         await callback.message.edit_caption(
@@ -622,44 +584,44 @@ async def update_product_view(callback: CallbackQuery, db: Database, product_id:
         )
 
 @router.callback_query(F.data.startswith('confirm_cart_'))
-async def confirm_add_to_cart(callback: CallbackQuery, db: Database):
+async def confirm_add_to_cart(callback: CallbackQuery, db: Database, t: Translator):
     """Подтверждение добавления в корзину"""
     product_id = int(callback.data.split('_')[2])
     quantity = int(callback.message.reply_markup.inline_keyboard[0][1].text)
     user_id = callback.from_user.id
     
-    if await db.add_to_cart(user_id, product_id, quantity):
+    if await db.add_to_cart(user_id, product_id, quantity) is not None:
         await callback.message.edit_text(
-            f"✅ Товар добавлен в корзину (количество: {quantity})"
+            t('cart_added_qty', quantity=quantity)
         )
     else:
-        await callback.message.edit_text("❌ Ошибка при добавлении товара в корзину")
+        await callback.message.edit_text(t('cart_add_error'))
 
-@router.message(F.text == '🗑️ Очистить корзину')
-async def clear_cart(message: Message, db: Database):
+@router.message(F.text.in_(variants('btn_clear_cart_reply')))
+async def clear_cart(message: Message, db: Database, t: Translator):
     """Очистка корзины"""
     if await db.clear_cart(message.from_user.id):
-        await message.answer("🗑️ Корзина очищена", reply_markup=kb.main)
+        await message.answer(t('cart_cleared'), reply_markup=kb.main_menu())
     else:
-        await message.answer("❌ Ошибка при очистке корзины")
+        await message.answer(t('cart_clear_error'))
 
-@router.message(F.text == '💳 Оформить заказ')
-async def checkout(message: Message, db: Database):
+@router.message(F.text.in_(variants('btn_checkout')))
+async def checkout(message: Message, db: Database, t: Translator):
     """Оформление заказа"""
     cart_items = await db.get_cart(message.from_user.id)
     if not cart_items:
-        await message.answer("❌ Ваша корзина пуста")
+        await message.answer(t('cart_empty_x'))
         return
     
     total = sum(price * quantity for _, price, quantity in cart_items)
-    order_text = "📋 Ваш заказ:\n\n"
+    order_text = f"{t('order_title')}\n\n"
     for name, price, quantity in cart_items:
-        order_text += f"📦 {name} x{quantity} = {price * quantity}₽\n"
-    order_text += f"\n💰 Итого к оплате: {total}₽"
+        order_text += f"{t('order_line', name=name, quantity=quantity, total=price * quantity)}\n"
+    order_text += f"\n{t('pay_total', total=total)}"
     
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="💳 Оплатить", callback_data="pay_order")],
-        [InlineKeyboardButton(text="❌ Отменить", callback_data="cancel_order")]
+        [InlineKeyboardButton(text=t('btn_pay'), callback_data="pay_order")],
+        [InlineKeyboardButton(text=t('btn_cancel'), callback_data="cancel_order")]
     ])
     
     await message.answer(order_text, reply_markup=keyboard)
@@ -692,7 +654,7 @@ async def decrease_product_quantity(callback: CallbackQuery):
     await callback.answer()
 
 @router.callback_query(F.data.startswith("remove_from_cart_"))
-async def remove_from_cart(callback: CallbackQuery, db: Database):
+async def remove_from_cart(callback: CallbackQuery, db: Database, t: Translator):
     """Удаление товара из корзины"""
     try:
         product_id = int(callback.data.split("_")[-1])
@@ -707,54 +669,52 @@ async def remove_from_cart(callback: CallbackQuery, db: Database):
                 # Показываем обновленную сумму
                 total = sum(product.price * quantity for product, quantity in cart_items)
                 await callback.message.answer(
-                    f"💰 Итого: {total}₽",
+                    t('cart_total', total=total),
                     reply_markup=kb.cart_summary_keyboard()
                 )
             else:
                 await callback.message.answer(
-                    "🛒 Ваша корзина пуста",
-                    reply_markup=kb.main
+                    t('cart_empty'),
+                    reply_markup=kb.main_menu()
                 )
-            await callback.answer("✅ Товар удален из корзины")
+            await callback.answer(t('cart_item_removed'))
         else:
-            await callback.answer("❌ Ошибка при удалении товара")
+            await callback.answer(t('cart_remove_error'))
     except Exception as e:
         logging.error(f"Ошибка при удалении товара из корзины: {e}")
-        await callback.answer("❌ Произошла ошибка")
+        await callback.answer(t('error_x'))
 
 @router.callback_query(F.data == "clear_cart")
-async def clear_cart(callback: CallbackQuery, db: Database):
+async def clear_cart(callback: CallbackQuery, db: Database, t: Translator):
     """Очистка корзины"""
     try:
         if await db.clear_cart(callback.from_user.id):
             await callback.message.edit_text(
-                "🛒 Корзина очищена",
-                reply_markup=kb.main_inline
+                t('cart_cleared'),
+                reply_markup=kb.main_inline()
             )
-            await callback.answer("✅ Корзина очищена")
+            await callback.answer(t('cart_cleared_ok'))
         else:
-            await callback.answer("❌ Ошибка при очистке корзины")
+            await callback.answer(t('cart_clear_error'))
     except Exception as e:
         logging.error(f"Ошибка при очистке корзины: {e}")
-        await callback.answer("Произошла ошибка")
+        await callback.answer(t('error'))
 
 @router.callback_query(F.data.startswith("cart_increase_"))
-async def cart_increase_quantity(callback: CallbackQuery, db: Database):
+async def cart_increase_quantity(callback: CallbackQuery, db: Database, t: Translator):
     """Увеличение количества товара в корзине"""
     try:
         product_id = int(callback.data.split("_")[2])
-        current_quantity = await db.get_cart_item_quantity(callback.from_user.id, product_id)
-        product = await db.get_product_by_id(product_id)
+        product = await db.get_product_card(callback.from_user.id, product_id)
+        current_quantity = product.cart_quantity if product else 0
         
         if product and current_quantity < product.quantity:
             new_quantity = current_quantity + 1
-            if await db.add_to_cart(callback.from_user.id, product_id, new_quantity):
+            if await db.add_to_cart(callback.from_user.id, product_id, new_quantity) is not None:
                 # Обновляем текст сообщения с новой суммой
                 item_total = product.price * new_quantity
-                text = (
-                    f"📦 {product.name}\n"
-                    f"💰 {product.price}₽ x {new_quantity} шт. = {item_total}₽"
-                )
+                text = t('cart_item', name=product.name, price=product.price,
+                         quantity=new_quantity, total=item_total)
                 
                 if product.photo_id:
                     await callback.message.edit_caption(
@@ -770,34 +730,32 @@ async def cart_increase_quantity(callback: CallbackQuery, db: Database):
                 # Обновляем итоговую сумму корзины
                 cart_items = await db.get_cart(callback.from_user.id)
                 total = sum(p.price * q for p, q in cart_items)
-                await callback.message.answer(f"💰 Итого: {total}₽", reply_markup=kb.cart_summary_keyboard())
+                await callback.message.answer(t('cart_total', total=total), reply_markup=kb.cart_summary_keyboard())
                 
-                await callback.answer("✅ Количество обновлено")
+                await callback.answer(t('qty_updated'))
             else:
-                await callback.answer("❌ Ошибка при обновлении количества")
+                await callback.answer(t('qty_update_error'))
         else:
-            await callback.answer("❌ Достигнуто максимальное количество")
+            await callback.answer(t('qty_max'))
     except Exception as e:
         logging.error(f"Ошибка при увеличении количества: {e}")
-        await callback.answer("❌ Произошла ошибка")
+        await callback.answer(t('error_x'))
 
 @router.callback_query(F.data.startswith("cart_decrease_"))
-async def cart_decrease_quantity(callback: CallbackQuery, db: Database):
+async def cart_decrease_quantity(callback: CallbackQuery, db: Database, t: Translator):
     """Уменьшение количества товара в корзине"""
     try:
         product_id = int(callback.data.split("_")[2])
-        current_quantity = await db.get_cart_item_quantity(callback.from_user.id, product_id)
-        product = await db.get_product_by_id(product_id)
+        product = await db.get_product_card(callback.from_user.id, product_id)
+        current_quantity = product.cart_quantity if product else 0
         
         if current_quantity > 1:
             new_quantity = current_quantity - 1
-            if await db.add_to_cart(callback.from_user.id, product_id, new_quantity):
+            if await db.add_to_cart(callback.from_user.id, product_id, new_quantity) is not None:
                 # Обновляем текст сообщения с новой суммой
                 item_total = product.price * new_quantity
-                text = (
-                    f"📦 {product.name}\n"
-                    f"💰 {product.price}₽ x {new_quantity} шт. = {item_total}₽"
-                )
+                text = t('cart_item', name=product.name, price=product.price,
+                         quantity=new_quantity, total=item_total)
                 
                 if product.photo_id:
                     await callback.message.edit_caption(
@@ -813,26 +771,26 @@ async def cart_decrease_quantity(callback: CallbackQuery, db: Database):
                 # Обновляем итоговую сумму корзины
                 cart_items = await db.get_cart(callback.from_user.id)
                 total = sum(p.price * q for p, q in cart_items)
-                await callback.message.answer(f"💰 Итого: {total}₽", reply_markup=kb.cart_summary_keyboard())
+                await callback.message.answer(t('cart_total', total=total), reply_markup=kb.cart_summary_keyboard())
                 
-                await callback.answer("✅ Количество обновлено")
+                await callback.answer(t('qty_updated'))
             else:
-                await callback.answer("❌ Ошибка при обновлении количества")
+                await callback.answer(t('qty_update_error'))
         else:
-            await callback.answer("❌ Минимальное количество: 1")
+            await callback.answer(t('qty_min'))
     except Exception as e:
         logging.error(f"Ошибка при уменьшении количества: {e}")
-        await callback.answer("❌ Произошла ошибка")
+        await callback.answer(t('error_x'))
 
-@router.message(F.text == "🛒 Корзина")
-async def show_cart(message: Message, db: Database):
+@router.message(F.text.in_(variants('btn_cart')))
+async def show_cart(message: Message, db: Database, t: Translator):
     """Показ корзины"""
     try:
         cart_items = await db.get_cart(message.from_user.id)
         if not cart_items:
             await message.answer(
-                "🛒 Ваша корзина пуста",
-                reply_markup=kb.main
+                t('cart_empty'),
+                reply_markup=kb.main_menu()
             )
             return
 
@@ -842,10 +800,8 @@ async def show_cart(message: Message, db: Database):
             item_total = product.price * quantity
             total += item_total
             
-            text = (
-                f"📦 {product.name}\n"
-                f"💰 {product.price}₽ x {quantity} шт. = {item_total}₽"
-            )
+            text = t('cart_item', name=product.name, price=product.price,
+                     quantity=quantity, total=item_total)
             
             if product.photo_id:
                 await message.answer_photo(
@@ -861,145 +817,127 @@ async def show_cart(message: Message, db: Database):
         
         # В конце показываем итоговую сумму и общие кнопки корзины
         await message.answer(
-            f"💰 Итого: {total}₽",
+            t('cart_total', total=total),
             reply_markup=kb.cart_summary_keyboard()
         )
     except Exception as e:
         logging.error(f"Ошибка при отображении корзины: {e}")
         await message.answer(
-            "Произошла ошибка при загрузке корзины",
-            reply_markup=kb.main
+            t('cart_error'),
+            reply_markup=kb.main_menu()
         )
 
 async def update_cart_total(message: Message, user_id: int, db: Database):
     """Обновление общей суммы корзины"""
     try:
+        t = get_translator()
         cart_items = await db.get_cart(user_id)
         if cart_items:
             total = sum(product.price * quantity for product, quantity in cart_items)
             # Отправляем новое сообщение с обновленной суммой
             await message.answer(
-                f"💰 Итого: {total}₽",
+                t('cart_total', total=total),
                 reply_markup=kb.cart_summary_keyboard()
             )
         else:
             # Если корзина пуста
             await message.answer(
-                "🛒 Ваша корзина пуста",
-                reply_markup=kb.main
+                t('cart_empty'),
+                reply_markup=kb.main_menu()
             )
     except Exception as e:
         logging.error(f"Ошибка при обновлении суммы корзины: {e}")
 
 @router.callback_query(F.data == "show_orders")
-async def show_orders_callback(callback: CallbackQuery):
+async def show_orders_callback(callback: CallbackQuery, t: Translator):
     """Показ истории заказов"""
     try:
         orders = await db.get_user_orders(callback.from_user.id)
         if not orders:
             await callback.message.answer(
-                "У вас пока нет заказов",
-                reply_markup=kb.main
+                t('no_orders'),
+                reply_markup=kb.main_menu()
             )
             await callback.message.delete()
             return
 
-        text = "📋 Ваши заказы:\n\n"
+        text = f"{t('orders_title')}\n\n"
         keyboard = InlineKeyboardMarkup(inline_keyboard=[])
         
         for order in orders:
-            status_emoji = kb.get_order_status_emoji(order.status)
-            text += (
-                f"🆔 Заказ #{order.order_id}\n"
-                f"Статус: {status_emoji} {order.status}\n"
-                f"💰 Сумма: {order.total_amount}₽\n"
-                f"📅 Дата: {order.created_at.strftime('%d.%m.%Y %H:%M')}\n"
-                "-------------------\n"
-            )
+            text += f"{kb.format_order_info(order)}\n-------------------\n"
             # Добавляем кнопку для каждого заказа
             keyboard.inline_keyboard.append([
                 InlineKeyboardButton(
-                    text=f"📦 Заказ №{order.order_id}",
+                    text=t('btn_order', order_id=order.order_id),
                     callback_data=f"order_details_{order.order_id}"
                 )
             ])
         
         # Добавляем кнопку возврата
         keyboard.inline_keyboard.append([
-            InlineKeyboardButton(text="◀️ Назад", callback_data="back_to_profile")
+            InlineKeyboardButton(text=t('btn_back'), callback_data="back_to_profile")
         ])
 
         await callback.message.answer(text, reply_markup=keyboard)
         await callback.message.delete()
     except Exception as e:
         logging.error(f"Ошибка при показе заказов: {e}")
-        await callback.answer("Произошла ошибка при загрузке заказов")
+        await callback.answer(t('orders_error'))
 
-@router.message(F.text == "📋 Мои заказы")
-async def show_orders_command(message: Message):
+@router.message(F.text.in_(variants('btn_orders')))
+async def show_orders_command(message: Message, t: Translator):
     """Показать заказы пользователя через команду"""
     try:
         orders = await db.get_user_orders(message.from_user.id)
         if not orders:
             await message.answer(
-                "У вас пока нет заказов",
-                reply_markup=kb.main
+                t('no_orders'),
+                reply_markup=kb.main_menu()
             )
             return
 
         # Форматируем каждый заказ
-        orders_text = []
-        for order in orders:
-            status_emoji = kb.get_order_status_emoji(order.status)
-            order_text = (
-                f"🆔 Заказ #{order.order_id}\n"
-                f"💰 Сумма: {order.total_amount}₽\n"
-                f"📅 Дата: {order.created_at.strftime('%d.%m.%Y %H:%M')}\n"
-                f"Статус: {status_emoji} {order.status}"
-            )
-            orders_text.append(order_text)
+        orders_text = [kb.format_order_info(order) for order in orders]
 
         await message.answer(
-            f"📋 Ваши заказы:\n\n" + "\n\n".join(orders_text),
-            reply_markup=kb.main
+            f"{t('orders_title')}\n\n" + "\n\n".join(orders_text),
+            reply_markup=kb.main_menu()
         )
     except Exception as e:
         logging.error(f"Ошибка при показе заказов: {e}")
         await message.answer(
-            "Произошла ошибка при получении заказов",
-            reply_markup=kb.main
+            t('orders_error'),
+            reply_markup=kb.main_menu()
         )
 
-@router.message(F.text == "🔍 Поиск")
-async def start_search(message: Message, state: FSMContext):
+@router.message(F.text.in_(variants('btn_search')))
+async def start_search(message: Message, state: FSMContext, t: Translator):
     """Начало поиска товаров"""
     await state.set_state(ProductStates.waiting_for_search)
     await message.answer(
-        "Введите название или описание товара для поиска:",
-        reply_markup=ReplyKeyboardMarkup(
-            keyboard=[[KeyboardButton(text="❌ Отменить поиск")]],
-            resize_keyboard=True
-        )
+        t('search_prompt'),
+        reply_markup=kb.search_keyboard()
     )
 
 @router.message(ProductStates.waiting_for_search)
-async def process_search(message: Message, state: FSMContext, db: Database):
+async def process_search(message: Message, state: FSMContext, db: Database, t: Translator):
     """Обработка поискового запроса"""
-    if message.text == "❌ Отменить поиск":
+    if message.text in variants('btn_cancel_search'):
         await state.clear()
-        await message.answer("Поиск отменен", reply_markup=kb.main)
+        await message.answer(t('search_cancelled'), reply_markup=kb.main_menu())
         return
 
     products = await db.search_products(message.text)
     if not products:
         await message.answer(
-            "По вашему запросу ничего не найдено",
-            reply_markup=kb.main
+            t('search_empty'),
+            reply_markup=kb.main_menu()
         )
         await state.clear()
         return
 
-    text = "🔍 Результаты поиска:\n\n"
+    text = f"{t('search_results')}\n\n"
     keyboard = InlineKeyboardMarkup(inline_keyboard=[])
     
     for product in products:
@@ -1011,57 +949,57 @@ async def process_search(message: Message, state: FSMContext, db: Database):
         ])
     
     keyboard.inline_keyboard.append([
-        InlineKeyboardButton(text="◀️ Назад", callback_data="back_to_catalog")
+        InlineKeyboardButton(text=t('btn_back'), callback_data="back_to_catalog")
     ])
     
     await message.answer(text, reply_markup=keyboard)
     await state.clear()
 
 @router.callback_query(F.data == "filter_products")
-async def show_filters(callback: CallbackQuery):
+async def show_filters(callback: CallbackQuery, t: Translator):
     """Показ фильтров для товаров"""
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [
-            InlineKeyboardButton(text="💰 По цене ⬆️", callback_data="sort_price_asc"),
-            InlineKeyboardButton(text="💰 По цене ⬇️", callback_data="sort_price_desc")
+            InlineKeyboardButton(text=t('btn_sort_price_asc'), callback_data="sort_price_asc"),
+            InlineKeyboardButton(text=t('btn_sort_price_desc'), callback_data="sort_price_desc")
         ],
         [
-            InlineKeyboardButton(text="⭐ По рейтингу", callback_data="sort_rating"),
-            InlineKeyboardButton(text="🔤 По названию", callback_data="sort_name")
+            InlineKeyboardButton(text=t('btn_sort_rating'), callback_data="sort_rating"),
+            InlineKeyboardButton(text=t('btn_sort_name'), callback_data="sort_name")
         ],
-        [InlineKeyboardButton(text="◀️ Назад", callback_data="back_to_catalog")]
+        [InlineKeyboardButton(text=t('btn_back'), callback_data="back_to_catalog")]
     ])
     
     await callback.message.edit_text(
-        "Выберите способ сортировки:",
+        t('choose_sort'),
         reply_markup=keyboard
     )
 
 @router.callback_query(F.data == "show_favorites")
-async def show_favorites(callback: CallbackQuery, db: Database):
+async def show_favorites(callback: CallbackQuery, db: Database, t: Translator):
     """Показ избранных товаров"""
     try:
         favorites = await db.get_user_favorites(callback.from_user.id)
         
         # Сначала отправляем новое сообщение
-        text = "❤️ Избранные товары:\n\n" if favorites else "У вас пока нет избранных товаров"
+        text = f"{t('favorites_title')}\n\n" if favorites else t('no_favorites')
         keyboard = InlineKeyboardMarkup(inline_keyboard=[])
         
         if favorites:
             for favorite in favorites:
                 product = favorite.product
-                rating = product.average_rating if product.reviews else 0
+                rating = product.average_rating
                 rating_stars = "⭐" * round(rating)
                 text += f"📦 {product.name} - {product.price}₽ {rating_stars}\n"
                 keyboard.inline_keyboard.append([
                     InlineKeyboardButton(
-                        text=f"Просмотреть {product.name}",
+                        text=t('btn_view_product', name=product.name),
                         callback_data=f"product_{product.product_id}"
                     )
                 ])
         
         keyboard.inline_keyboard.append([
-            InlineKeyboardButton(text="◀️ Назад", callback_data="back_to_profile")
+            InlineKeyboardButton(text=t('btn_back'), callback_data="back_to_profile")
         ])
         
         # Отправляем новое сообщение вместо редактирования
@@ -1071,39 +1009,38 @@ async def show_favorites(callback: CallbackQuery, db: Database):
         
     except Exception as e:
         logging.error(f"Ошибка при показе избранного: {e}")
-        await callback.answer("Произошла ошибка при загрузке избранного")
+        await callback.answer(t('favorites_error'))
 
 @router.callback_query(F.data.startswith("toggle_favorite_"))
-async def toggle_favorite(callback: CallbackQuery, db: Database):
+async def toggle_favorite(callback: CallbackQuery, db: Database, t: Translator):
     """Добавление/удаление из избранного"""
     try:
         product_id = int(callback.data.split("_")[2])  # Получаем product_id
-        result = await db.toggle_favorite(callback.from_user.id, product_id)
+        # toggle_favorite возвращает новый статус избранного
+        is_favorite = await db.toggle_favorite(callback.from_user.id, product_id)
         
-        if result:
-            # Проверяем новый статус избранного
-            is_favorite = await db.is_favorite(callback.from_user.id, product_id)
+        if is_favorite is not None:
             await callback.answer(
-                "✅ Добавлено в избранное" if is_favorite else "❌ Удалено из избранного"
+                t('favorite_added' if is_favorite else 'favorite_removed')
             )
             
             # Получаем актуальные данные о товаре
-            product = await db.get_product_by_id(product_id)
-            cart_quantity = await db.get_cart_item_quantity(callback.from_user.id, product_id)
+            product = await db.get_product_card(callback.from_user.id, product_id)
+            cart_quantity = product.cart_quantity
             
             # Обновляем отображение товара
-            rating = product.average_rating if product.reviews else 0
+            rating = product.average_rating
             rating_stars = "⭐" * round(rating)
             
             text = (
                 f"📦 {product.name}\n"
-                f"💰 Цена: {product.price}₽\n"
-                f"📝 Описание: {product.description}\n"
-                f"{rating_stars} Рейтинг: {rating:.1f}\n"
-                f"{'❤️ В избранном' if is_favorite else '🤍 Не в избранном'}\n"
-                f"📦 В наличии: {product.quantity} шт.\n"
-                f"🛒 Выбрано: {cart_quantity} шт.\n\n"
-                f"💰 Итого: {product.price * cart_quantity}₽"
+                f"{t('product_price', price=product.price)}\n"
+                f"{t('product_description', description=product.description)}\n"
+                f"{t('product_rating', stars=rating_stars, rating=rating)}\n"
+                f"{t('product_favorite' if is_favorite else 'product_not_favorite')}\n"
+                f"{t('product_in_stock', quantity=product.quantity)}\n"
+                f"{t('product_selected', quantity=cart_quantity)}\n\n"
+                f"{t('cart_total', total=product.price * cart_quantity)}"
             )
             
             keyboard = kb.product_keyboard(product_id, is_favorite)
@@ -1119,18 +1056,18 @@ async def toggle_favorite(callback: CallbackQuery, db: Database):
                     reply_markup=keyboard
                 )
         else:
-            await callback.answer("❌ Произошла ошибка")
+            await callback.answer(t('error_x'))
     except Exception as e:
         logging.error(f"Ошибка при работе с избранным: {e}")
-        await callback.answer("Произошла ошибка")
+        await callback.answer(t('error'))
 
-@router.message(F.text == "👤 Профиль")
+@router.message(F.text.in_(variants('btn_profile')))
 async def show_profile_command(message: Message, db: Database):
     """Показ профиля через команду в главном меню"""
     await cmd_profile(message, db)
 
 @router.callback_query(F.data.startswith("order_details_"))
-async def show_order_details(callback: CallbackQuery, db: Database):
+async def show_order_details(callback: CallbackQuery, db: Database, t: Translator):
     """Показ деталей заказа"""
     try:
         order_id = int(callback.data.split("_")[2])
@@ -1140,67 +1077,68 @@ async def show_order_details(callback: CallbackQuery, db: Database):
             # Получаем товары заказа
             items = await db.get_order_items(order_id)
             
-            text = (
-                f"📦 Заказ №{order.order_id}\n"
-                f"📅 Дата: {order.created_at.strftime('%d.%m.%Y %H:%M')}\n"
-                f"📊 Статус: {order.status.value}\n"
-                f"💰 Сумма: {order.total_amount}₽\n"
-                f"🚚 Способ доставки: {order.delivery_method.value}\n"
-                f"📍 Адрес: {order.delivery_address}\n"
-                f"💳 Способ оплаты: {order.payment_method.value}\n\n"
-                "📋 Состав заказа:\n"
+            text = t(
+                'order_details',
+                order_id=order.order_id,
+                date=order.created_at.strftime('%d.%m.%Y %H:%M'),
+                status=kb.order_status_name(order.status),
+                total=order.total_amount,
+                delivery=t(f'btn_{order.delivery_method}') if order.delivery_method else t('not_specified_m'),
+                address=order.delivery_address or t('not_specified_m'),
+                payment=order.payment_method
             )
             
             for item in items:
-                text += f"• {item.product.name} x {item.quantity} шт. = {item.price * item.quantity}₽\n"
+                name = item.product.name if item.product else t('product_deleted')
+                text += f"{t('order_item_line', name=name, quantity=item.quantity, total=item.price * item.quantity)}\n"
             
             keyboard = InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text="◀️ Назад к заказам", callback_data="show_orders")]
+                [InlineKeyboardButton(text=t('btn_back_to_orders'), callback_data="show_orders")]
             ])
             
             await callback.message.edit_text(text, reply_markup=keyboard)
         else:
-            await callback.answer("Заказ не найден")
+            await callback.answer(t('order_not_found'))
     except Exception as e:
         logging.error(f"Ошибка при показе деталей заказа: {e}")
-        await callback.answer("Произошла ошибка при загрузке деталей заказа")
+        await callback.answer(t('order_details_error'))
 
 @router.callback_query(F.data == "back_to_profile")
-async def back_to_profile(callback: CallbackQuery, db: Database):
+async def back_to_profile(callback: CallbackQuery, db: Database, t: Translator):
     """Возврат к профилю"""
     try:
         profile = await db.get_user_profile(callback.from_user.id)
         if profile:
             user_id, name, phone, email, lat, lon, age, photo_id, reg_date, username = profile
             
-            text = (
-                f"👤 Профиль\n\n"
-                f"Имя: {name}\n"
-                f"Телефон: {phone}\n"
-                f"Email: {email}\n"
-                f"Возраст: {age}\n"
-                f"Дата регистрации: {reg_date}\n"
-                f"Username: @{username}"
+            text = t(
+                'profile_short',
+                name=name,
+                phone=phone,
+                email=email,
+                age=age,
+                reg_date=reg_date,
+                username=username
             )
             
-            await callback.message.edit_text(text, reply_markup=kb.profile_keyboard)
+            await callback.message.edit_text(text, reply_markup=kb.profile_keyboard())
         else:
             await callback.message.edit_text(
-                "Профиль не найден. Пожалуйста, зарегистрируйтесь.",
-                reply_markup=kb.main_inline
+                t('profile_not_found_register'),
+                reply_markup=kb.main_inline()
             )
     except Exception as e:
         logging.error(f"Ошибка при возврате к профилю: {e}")
-        await callback.answer("Произошла ошибка")
+        await callback.answer(t('error'))
 
 @router.callback_query(F.data.startswith("review_"))
-async def start_review(callback: CallbackQuery, state: FSMContext):
+async def start_review(callback: CallbackQuery, state: FSMContext, t: Translator):
     """Начало создания отзыва"""
     try:
         product_id = int(callback.data.split("_")[1])
         product = await db.get_product_by_id(product_id)
         if not product:
-            await callback.answer("Товар не найден")
+            await callback.answer(t('product_not_found'))
             return
 
         await state.set_state(ProductStates.waiting_for_rating)
@@ -1208,8 +1146,8 @@ async def start_review(callback: CallbackQuery, state: FSMContext):
         
         # Отправляем новое сообщение вместо редактирования
         await callback.message.answer(
-            f"Оцените товар {product.name}:",
-            reply_markup=kb.review_keyboard
+            t('rate_product', name=product.name),
+            reply_markup=kb.review_keyboard()
         )
         # Удаляем предыдущее сообщение если оно с фото
         if callback.message.photo:
@@ -1217,10 +1155,10 @@ async def start_review(callback: CallbackQuery, state: FSMContext):
             
     except Exception as e:
         logging.error(f"Ошибка при начале создания отзыва: {e}")
-        await callback.answer("❌ Произошла ошибка")
+        await callback.answer(t('error_x'))
 
 @router.callback_query(ProductStates.waiting_for_rating, F.data.startswith("rate_"))
-async def process_rating(callback: CallbackQuery, state: FSMContext):
+async def process_rating(callback: CallbackQuery, state: FSMContext, t: Translator):
     """Обработка выбранного рейтинга"""
     try:
         rating = int(callback.data.split("_")[1])
@@ -1228,17 +1166,17 @@ async def process_rating(callback: CallbackQuery, state: FSMContext):
         await state.set_state(ProductStates.waiting_for_review)
         
         await callback.message.edit_text(
-            f"Вы поставили {rating} ⭐\nТеперь напишите текст отзыва:",
+            t('review_rated', rating=rating),
             reply_markup=InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text="❌ Отмена", callback_data="cancel_review")]
+                [InlineKeyboardButton(text=t('btn_cancel_short'), callback_data="cancel_review")]
             ])
         )
     except Exception as e:
         logging.error(f"Ошибка при обработке рейтинга: {e}")
-        await callback.answer("❌ Произошла ошибка")
+        await callback.answer(t('error_x'))
 
 @router.message(ProductStates.waiting_for_review)
-async def process_review_text(message: Message, state: FSMContext, db: Database):
+async def process_review_text(message: Message, state: FSMContext, db: Database, t: Translator):
     """Сохранение отзыва"""
     try:
         data = await state.get_data()
@@ -1252,15 +1190,15 @@ async def process_review_text(message: Message, state: FSMContext, db: Database)
             text=message.text
         ):
             # Получаем товар для возврата к его просмотру
-            product = await db.get_product_by_id(product_id)
-            is_favorite = await db.is_favorite(message.from_user.id, product_id)
+            product = await db.get_product_card(message.from_user.id, product_id)
+            is_favorite = product.is_favorite
             
             text = (
-                "✅ Спасибо за ваш отзыв!\n\n"
+                f"{t('review_thanks')}\n\n"
                 f"📦 {product.name}\n"
-                f"💰 Цена: {product.price}₽\n"
-                f"📝 Описание: {product.description}\n"
-                f"⭐ Рейтинг: {product.average_rating:.1f}"
+                f"{t('product_price', price=product.price)}\n"
+                f"{t('product_description', description=product.description)}\n"
+                f"{t('product_rating', stars='⭐', rating=product.average_rating)}"
             )
             
             await message.answer(
@@ -1269,40 +1207,40 @@ async def process_review_text(message: Message, state: FSMContext, db: Database)
             )
         else:
             await message.answer(
-                "❌ Произошла ошибка при сохранении отзыва",
-                reply_markup=kb.main
+                t('review_save_error'),
+                reply_markup=kb.main_menu()
             )
     except Exception as e:
         logging.error(f"Ошибка при сохранении отзыва: {e}")
-        await message.answer("Произошла ошибка", reply_markup=kb.main)
+        await message.answer(t('error'), reply_markup=kb.main_menu())
     finally:
         await state.clear()
 
 @router.callback_query(F.data == "cancel_review")
-async def cancel_review(callback: CallbackQuery, state: FSMContext):
+async def cancel_review(callback: CallbackQuery, state: FSMContext, t: Translator):
     """Отмена создания отзыва"""
     await state.clear()
     await callback.message.edit_text(
-        "❌ Создание отзыва отменено",
-        reply_markup=kb.main_inline
+        t('review_cancelled'),
+        reply_markup=kb.main_inline()
     )
 
 @router.callback_query(F.data.startswith("show_reviews_"))
-async def show_product_reviews(callback: CallbackQuery):
+async def show_product_reviews(callback: CallbackQuery, t: Translator):
     """Показ всех отзывов о товаре"""
     try:
         product_id = int(callback.data.split("_")[2])
         product = await db.get_product_by_id(product_id)
         if not product:
-            await callback.answer("Товар не найден")
+            await callback.answer(t('product_not_found'))
             return
 
         reviews = await db.get_product_reviews(product_id)
         
-        text = f"📝 Отзывы о товаре {product.name}:\n\n"
+        text = f"{t('reviews_title', name=product.name)}\n\n"
         
         if not reviews:
-            text += "Пока нет отзывов о товаре"
+            text += t('no_reviews')
         else:
             for review in reviews:
                 rating_stars = "⭐" * review.rating
@@ -1316,13 +1254,13 @@ async def show_product_reviews(callback: CallbackQuery):
         keyboard = InlineKeyboardMarkup(inline_keyboard=[
             [
                 InlineKeyboardButton(
-                    text="✍️ Написать отзыв",
+                    text=t('btn_write_review'),
                     callback_data=f"review_{product_id}"
                 )
             ],
             [
                 InlineKeyboardButton(
-                    text="◀️ Назад к товару",
+                    text=t('btn_back_to_product'),
                     callback_data=f"product_{product_id}"
                 )
             ]
@@ -1338,26 +1276,25 @@ async def show_product_reviews(callback: CallbackQuery):
 
     except Exception as e:
         logging.error(f"Ошибка при показе отзывов: {e}")
-        await callback.answer("Произошла ошибка при загрузке отзывов")
+        await callback.answer(t('reviews_error'))
 
 @router.callback_query(F.data.startswith("back_to_product_"))
-async def back_to_product(callback: CallbackQuery):
+async def back_to_product(callback: CallbackQuery, db: Database, t: Translator):
     """Возврат к просмотру товара"""
     try:
         product_id = int(callback.data.split('_')[-1])
-        product = await db.get_product_by_id(product_id)
+        product = await db.get_product_card(callback.from_user.id, product_id)
         if not product:
-            await callback.answer("Товар не найден")
+            await callback.answer(t('product_not_found'))
             return
 
-        # Проверяем, является ли товар избранным
-        is_favorite = await db.is_favorite(callback.from_user.id, product_id)
+        is_favorite = product.is_favorite
         
         text = (
             f"📦 {product.name}\n"
-            f"💰 Цена: {product.price}₽\n"
+            f"{t('product_price', price=product.price)}\n"
             f"📝 {product.description}\n"
-            f"📦 В наличии: {product.quantity} шт."
+            f"{t('product_in_stock', quantity=product.quantity)}"
         )
 
         await callback.message.answer(
@@ -1368,26 +1305,26 @@ async def back_to_product(callback: CallbackQuery):
 
     except Exception as e:
         logging.error(f"Ошибка при возврате к товару: {e}")
-        await callback.answer("Произошла ошибка")
+        await callback.answer(t('error'))
 
 @router.callback_query(F.data == "back_to_catalog")
-async def back_to_catalog(callback: CallbackQuery):
+async def back_to_catalog(callback: CallbackQuery, t: Translator):
     """Возврат к каталогу"""
     try:
         keyboard = await kb.categories()
         if keyboard:
             await callback.message.edit_text(
-                text='📋 Выберите категорию:',
+                text=t('choose_category'),
                 reply_markup=keyboard
             )
         else:
-            await callback.answer("❌ К сожалению, категории сейчас недоступны")
+            await callback.answer(t('categories_unavailable'))
     except Exception as e:
         logging.error(f"Ошибка при возврате к каталогу: {e}")
-        await callback.answer("Произошла ошибка")
+        await callback.answer(t('error'))
 
 @router.callback_query(F.data == "back_to_categories")
-async def back_to_categories(callback: CallbackQuery):
+async def back_to_categories(callback: CallbackQuery, t: Translator):
     """Возврат к категориям"""
     try:
         keyboard = await kb.categories()
@@ -1400,25 +1337,25 @@ async def back_to_categories(callback: CallbackQuery):
             
             # Отправляем новое сообщение с категориями
             await callback.message.answer(
-                text='📋 Выберите категорию:',
+                text=t('choose_category'),
                 reply_markup=keyboard
             )
         else:
-            await callback.answer("❌ К сожалению, категории сейчас недоступны")
+            await callback.answer(t('categories_unavailable'))
     except Exception as e:
         logging.error(f"Ошибка при возврате к категориям: {e}")
-        await callback.answer("Произошла ошибка")
+        await callback.answer(t('error'))
 
 @router.callback_query(F.data.startswith('qty_'))
-async def change_quantity(callback: CallbackQuery, state: FSMContext, db: Database):
+async def change_quantity(callback: CallbackQuery, state: FSMContext, db: Database, t: Translator):
     """Изменение количества товара перед добавлением в корзину"""
     try:
         action, product_id = callback.data.split('_')[1:]
         product_id = int(product_id)
-        product = await db.get_product_by_id(product_id)
+        product = await db.get_product_card(callback.from_user.id, product_id)
         
         if not product:
-            await callback.answer("❌ Товар не найден")
+            await callback.answer(t('product_not_found'))
             return
             
         # Получаем текущее количество из кнопки
@@ -1430,55 +1367,23 @@ async def change_quantity(callback: CallbackQuery, state: FSMContext, db: Databa
         elif action == 'plus' and current_qty < product.quantity:
             new_qty = current_qty + 1
         else:
-            await callback.answer("❌ Невозможно изменить количество")
+            await callback.answer(t('qty_cannot_change'))
             return
             
         # Обновляем отображение товара
-        is_favorite = await db.is_favorite(callback.from_user.id, product_id)
+        is_favorite = product.is_favorite
         text = (
             f"📦 {product.name}\n"
-            f"💰 Цена: {product.price}₽\n"
-            f"📝 Описание: {product.description}\n"
-            f"⭐ Рейтинг: {product.average_rating:.1f}\n"
-            f"{'❤️ В избранном' if is_favorite else '🤍 Не в избранном'}\n"
-            f"📦 В наличии: {product.quantity} шт.\n"
-            f"🛒 Выбрано: {new_qty} шт.\n\n"
-            f"💰 Итого: {product.price * new_qty}₽"
+            f"{t('product_price', price=product.price)}\n"
+            f"{t('product_description', description=product.description)}\n"
+            f"{t('product_rating', stars='⭐', rating=product.average_rating)}\n"
+            f"{t('product_favorite' if is_favorite else 'product_not_favorite')}\n"
+            f"{t('product_in_stock', quantity=product.quantity)}\n"
+            f"{t('product_selected', quantity=new_qty)}\n\n"
+            f"{t('cart_total', total=product.price * new_qty)}"
         )
         
-        keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [
-                InlineKeyboardButton(text="➖", callback_data=f"qty_minus_{product_id}"),
-                InlineKeyboardButton(text=str(new_qty), callback_data="current_qty"),
-                InlineKeyboardButton(text="➕", callback_data=f"qty_plus_{product_id}")
-            ],
-            [
-                InlineKeyboardButton(
-                    text="❤️" if is_favorite else "🤍",
-                    callback_data=f"toggle_favorite_{product_id}"
-                ),
-                InlineKeyboardButton(
-                    text="🛒 В корзину",
-                    callback_data=f"cart_add_{product_id}"
-                )
-            ],
-            [
-                InlineKeyboardButton(
-                    text="📝 Отзывы",
-                    callback_data=f"show_reviews_{product_id}"
-                ),
-                InlineKeyboardButton(
-                    text="✍️ Написать отзыв",
-                    callback_data=f"review_{product_id}"
-                )
-            ],
-            [
-                InlineKeyboardButton(
-                    text="◀️ Назад к категориям",
-                    callback_data="back_to_categories"
-                )
-            ]
-        ])
+        keyboard = kb.product_keyboard(product_id, is_favorite, new_qty)
         
         if product.photo_id:
             await callback.message.edit_caption(
@@ -1495,31 +1400,30 @@ async def change_quantity(callback: CallbackQuery, state: FSMContext, db: Databa
         
     except Exception as e:
         logging.error(f"Ошибка при изменении количества: {e}")
-        await callback.answer("Произошла ошибка")
+        await callback.answer(t('error'))
 
 async def show_cart_summary(callback: CallbackQuery, db: Database):
     """Показ итоговой информации о корзине"""
+    t = get_translator()
     try:
         cart_items = await db.get_cart(callback.from_user.id)
         if not cart_items:
             await callback.message.answer(
-                "🛒 Ваша корзина пуста",
-                reply_markup=kb.main_inline
+                t('cart_empty'),
+                reply_markup=kb.main_inline()
             )
             return
 
         total = 0
-        cart_text = "🛒 Ваша корзина:\n\n"
+        cart_text = f"{t('cart_title')}\n\n"
         
         for product, quantity in cart_items:
             item_total = product.price * quantity
             total += item_total
-            cart_text += (
-                f"📦 {product.name}\n"
-                f"   {product.price}₽ x {quantity} шт. = {item_total}₽\n\n"
-            )
+            cart_text += t('cart_summary_item', name=product.name, price=product.price,
+                           quantity=quantity, total=item_total) + "\n\n"
        
-        cart_text += f"\n💰 Итого: {total}₽"
+        cart_text += f"\n{t('cart_total', total=total)}"
         
         # Отправляем сообщение с итогами и клавиатурой
         await callback.message.answer(
@@ -1530,7 +1434,7 @@ async def show_cart_summary(callback: CallbackQuery, db: Database):
         logging.error(f"Ошибка при показе итогов корзины: {e}")
 
 @router.callback_query(F.data == "continue_shopping")
-async def continue_shopping(callback: CallbackQuery, db: Database):
+async def continue_shopping(callback: CallbackQuery, db: Database, t: Translator):
     """Возврат к категориям из корзины"""
     try:
         keyboard = await kb.categories()
@@ -1543,58 +1447,54 @@ async def continue_shopping(callback: CallbackQuery, db: Database):
             
             # Отправляем новое сообщение с категориями
             await callback.message.answer(
-                text='📋 Выберите категорию:',
+                text=t('choose_category'),
                 reply_markup=keyboard
             )
         else:
-            await callback.answer("❌ К сожалению, категории сейчас недоступны")
+            await callback.answer(t('categories_unavailable'))
     except Exception as e:
         logging.error(f"Ошибка при возврате к категориям: {e}")
-        await callback.answer("Произошла ошибка")
+        await callback.answer(t('error'))
 
 @router.callback_query(F.data == "clear_cart")
-async def clear_cart(callback: CallbackQuery, db: Database):
+async def clear_cart(callback: CallbackQuery, db: Database, t: Translator):
     """Очистка корзины"""
     try:
         if await db.clear_cart(callback.from_user.id):
             await callback.message.edit_text(
-                "🛒 Корзина очищена",
-                reply_markup=kb.main_inline
+                t('cart_cleared'),
+                reply_markup=kb.main_inline()
             )
-            await callback.answer("✅ Корзина очищена")
+            await callback.answer(t('cart_cleared_ok'))
         else:
-            await callback.answer("❌ Ошибка при очистке корзины")
+            await callback.answer(t('cart_clear_error'))
     except Exception as e:
         logging.error(f"Ошибка при очистке корзины: {e}")
-        await callback.answer("Произошла ошибка")
+        await callback.answer(t('error'))
 
 @router.message(Command("stars"))
-async def check_stars_balance(message: Message, db: Database):
+async def check_stars_balance(message: Message, db: Database, t: Translator):
     """Проверка баланса Stars"""
     try:
         total_stars, total_rub = await db.get_user_stars_total(message.from_user.id)
         
         await message.answer(
-            f"💫 Ваш баланс Stars:\n\n"
-            f"⭐ Всего потрачено Stars: {total_stars}\n"
-            f"💰 На сумму: {total_rub}₽\n\n"
-            f"📊 Текущий курс: 1 Star = {Config.STARS_RATE}₽"
+            t('stars_balance', stars=total_stars, rub=total_rub, rate=Config.STARS_RATE)
         )
     except Exception as e:
         logging.error(f"Ошибка при проверке баланса Stars: {e}")
-        await message.answer("❌ Не удалось получить информацию о балансе Stars")
+        await message.answer(t('stars_balance_error'))
 
-@router.message(F.text == '💳 Оплатить')
-async def process_payment_cmd(message: Message):
+@router.message(F.text.in_(variants('btn_pay')))
+async def process_payment_cmd(message: Message, t: Translator):
     """Обработка нажатия кнопки Оплатить"""
     try:
         # Проверяем есть ли товары в корзине
         cart_items = await db.get_cart(message.from_user.id)
         if not cart_items:
             await message.answer(
-                "🛒 Ваша корзина пуста!\n"
-                "Добавьте товары в корзину перед оплатой.",
-                reply_markup=kb.main
+                t('pay_cart_empty'),
+                reply_markup=kb.main_menu()
             )
             return
 
@@ -1602,196 +1502,122 @@ async def process_payment_cmd(message: Message):
         total = sum(product.price * quantity for product, quantity in cart_items)
         
         # Формируем текст с содержимым корзины
-        cart_text = "🛒 Ваша корзина:\n\n"
+        cart_text = f"{t('cart_title')}\n\n"
         for product, quantity in cart_items:
-            cart_text += f"📦 {product.name} x {quantity} шт. = {product.price * quantity}₽\n"
-        cart_text += f"\n💰 Итого к оплате: {total}₽"
+            cart_text += f"{t('pay_cart_item', name=product.name, quantity=quantity, total=product.price * quantity)}\n"
+        cart_text += f"\n{t('pay_total', total=total)}"
 
         # Показываем способы оплаты
-        payment_kb = InlineKeyboardMarkup(inline_keyboard=[
-            [
-                InlineKeyboardButton(text="💳 Картой", callback_data="payment_card"),
-                InlineKeyboardButton(text="⭐ Stars", callback_data="payment_stars")
-            ],
-            [InlineKeyboardButton(text="❌ Отмена", callback_data="cancel_payment")]
-        ])
-
         await message.answer(
             cart_text,
-            reply_markup=payment_kb
+            reply_markup=kb.payment_method_keyboard('cancel_payment', 'btn_pay_card')
         )
 
     except Exception as e:
         logging.error(f"Ошибка при обработке оплаты: {e}")
         await message.answer(
-            "❌ Произошла ошибка при обработке оплаты",
-            reply_markup=kb.main
+            t('payment_error'),
+            reply_markup=kb.main_menu()
         )
 
 @router.callback_query(F.data == "show_catalog")
-async def show_catalog_inline(callback: CallbackQuery):
+async def show_catalog_inline(callback: CallbackQuery, t: Translator):
     """Показ каталога через inline кнопку"""
     try:
         keyboard = await kb.categories()
         if keyboard:
             await callback.message.edit_text(
-                text='📋 Выберите категорию:',
+                text=t('choose_category'),
                 reply_markup=keyboard
             )
         else:
-            await callback.answer("❌ К сожалению, категории сейчас недоступны")
+            await callback.answer(t('categories_unavailable'))
     except Exception as e:
         logging.error(f"Ошибка при показе каталога: {e}")
-        await callback.answer("Произошла ошибка")
+        await callback.answer(t('error'))
 
 @router.callback_query(F.data == "show_profile")
-async def show_profile_inline(callback: CallbackQuery):
+async def show_profile_inline(callback: CallbackQuery, t: Translator):
     """Показ профиля через inline кнопку"""
     try:
         user = await db.get_user(callback.from_user.id)
         if not user:
-            await callback.answer("Профиль не найден")
+            await callback.answer(t('profile_not_found'))
             return
             
-        profile_text = (
-            f"👤 Профиль\n\n"
-            f"ID: {user.user_id}\n"
-            f"Имя: {user.first_name}\n"
-            f"Username: @{user.username}\n"
+        profile_text = t(
+            'profile_inline',
+            user_id=user.user_id,
+            name=user.first_name,
+            username=user.username
         )
         
         await callback.message.edit_text(
             profile_text,
-            reply_markup=kb.profile_keyboard
+            reply_markup=kb.profile_keyboard()
         )
     except Exception as e:
         logging.error(f"Ошибка при показе профиля: {e}")
-        await callback.answer("Произошла ошибка")
+        await callback.answer(t('error'))
 
 @router.callback_query(F.data == "back_to_main")
-async def back_to_main_menu_inline(callback: CallbackQuery):
+async def back_to_main_menu_inline(callback: CallbackQuery, t: Translator):
     """Возврат в главное меню через inline кнопку"""
     try:
         await callback.message.edit_text(
-            "🏠 Главное меню",
-            reply_markup=kb.main_inline
+            t('main_menu'),
+            reply_markup=kb.main_inline()
         )
     except Exception as e:
         logging.error(f"Ошибка при возврате в меню: {e}")
-        await callback.answer("Произошла ошибка")
+        await callback.answer(t('error'))
 
 @router.message(Command("help"))
-async def show_help(message: Message):
+async def show_help(message: Message, t: Translator):
     """Показ справки по боту"""
-    help_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [
-            InlineKeyboardButton(text="🛍️ Как сделать заказ", callback_data="help_order"),
-            InlineKeyboardButton(text="💳 Оплата", callback_data="help_payment")
-        ],
-        [
-            InlineKeyboardButton(text="📝 Отзывы", callback_data="help_reviews"),
-            InlineKeyboardButton(text="⚙️ Настройки", callback_data="help_settings")
-        ],
-        [
-            InlineKeyboardButton(text="👤 Профиль", callback_data="help_profile")
-        ],
-        [
-            InlineKeyboardButton(text="💬 Чат поддержки", url="https://t.me/chanvasya")
-        ]
-    ])
-    
     await message.answer(
-        "🤖 Добро пожаловать в справочный раздел!\n"
-        "Выберите интересующую вас тему или обратитесь в поддержку:",
-        reply_markup=help_keyboard
+        t('help_intro'),
+        reply_markup=kb.help_keyboard()
     )
 
 @router.callback_query(F.data == "help_back")
-async def help_back_to_main(callback: CallbackQuery):
+async def help_back_to_main(callback: CallbackQuery, t: Translator):
     """Возврат к главному меню помощи"""
-    help_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [
-            InlineKeyboardButton(text="🛍️ Как сделать заказ", callback_data="help_order"),
-            InlineKeyboardButton(text="💳 Оплата", callback_data="help_payment")
-        ],
-        [
-            InlineKeyboardButton(text="📝 Отзывы", callback_data="help_reviews"),
-            InlineKeyboardButton(text="⚙️ Настройки", callback_data="help_settings")
-        ],
-        [
-            InlineKeyboardButton(text="👤 Профиль", callback_data="help_profile")
-        ],
-        [
-            InlineKeyboardButton(text="💬 Чат поддержки", url="https://t.me/chanvasya")
-        ]
-    ])
-    
     await callback.message.edit_text(
-        "🤖 Добро пожаловать в справочный раздел!\n"
-        "Выберите интересующую вас тему или обратитесь в поддержку:",
-        reply_markup=help_keyboard
+        t('help_intro'),
+        reply_markup=kb.help_keyboard()
     )
 
+# Разделы справки: help_<раздел> -> ключ текста
+HELP_SECTIONS = {
+    'order': 'help_order',
+    'payment': 'help_payment',
+    'reviews': 'help_reviews',
+    'settings': 'help_settings',
+    'profile': 'help_profile',
+}
+
 @router.callback_query(F.data.startswith("help_"))
-async def process_help_section(callback: CallbackQuery):
+async def process_help_section(callback: CallbackQuery, t: Translator):
     """Обработка выбора раздела помощи"""
     if callback.data == "help_back":
-        await help_back_to_main(callback)
+        await help_back_to_main(callback, t)
         return
         
     section = callback.data.split("_")[1]
     
-    help_texts = {
-        "order": (
-            "🛍️ Как сделать заказ:\n\n"
-            "1. Выберите товары в каталоге\n"
-            "2. Добавьте их в корзину\n"
-            "3. Перейдите в корзину\n"
-            "4. Нажмите «Оформить заказ»\n"
-            "5. Укажите адрес доставки\n"
-            "6. Выберите способ оплаты\n\n"
-            "После оформления заказа вы получите уведомление о его статусе"
-        ),
-        "payment": (
-            "💳 Способы оплаты:\n\n"
-            "• Банковской картой\n"
-            "• Stars (бонусная система)\n\n"
-            "При оплате Stars используется курс: 1 Star = 1,35₽"
-        ),
-        "reviews": (
-            "📝 Система отзывов:\n\n"
-            "• Оставить отзыв можно на странице товара\n"
-            "• Укажите рейтинг от 1 до 5 звезд\n"
-            "• Напишите текстовый отзыв\n"
-            "• Ваш отзыв поможет другим покупателям"
-        ),
-        "settings": (
-            "⚙️ Настройки:\n\n"
-            "• Язык интерфейса\n"
-            "• Уведомления\n"
-            "Изменить настройки: /settings"
-        ),
-        "profile": (
-            "👤 Профиль:\n\n"
-            "• Просмотр и редактирование данных\n"
-            "• История заказов\n"
-            "• Баланс Stars\n"
-            "• Управление уведомлениями"
-        )
-    }
-    
     back_kb = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="◀️ Назад к разделам", callback_data="help_back")]
+        [InlineKeyboardButton(text=t('btn_help_back'), callback_data="help_back")]
     ])
     
     try:
-        if section in help_texts:
+        if section in HELP_SECTIONS:
             await callback.message.edit_text(
-                help_texts[section],
+                t(HELP_SECTIONS[section]),
                 reply_markup=back_kb
             )
         else:
-            await callback.answer("❌ Раздел не найден")
+            await callback.answer(t('help_not_found'))
     except Exception as e:
         logging.error(f"Ошибка при показе справки: {e}")
-        await callback.answer("❌ Произошла ошибка")
+        await callback.answer(t('error_x'))
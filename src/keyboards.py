@@ -2,23 +2,29 @@ from aiogram.types import (ReplyKeyboardMarkup, KeyboardButton,
                           InlineKeyboardMarkup, InlineKeyboardButton)
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 import src.database.requests as db
+from src.database.catalog_cache import catalog
+from src.utils.keyboard_cache import cached_keyboard
+from src.utils.i18n import get_translator
 from src.database.models import OrderStatus, PaymentMethod, Order
 import logging
-# Главное меню с поиском и избранным
-main = ReplyKeyboardMarkup(keyboard=[
-    [
-        KeyboardButton(text='🛍️ Каталог'),
-        KeyboardButton(text='🛒 Корзина')
-    ],
-    [
-        KeyboardButton(text='📋 Мои заказы'),
-        KeyboardButton(text='💳 Оплатить')
-    ],
-    [
-        KeyboardButton(text='👤 Профиль'),
-        KeyboardButton(text='🔍 Поиск')
-    ]
-], resize_keyboard=True)
+# Главное меню с поиском и избранным (на языке текущего пользователя)
+@cached_keyboard
+def main_menu():
+    t = get_translator()
+    return ReplyKeyboardMarkup(keyboard=[
+        [
+            KeyboardButton(text=t('btn_catalog')),
+            KeyboardButton(text=t('btn_cart'))
+        ],
+        [
+            KeyboardButton(text=t('btn_orders')),
+            KeyboardButton(text=t('btn_pay'))
+        ],
+        [
+            KeyboardButton(text=t('btn_profile')),
+            KeyboardButton(text=t('btn_search'))
+        ]
+    ], resize_keyboard=True)
 
 # Клавиатура для корзины
 cart_keyboard = ReplyKeyboardMarkup(keyboard=[
@@ -59,15 +65,21 @@ async def catalog_builder():
     return catalog_kb
 
 
-send_contact = ReplyKeyboardMarkup(keyboard=[
-    [KeyboardButton(text='📱 Отправить номер телефона', request_contact=True)],
-    [KeyboardButton(text='❌ Отмена регистрации')]
-], resize_keyboard=True)
+@cached_keyboard
+def send_contact():
+    t = get_translator()
+    return ReplyKeyboardMarkup(keyboard=[
+        [KeyboardButton(text=t('btn_send_phone'), request_contact=True)],
+        [KeyboardButton(text=t('btn_cancel_registration'))]
+    ], resize_keyboard=True)
 
-send_location = ReplyKeyboardMarkup(keyboard=[
-    [KeyboardButton(text='📍 Отправить местоположение', request_location=True)],
-    [KeyboardButton(text='❌ Отмена регистрации')]
-], resize_keyboard=True)
+@cached_keyboard
+def send_location():
+    t = get_translator()
+    return ReplyKeyboardMarkup(keyboard=[
+        [KeyboardButton(text=t('btn_send_location'), request_location=True)],
+        [KeyboardButton(text=t('btn_cancel_registration'))]
+    ], resize_keyboard=True)
 
 # Клавиатура для меню команд
 
@@ -78,33 +90,37 @@ cancel_kb = ReplyKeyboardMarkup(keyboard=[
 ], resize_keyboard=True)
 
 # Обновленная клавиатура профиля
-profile_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-    [
-        InlineKeyboardButton(text='✏️ Изменить имя', callback_data='edit_name'),
-        InlineKeyboardButton(text='✉️ Изменить email', callback_data='edit_email')
-    ],
-    [
-        InlineKeyboardButton(text='📱 Изменить телефон', callback_data='edit_phone'),
-        InlineKeyboardButton(text='🔢 Изменить возраст', callback_data='edit_age')
-    ],
-    [
-        InlineKeyboardButton(text='📷 Изменить фото', callback_data='edit_photo'),
-        InlineKeyboardButton(text='📍 Изменить локацию', callback_data='edit_location')
-    ],
-    [
-        InlineKeyboardButton(text='🛒 Корзина', callback_data='show_cart'),
-        InlineKeyboardButton(text='❤️ Избранное', callback_data='show_favorites')
-    ],
-    [
-        InlineKeyboardButton(text='📋 Мои заказы', callback_data='show_orders')
-    ]
-])
+@cached_keyboard
+def profile_keyboard():
+    t = get_translator()
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [
+            InlineKeyboardButton(text=t('btn_edit_name'), callback_data='edit_name'),
+            InlineKeyboardButton(text=t('btn_edit_email'), callback_data='edit_email')
+        ],
+        [
+            InlineKeyboardButton(text=t('btn_edit_phone'), callback_data='edit_phone'),
+            InlineKeyboardButton(text=t('btn_edit_age'), callback_data='edit_age')
+        ],
+        [
+            InlineKeyboardButton(text=t('btn_edit_photo'), callback_data='edit_photo'),
+            InlineKeyboardButton(text=t('btn_edit_location'), callback_data='edit_location')
+        ],
+        [
+            InlineKeyboardButton(text=t('btn_cart'), callback_data='show_cart'),
+            InlineKeyboardButton(text=t('btn_favorites'), callback_data='show_favorites')
+        ],
+        [
+            InlineKeyboardButton(text=t('btn_orders'), callback_data='show_orders')
+        ]
+    ])
 
 # Клавиатура для выбора категории
+@cached_keyboard(uses_catalog=True)
 async def categories() -> InlineKeyboardMarkup:
     """Клавиатура для выбора категории (обычная версия)"""
     try:
-        all_categories = await db.get_categories()
+        all_categories = await catalog.get_categories()
         keyboard = InlineKeyboardBuilder()
         
         for category in all_categories:
@@ -114,7 +130,7 @@ async def categories() -> InlineKeyboardMarkup:
             ))
             
         keyboard.add(InlineKeyboardButton(
-            text="◀️ Назад",
+            text=get_translator()('btn_back'),
             callback_data="back"
         ))
         
@@ -123,35 +139,139 @@ async def categories() -> InlineKeyboardMarkup:
         logging.error(f"Ошибка при создании клавиатуры категорий: {e}")
         return None
 
-# Клавиатура для выбора продукта
-async def category_products(category_id: int):
+# Размер страницы в списках товаров
+PRODUCTS_PAGE_SIZE = 10
+
+# Списки товаров с постраничной навигацией. Ключ входит в callback_data
+# кнопок листания: pg_<список>_<категория>_<n|p>_<ID граничного товара>.
+# translate — подписи кнопок в footer являются ключами каталога текстов
+# (списки админки только на русском)
+PRODUCT_LISTS = {
+    # Товары категории для покупателя
+    'cat': {
+        'item': 'product_',
+        'text': '{name} - {price}₽',
+        'width': 2,
+        'empty': None,
+        'footer': [("btn_back_to_categories", "back_to_categories")],
+        'translate': True,
+    },
+    # Выбор товара категории для редактирования
+    'edt': {
+        'item': 'edit_product_',
+        'text': '✏️ {name}',
+        'width': 1,
+        'empty': "В этой категории нет товаров",
+        'footer': [("◀️ Назад к категориям", "back_to_categories")],
+    },
+    # Выбор товара категории в админке (удаление)
+    'adm': {
+        'item': 'admin_product_',
+        'text': '{name} - {price}₽',
+        'width': 1,
+        'empty': None,
+        'footer': [
+            ("◀️ К категориям", "back_to_admin_categories"),
+            ("🏠 В админ меню", "back_to_admin_menu"),
+        ],
+    },
+    # Все товары магазина: удаление
+    'del': {
+        'item': 'deleteproduct_',
+        'text': '{name} - {price}₽',
+        'width': 1,
+        'empty': "Нет доступных товаров",
+        'footer': [("◀️ Отмена", "cancel_delete")],
+    },
+    'pdel': {
+        'item': 'proddelete_',
+        'text': '{name} - {price}₽',
+        'width': 1,
+        'empty': "Нет доступных товаров",
+        'footer': [("◀️ Отмена", "cancel_delete")],
+    },
+    # Все товары магазина: редактирование
+    'edall': {
+        'item': 'edit_product_',
+        'text': '{name} - {price}₽',
+        'width': 1,
+        'empty': "Нет доступных товаров",
+        'footer': [("◀️ Отмена", "cancel_edit")],
+    },
+}
+
+# Списки, которые листаются в админском роутере
+ADMIN_PAGE_PREFIXES = tuple(f'pg_{scope}_' for scope in ('edt', 'adm', 'del', 'pdel', 'edall'))
+
+def page_callback(scope: str, category_id: int | None, direction: str, cursor_id: int) -> str:
+    """callback_data кнопки листания списка товаров"""
+    return f"pg_{scope}_{category_id or 0}_{direction}_{cursor_id}"
+
+def parse_page_callback(data: str) -> tuple:
+    """Разбор callback_data листания: (список, категория, ID граничного товара, назад ли)"""
+    _, scope, category_id, direction, cursor_id = data.split('_')
+    return scope, int(category_id) or None, int(cursor_id), direction == 'p'
+
+@cached_keyboard(uses_catalog=True)
+async def product_list_page(scope: str, category_id: int | None = None,
+                            cursor_id: int | None = None, backward: bool = False):
+    """Страница списка товаров: не больше PRODUCTS_PAGE_SIZE кнопок и листание"""
     try:
-        all_products = await db.get_products_by_category(category_id)
-        products_list = [prod for prod in all_products]
+        spec = PRODUCT_LISTS[scope]
+        products, has_more = await catalog.get_products_page(
+            category_id, cursor_id, backward, limit=PRODUCTS_PAGE_SIZE
+        )
+        if not products and cursor_id is not None:
+            # Граничный товар удален или страница опустела — начинаем сначала
+            cursor_id, backward = None, False
+            products, has_more = await catalog.get_products_page(category_id, limit=PRODUCTS_PAGE_SIZE)
         
         keyboard = InlineKeyboardBuilder()
         
-        if not products_list:
+        if not products and spec['empty']:
             keyboard.add(InlineKeyboardButton(
-                text="◀️ Назад к категориям",
-                callback_data="back_to_categories"
+                text=spec['empty'],
+                callback_data="no_products"
             ))
-        else:
-            for product in products_list:
-                keyboard.add(InlineKeyboardButton(
-                    text=f"{product.name} - {product.price}₽",
-                    callback_data=f'product_{product.product_id}'
-                ))
+        for product in products:
             keyboard.add(InlineKeyboardButton(
-                text="◀️ Назад к категориям",
-                callback_data="back_to_categories"
+                text=spec['text'].format(name=product.name, price=product.price),
+                callback_data=f"{spec['item']}{product.product_id}"
             ))
+        keyboard.adjust(spec['width'])
         
-        return keyboard.adjust(2).as_markup()
+        # Вперед листаем, если есть еще товары; назад — если пришли не с первой страницы
+        has_prev = has_more if backward else cursor_id is not None
+        has_next = cursor_id is not None if backward else has_more
+        navigation = []
+        if has_prev:
+            navigation.append(InlineKeyboardButton(
+                text="⬅️",
+                callback_data=page_callback(scope, category_id, 'p', products[0].product_id)
+            ))
+        if has_next:
+            navigation.append(InlineKeyboardButton(
+                text="➡️",
+                callback_data=page_callback(scope, category_id, 'n', products[-1].product_id)
+            ))
+        if navigation:
+            keyboard.row(*navigation)
+        
+        label = get_translator() if spec.get('translate') else str
+        keyboard.row(*(
+            InlineKeyboardButton(text=label(text), callback_data=callback_data)
+            for text, callback_data in spec['footer']
+        ))
+        
+        return keyboard.as_markup()
     except Exception as e:
-        logging.error(f"Ошибка при создании клавиатуры продуктов: {e}")
+        logging.error(f"Ошибка при создании клавиатуры товаров: {e}")
         return None
 
+# Клавиатура для выбора продукта
+async def category_products(category_id: int):
+    return await product_list_page('cat', category_id)
+
 # Клавиатура подтверждения
 confirm = InlineKeyboardMarkup(inline_keyboard=[
     [
@@ -177,46 +297,24 @@ admin_main = ReplyKeyboardMarkup(keyboard=[
     [KeyboardButton(text='🚪 Выйти')]
 ], resize_keyboard=True)
 
+@cached_keyboard(uses_catalog=True)
 async def delete_categories():
-    all_categories = await db.get_categories()
+    all_categories = await catalog.get_categories()
     keyboard = InlineKeyboardBuilder()
     for category in all_categories:
         keyboard.add(InlineKeyboardButton(text=category.name, callback_data=f'delete_{category.id}'))
     return keyboard.adjust(2).as_markup()
 
+@cached_keyboard(uses_catalog=True)
 async def admin_categories():
-    all_categories = await db.get_categories()
+    all_categories = await catalog.get_categories()
     keyboard = InlineKeyboardBuilder()
     for category in all_categories:
         keyboard.add(InlineKeyboardButton(text=category.name, callback_data=f'addcategory_{category.id}'))
     return keyboard.adjust(2).as_markup()
 
 async def delete_product():
-    try:
-        all_products = await db.get_all_products()
-        keyboard = InlineKeyboardBuilder()
-        
-        if not all_products:
-            keyboard.add(InlineKeyboardButton(
-                text="Нет доступных товаров",
-                callback_data="no_products"
-            ))
-        else:
-            for product in all_products:
-                keyboard.add(InlineKeyboardButton(
-                    text=f"{product.name} - {product.price}₽",
-                    callback_data=f"proddelete_{product.product_id}"
-                ))
-                
-        keyboard.add(InlineKeyboardButton(
-            text="◀️ Отмена",
-            callback_data="cancel_delete"
-        ))
-        
-        return keyboard.adjust(1).as_markup()
-    except Exception as e:
-        logging.error(f"Ошибка при создании клавиатуры: {e}")
-        return None
+    return await product_list_page('pdel')
 
 async def add_admins():
     all_admins = await db.get_admins()
@@ -257,31 +355,7 @@ async def delete_admins():
 
 async def edit_product_kb():
     """Клавиатура для выбора товара для редактирования"""
-    try:
-        all_products = await db.get_all_products()
-        keyboard = InlineKeyboardBuilder()
-        
-        if not all_products:
-            keyboard.add(InlineKeyboardButton(
-                text="Нет доступных товаров",
-                callback_data="no_products"
-            ))
-        else:
-            for product in all_products:
-                keyboard.add(InlineKeyboardButton(
-                    text=f"{product.name} - {product.price}₽",
-                    callback_data=f"edit_product_{product.product_id}"
-                ))
-                
-        keyboard.add(InlineKeyboardButton(
-            text="◀️ Отмена",
-            callback_data="cancel_edit"
-        ))
-        
-        return keyboard.adjust(1).as_markup()
-    except Exception as e:
-        logging.error(f"Ошибка при создании клавиатуры: {e}")
-        return None
+    return await product_list_page('edall')
 
 edit_product_fields = InlineKeyboardMarkup(inline_keyboard=[
     [
@@ -299,105 +373,35 @@ edit_product_fields = InlineKeyboardMarkup(inline_keyboard=[
     [InlineKeyboardButton(text="◀️ Назад", callback_data="back_to_admin_menu")]
 ])
 
+@cached_keyboard
 def product_actions(product_id: int, current_quantity: int = 1) -> InlineKeyboardMarkup:
     """Клавиатура действий с товаром"""
+    t = get_translator()
     return InlineKeyboardMarkup(inline_keyboard=[
         [
             InlineKeyboardButton(text="➖", callback_data=f"decrease_{product_id}"),
-            InlineKeyboardButton(text=f"{current_quantity} шт.", callback_data=f"quantity_{product_id}"),
+            InlineKeyboardButton(text=t('qty_pcs', quantity=current_quantity), callback_data=f"quantity_{product_id}"),
             InlineKeyboardButton(text="➕", callback_data=f"increase_{product_id}")
         ],
         [
-            InlineKeyboardButton(text="🛒 Добавить в корзину", callback_data=f"add_to_cart_{product_id}")
+            InlineKeyboardButton(text=t('btn_add_to_cart'), callback_data=f"add_to_cart_{product_id}")
         ],
         [
-            InlineKeyboardButton(text="◀️ Назад к категориям", callback_data="back_to_categories")
+            InlineKeyboardButton(text=t('btn_back_to_categories'), callback_data="back_to_categories")
         ]
     ])
 
 async def edit_product_by_category_kb(category_id: int):
     """Клавиатура для выбора товара для редактирования из конкретной категории"""
-    try:
-        products = await db.get_products_by_category(category_id)
-        keyboard = InlineKeyboardBuilder()
-        
-        if not products:
-            keyboard.add(InlineKeyboardButton(
-                text="Нет доступных товаров",
-                callback_data="no_products"
-            ))
-        else:
-            for product in products:
-                keyboard.add(InlineKeyboardButton(
-                    text=f"{product.name} - {product.price}₽",
-                    callback_data=f"edit_product_{product.product_id}"
-                ))
-                
-        keyboard.add(InlineKeyboardButton(
-            text="◀️ Назад к категориям",
-            callback_data="back_to_categories"
-        ))
-        
-        return keyboard.adjust(1).as_markup()
-    except Exception as e:
-        logging.error(f"Ошибка при создании клавиатуры: {e}")
-        return None
+    return await product_list_page('edt', category_id)
 
 async def delete_products():
     """Клавиатура для удаления товаров"""
-    try:
-        all_products = await db.get_all_products()
-        keyboard = InlineKeyboardBuilder()
-        
-        if not all_products:
-            keyboard.add(InlineKeyboardButton(
-                text="Нет доступных товаров",
-                callback_data="no_products"
-            ))
-        else:
-            for product in all_products:
-                keyboard.add(InlineKeyboardButton(
-                    text=f"{product.name} - {product.price}₽",
-                    callback_data=f"deleteproduct_{product.product_id}"
-                ))
-                
-        keyboard.add(InlineKeyboardButton(
-            text="◀️ Отмена",
-            callback_data="cancel_delete"
-        ))
-        
-        return keyboard.adjust(1).as_markup()
-    except Exception as e:
-        logging.error(f"Ошибка при создании клавиатуры: {e}")
-        return None
+    return await product_list_page('del')
 
 async def products_by_category(category_id: int):
     """Клавиатура для выбора товара из категории"""
-    try:
-        products = await db.get_products_by_category(category_id)
-        keyboard = InlineKeyboardBuilder()
-        
-        if not products:
-            keyboard.add(InlineKeyboardButton(
-                text="В этой категории нет товаров",
-                callback_data="no_products"
-            ))
-        else:
-            for product in products:
-                keyboard.add(InlineKeyboardButton(
-                    text=f"{product.name} - {product.price}₽",
-                    callback_data=f"product_{product.product_id}"
-                ))
-                
-        keyboard.add(InlineKeyboardButton(
-            text="◀️ Назад к категориям",
-            callback_data="back_to_categories"
-        ))
-        
-        return keyboard.adjust(1).as_markup()
-    except Exception as e:
-        logging.error(f"Ошибка при создании клавиатуры: {e}")
-        return None
+    return await product_list_page('cat', category_id)
 
 edit_product = InlineKeyboardMarkup(inline_keyboard=[
     [
@@ -420,43 +424,23 @@ edit_product = InlineKeyboardMarkup(inline_keyboard=[
 
 async def admin_products_by_category(category_id: int):
     """Клавиатура для выбора товара для редактирования (для админа)"""
-    try:
-        products = await db.get_products_by_category(category_id)
-        keyboard = InlineKeyboardBuilder()
-        
-        if not products:
-            keyboard.add(InlineKeyboardButton(
-                text="В этой категории нет товаров",
-                callback_data="no_products"
-            ))
-        else:
-            for product in products:
-                keyboard.add(InlineKeyboardButton(
-                    text=f"✏️ {product.name}",
-                    callback_data=f"edit_product_{product.product_id}"
-                ))
-                
-        keyboard.add(InlineKeyboardButton(
-            text="◀️ Назад к категориям",
-            callback_data="back_to_categories"
-        ))
-        
-        return keyboard.adjust(1).as_markup()
-    except Exception as e:
-        logging.error(f"Ошибка при создании клавиатуры: {e}")
-        return None
+    return await product_list_page('edt', category_id)
 
 # Клавиатура для пропуска геолокации
-skip_location = ReplyKeyboardMarkup(keyboard=[
-    [KeyboardButton(text='📍 Отправить местоположение', request_location=True)],
-    [KeyboardButton(text='⏩ Пропустить')],
-    [KeyboardButton(text='❌ Отмена регистрации')]
-], resize_keyboard=True)
-
+@cached_keyboard
+def skip_location():
+    t = get_translator()
+    return ReplyKeyboardMarkup(keyboard=[
+        [KeyboardButton(text=t('btn_send_location'), request_location=True)],
+        [KeyboardButton(text=t('btn_skip'))],
+        [KeyboardButton(text=t('btn_cancel_registration'))]
+    ], resize_keyboard=True)
+
+@cached_keyboard(uses_catalog=True)
 async def admin_categories_kb() -> InlineKeyboardMarkup:
     """Клавиатура для выбора категории (админская версия)"""
     try:
-        all_categories = await db.get_categories()
+        all_categories = await catalog.get_categories()
         keyboard = InlineKeyboardBuilder()
         
         for category in all_categories:
@@ -477,39 +461,9 @@ async def admin_categories_kb() -> InlineKeyboardMarkup:
 
 async def admin_products_by_category_kb(category_id: int) -> InlineKeyboardMarkup:
     """Клавиатура для выбора товара из категории (админская версия)"""
-    try:
-        products = await db.get_products_by_category(category_id)
-        keyboard = InlineKeyboardBuilder()
-        
-        if products:
-            for product in products:
-                keyboard.add(InlineKeyboardButton(
-                    text=f"{product.name} - {product.price}₽",
-                    callback_data=f'admin_product_{product.product_id}'
-                ))
-        
-        # Добавляем кнопки навигации
-        keyboard.row(
-            InlineKeyboardButton(
-                text="◀️ К категориям",
-                callback_data="back_to_admin_categories"
-            ),
-            InlineKeyboardButton(
-                text="🏠 В админ меню",
-                callback_data="back_to_admin_menu"
-            )
-        )
-        
-        return keyboard.adjust(1).as_markup()
-    except Exception as e:
-        logging.error(f"Ошибка при создании клавиатуры товаров: {e}")
-        return None
+    return await product_list_page('adm', category_id)
 
 cancel_button = KeyboardButton(text="❌ Отменить")
-cancel_keyboard = ReplyKeyboardMarkup(
-    keyboard=[[cancel_button]], 
-    resize_keyboard=True
-)
 
 skip_photo_kb = ReplyKeyboardMarkup(
     keyboard=[
@@ -519,60 +473,72 @@ skip_photo_kb = ReplyKeyboardMarkup(
     resize_keyboard=True
 )
 
+@cached_keyboard
 def cart_item_keyboard(product_id: int, current_quantity: int = 1):
     """Клавиатура для товара в корзине"""
+    t = get_translator()
     return InlineKeyboardMarkup(inline_keyboard=[
         [
             InlineKeyboardButton(text="➖", callback_data=f"cart_decrease_{product_id}"),
-            InlineKeyboardButton(text=f"{current_quantity} шт.", callback_data=f"cart_qty_{product_id}"),
+            InlineKeyboardButton(text=t('qty_pcs', quantity=current_quantity), callback_data=f"cart_qty_{product_id}"),
             InlineKeyboardButton(text="➕", callback_data=f"cart_increase_{product_id}")
         ],
         [
-            InlineKeyboardButton(text="🗑 Удалить", callback_data=f"remove_from_cart_{product_id}")
+            InlineKeyboardButton(text=t('btn_remove'), callback_data=f"remove_from_cart_{product_id}")
         ]
     ])
 
+@cached_keyboard
 def cart_summary_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура для итогов корзины"""
+    t = get_translator()
     return InlineKeyboardMarkup(inline_keyboard=[
         [
-            InlineKeyboardButton(text="💳 Оформить заказ", callback_data="checkout"),
-            InlineKeyboardButton(text="🗑 Очистить корзину", callback_data="clear_cart")
+            InlineKeyboardButton(text=t('btn_checkout'), callback_data="checkout"),
+            InlineKeyboardButton(text=t('btn_clear_cart'), callback_data="clear_cart")
         ],
         [
-            InlineKeyboardButton(text="🛍️ Продолжить покупки", callback_data="continue_shopping")
+            InlineKeyboardButton(text=t('btn_continue_shopping'), callback_data="continue_shopping")
         ]
     ])
 
+@cached_keyboard
 def delivery_method_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура выбора способа доставки"""
+    t = get_translator()
     return InlineKeyboardMarkup(inline_keyboard=[
         [
-            InlineKeyboardButton(text="🚚 Курьером", callback_data="delivery_courier"),
-            InlineKeyboardButton(text="🏪 Самовывоз", callback_data="delivery_pickup")
+            InlineKeyboardButton(text=t('btn_courier'), callback_data="delivery_courier"),
+            InlineKeyboardButton(text=t('btn_pickup'), callback_data="delivery_pickup")
         ],
-        [InlineKeyboardButton(text="❌ Отменить", callback_data="cancel_checkout")]
+        [InlineKeyboardButton(text=t('btn_cancel'), callback_data="cancel_checkout")]
     ])
 
-def payment_method_keyboard() -> InlineKeyboardMarkup:
+@cached_keyboard
+def payment_method_keyboard(cancel_callback: str = "cancel_checkout",
+                            card_label: str = 'btn_pay_transfer') -> InlineKeyboardMarkup:
     """Клавиатура выбора способа оплаты"""
+    t = get_translator()
     return InlineKeyboardMarkup(inline_keyboard=[
         [
-            InlineKeyboardButton(text="💵 Перевод на карту", callback_data="payment_card"),
-            InlineKeyboardButton(text="⭐ Telegram Stars", callback_data="payment_stars")
+            InlineKeyboardButton(text=t(card_label), callback_data="payment_card"),
+            InlineKeyboardButton(text=t('btn_pay_telegram_stars'), callback_data="payment_stars")
         ],
-        [InlineKeyboardButton(text="❌ Отменить", callback_data="cancel_checkout")]
+        [InlineKeyboardButton(text=t('btn_cancel'), callback_data=cancel_callback)]
     ])
 
+@cached_keyboard
 def payment_confirm_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура подтверждения оплаты P2P"""
+    t = get_translator()
     return InlineKeyboardMarkup(inline_keyboard=[
         [
-            InlineKeyboardButton(text="✅ Подтвердить оплату", callback_data="confirm_payment"),
-            InlineKeyboardButton(text="❌ Отменить", callback_data="cancel_payment")
+            InlineKeyboardButton(text=t('btn_confirm_payment'), callback_data="confirm_payment"),
+            InlineKeyboardButton(text=t('btn_cancel'), callback_data="cancel_payment")
         ]
     ])
 
+@cached_keyboard
 def order_confirmation_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура подтверждения заказа"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -582,6 +548,7 @@ def order_confirmation_keyboard() -> InlineKeyboardMarkup:
         ]
     ])
 
+@cached_keyboard
 def order_status_keyboard(order_id: int) -> InlineKeyboardMarkup:
     """Клавиатура для просмотра статуса заказа"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -594,27 +561,32 @@ def order_status_keyboard(order_id: int) -> InlineKeyboardMarkup:
         ]
     ])
 
-main_inline = InlineKeyboardMarkup(inline_keyboard=[
-    [
-        InlineKeyboardButton(text="🛍️ Каталог", callback_data="show_catalog"),
-        InlineKeyboardButton(text="🛒 Корзина", callback_data="show_cart")
-    ],
-    [
-        InlineKeyboardButton(text="👤 Профиль", callback_data="show_profile"),
-        InlineKeyboardButton(text="📋 Мои заказы", callback_data="show_orders")
-    ],
-    [
-        InlineKeyboardButton(text="🏠 В главное меню", callback_data="back_to_main")
-    ]
-])
+@cached_keyboard
+def main_inline():
+    t = get_translator()
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [
+            InlineKeyboardButton(text=t('btn_catalog'), callback_data="show_catalog"),
+            InlineKeyboardButton(text=t('btn_cart'), callback_data="show_cart")
+        ],
+        [
+            InlineKeyboardButton(text=t('btn_profile'), callback_data="show_profile"),
+            InlineKeyboardButton(text=t('btn_orders'), callback_data="show_orders")
+        ],
+        [
+            InlineKeyboardButton(text=t('btn_main_menu'), callback_data="back_to_main")
+        ]
+    ])
 
 # Клавиатура для товара с кнопкой избранного
-def product_keyboard(product_id: int, is_favorite: bool = False):
-    """Клавиатура для товара"""
+@cached_keyboard
+def product_keyboard(product_id: int, is_favorite: bool = False, quantity: int = 0):
+    """Клавиатура для товара; quantity — выбранное количество"""
+    t = get_translator()
     return InlineKeyboardMarkup(inline_keyboard=[
         [
             InlineKeyboardButton(text="➖", callback_data=f"qty_minus_{product_id}"),
-            InlineKeyboardButton(text="0", callback_data="current_qty"),
+            InlineKeyboardButton(text=str(quantity), callback_data="current_qty"),
             InlineKeyboardButton(text="➕", callback_data=f"qty_plus_{product_id}")
         ],
         [
@@ -623,56 +595,103 @@ def product_keyboard(product_id: int, is_favorite: bool = False):
                 callback_data=f"toggle_favorite_{product_id}"
             ),
             InlineKeyboardButton(
-                text="🛒 В корзину",
+                text=t('btn_to_cart'),
                 callback_data=f"cart_add_{product_id}"
             )
         ],
         [
             InlineKeyboardButton(
-                text="📝 Отзывы",
+                text=t('btn_reviews'),
                 callback_data=f"show_reviews_{product_id}"
             ),
             InlineKeyboardButton(
-                text="✍️ Написать отзыв",
+                text=t('btn_write_review'),
                 callback_data=f"review_{product_id}"
             )
         ],
         [
             InlineKeyboardButton(
-                text="◀️ Назад к категориям",
+                text=t('btn_back_to_categories'),
                 callback_data="back_to_categories"
             )
         ]
     ])
 
 # Клавиатура для отзыва
-review_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-    [
-        InlineKeyboardButton(text="⭐", callback_data="rate_1"),
-        InlineKeyboardButton(text="⭐⭐", callback_data="rate_2"),
-        InlineKeyboardButton(text="⭐⭐⭐", callback_data="rate_3"),
-        InlineKeyboardButton(text="⭐⭐⭐⭐", callback_data="rate_4"),
-        InlineKeyboardButton(text="⭐⭐⭐⭐⭐", callback_data="rate_5")
-    ],
-    [
-        InlineKeyboardButton(text="❌ Отмена", callback_data="cancel_review")
-    ]
-])
+@cached_keyboard
+def review_keyboard():
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [
+            InlineKeyboardButton(text="⭐", callback_data="rate_1"),
+            InlineKeyboardButton(text="⭐⭐", callback_data="rate_2"),
+            InlineKeyboardButton(text="⭐⭐⭐", callback_data="rate_3"),
+            InlineKeyboardButton(text="⭐⭐⭐⭐", callback_data="rate_4"),
+            InlineKeyboardButton(text="⭐⭐⭐⭐⭐", callback_data="rate_5")
+        ],
+        [
+            InlineKeyboardButton(text=get_translator()('btn_cancel_short'), callback_data="cancel_review")
+        ]
+    ])
 
 # Клавиатура для подтверждения
-confirm_keyboard = ReplyKeyboardMarkup(
-    keyboard=[
-        [KeyboardButton(text="Подтвердить")],
-        [KeyboardButton(text="Отменить редактирование")]
-    ],
-    resize_keyboard=True
-)
+@cached_keyboard
+def confirm_keyboard():
+    t = get_translator()
+    return ReplyKeyboardMarkup(
+        keyboard=[
+            [KeyboardButton(text=t('btn_confirm'))],
+            [KeyboardButton(text=t('btn_cancel_edit'))]
+        ],
+        resize_keyboard=True
+    )
 
 # Клавиатура для отмены
-cancel_keyboard = ReplyKeyboardMarkup(
-    keyboard=[[KeyboardButton(text="Отменить редактирование")]],
-    resize_keyboard=True
-)
+@cached_keyboard
+def cancel_keyboard():
+    return ReplyKeyboardMarkup(
+        keyboard=[[KeyboardButton(text=get_translator()('btn_cancel_edit'))]],
+        resize_keyboard=True
+    )
+
+# Подтверждение регистрации
+@cached_keyboard
+def registration_confirm_keyboard():
+    t = get_translator()
+    return ReplyKeyboardMarkup(
+        keyboard=[
+            [KeyboardButton(text=t('btn_confirm'))],
+            [KeyboardButton(text=t('btn_cancel_plain'))]
+        ],
+        resize_keyboard=True
+    )
+
+@cached_keyboard
+def search_keyboard():
+    return ReplyKeyboardMarkup(
+        keyboard=[[KeyboardButton(text=get_translator()('btn_cancel_search'))]],
+        resize_keyboard=True
+    )
+
+# Разделы справки
+@cached_keyboard
+def help_keyboard():
+    t = get_translator()
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [
+            InlineKeyboardButton(text=t('btn_help_order'), callback_data="help_order"),
+            InlineKeyboardButton(text=t('btn_help_payment'), callback_data="help_payment")
+        ],
+        [
+            InlineKeyboardButton(text=t('btn_help_reviews'), callback_data="help_reviews"),
+            InlineKeyboardButton(text=t('btn_help_settings'), callback_data="help_settings")
+        ],
+        [
+            InlineKeyboardButton(text=t('btn_help_profile'), callback_data="help_profile")
+        ],
+        [
+            InlineKeyboardButton(text=t('btn_support_chat'), url="https://t.me/chanvasya")
+        ]
+    ])
 
 def get_order_status_emoji(status: str) -> str:
     """Получение эмодзи для статуса заказа"""
@@ -684,37 +703,52 @@ def get_order_status_emoji(status: str) -> str:
     }
     return status_emojis.get(status, "❓")
 
+def order_status_name(status: str) -> str:
+    """Название статуса заказа на языке текущего пользователя"""
+    status = getattr(status, 'value', status)
+    return get_translator()(f'order_status_{status}')
+
 def format_order_info(order: Order) -> str:
     """Форматирование информации о заказе"""
-    status_emoji = get_order_status_emoji(order.status)
-    return (
-        f"🆔 Заказ #{order.order_id}\n"
-        f"💰 Сумма: {order.total_amount}₽\n"
-        f"📅 Дата: {order.created_at.strftime('%d.%m.%Y %H:%M')}\n"
-        f"Статус: {status_emoji} {order.status}"
+    return get_translator()(
+        'order_info',
+        order_id=order.order_id,
+        total=order.total_amount,
+        date=order.created_at.strftime('%d.%m.%Y %H:%M'),
+        emoji=get_order_status_emoji(order.status),
+        status=order_status_name(order.status)
     )
 
 # Клавиатуры для настроек
-notifications_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-    [
-        InlineKeyboardButton(text="🔔 Вкл", callback_data="notif_on"),
-        InlineKeyboardButton(text="🔕 Выкл", callback_data="notif_off")
-    ],
-    [InlineKeyboardButton(text="◀️ Назад к настройкам", callback_data="back_to_settings")]
-])
+@cached_keyboard
+def notifications_keyboard():
+    t = get_translator()
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [
+            InlineKeyboardButton(text=t('btn_notif_on'), callback_data="notif_on"),
+            InlineKeyboardButton(text=t('btn_notif_off'), callback_data="notif_off")
+        ],
+        [InlineKeyboardButton(text=t('btn_back_to_settings'), callback_data="back_to_settings")]
+    ])
 
-language_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-    [
-        InlineKeyboardButton(text="🇷🇺 Русский", callback_data="lang_ru"),
-        InlineKeyboardButton(text="🇬🇧 English", callback_data="lang_en")
-    ],
-    [InlineKeyboardButton(text="◀️ Назад к настройкам", callback_data="back_to_settings")]
-])
+@cached_keyboard
+def language_keyboard():
+    t = get_translator()
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [
+            InlineKeyboardButton(text=t('btn_lang_ru'), callback_data="lang_ru"),
+            InlineKeyboardButton(text=t('btn_lang_en'), callback_data="lang_en")
+        ],
+        [InlineKeyboardButton(text=t('btn_back_to_settings'), callback_data="back_to_settings")]
+    ])
 
-settings_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-    [
-        InlineKeyboardButton(text="🔔 Уведомления", callback_data="settings_notifications"),
-        InlineKeyboardButton(text="🌍 Язык", callback_data="settings_language")
-    ],
-    [InlineKeyboardButton(text="◀️ Назад", callback_data="back_to_main")]
-])
+@cached_keyboard
+def settings_keyboard():
+    t = get_translator()
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [
+            InlineKeyboardButton(text=t('btn_notifications'), callback_data="settings_notifications"),
+            InlineKeyboardButton(text=t('btn_language'), callback_data="settings_language")
+        ],
+        [InlineKeyboardButton(text=t('btn_back'), callback_data="back_to_main")]
+    ])
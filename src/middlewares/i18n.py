@@ -0,0 +1,36 @@
+from typing import Callable, Dict, Any, Awaitable
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+from ..database.user_settings import UserSettingsStore, user_settings
+from ..utils.i18n import DEFAULT_LOCALE, current_locale, get_translator, resolve_locale
+
+class I18nMiddleware(BaseMiddleware):
+    """Определяет язык один раз на апдейт.
+
+    В хендлеры передаются locale и переводчик t, фабрики клавиатур
+    берут язык из current_locale.
+    """
+    def __init__(self, store: UserSettingsStore = user_settings):
+        self.store = store
+        super().__init__()
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        user = data.get('event_from_user')
+        if user is None:
+            locale = DEFAULT_LOCALE
+        else:
+            settings = await self.store.get(user.id)
+            locale = resolve_locale(settings.language, user.language_code)
+
+        data['locale'] = locale
+        data['t'] = get_translator(locale)
+        token = current_locale.set(locale)
+        try:
+            return await handler(event, data)
+        finally:
+            current_locale.reset(token)
@@ -0,0 +1,76 @@
+"""Метрики хендлеров и исходящих запросов к Bot API (см. src/utils/metrics.py).
+
+HandlerMetricsMiddleware — inner middleware событий: время выполнения и
+исключения хендлера с метками router (модуль хендлеров: user, admin, order,
+payment, settings) и handler (имя функции). Ожидание в очереди планировщика
+сюда не входит — оно в метриках полос планировщика.
+BotAPIMetricsMiddleware — middleware сессии бота: время запроса по методу
+Bot API, ответы 429 и прочие ошибки.
+"""
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware, Bot, Dispatcher
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramAPIError, TelegramNetworkError, TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.types import TelegramObject
+
+from ..utils.metrics import (
+    bot_api_errors, bot_api_latency, bot_api_rate_limited, handler_errors, handler_latency
+)
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        handler_object = data.get('handler')
+        if handler_object is None:
+            return await handler(event, data)
+        callback = handler_object.callback
+        router = (getattr(callback, '__module__', None) or '').rsplit('.', 1)[-1]
+        name = getattr(callback, '__name__', None) or type(callback).__name__
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        except Exception:
+            handler_errors.inc(router, name)
+            raise
+        finally:
+            handler_latency.observe(time.perf_counter() - started, router, name)
+
+
+class BotAPIMetricsMiddleware(BaseRequestMiddleware):
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType,
+        bot: Bot,
+        method: TelegramMethod
+    ) -> Response:
+        api_method = method.__api_method__
+        started = time.perf_counter()
+        try:
+            return await make_request(bot, method)
+        except TelegramRetryAfter:
+            bot_api_rate_limited.inc(api_method)
+            raise
+        except TelegramNetworkError:
+            bot_api_errors.inc(api_method, 'network')
+            raise
+        except TelegramAPIError as e:
+            bot_api_errors.inc(api_method, type(e).__name__)
+            raise
+        finally:
+            bot_api_latency.observe(time.perf_counter() - started, api_method)
+
+
+def setup_handler_metrics(dp: Dispatcher) -> None:
+    """Учет времени хендлеров всех событий (middleware диспетчера действуют и на вложенные роутеры)"""
+    middleware = HandlerMetricsMiddleware()
+    for name, observer in dp.observers.items():
+        if name not in ('update', 'error'):
+            observer.middleware(middleware)
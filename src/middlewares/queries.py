@@ -0,0 +1,55 @@
+"""Привязка SQL-запросов к апдейту и хендлеру (см. src/database/query_log.py).
+
+UpdateQueriesMiddleware — outer middleware апдейта, ставится после
+планировщика: отброшенные очередью апдейты не учитываются, а чтение
+состояния FSM из базы уже попадает в область апдейта.
+HandlerQueriesMiddleware — inner middleware событий: к нему aiogram приходит
+с выбранным хендлером в data['handler'].
+"""
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware, Dispatcher
+from aiogram.types import TelegramObject, Update
+
+from ..database.query_log import QueryLog, current_update, handler_name, query_log
+
+
+class UpdateQueriesMiddleware(BaseMiddleware):
+    def __init__(self, log: QueryLog = query_log):
+        self.log = log
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any]
+    ) -> Any:
+        scope = self.log.begin(event.update_id)
+        try:
+            return await handler(event, data)
+        finally:
+            self.log.finish(scope)
+
+
+class HandlerQueriesMiddleware(BaseMiddleware):
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        scope = current_update.get()
+        handler_object = data.get('handler')
+        if scope is not None and handler_object is not None:
+            scope.handler = handler_name(handler_object.callback)
+        return await handler(event, data)
+
+
+def setup_query_tracking(dp: Dispatcher, log: QueryLog = query_log) -> None:
+    """Регистрация учета: область апдейта и имена хендлеров всех событий"""
+    dp.update.outer_middleware(UpdateQueriesMiddleware(log))
+    # Inner middleware диспетчера действуют и на хендлеры вложенных роутеров
+    marker = HandlerQueriesMiddleware()
+    for name, observer in dp.observers.items():
+        if name not in ('update', 'error'):
+            observer.middleware(marker)
@@ -0,0 +1,227 @@
+"""Планировщик апдейтов: порядок внутри чата, параллельность между чатами.
+
+Апдейты одного чата обрабатываются строго по очереди (быстрые нажатия
+qty_plus_/cart_increase_ не гоняются на чтении-изменении корзины), разные
+чаты — параллельно, но не больше concurrency хендлеров одновременно.
+Очередь ограничена: при переполнении новый апдейт отбрасывается (policy
+'drop') или вытесняет самый старый ожидающий апдейт того же чата ('merge',
+подходит для навигации по меню). Middleware должен стоять перед
+FSMContextMiddleware, иначе состояние читается до своей очереди.
+
+Платежи (pre_checkout_query — ответ нужен за 10 секунд, successful_payment)
+и действия администраторов идут в приоритетной полосе: у нее свой запас
+слотов и своя очередь в каждом чате (приоритетные апдейты упорядочены между
+собой, но не ждут обычных), и она никогда не отбрасывается.
+"""
+import asyncio
+import logging
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Optional
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.middlewares.user_context import EVENT_CONTEXT_KEY
+from aiogram.types import TelegramObject, Update
+
+from ..database.admins import admins
+
+POLICIES = ('drop', 'merge')
+
+PRIORITY = 'priority'
+DEFAULT = 'default'
+
+# Границы гистограмм ожидания и полной задержки, сек
+LATENCY_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+
+def update_lane(update: Update, data: Dict[str, Any]) -> str:
+    """Полоса апдейта: платежи и администраторы — приоритетная"""
+    if update.pre_checkout_query is not None:
+        return PRIORITY
+    if update.message is not None and update.message.successful_payment is not None:
+        return PRIORITY
+    context = data.get(EVENT_CONTEXT_KEY)
+    if context is not None and context.user_id is not None and context.user_id in admins:
+        return PRIORITY
+    return DEFAULT
+
+
+class _Ticket:
+    __slots__ = ('superseded', 'started')
+
+    def __init__(self):
+        self.superseded = False  # вытеснен более новым апдейтом чата
+        self.started = False  # покинул очередь и обрабатывается
+
+
+class _ChatQueue:
+    __slots__ = ('lock', 'waiting')
+
+    def __init__(self):
+        self.lock = asyncio.Lock()  # будит ожидающих в порядке FIFO
+        self.waiting: Deque[_Ticket] = deque()
+
+
+class _LaneStats:
+    __slots__ = ('pending', 'in_flight', 'processed', 'wait_total', 'wait_max',
+                 'latency_total', 'wait_buckets', 'latency_buckets')
+
+    def __init__(self):
+        self.pending = 0  # ждут своей очереди
+        self.in_flight = 0  # обрабатываются
+        self.processed = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.latency_total = 0.0
+        self.wait_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # ожидание + обработка
+
+    def observe_wait(self, seconds: float):
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+        self.wait_buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def observe_latency(self, seconds: float):
+        self.latency_total += seconds
+        self.latency_buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def as_dict(self) -> dict:
+        started = sum(self.wait_buckets)
+        bounds = LATENCY_BUCKETS + (float('inf'),)
+        return {
+            'pending': self.pending,
+            'in_flight': self.in_flight,
+            'processed': self.processed,
+            'wait_avg': self.wait_total / started if started else 0.0,
+            'wait_max': self.wait_max,
+            'wait_total': self.wait_total,
+            'latency_total': self.latency_total,
+            'wait_buckets': dict(zip(bounds, self.wait_buckets)),
+            'latency_buckets': dict(zip(bounds, self.latency_buckets)),
+        }
+
+
+class UpdateScheduler(BaseMiddleware):
+    def __init__(self, concurrency: int = 32, priority_concurrency: int = 8,
+                 max_pending: int = 1000, max_chat_pending: int = 20,
+                 policy: str = 'drop',
+                 classify: Callable[[Update, Dict[str, Any]], str] = update_lane):
+        if policy not in POLICIES:
+            raise ValueError(f"Неизвестная политика переполнения: {policy}")
+        self.concurrency = concurrency
+        self.priority_concurrency = priority_concurrency
+        self.max_pending = max_pending
+        self.max_chat_pending = max_chat_pending
+        self.policy = policy
+        self.classify = classify
+        # У каждой полосы свой запас слотов: просмотр каталога не занимает платежные
+        self._slots = {
+            PRIORITY: asyncio.Semaphore(priority_concurrency),
+            DEFAULT: asyncio.Semaphore(concurrency),
+        }
+        self._chats: Dict[Hashable, _ChatQueue] = {}
+        self.lanes = {PRIORITY: _LaneStats(), DEFAULT: _LaneStats()}
+
+        # Метрики
+        self.max_depth = 0
+        self.dropped = 0
+        self.merged = 0
+
+    @property
+    def pending(self) -> int:
+        return sum(stats.pending for stats in self.lanes.values())
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        context = data.get(EVENT_CONTEXT_KEY)
+        chat_id = None
+        if context is not None:
+            chat_id = context.chat_id if context.chat_id is not None else context.user_id
+        lane = self.classify(event, data)
+        stats = self.lanes[lane]
+
+        # Постановка в очередь — синхронно, чтобы сохранить порядок поступления
+        key = chat = None
+        if chat_id is not None:
+            key = (lane, chat_id)
+            chat = self._chats.get(key)
+            if chat is None:
+                chat = self._chats[key] = _ChatQueue()
+        ticket = self._admit(chat, chat_id, lane)
+        if ticket is None:
+            self._release_chat(key, chat)
+            return None
+
+        loop = asyncio.get_running_loop()
+        enqueued_at = loop.time()
+        stats.pending += 1
+        self.max_depth = max(self.max_depth, self.pending)
+        try:
+            if chat is not None:
+                chat.waiting.append(ticket)
+                try:
+                    await chat.lock.acquire()
+                finally:
+                    chat.waiting.remove(ticket)
+            try:
+                if ticket.superseded:
+                    return None
+                async with self._slots[lane]:
+                    ticket.started = True
+                    stats.pending -= 1
+                    stats.observe_wait(loop.time() - enqueued_at)
+                    stats.in_flight += 1
+                    try:
+                        return await handler(event, data)
+                    finally:
+                        stats.in_flight -= 1
+                        stats.processed += 1
+                        stats.observe_latency(loop.time() - enqueued_at)
+            finally:
+                if chat is not None:
+                    chat.lock.release()
+        finally:
+            # Отмена или исключение до начала обработки
+            if not ticket.started and not ticket.superseded:
+                stats.pending -= 1
+            self._release_chat(key, chat)
+
+    def _admit(self, chat: Optional[_ChatQueue], chat_id: Optional[int], lane: str) -> Optional[_Ticket]:
+        """Проверка лимитов очереди; None — апдейт отброшен"""
+        if lane == PRIORITY:
+            return _Ticket()
+        chat_full = chat is not None and len(chat.waiting) >= self.max_chat_pending
+        if not chat_full and self.lanes[DEFAULT].pending < self.max_pending:
+            return _Ticket()
+
+        if self.policy == 'merge' and chat is not None:
+            # Вытесняем самый старый еще не вытесненный апдейт этого чата
+            for waiting in chat.waiting:
+                if not waiting.superseded:
+                    waiting.superseded = True
+                    self.lanes[DEFAULT].pending -= 1
+                    self.merged += 1
+                    return _Ticket()
+
+        self.dropped += 1
+        logging.warning(f"Очередь апдейтов переполнена, апдейт чата {chat_id} отброшен")
+        return None
+
+    def _release_chat(self, key: Hashable, chat: Optional[_ChatQueue]):
+        if chat is not None and not chat.waiting and not chat.lock.locked():
+            self._chats.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            'pending': self.pending,
+            'in_flight': sum(stats.in_flight for stats in self.lanes.values()),
+            'chats': len(self._chats),
+            'max_depth': self.max_depth,
+            'dropped': self.dropped,
+            'merged': self.merged,
+            'lanes': {lane: stats.as_dict() for lane, stats in self.lanes.items()},
+        }
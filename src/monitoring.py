@@ -0,0 +1,147 @@
+"""Локальный эндпоинт метрик для Prometheus.
+
+Необязательный aiohttp-сервер (METRICS_PORT, 0 — выключен) отдает GET
+/metrics в текстовом формате Prometheus. Слушает METRICS_HOST (по умолчанию
+127.0.0.1): метрики собираются агентом на той же машине, наружу не
+публикуются. Кроме гистограмм и счетчиков из src/utils/metrics.py, при каждом
+опросе читаются stats() планировщика, кэшей и журнала запросов, состояние
+пула соединений и число активных состояний FSM в базе.
+"""
+import logging
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+from aiogram import Dispatcher
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .database.catalog_cache import catalog
+from .database.query_log import query_log
+from .database.user_settings import user_settings
+from .utils.keyboard_cache import keyboard_cache
+from .utils.metrics import METRICS, LoopLagMonitor, family, histogram_family
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class MetricsCollector:
+    def __init__(self, dp: Dispatcher, engine: Optional[AsyncEngine] = None,
+                 loop_monitor: Optional[LoopLagMonitor] = None):
+        self.dp = dp
+        self.engine = engine
+        self.loop_monitor = loop_monitor
+
+    async def render(self) -> str:
+        lines: List[str] = []
+        for metric in METRICS:
+            lines.extend(metric.render())
+        lines.extend(self._scheduler())
+        lines.extend(self._caches())
+        lines.extend(self._queries())
+        lines.extend(self._pool())
+        lines.extend(await self._fsm_states())
+        if self.loop_monitor is not None:
+            lines.extend(family('bot_event_loop_lag_last_seconds', 'gauge',
+                                'Последний замер задержки event loop', [({}, self.loop_monitor.last)]))
+        return '\n'.join(lines) + '\n'
+
+    def _scheduler(self) -> List[str]:
+        scheduler = self.dp.get('scheduler')
+        if scheduler is None:
+            return []
+        stats = scheduler.stats()
+        lanes = stats['lanes']
+        lines = []
+        lines += family('bot_updates_pending', 'gauge', 'Апдейты в очереди планировщика',
+                        [({'lane': lane}, row['pending']) for lane, row in lanes.items()])
+        lines += family('bot_updates_in_flight', 'gauge', 'Апдейты в обработке',
+                        [({'lane': lane}, row['in_flight']) for lane, row in lanes.items()])
+        lines += family('bot_updates_processed_total', 'counter', 'Обработанные апдейты',
+                        [({'lane': lane}, row['processed']) for lane, row in lanes.items()])
+        lines += family('bot_updates_dropped_total', 'counter', 'Апдейты, отброшенные при переполнении',
+                        [({}, stats['dropped'])])
+        lines += family('bot_updates_merged_total', 'counter', 'Апдейты, вытесненные более новыми',
+                        [({}, stats['merged'])])
+        lines += histogram_family('bot_update_wait_seconds', 'Ожидание апдейта в очереди чата и слота',
+                                  [({'lane': lane}, row['wait_buckets'].items(), row['wait_total'])
+                                   for lane, row in lanes.items()])
+        lines += histogram_family('bot_update_latency_seconds', 'Ожидание и обработка апдейта',
+                                  [({'lane': lane}, row['latency_buckets'].items(), row['latency_total'])
+                                   for lane, row in lanes.items()])
+        return lines
+
+    def _caches(self) -> List[str]:
+        caches: Dict[str, Dict[str, Any]] = {
+            'catalog': catalog.stats(),
+            'user_settings': user_settings.stats(),
+            'keyboards': keyboard_cache.stats(),
+        }
+        storage = self.dp.storage
+        if hasattr(storage, 'stats'):
+            caches['fsm'] = storage.stats()
+        lines = []
+        lines += family('bot_cache_hits_total', 'counter', 'Попадания в кэш',
+                        [({'cache': name}, row['hits']) for name, row in caches.items()])
+        lines += family('bot_cache_misses_total', 'counter', 'Промахи кэша (загрузки из базы)',
+                        [({'cache': name}, row.get('misses', row.get('loads', 0)))
+                         for name, row in caches.items()])
+        lines += family('bot_cache_hit_ratio', 'gauge', 'Доля попаданий в кэш',
+                        [({'cache': name}, row['hit_rate']) for name, row in caches.items()])
+        return lines
+
+    def _queries(self) -> List[str]:
+        stats = query_log.stats()
+        handlers = stats['handlers']
+        lines = []
+        lines += family('bot_db_statements_total', 'counter', 'SQL-запросы по хендлерам (<background> — вне апдейтов)',
+                        [({'handler': name}, row['statements']) for name, row in handlers.items()]
+                        + [({'handler': '<background>'}, stats['background_statements'])])
+        lines += family('bot_db_handler_updates_total', 'counter', 'Апдейты с учетом запросов по хендлерам',
+                        [({'handler': name}, row['updates']) for name, row in handlers.items()])
+        lines += family('bot_db_n_plus_one_total', 'counter', 'Апдейты с повторяющимися запросами (N+1)',
+                        [({'handler': name}, row['n_plus_one']) for name, row in handlers.items()])
+        lines += family('bot_db_slow_queries_total', 'counter', 'Запросы дольше DB_SLOW_QUERY_MS',
+                        [({}, stats['slow_queries'])])
+        return lines
+
+    def _pool(self) -> List[str]:
+        pool = self.engine.pool if self.engine is not None else None
+        if pool is None or not hasattr(pool, 'checkedout'):
+            return []
+        lines = []
+        lines += family('bot_db_pool_checked_out', 'gauge', 'Соединения, выданные из пула',
+                        [({}, pool.checkedout())])
+        lines += family('bot_db_pool_size', 'gauge', 'Размер пула соединений',
+                        [({}, pool.size())])
+        return lines
+
+    async def _fsm_states(self) -> List[str]:
+        storage = self.dp.storage
+        if not hasattr(storage, 'count_states'):
+            return []
+        try:
+            counts = await storage.count_states()
+        except Exception as e:
+            logging.error(f"Ошибка при подсчете состояний FSM для метрик: {e}")
+            return []
+        return family('bot_fsm_states', 'gauge', 'Активные записи FSM по состояниям',
+                      [({'state': state or '<none>'}, count) for state, count in sorted(
+                          counts.items(), key=lambda item: item[0] or '')])
+
+
+def create_metrics_app(collector: MetricsCollector) -> web.Application:
+    async def metrics(request: web.Request) -> web.Response:
+        body = await collector.render()
+        return web.Response(body=body.encode(), headers={'Content-Type': CONTENT_TYPE})
+
+    app = web.Application()
+    app.router.add_get('/metrics', metrics)
+    return app
+
+
+async def start_metrics_server(collector: MetricsCollector, host: str, port: int) -> web.AppRunner:
+    """Запуск сервера метрик; остановка — runner.cleanup()"""
+    runner = web.AppRunner(create_metrics_app(collector))
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logging.info(f"Метрики доступны на http://{host}:{port}/metrics")
+    return runner
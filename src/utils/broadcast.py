@@ -0,0 +1,189 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from aiogram import Bot
+from aiogram.exceptions import (TelegramBadRequest, TelegramForbiddenError,
+                                TelegramNetworkError, TelegramRetryAfter)
+
+from ..database.database import Database
+from ..database.models import BroadcastStatus
+from .rate_limit import TokenBucket
+
+SENT = 'sent'
+FAILED = 'failed'
+BLOCKED = 'blocked'
+
+
+class BroadcastEngine:
+    """Фоновые рассылки всем пользователям с включенными уведомлениями.
+
+    Получатели читаются из базы порциями по user_id, порция отправляется
+    параллельно (не более concurrency запросов сразу) с общим лимитом
+    частоты bucket. После каждой порции прогресс сохраняется в
+    broadcasts, поэтому после перезапуска рассылка продолжается с места
+    остановки. Остановка и отмена не прерывают запросы к базе и Bot API:
+    новые отправки не начинаются, уже начатые доводятся до результата.
+    Отправки начинаются строго по порядку user_id, поэтому обработанные
+    получатели — всегда начало порции, и курсор не пропускает и не
+    повторяет никого.
+    """
+
+    def __init__(self, bot: Bot, db: Database, bucket: Optional[TokenBucket] = None,
+                 concurrency: int = 10, batch_size: int = 500, max_retries: int = 3):
+        self.bot = bot
+        self.db = db
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        # Лимит частоты общий с остальными исходящими сообщениями бота
+        self.bucket = bucket or TokenBucket(25.0)
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._cancelled: Set[int] = set()
+        self._stopping = False
+
+    async def start(self):
+        """Возобновление рассылок, прерванных перезапуском"""
+        for broadcast in await self.db.get_unfinished_broadcasts():
+            self._schedule(broadcast.id)
+        if self._tasks:
+            logging.info(f"Возобновлено рассылок: {len(self._tasks)}")
+
+    async def stop(self, timeout: float = 10.0):
+        """Остановка рассылок; статус running сохраняется для возобновления"""
+        self._stopping = True
+        tasks = list(self._tasks.values())
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            # Например, ожидание после 429 дольше таймаута
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks.clear()
+
+    async def create(self, text: str) -> Optional[int]:
+        """Создание и запуск рассылки, возвращает ее ID"""
+        broadcast_id = await self.db.create_broadcast(text)
+        if broadcast_id is not None:
+            self._schedule(broadcast_id)
+        return broadcast_id
+
+    async def cancel(self, broadcast_id: int) -> bool:
+        """Отмена рассылки. False, если она уже завершена"""
+        broadcast = await self.db.get_broadcast(broadcast_id)
+        if broadcast is None or broadcast.status not in (BroadcastStatus.PENDING, BroadcastStatus.RUNNING):
+            return False
+        task = self._tasks.get(broadcast_id)
+        if task is not None:
+            self._cancelled.add(broadcast_id)
+            await asyncio.gather(task, return_exceptions=True)
+            self._cancelled.discard(broadcast_id)
+        return await self.db.update_broadcast(
+            broadcast_id,
+            status=BroadcastStatus.CANCELLED,
+            finished_at=datetime.utcnow()
+        )
+
+    def is_active(self, broadcast_id: int) -> bool:
+        return broadcast_id in self._tasks
+
+    def _schedule(self, broadcast_id: int):
+        task = asyncio.create_task(self._run(broadcast_id))
+        self._tasks[broadcast_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(broadcast_id, None))
+
+    async def _run(self, broadcast_id: int):
+        broadcast = await self.db.get_broadcast(broadcast_id)
+        if broadcast is None:
+            return
+        cursor = broadcast.cursor_user_id
+        totals = {SENT: broadcast.sent, FAILED: broadcast.failed, BLOCKED: broadcast.blocked}
+        try:
+            await self.db.update_broadcast(
+                broadcast_id,
+                status=BroadcastStatus.RUNNING,
+                started_at=broadcast.started_at or datetime.utcnow()
+            )
+            while True:
+                recipients = await self.db.get_broadcast_recipients(cursor, self.batch_size)
+                if not recipients:
+                    break
+                # Результаты только по обработанному началу порции,
+                # остальные получатели будут обработаны при возобновлении
+                results = await self._deliver_batch(broadcast_id, recipients, broadcast.text)
+                blocked = [
+                    user_id for user_id, result in zip(recipients, results)
+                    if result == BLOCKED
+                ]
+                if blocked:
+                    await self.db.disable_notifications(blocked)
+                for result in results:
+                    totals[result] += 1
+                if results:
+                    cursor = recipients[len(results) - 1]
+                    await self.db.update_broadcast(broadcast_id, cursor_user_id=cursor, **totals)
+                if self._should_stop(broadcast_id):
+                    return
+
+            await self.db.update_broadcast(
+                broadcast_id,
+                status=BroadcastStatus.COMPLETED,
+                finished_at=datetime.utcnow()
+            )
+            logging.info(
+                f"Рассылка {broadcast_id} завершена: отправлено {totals[SENT]}, "
+                f"ошибок {totals[FAILED]}, заблокировали бота {totals[BLOCKED]}"
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error(f"Ошибка при выполнении рассылки {broadcast_id}: {e}")
+            await self.db.update_broadcast(
+                broadcast_id,
+                status=BroadcastStatus.FAILED,
+                finished_at=datetime.utcnow()
+            )
+
+    def _should_stop(self, broadcast_id: int) -> bool:
+        return self._stopping or broadcast_id in self._cancelled
+
+    async def _deliver_batch(self, broadcast_id: int, recipients: List[int], text: str) -> List[str]:
+        """Отправка порции: результаты по началу порции до остановки.
+
+        Остановка проверяется перед каждым получателем по порядку, а начатая
+        отправка доводится до результата, поэтому пропущенные получатели —
+        всегда конец порции.
+        """
+        tasks = []
+        for user_id in recipients:
+            await self._semaphore.acquire()
+            await self.bucket.acquire()
+            if self._should_stop(broadcast_id):
+                self._semaphore.release()
+                break
+            task = asyncio.create_task(self._deliver(user_id, text))
+            task.add_done_callback(lambda _: self._semaphore.release())
+            tasks.append(task)
+        return list(await asyncio.gather(*tasks))
+
+    async def _deliver(self, user_id: int, text: str) -> str:
+        """Отправка одному получателю с учетом лимитов Telegram (токен первой попытки уже взят)"""
+        for attempt in range(self.max_retries):
+            if attempt:
+                await self.bucket.acquire()
+            try:
+                await self.bot.send_message(user_id, text)
+                return SENT
+            except TelegramRetryAfter as e:
+                # 429: Telegram просит подождать — останавливаем всю рассылку
+                self.bucket.pause(e.retry_after)
+            except TelegramForbiddenError:
+                # Пользователь заблокировал бота или удалил аккаунт
+                return BLOCKED
+            except TelegramNetworkError as e:
+                logging.warning(f"Сетевая ошибка при рассылке пользователю {user_id}: {e}")
+            except TelegramBadRequest as e:
+                logging.warning(f"Сообщение пользователю {user_id} не доставлено: {e}")
+                return FAILED
+        return FAILED
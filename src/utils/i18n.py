@@ -1,48 +1,72 @@
-from typing import Dict
-from ..database import requests as db
+from contextvars import ContextVar
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Mapping, Optional
+from ..database.user_settings import user_settings
+from .locales import en, ru
 
+DEFAULT_LOCALE = 'ru'
+
+# Язык пользователя, для которого обрабатывается текущий апдейт
+current_locale: ContextVar[str] = ContextVar('current_locale', default=DEFAULT_LOCALE)
+
+# Каталоги текстов по языкам (см. src/utils/locales)
 texts = {
-    'ru': {
-        # Настройки
-        'settings_title': '⚙️ Настройки\n\nВыберите раздел настроек:',
-        'notifications_settings': '🔔 Настройки уведомлений\n\nВключить или выключить уведомления:',
-        'language_settings': '🌍 Выберите язык интерфейса:',
-        'notifications_on': '🔔 Уведомления включены',
-        'notifications_off': '🔕 Уведомления выключены',
-        'language_changed': '🌍 Язык изменен на русский',
-        'error': 'Произошла ошибка',
-        
-        # Кнопки настроек
-        'btn_notifications': '🔔 Уведомления',
-        'btn_language': '🌍 Язык',
-        'btn_back': '◀️ Назад',
-        'btn_notif_on': '🔔 Вкл',
-        'btn_notif_off': '🔕 Выкл',
-        'btn_lang_ru': '🇷🇺 Русский',
-        'btn_lang_en': '🇬🇧 English'
-    },
-    'en': {
-        # Settings
-        'settings_title': '⚙️ Settings\n\nSelect settings section:',
-        'notifications_settings': '🔔 Notification Settings\n\nEnable or disable notifications:',
-        'language_settings': '🌍 Choose interface language:',
-        'notifications_on': '🔔 Notifications enabled',
-        'notifications_off': '🔕 Notifications disabled',
-        'language_changed': '🌍 Language changed to English',
-        'error': 'An error occurred',
-        
-        # Settings buttons
-        'btn_notifications': '🔔 Notifications',
-        'btn_language': '🌍 Language',
-        'btn_back': '◀️ Back',
-        'btn_notif_on': '🔔 On',
-        'btn_notif_off': '🔕 Off',
-        'btn_lang_ru': '🇷🇺 Russian',
-        'btn_lang_en': '🇬🇧 English'
-    }
+    'ru': ru.TEXTS,
+    'en': en.TEXTS,
+}
+
+
+class Translator:
+    """Тексты одного языка: t('key') или t('key', name=...) для шаблонов"""
+    __slots__ = ('locale', '_catalog')
+
+    def __init__(self, locale: str, catalog: Mapping[str, str]):
+        self.locale = locale
+        self._catalog = catalog
+
+    def __call__(self, key: str, **kwargs) -> str:
+        text = self._catalog[key]
+        return text.format(**kwargs) if kwargs else text
+
+
+def _compile(locale: str) -> Mapping[str, str]:
+    # Недостающие ключи берутся из русского каталога один раз, при импорте
+    return MappingProxyType({**texts[DEFAULT_LOCALE], **texts[locale]})
+
+
+SUPPORTED_LOCALES: FrozenSet[str] = frozenset(texts)
+_translators: Dict[str, Translator] = {
+    locale: Translator(locale, _compile(locale)) for locale in texts
 }
 
-async def get_text(key: str, user_id: int) -> str:
+
+def get_translator(locale: Optional[str] = None) -> Translator:
+    """Переводчик для языка (по умолчанию — языка текущего апдейта)"""
+    return _translators.get(locale or current_locale.get(), _translators[DEFAULT_LOCALE])
+
+
+def resolve_locale(language: Optional[str], language_code: Optional[str] = None) -> str:
+    """Язык из настроек пользователя, иначе язык клиента Telegram, иначе русский"""
+    if language in SUPPORTED_LOCALES:
+        return language
+    if language is None and language_code:
+        code = language_code.split('-')[0].lower()
+        if code in SUPPORTED_LOCALES:
+            return code
+    return DEFAULT_LOCALE
+
+
+def variants(key: str) -> FrozenSet[str]:
+    """Текст кнопки на всех языках — для фильтров F.text.in_(...)"""
+    return frozenset(translator(key) for translator in _translators.values())
+
+
+async def get_user_translator(user_id: int) -> Translator:
+    """Переводчик на языке пользователя вне его апдейта (уведомления)"""
+    settings = await user_settings.get(user_id)
+    return get_translator(resolve_locale(settings.language))
+
+
+async def get_text(key: str, user_id: int, **kwargs) -> str:
     """Получение текста на языке пользователя"""
-    user_lang = await db.get_user_language(user_id)
-    return texts.get(user_lang, texts['ru']).get(key, texts['ru'][key]) 
\ No newline at end of file
+    return (await get_user_translator(user_id))(key, **kwargs)
@@ -0,0 +1,111 @@
+"""LRU-кэш готовых клавиатур.
+
+Клавиатура, построенная фабрикой из keyboards.py, переиспользуется для тех же
+аргументов, языка пользователя и (для клавиатур каталога) версии каталога.
+Закэшированные клавиатуры общие для всех вызовов — изменять их нельзя.
+"""
+import functools
+import inspect
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from ..database.catalog_cache import catalog
+from .i18n import current_locale
+
+_MISSING = object()
+
+
+class KeyboardCache:
+    def __init__(self, maxsize: int = 2048):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        value = self._entries.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return _MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+keyboard_cache = KeyboardCache()
+
+
+def _make_key(factory: Callable, args: tuple, kwargs: dict, uses_catalog: bool) -> Optional[tuple]:
+    key = (
+        factory.__qualname__,
+        args,
+        tuple(sorted(kwargs.items())),
+        current_locale.get(),
+        catalog.version if uses_catalog else None,
+    )
+    try:
+        hash(key)
+    except TypeError:
+        # Нехэшируемые аргументы — строим клавиатуру без кэша
+        return None
+    return key
+
+
+def cached_keyboard(factory: Optional[Callable] = None, *, uses_catalog: bool = False):
+    """Декоратор фабрики клавиатур (синхронной или async).
+
+    uses_catalog=True — клавиатура строится по данным каталога и
+    перестраивается после каждого изменения catalog.version.
+    None (ошибка построения) не кэшируется.
+    """
+    def decorator(func: Callable):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key = _make_key(func, args, kwargs, uses_catalog)
+                if key is None:
+                    return await func(*args, **kwargs)
+                markup = keyboard_cache.get(key)
+                if markup is _MISSING:
+                    markup = await func(*args, **kwargs)
+                    # Каталог мог измениться (или загрузиться) во время построения
+                    if markup is not None and key == _make_key(func, args, kwargs, uses_catalog):
+                        keyboard_cache.put(key, markup)
+                return markup
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _make_key(func, args, kwargs, uses_catalog)
+            if key is None:
+                return func(*args, **kwargs)
+            markup = keyboard_cache.get(key)
+            if markup is _MISSING:
+                markup = func(*args, **kwargs)
+                if markup is not None:
+                    keyboard_cache.put(key, markup)
+            return markup
+        return wrapper
+
+    if factory is not None:
+        return decorator(factory)
+    return decorator
@@ -0,0 +1,7 @@
+"""Каталоги текстов по языкам: модуль <язык>.py с словарем TEXTS.
+
+Переведены экраны покупателя: меню, каталог и карточки товаров, корзина,
+оформление и оплата заказов, отзывы, профиль, справка и уведомления
+покупателю. Админка и текст массовых рассылок — только на русском.
+Недостающие в каталоге ключи берутся из русского (см. src/utils/i18n.py).
+"""
@@ -0,0 +1,384 @@
+TEXTS = {
+    # Settings
+    'settings_title': '⚙️ Settings\n\nSelect settings section:',
+    'notifications_settings': '🔔 Notification Settings\n\nEnable or disable notifications:',
+    'language_settings': '🌍 Choose interface language:',
+    'notifications_on': '🔔 Notifications enabled',
+    'notifications_off': '🔕 Notifications disabled',
+    'language_changed': '🌍 Language changed to English',
+    'error': 'An error occurred',
+    'error_x': '❌ An error occurred',
+
+    # Settings buttons
+    'btn_notifications': '🔔 Notifications',
+    'btn_language': '🌍 Language',
+    'btn_back': '◀️ Back',
+    'btn_back_to_settings': '◀️ Back to settings',
+    'btn_notif_on': '🔔 On',
+    'btn_notif_off': '🔕 Off',
+    'btn_lang_ru': '🇷🇺 Russian',
+    'btn_lang_en': '🇬🇧 English',
+
+    # Main menu
+    'btn_catalog': '🛍️ Catalog',
+    'btn_cart': '🛒 Cart',
+    'btn_orders': '📋 My orders',
+    'btn_pay': '💳 Pay',
+    'btn_profile': '👤 Profile',
+    'btn_search': '🔍 Search',
+    'btn_main_menu': '🏠 Main menu',
+    'welcome': 'Welcome',
+    'main_menu': '🏠 Main menu',
+    'back_to_main_menu': '🏠 You are back in the main menu',
+
+    # Bot menu commands
+    'cmd_start': 'Start the bot',
+    'cmd_menu': 'Show the menu',
+    'cmd_help': 'Get help',
+    'cmd_profile': 'My profile',
+    'cmd_settings': 'Settings',
+    'cmd_register': 'Sign up',
+    'cmd_catalog': 'Browse the catalog',
+
+    # Common buttons
+    'btn_cancel': '❌ Cancel',
+    'btn_cancel_short': '❌ Cancel',
+    'btn_confirm': 'Confirm',
+    'btn_cancel_plain': 'Cancel',
+    'btn_skip': '⏩ Skip',
+    'cancel_word': 'cancel',
+
+    # Catalog
+    'choose_category': '📋 Choose a category:',
+    'categories_unavailable': '❌ Sorry, categories are not available right now',
+    'choose_product': 'Choose a product:',
+    'category_empty': 'There are no products in this category yet',
+    'btn_back_to_categories': '◀️ Back to categories',
+
+    # Product card
+    'product_not_found': '❌ Product not found',
+    'product_load_error': 'Failed to load the product',
+    'product_price': '💰 Price: {price}₽',
+    'product_description': '📝 Description: {description}',
+    'product_rating': '{stars} Rating: {rating:.1f}',
+    'product_favorite': '❤️ In favorites',
+    'product_not_favorite': '🤍 Not in favorites',
+    'product_in_stock': '📦 In stock: {quantity} pcs.',
+    'product_selected': '🛒 Selected: {quantity} pcs.',
+    'product_in_cart': '🛒 In cart: {quantity} pcs.',
+    'qty_pcs': '{quantity} pcs.',
+    'btn_to_cart': '🛒 To cart',
+    'btn_add_to_cart': '🛒 Add to cart',
+    'btn_reviews': '📝 Reviews',
+    'btn_write_review': '✍️ Write a review',
+    'btn_back_to_product': '◀️ Back to product',
+
+    # Cart
+    'cart_empty': '🛒 Your cart is empty',
+    'cart_empty_x': '❌ Your cart is empty',
+    'cart_empty_short': 'Cart is empty',
+    'cart_item': '📦 {name}\n💰 {price}₽ x {quantity} pcs. = {total}₽',
+    'cart_total': '💰 Total: {total}₽',
+    'cart_error': 'Failed to load the cart',
+    'cart_title': '🛒 Your cart:',
+    'cart_summary_item': '📦 {name}\n   {price}₽ x {quantity} pcs. = {total}₽',
+    'cart_cleared': '🛒 Cart cleared',
+    'cart_cleared_ok': '✅ Cart cleared',
+    'cart_clear_error': '❌ Failed to clear the cart',
+    'cart_added': '✅ Added to cart',
+    'cart_added_qty': '✅ Added to cart (quantity: {quantity})',
+    'cart_add_error': '❌ Failed to add to cart',
+    'cart_item_removed': '✅ Removed from cart',
+    'cart_remove_error': '❌ Failed to remove the product',
+    'out_of_stock': '❌ Out of stock',
+    'not_enough_stock': '❌ Not enough stock',
+    'qty_update_error': '❌ Failed to update the quantity',
+    'qty_updated': '✅ Quantity updated',
+    'qty_min': '❌ Minimum quantity: 1',
+    'qty_max': '❌ Maximum quantity reached',
+    'qty_cannot_change': '❌ Cannot change the quantity',
+    'btn_checkout': '💳 Checkout',
+    'btn_clear_cart': '🗑 Clear cart',
+    'btn_clear_cart_reply': '🗑️ Clear cart',
+    'btn_continue_shopping': '🛍️ Continue shopping',
+    'btn_remove': '🗑 Remove',
+
+    # Search and favorites
+    'search_prompt': 'Enter a product name or description to search:',
+    'btn_cancel_search': '❌ Cancel search',
+    'search_cancelled': 'Search cancelled',
+    'search_empty': 'Nothing found',
+    'search_results': '🔍 Search results:',
+    'choose_sort': 'Choose sorting:',
+    'btn_sort_price_asc': '💰 By price ⬆️',
+    'btn_sort_price_desc': '💰 By price ⬇️',
+    'btn_sort_rating': '⭐ By rating',
+    'btn_sort_name': '🔤 By name',
+    'favorites_title': '❤️ Favorites:',
+    'no_favorites': 'You have no favorites yet',
+    'btn_view_product': 'View {name}',
+    'favorites_error': 'Failed to load favorites',
+    'favorite_added': '✅ Added to favorites',
+    'favorite_removed': '❌ Removed from favorites',
+
+    # Registration
+    'btn_register': '👤 Sign up',
+    'btn_auth': '🔑 Sign in',
+    'already_registered': '✅ You are already registered!',
+    'reg_enter_name': '👤 Enter your name',
+    'reg_send_contact': 'Share your contact',
+    'reg_send_location': 'Share your location or skip this step',
+    'reg_enter_email': 'Enter your e-mail',
+    'reg_invalid_email': 'Please enter a valid e-mail address.',
+    'reg_enter_age': 'Enter your age',
+    'reg_invalid_age': 'Enter your age as a whole number',
+    'reg_send_photo': 'Send your photo',
+    'reg_no_photo': 'Send a photo',
+    'reg_confirm': (
+        'Please check your details:\n'
+        'Name: {name}\n'
+        'Phone: {phone}\n'
+        'Email: {email}\n'
+        'Age: {age}\n'
+        'Location and photo received\n\n'
+        'Is everything correct?'
+    ),
+    'reg_done': 'Registration complete!',
+    'reg_error': 'Registration failed. Please try again later.',
+    'reg_cancelled': 'Registration cancelled. You can start over.',
+    'reg_use_buttons': 'Please use the buttons to confirm or cancel',
+    'auth_ok': '✅ You are signed in!',
+    'auth_not_registered': '❌ You are not registered. Please sign up first.',
+    'btn_send_phone': '📱 Share phone number',
+    'btn_send_location': '📍 Share location',
+    'btn_cancel_registration': '❌ Cancel registration',
+
+    # Profile
+    'profile': (
+        '👤 <b>Your profile</b>\n\n'
+        'Name: {name}\n'
+        '📱 Phone: {phone}\n'
+        '📧 Email: {email}\n'
+        '🎂 Age: {age}\n'
+        '📍 Location: {location}\n'
+        '📅 Registered: {reg_date}\n'
+        '🆔 Username: @{username}'
+    ),
+    'profile_short': (
+        '👤 Profile\n\n'
+        'Name: {name}\n'
+        'Phone: {phone}\n'
+        'Email: {email}\n'
+        'Age: {age}\n'
+        'Registered: {reg_date}\n'
+        'Username: @{username}'
+    ),
+    'profile_inline': '👤 Profile\n\nID: {user_id}\nName: {name}\nUsername: @{username}\n',
+    'not_specified_n': 'Not specified',
+    'not_specified_m': 'Not specified',
+    'not_specified_f': 'Not specified',
+    'location_specified': 'Specified',
+    'profile_not_registered': 'You are not registered. Use /register to sign up.',
+    'profile_not_found': 'Profile not found',
+    'profile_not_found_register': 'Profile not found. Please sign up.',
+    'profile_error': 'Failed to load the profile. Please try again later.',
+    'btn_edit_name': '✏️ Change name',
+    'btn_edit_email': '✉️ Change email',
+    'btn_edit_phone': '📱 Change phone',
+    'btn_edit_age': '🔢 Change age',
+    'btn_edit_photo': '📷 Change photo',
+    'btn_edit_location': '📍 Change location',
+    'btn_favorites': '❤️ Favorites',
+
+    # Profile editing
+    'edit_prompt_name': 'Enter a new name:',
+    'edit_prompt_email': 'Enter a new email:',
+    'edit_prompt_phone': 'Share a new phone number:',
+    'edit_prompt_age': 'Enter a new age:',
+    'edit_prompt_photo': 'Send a new photo:',
+    'edit_prompt_location': 'Share a new location:',
+    'field_name': 'Name',
+    'field_email': 'Email',
+    'field_phone': 'Phone',
+    'field_age': 'Age',
+    'field_photo': 'Photo',
+    'field_location': 'Location',
+    'btn_cancel_edit': 'Cancel editing',
+    'edit_cancelled': 'Editing cancelled',
+    'edit_saved': 'Changes saved: {field}',
+    'edit_error': 'Failed to update.',
+    'edit_retry_error': 'An error occurred. Try again or cancel editing.',
+    'edit_photo_confirm': 'Set this photo as your profile photo?',
+    'edit_photo_error': 'Failed to process the photo. Try again or cancel editing.',
+    'edit_send_photo': 'Please send a photo',
+    'edit_phone_confirm': 'Change your phone number to {phone}?',
+    'edit_use_contact_button': 'Please use the button to share your contact',
+    'edit_use_location_button': 'Please use the button to share your location',
+    'edit_name_confirm': 'Change your name to "{value}"?',
+    'edit_email_confirm': 'Change your email to "{value}"?',
+    'edit_invalid_email': 'Please enter a valid email address.',
+    'edit_age_confirm': 'Change your age to {value}?',
+    'edit_invalid_age': 'Please enter a valid age (a whole number).',
+    'edit_location_confirm': 'Set this location?',
+
+    # Orders
+    'no_orders': 'You have no orders yet',
+    'orders_title': '📋 Your orders:',
+    'orders_error': 'Failed to load orders',
+    'order_info': (
+        '🆔 Order #{order_id}\n'
+        '💰 Amount: {total}₽\n'
+        '📅 Date: {date}\n'
+        'Status: {emoji} {status}'
+    ),
+    'btn_order': '📦 Order #{order_id}',
+    'order_details': (
+        '📦 Order #{order_id}\n'
+        '📅 Date: {date}\n'
+        '📊 Status: {status}\n'
+        '💰 Amount: {total}₽\n'
+        '🚚 Delivery: {delivery}\n'
+        '📍 Address: {address}\n'
+        '💳 Payment: {payment}\n\n'
+        '📋 Items:\n'
+    ),
+    'order_item_line': '• {name} x {quantity} pcs. = {total}₽',
+    'product_deleted': 'Product removed',
+    'btn_back_to_orders': '◀️ Back to orders',
+    'order_not_found': 'Order not found',
+    'order_details_error': 'Failed to load order details',
+    'order_status_pending': 'pending',
+    'order_status_processing': 'processing',
+    'order_status_completed': 'completed',
+    'order_status_cancelled': 'cancelled',
+    'notify_order_status': '📦 Order #{order_id}\nStatus changed to: {status}',
+
+    # Checkout
+    'order_title': '📋 Your order:',
+    'order_line': '📦 {name} x{quantity} = {total}₽',
+    'pay_total': '💰 Total to pay: {total}₽',
+    'pay_cart_empty': '🛒 Your cart is empty!\nAdd items to your cart before paying.',
+    'pay_cart_item': '📦 {name} x {quantity} pcs = {total}₽',
+    'checkout_cart_empty': 'Your cart is empty!',
+    'enter_address': '📍 Please enter the delivery address:',
+    'choose_delivery': '🚚 Choose a delivery method:',
+    'choose_payment': '💳 Choose a payment method:',
+    'card_payment': '💳 Card payment\nAmount to pay: {total}₽\n',
+    'order_created': '✅ Order #{order_id} has been created!\nWe will contact you to confirm it.',
+    'order_created_short': 'Order created!',
+    'order_create_error': '❌ Failed to create the order',
+    'checkout_error': 'An error occurred while creating the order',
+    'checkout_cancelled': '❌ Checkout cancelled',
+    'btn_courier': '🚚 Courier',
+    'btn_pickup': '🏪 Pickup',
+
+    # Payment
+    'btn_pay_card': '💳 Card',
+    'btn_pay_transfer': '💵 Card transfer',
+    'btn_pay_transfer_card': '💳 Card transfer',
+    'btn_pay_telegram_stars': '⭐ Telegram Stars',
+    'btn_confirm_payment': '✅ Confirm payment',
+    'payment_error': '❌ An error occurred while processing the payment',
+    'payment_create_error': '❌ Failed to create the payment',
+    'payment_confirm_error': 'Failed to confirm the payment',
+    'payment_process_error': '❌ Failed to process the payment',
+    'payment_cancelled': '❌ Payment cancelled',
+    'tinkoff_payment': (
+        '💳 Payment via Tinkoff\n\n'
+        'Amount to pay: {amount}₽\n\n'
+        'Transfer the amount:\n'
+        '💳 To card: {card}\n'
+        '📱 Or by phone number: {phone}\n\n'
+        '❗️ Important: put this code in the transfer comment: {code}\n\n'
+        "After paying, press 'Confirm payment'"
+    ),
+    'p2p_thanks': '✅ Thank you for your payment!\nYour order is being processed.\nOrder number: {order_id}',
+    'stars_invoice_title': 'Order payment with Stars',
+    'stars_invoice_description': 'Items in the order:\n{items}',
+    'stars_invoice_item': '📦 {name} x {quantity} pcs.',
+    'stars_price_label': 'Stars payment',
+    'reservation_expired': 'Your reservation has expired. Please place the order again.',
+    'stock_short_named': '❌ Not enough "{name}" in stock.\nThe order was not placed, your cart is kept.',
+    'stars_credited': '⭐ You received {stars} Stars for your purchase!',
+    'stars_paid': (
+        '✅ Stars payment successful!\n\n'
+        '🆔 Order #{order_id}\n'
+        '⭐ Stars charged: {spent}\n'
+        '⭐ Stars credited: {returned}\n'
+        '💰 Amount: {total}₽\n\n'
+        'Transaction ID: {charge_id}'
+    ),
+    'stars_balance': (
+        '💫 Your Stars balance:\n\n'
+        '⭐ Total Stars spent: {stars}\n'
+        '💰 Worth: {rub}₽\n\n'
+        '📊 Current rate: 1 Star = {rate}₽'
+    ),
+    'stars_channel_balance': (
+        '⭐ Stars balance of {title}:\n'
+        '💰 Available for withdrawal: {balance}\n'
+        '📊 Conversion rate: 1 Star = {rate}₽'
+    ),
+    'stars_balance_error': '❌ Failed to get the Stars balance',
+
+    # Reviews
+    'rate_product': 'Rate {name}:',
+    'review_rated': 'You rated it {rating} ⭐\nNow write your review:',
+    'review_thanks': '✅ Thank you for your review!',
+    'review_save_error': '❌ Failed to save the review',
+    'review_cancelled': '❌ Review cancelled',
+    'reviews_title': '📝 Reviews of {name}:',
+    'no_reviews': 'No reviews yet',
+    'reviews_error': 'Failed to load reviews',
+    'notify_review_response': '📝 Your review got a reply:\n\nYour review: {review}\nReply: {response}',
+
+    # Help
+    'help_intro': (
+        '🤖 Welcome to the help section!\n'
+        'Choose a topic or contact support:'
+    ),
+    'btn_help_order': '🛍️ How to order',
+    'btn_help_payment': '💳 Payment',
+    'btn_help_reviews': '📝 Reviews',
+    'btn_help_settings': '⚙️ Settings',
+    'btn_help_profile': '👤 Profile',
+    'btn_support_chat': '💬 Support chat',
+    'btn_help_back': '◀️ Back to topics',
+    'help_not_found': '❌ Section not found',
+    'help_order': (
+        '🛍️ How to order:\n\n'
+        '1. Choose products in the catalog\n'
+        '2. Add them to the cart\n'
+        '3. Open the cart\n'
+        '4. Press "Checkout"\n'
+        '5. Enter the delivery address\n'
+        '6. Choose a payment method\n\n'
+        'You will be notified when the order status changes'
+    ),
+    'help_payment': (
+        '💳 Payment methods:\n\n'
+        '• Bank card\n'
+        '• Stars (bonus system)\n\n'
+        'Stars are converted at: 1 Star = 1.35₽'
+    ),
+    'help_reviews': (
+        '📝 Reviews:\n\n'
+        '• Leave a review on the product page\n'
+        '• Rate it from 1 to 5 stars\n'
+        '• Write a text review\n'
+        '• Your review helps other shoppers'
+    ),
+    'help_settings': (
+        '⚙️ Settings:\n\n'
+        '• Interface language\n'
+        '• Notifications\n'
+        'Change settings: /settings'
+    ),
+    'help_profile': (
+        '👤 Profile:\n\n'
+        '• View and edit your details\n'
+        '• Order history\n'
+        '• Stars balance\n'
+        '• Notification settings'
+    ),
+}
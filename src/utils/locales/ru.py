@@ -0,0 +1,385 @@
+TEXTS = {
+    # Настройки
+    'settings_title': '⚙️ Настройки\n\nВыберите раздел настроек:',
+    'notifications_settings': '🔔 Настройки уведомлений\n\nВключить или выключить уведомления:',
+    'language_settings': '🌍 Выберите язык интерфейса:',
+    'notifications_on': '🔔 Уведомления включены',
+    'notifications_off': '🔕 Уведомления выключены',
+    'language_changed': '🌍 Язык изменен на русский',
+    'error': 'Произошла ошибка',
+    'error_x': '❌ Произошла ошибка',
+
+    # Кнопки настроек
+    'btn_notifications': '🔔 Уведомления',
+    'btn_language': '🌍 Язык',
+    'btn_back': '◀️ Назад',
+    'btn_back_to_settings': '◀️ Назад к настройкам',
+    'btn_notif_on': '🔔 Вкл',
+    'btn_notif_off': '🔕 Выкл',
+    'btn_lang_ru': '🇷🇺 Русский',
+    'btn_lang_en': '🇬🇧 English',
+
+    # Главное меню
+    'btn_catalog': '🛍️ Каталог',
+    'btn_cart': '🛒 Корзина',
+    'btn_orders': '📋 Мои заказы',
+    'btn_pay': '💳 Оплатить',
+    'btn_profile': '👤 Профиль',
+    'btn_search': '🔍 Поиск',
+    'btn_main_menu': '🏠 В главное меню',
+    'welcome': 'Добро пожаловать',
+    'main_menu': '🏠 Главное меню',
+    'back_to_main_menu': '🏠 Вы вернулись в главное меню',
+
+    # Команды в меню бота
+    'cmd_start': 'Запустить бота',
+    'cmd_menu': 'Показать меню команд',
+    'cmd_help': 'Получить помощь',
+    'cmd_profile': 'Мой профиль',
+    'cmd_settings': 'Настройки',
+    'cmd_register': 'Регистрация в боте',
+    'cmd_catalog': 'Просмотр каталога товаров',
+
+    # Общие кнопки
+    'btn_cancel': '❌ Отменить',
+    'btn_cancel_short': '❌ Отмена',
+    'btn_confirm': 'Подтвердить',
+    'btn_cancel_plain': 'Отменить',
+    'btn_skip': '⏩ Пропустить',
+    'cancel_word': 'отмена',
+
+    # Каталог
+    'choose_category': '📋 Выберите категорию:',
+    'categories_unavailable': '❌ К сожалению, категории сейчас недоступны',
+    'choose_product': 'Выберите товар:',
+    'category_empty': 'В этой категории пока нет товаров',
+    'btn_back_to_categories': '◀️ Назад к категориям',
+
+    # Карточка товара
+    'product_not_found': '❌ Товар не найден',
+    'product_load_error': 'Произошла ошибка при загрузке товара',
+    'product_price': '💰 Цена: {price}₽',
+    'product_description': '📝 Описание: {description}',
+    'product_rating': '{stars} Рейтинг: {rating:.1f}',
+    'product_favorite': '❤️ В избранном',
+    'product_not_favorite': '🤍 Не в избранном',
+    'product_in_stock': '📦 В наличии: {quantity} шт.',
+    'product_selected': '🛒 Выбрано: {quantity} шт.',
+    'product_in_cart': '🛒 В корзине: {quantity} шт.',
+    'qty_pcs': '{quantity} шт.',
+    'btn_to_cart': '🛒 В корзину',
+    'btn_add_to_cart': '🛒 Добавить в корзину',
+    'btn_reviews': '📝 Отзывы',
+    'btn_write_review': '✍️ Написать отзыв',
+    'btn_back_to_product': '◀️ Назад к товару',
+
+    # Корзина
+    'cart_empty': '🛒 Ваша корзина пуста',
+    'cart_empty_x': '❌ Ваша корзина пуста',
+    'cart_empty_short': 'Корзина пуста',
+    'cart_item': '📦 {name}\n💰 {price}₽ x {quantity} шт. = {total}₽',
+    'cart_total': '💰 Итого: {total}₽',
+    'cart_error': 'Произошла ошибка при загрузке корзины',
+    'cart_title': '🛒 Ваша корзина:',
+    'cart_summary_item': '📦 {name}\n   {price}₽ x {quantity} шт. = {total}₽',
+    'cart_cleared': '🛒 Корзина очищена',
+    'cart_cleared_ok': '✅ Корзина очищена',
+    'cart_clear_error': '❌ Ошибка при очистке корзины',
+    'cart_added': '✅ Товар добавлен в корзину',
+    'cart_added_qty': '✅ Товар добавлен в корзину (количество: {quantity})',
+    'cart_add_error': '❌ Ошибка при добавлении в корзину',
+    'cart_item_removed': '✅ Товар удален из корзины',
+    'cart_remove_error': '❌ Ошибка при удалении товара',
+    'out_of_stock': '❌ Товар закончился',
+    'not_enough_stock': '❌ Недостаточно товара на складе',
+    'qty_update_error': '❌ Ошибка при обновлении количества',
+    'qty_updated': '✅ Количество обновлено',
+    'qty_min': '❌ Минимальное количество: 1',
+    'qty_max': '❌ Достигнуто максимальное количество',
+    'qty_cannot_change': '❌ Невозможно изменить количество',
+    'btn_checkout': '💳 Оформить заказ',
+    'btn_clear_cart': '🗑 Очистить корзину',
+    'btn_clear_cart_reply': '🗑️ Очистить корзину',
+    'btn_continue_shopping': '🛍️ Продолжить покупки',
+    'btn_remove': '🗑 Удалить',
+
+    # Поиск и избранное
+    'search_prompt': 'Введите название или описание товара для поиска:',
+    'btn_cancel_search': '❌ Отменить поиск',
+    'search_cancelled': 'Поиск отменен',
+    'search_empty': 'По вашему запросу ничего не найдено',
+    'search_results': '🔍 Результаты поиска:',
+    'choose_sort': 'Выберите способ сортировки:',
+    'btn_sort_price_asc': '💰 По цене ⬆️',
+    'btn_sort_price_desc': '💰 По цене ⬇️',
+    'btn_sort_rating': '⭐ По рейтингу',
+    'btn_sort_name': '🔤 По названию',
+    'favorites_title': '❤️ Избранные товары:',
+    'no_favorites': 'У вас пока нет избранных товаров',
+    'btn_view_product': 'Просмотреть {name}',
+    'favorites_error': 'Произошла ошибка при загрузке избранного',
+    'favorite_added': '✅ Добавлено в избранное',
+    'favorite_removed': '❌ Удалено из избранного',
+
+    # Регистрация
+    'btn_register': '👤 Регистрация',
+    'btn_auth': '🔑 Авторизация',
+    'already_registered': '✅ Вы уже зарегистрированы!',
+    'reg_enter_name': '👤 Введите ваше имя',
+    'reg_send_contact': 'Отправьте контакт',
+    'reg_send_location': 'Отправьте локацию или пропустите этот шаг',
+    'reg_enter_email': 'Введите e-mail',
+    'reg_invalid_email': 'Пожалуйста, введите корректный e-mail адрес.',
+    'reg_enter_age': 'Введите возраст',
+    'reg_invalid_age': 'Введите возраст целым числом',
+    'reg_send_photo': 'Отправьте ваше фото',
+    'reg_no_photo': 'Отправьте фото',
+    'reg_confirm': (
+        'Пожалуйста, проверьте введенные данные:\n'
+        'Имя: {name}\n'
+        'Телефон: {phone}\n'
+        'Email: {email}\n'
+        'Возраст: {age}\n'
+        'Локация и фото получены\n\n'
+        'Все верно?'
+    ),
+    'reg_done': 'Регистрация успешно завершена!',
+    'reg_error': 'Произошла ошибка при регистрации. Попробуйте позже.',
+    'reg_cancelled': 'Регистрация отменена. Вы можете начать заново.',
+    'reg_use_buttons': 'Пожалуйста, используйте кнопки для подтверждения или отмены',
+    'auth_ok': '✅ Вы успешно авторизованы!',
+    'auth_not_registered': '❌ Вы не зарегистрированы. Пожалуйста, сначала пройдите регистрацию.',
+    'btn_send_phone': '📱 Отправить номер телефона',
+    'btn_send_location': '📍 Отправить местоположение',
+    'btn_cancel_registration': '❌ Отмена регистрации',
+
+    # Профиль
+    'profile': (
+        '👤 <b>Ваш профиль</b>\n\n'
+        'Имя: {name}\n'
+        '📱 Телефон: {phone}\n'
+        '📧 Email: {email}\n'
+        '🎂 Возраст: {age}\n'
+        '📍 Локация: {location}\n'
+        '📅 Дата регистрации: {reg_date}\n'
+        '🆔 Username: @{username}'
+    ),
+    'profile_short': (
+        '👤 Профиль\n\n'
+        'Имя: {name}\n'
+        'Телефон: {phone}\n'
+        'Email: {email}\n'
+        'Возраст: {age}\n'
+        'Дата регистрации: {reg_date}\n'
+        'Username: @{username}'
+    ),
+    'profile_inline': '👤 Профиль\n\nID: {user_id}\nИмя: {name}\nUsername: @{username}\n',
+    # «Не указан» в трех родах: имя, телефон, дата
+    'not_specified_n': 'Не указано',
+    'not_specified_m': 'Не указан',
+    'not_specified_f': 'Не указана',
+    'location_specified': 'Указана',
+    'profile_not_registered': 'Вы не зарегистрированы. Используйте /register для регистрации.',
+    'profile_not_found': 'Профиль не найден',
+    'profile_not_found_register': 'Профиль не найден. Пожалуйста, зарегистрируйтесь.',
+    'profile_error': 'Произошла ошибка при загрузке профиля. Попробуйте позже.',
+    'btn_edit_name': '✏️ Изменить имя',
+    'btn_edit_email': '✉️ Изменить email',
+    'btn_edit_phone': '📱 Изменить телефон',
+    'btn_edit_age': '🔢 Изменить возраст',
+    'btn_edit_photo': '📷 Изменить фото',
+    'btn_edit_location': '📍 Изменить локацию',
+    'btn_favorites': '❤️ Избранное',
+
+    # Редактирование профиля
+    'edit_prompt_name': 'Введите новое имя:',
+    'edit_prompt_email': 'Введите новый email:',
+    'edit_prompt_phone': 'Отправьте новый номер телефона:',
+    'edit_prompt_age': 'Введите новый возраст:',
+    'edit_prompt_photo': 'Отправьте новое фото:',
+    'edit_prompt_location': 'Отправьте новую локацию:',
+    'field_name': 'Имя',
+    'field_email': 'Email',
+    'field_phone': 'Телефон',
+    'field_age': 'Возраст',
+    'field_photo': 'Фото',
+    'field_location': 'Локация',
+    'btn_cancel_edit': 'Отменить редактирование',
+    'edit_cancelled': 'Редактирование отменено',
+    'edit_saved': 'Изменения сохранены: {field}',
+    'edit_error': 'Произошла ошибка при обновлении.',
+    'edit_retry_error': 'Произошла ошибка. Попробуйте еще раз или отмените редактирование.',
+    'edit_photo_confirm': 'Установить это фото в качестве фото профиля?',
+    'edit_photo_error': 'Произошла ошибка при обработке фото. Попробуйте еще раз или отмените редактирование.',
+    'edit_send_photo': 'Пожалуйста, отправьте фото',
+    'edit_phone_confirm': 'Вы хотите изменить номер телефона на {phone}?',
+    'edit_use_contact_button': 'Пожалуйста, используйте кнопку для отправки контакта',
+    'edit_use_location_button': 'Пожалуйста, используйте кнопку для отправки локации',
+    'edit_name_confirm': 'Вы хотите изменить имя на "{value}"?',
+    'edit_email_confirm': 'Вы хотите изменить email на "{value}"?',
+    'edit_invalid_email': 'Пожалуйста, введите корректный email адрес.',
+    'edit_age_confirm': 'Вы хотите изменить возраст на {value}?',
+    'edit_invalid_age': 'Пожалуйста, введите корректный возраст (целое число).',
+    'edit_location_confirm': 'Вы хотите установить эту локацию?',
+
+    # Заказы
+    'no_orders': 'У вас пока нет заказов',
+    'orders_title': '📋 Ваши заказы:',
+    'orders_error': 'Произошла ошибка при загрузке заказов',
+    'order_info': (
+        '🆔 Заказ #{order_id}\n'
+        '💰 Сумма: {total}₽\n'
+        '📅 Дата: {date}\n'
+        'Статус: {emoji} {status}'
+    ),
+    'btn_order': '📦 Заказ №{order_id}',
+    'order_details': (
+        '📦 Заказ №{order_id}\n'
+        '📅 Дата: {date}\n'
+        '📊 Статус: {status}\n'
+        '💰 Сумма: {total}₽\n'
+        '🚚 Способ доставки: {delivery}\n'
+        '📍 Адрес: {address}\n'
+        '💳 Способ оплаты: {payment}\n\n'
+        '📋 Состав заказа:\n'
+    ),
+    'order_item_line': '• {name} x {quantity} шт. = {total}₽',
+    'product_deleted': 'Товар удален',
+    'btn_back_to_orders': '◀️ Назад к заказам',
+    'order_not_found': 'Заказ не найден',
+    'order_details_error': 'Произошла ошибка при загрузке деталей заказа',
+    'order_status_pending': 'ожидает обработки',
+    'order_status_processing': 'в работе',
+    'order_status_completed': 'выполнен',
+    'order_status_cancelled': 'отменен',
+    'notify_order_status': '📦 Заказ #{order_id}\nСтатус изменен на: {status}',
+
+    # Оформление заказа
+    'order_title': '📋 Ваш заказ:',
+    'order_line': '📦 {name} x{quantity} = {total}₽',
+    'pay_total': '💰 Итого к оплате: {total}₽',
+    'pay_cart_empty': '🛒 Ваша корзина пуста!\nДобавьте товары в корзину перед оплатой.',
+    'pay_cart_item': '📦 {name} x {quantity} шт. = {total}₽',
+    'checkout_cart_empty': 'Корзина пуста!',
+    'enter_address': '📍 Пожалуйста, введите адрес доставки:',
+    'choose_delivery': '🚚 Выберите способ доставки:',
+    'choose_payment': '💳 Выберите способ оплаты:',
+    'card_payment': '💳 Оплата картой\nСумма к оплате: {total}₽\n',
+    'order_created': '✅ Заказ №{order_id} успешно создан!\nМы свяжемся с вами для подтверждения.',
+    'order_created_short': 'Заказ успешно создан!',
+    'order_create_error': '❌ Ошибка при создании заказа',
+    'checkout_error': 'Произошла ошибка при создании заказа',
+    'checkout_cancelled': '❌ Оформление заказа отменено',
+    'btn_courier': '🚚 Курьером',
+    'btn_pickup': '🏪 Самовывоз',
+
+    # Оплата
+    'btn_pay_card': '💳 Картой',
+    'btn_pay_transfer': '💵 Перевод на карту',
+    'btn_pay_transfer_card': '💳 Перевод на карту',
+    'btn_pay_telegram_stars': '⭐ Telegram Stars',
+    'btn_confirm_payment': '✅ Подтвердить оплату',
+    'payment_error': '❌ Произошла ошибка при обработке оплаты',
+    'payment_create_error': '❌ Произошла ошибка при создании платежа',
+    'payment_confirm_error': 'Произошла ошибка при подтверждении платежа',
+    'payment_process_error': '❌ Произошла ошибка при обработке платежа',
+    'payment_cancelled': '❌ Оплата отменена',
+    'tinkoff_payment': (
+        '💳 Оплата через Тинькофф\n\n'
+        'Сумма к оплате: {amount}₽\n\n'
+        'Для оплаты переведите указанную сумму:\n'
+        '💳 На карту: {card}\n'
+        '📱 Или по номеру телефона: {phone}\n\n'
+        '❗️ Важно: В комментарии к переводу укажите код: {code}\n\n'
+        "После оплаты нажмите кнопку 'Подтвердить оплату'"
+    ),
+    'p2p_thanks': '✅ Спасибо за оплату!\nВаш заказ принят в обработку.\nНомер заказа: {order_id}',
+    'stars_invoice_title': 'Оплата заказа Stars',
+    'stars_invoice_description': 'Товары в заказе:\n{items}',
+    'stars_invoice_item': '📦 {name} x {quantity} шт.',
+    'stars_price_label': 'Оплата Stars',
+    'reservation_expired': 'Время резерва истекло. Оформите заказ заново.',
+    'stock_short_named': '❌ Недостаточно товара «{name}» на складе.\nЗаказ не оформлен, корзина сохранена.',
+    'stars_credited': '⭐ Вам начислено {stars} Stars за покупку!',
+    'stars_paid': (
+        '✅ Оплата Stars прошла успешно!\n\n'
+        '🆔 Заказ #{order_id}\n'
+        '⭐ Списано Stars: {spent}\n'
+        '⭐ Начислено Stars: {returned}\n'
+        '💰 Сумма: {total}₽\n\n'
+        'ID транзакции: {charge_id}'
+    ),
+    'stars_balance': (
+        '💫 Ваш баланс Stars:\n\n'
+        '⭐ Всего потрачено Stars: {stars}\n'
+        '💰 На сумму: {rub}₽\n\n'
+        '📊 Текущий курс: 1 Star = {rate}₽'
+    ),
+    'stars_channel_balance': (
+        '⭐ Баланс Stars канала {title}:\n'
+        '💰 Доступно для вывода: {balance}\n'
+        '📊 Курс конвертации: 1 Star = {rate}₽'
+    ),
+    'stars_balance_error': '❌ Не удалось получить информацию о балансе Stars',
+
+    # Отзывы
+    'rate_product': 'Оцените товар {name}:',
+    'review_rated': 'Вы поставили {rating} ⭐\nТеперь напишите текст отзыва:',
+    'review_thanks': '✅ Спасибо за ваш отзыв!',
+    'review_save_error': '❌ Произошла ошибка при сохранении отзыва',
+    'review_cancelled': '❌ Создание отзыва отменено',
+    'reviews_title': '📝 Отзывы о товаре {name}:',
+    'no_reviews': 'Пока нет отзывов о товаре',
+    'reviews_error': 'Произошла ошибка при загрузке отзывов',
+    'notify_review_response': '📝 Получен ответ на ваш отзыв:\n\nВаш отзыв: {review}\nОтвет: {response}',
+
+    # Справка
+    'help_intro': (
+        '🤖 Добро пожаловать в справочный раздел!\n'
+        'Выберите интересующую вас тему или обратитесь в поддержку:'
+    ),
+    'btn_help_order': '🛍️ Как сделать заказ',
+    'btn_help_payment': '💳 Оплата',
+    'btn_help_reviews': '📝 Отзывы',
+    'btn_help_settings': '⚙️ Настройки',
+    'btn_help_profile': '👤 Профиль',
+    'btn_support_chat': '💬 Чат поддержки',
+    'btn_help_back': '◀️ Назад к разделам',
+    'help_not_found': '❌ Раздел не найден',
+    'help_order': (
+        '🛍️ Как сделать заказ:\n\n'
+        '1. Выберите товары в каталоге\n'
+        '2. Добавьте их в корзину\n'
+        '3. Перейдите в корзину\n'
+        '4. Нажмите «Оформить заказ»\n'
+        '5. Укажите адрес доставки\n'
+        '6. Выберите способ оплаты\n\n'
+        'После оформления заказа вы получите уведомление о его статусе'
+    ),
+    'help_payment': (
+        '💳 Способы оплаты:\n\n'
+        '• Банковской картой\n'
+        '• Stars (бонусная система)\n\n'
+        'При оплате Stars используется курс: 1 Star = 1,35₽'
+    ),
+    'help_reviews': (
+        '📝 Система отзывов:\n\n'
+        '• Оставить отзыв можно на странице товара\n'
+        '• Укажите рейтинг от 1 до 5 звезд\n'
+        '• Напишите текстовый отзыв\n'
+        '• Ваш отзыв поможет другим покупателям'
+    ),
+    'help_settings': (
+        '⚙️ Настройки:\n\n'
+        '• Язык интерфейса\n'
+        '• Уведомления\n'
+        'Изменить настройки: /settings'
+    ),
+    'help_profile': (
+        '👤 Профиль:\n\n'
+        '• Просмотр и редактирование данных\n'
+        '• История заказов\n'
+        '• Баланс Stars\n'
+        '• Управление уведомлениями'
+    ),
+}
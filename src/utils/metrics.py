@@ -0,0 +1,164 @@
+"""Метрики процесса в текстовом формате Prometheus.
+
+Гистограммы и счетчики — простые структуры в памяти процесса, без
+prometheus_client: наблюдение стоит одного bisect и пары сложений, поэтому
+точки учета включены всегда, а наружу метрики отдает необязательный сервер
+(src/monitoring.py, METRICS_PORT). Значения, которые уже считают сами
+компоненты (планировщик, кэши, журнал запросов), собираются в момент опроса.
+"""
+import asyncio
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Границы гистограмм задержек, сек
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Dict[str, str]
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _number(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _sample(name: str, labels: Labels, value: float) -> str:
+    return f'{name}{_labels(labels)} {_number(value)}'
+
+
+def family(name: str, kind: str, documentation: str,
+           samples: Iterable[Tuple[Labels, float]]) -> List[str]:
+    """Строки одного семейства метрик: HELP, TYPE и значения"""
+    lines = [f'# HELP {name} {documentation}', f'# TYPE {name} {kind}']
+    lines.extend(_sample(name, labels, value) for labels, value in samples)
+    return lines
+
+
+def histogram_family(name: str, documentation: str,
+                     series: Iterable[Tuple[Labels, Iterable[Tuple[float, int]], float]]) -> List[str]:
+    """Гистограмма из корзин: (метки, [(граница, число в корзине)], сумма)"""
+    lines = [f'# HELP {name} {documentation}', f'# TYPE {name} histogram']
+    for labels, buckets, total in series:
+        cumulative = 0
+        for bound, count in buckets:
+            cumulative += count
+            lines.append(_sample(f'{name}_bucket', {**labels, 'le': _number(bound)}, cumulative))
+        lines.append(_sample(f'{name}_sum', labels, total))
+        lines.append(_sample(f'{name}_count', labels, cumulative))
+    return lines
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, *label_values, amount: float = 1):
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> List[str]:
+        return family(self.name, 'counter', self.documentation, (
+            (dict(zip(self.label_names, key)), value) for key, value in sorted(self._values.items())
+        ))
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self.buckets = tuple(buckets)
+        # значения меток -> [счетчики корзин (последняя — +Inf), сумма, количество]
+        self._series: Dict[tuple, list] = {}
+
+    def observe(self, value: float, *label_values):
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> List[str]:
+        bounds = self.buckets + (float('inf'),)
+        return histogram_family(self.name, self.documentation, (
+            (dict(zip(self.label_names, key)), zip(bounds, counts), total)
+            for key, (counts, total, _) in sorted(self._series.items())
+        ))
+
+
+class LoopLagMonitor:
+    """Задержка event loop: насколько позже срока просыпается sleep(interval)"""
+
+    def __init__(self, histogram: Histogram, interval: float = 0.5):
+        self.histogram = histogram
+        self.interval = interval
+        self.last = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.last = max(0.0, loop.time() - started - self.interval)
+            self.histogram.observe(self.last)
+
+
+# Метрики процесса; точки учета — middleware, движок базы, журнал запросов
+handler_latency = Histogram(
+    'bot_handler_seconds', 'Время выполнения хендлера', ('router', 'handler')
+)
+handler_errors = Counter(
+    'bot_handler_errors_total', 'Исключения в хендлерах', ('router', 'handler')
+)
+db_statement_latency = Histogram(
+    'bot_db_statement_seconds', 'Время выполнения SQL-запроса', ('operation',)
+)
+db_pool_wait = Histogram(
+    'bot_db_pool_wait_seconds', 'Ожидание соединения из пула (вместе с подключением)'
+)
+bot_api_latency = Histogram(
+    'bot_api_request_seconds', 'Время запроса к Bot API', ('method',)
+)
+bot_api_rate_limited = Counter(
+    'bot_api_rate_limited_total', 'Ответы 429 (retry_after) от Bot API', ('method',)
+)
+bot_api_errors = Counter(
+    'bot_api_errors_total', 'Прочие ошибки запросов к Bot API', ('method', 'error')
+)
+loop_lag = Histogram(
+    'bot_event_loop_lag_seconds', 'Задержка пробуждения event loop',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+
+METRICS = (
+    handler_latency, handler_errors, db_statement_latency, db_pool_wait,
+    bot_api_latency, bot_api_rate_limited, bot_api_errors, loop_lag,
+)
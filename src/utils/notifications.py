@@ -1,16 +1,31 @@
 from aiogram import Bot
 from ..database import requests as db
+from ..database.user_settings import user_settings
+from .broadcast import BroadcastEngine
+from .i18n import get_text, get_user_translator
 import logging
 from typing import List, Optional
 
+async def order_status_text(user_id: int, order_id: int, new_status: str) -> str:
+    """Текст уведомления об изменении статуса заказа на языке покупателя"""
+    t = await get_user_translator(user_id)
+    return t('notify_order_status', order_id=order_id, status=t(f'order_status_{new_status}'))
+
+def payment_status_text(order_id: int, status: str) -> str:
+    """Текст уведомления о статусе оплаты"""
+    return f"💳 Оплата заказа #{order_id}\nСтатус: {status}"
+
 class NotificationManager:
-    def __init__(self, bot: Bot):
+    def __init__(self, bot: Bot, broadcasts: Optional[BroadcastEngine] = None):
         self.bot = bot
+        # Массовые уведомления уходят через фоновые рассылки
+        self.broadcasts = broadcasts
 
     async def send_notification(self, user_id: int, text: str, disable_notification: bool = False) -> bool:
         """Отправка уведомления пользователю"""
         try:
-            if await db.get_user_notifications(user_id):
+            settings = await user_settings.get(user_id)
+            if settings.notifications:
                 await self.bot.send_message(
                     user_id, 
                     text, 
@@ -22,52 +37,36 @@ class NotificationManager:
             logging.error(f"Ошибка при отправке уведомления: {e}")
             return False
 
-    async def notify_order_status(self, order_id: int, new_status: str):
-        """Уведомление об изменении статуса заказа"""
-        try:
-            order = await db.get_order(order_id)
-            if order:
-                text = f"📦 Заказ #{order_id}\n"
-                text += f"Статус изменен на: {new_status}"
-                await self.send_notification(order.user_id, text)
-        except Exception as e:
-            logging.error(f"Ошибка при отправке уведомления о статусе заказа: {e}")
-
-    async def notify_new_product(self, product_id: int):
-        """Уведомление о новом товаре"""
+    async def notify_new_product(self, product_id: int) -> Optional[int]:
+        """Уведомление о новом товаре: запуск рассылки, возвращает ее ID"""
         try:
+            if self.broadcasts is None:
+                logging.error("Рассылки не настроены, уведомление о новом товаре не отправлено")
+                return None
             product = await db.get_product_by_id(product_id)
             if product:
                 text = f"🆕 Новый товар в магазине!\n\n"
                 text += f"📝 {product.name}\n"
                 text += f"💰 Цена: {product.price}₽"
                 
-                # Получаем всех пользователей с включенными уведомлениями
-                users = await db.get_users_with_notifications()
-                for user in users:
-                    await self.send_notification(user.user_id, text)
+                # Отправка всем пользователям с включенными уведомлениями идет в фоне
+                return await self.broadcasts.create(text)
         except Exception as e:
             logging.error(f"Ошибка при отправке уведомления о новом товаре: {e}")
+        return None
 
-    async def notify_payment_status(self, order_id: int, status: str):
-        """Уведомление о статусе оплаты"""
-        try:
-            order = await db.get_order(order_id)
-            if order:
-                text = f"💳 Оплата заказа #{order_id}\n"
-                text += f"Статус: {status}"
-                await self.send_notification(order.user_id, text)
-        except Exception as e:
-            logging.error(f"Ошибка при отправке уведомления об оплате: {e}")
-
-    async def notify_review_response(self, review_id: int, response: str):
-        """Уведомление об ответе на отзыв"""
+    async def notify_review_response(self, review_id: int, response: str) -> bool:
+        """Уведомление об ответе на отзыв (через outbox, один раз на отзыв)"""
         try:
             review = await db.get_review(review_id)
             if review:
-                text = f"📝 Получен ответ на ваш отзыв:\n\n"
-                text += f"Ваш отзыв: {review.text}\n"
-                text += f"Ответ: {response}"
-                await self.send_notification(review.user_id, text)
+                text = await get_text(
+                    'notify_review_response', review.user_id,
+                    review=review.text, response=response
+                )
+                return await db.add_notification(
+                    review.user_id, text, dedupe_key=f"review_response:{review_id}"
+                )
         except Exception as e:
-            logging.error(f"Ошибка при отправке уведомления об ответе на отзыв: {e}")
\ No newline at end of file
+            logging.error(f"Ошибка при отправке уведомления об ответе на отзыв: {e}")
+        return False
\ No newline at end of file
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from aiogram import Bot
+from aiogram.exceptions import (TelegramBadRequest, TelegramForbiddenError,
+                                TelegramRetryAfter)
+
+from ..database.database import Database
+from ..database.models import OutboxStatus
+from ..database.user_settings import user_settings
+from .rate_limit import TokenBucket
+
+
+class NotificationOutbox:
+    """Воркеры, отправляющие уведомления из notification_outbox.
+
+    Каждый воркер захватывает порцию записей на время lease, отправляет их
+    с общим ограничением частоты и отмечает результат. Ошибки сети и 429
+    переносят попытку (экспоненциальная задержка), 400/403 — окончательная
+    ошибка. Запись, захваченная упавшим процессом, возвращается в работу
+    по истечении lease: доставка «хотя бы один раз».
+    """
+
+    def __init__(self, bot: Bot, db: Database, bucket: Optional[TokenBucket] = None,
+                 workers: int = 2, batch_size: int = 50, max_attempts: int = 5,
+                 poll_interval: float = 1.0, lease: float = 60.0, retry_delay: float = 5.0):
+        self.bot = bot
+        self.db = db
+        self.bucket = bucket or TokenBucket(25.0)
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.retry_delay = retry_delay
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+    async def start(self, keep_days: int = 7):
+        """Очистка старых записей и запуск воркеров"""
+        purged = await self.db.purge_outbox(datetime.utcnow() - timedelta(days=keep_days))
+        if purged:
+            logging.info(f"Удалено обработанных уведомлений: {purged}")
+        self._stopping = False
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self, timeout: float = 10.0):
+        """Остановка воркеров после текущей порции"""
+        self._stopping = True
+        self._wakeup.set()
+        if self._tasks:
+            _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+
+    def wake(self):
+        """Новое уведомление записано — не ждать очередного опроса"""
+        self._wakeup.set()
+
+    async def _work(self):
+        while not self._stopping:
+            try:
+                processed = await self.drain_once()
+            except Exception as e:
+                logging.error(f"Ошибка воркера уведомлений: {e}")
+                processed = 0
+            if processed < self.batch_size and not self._stopping:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    async def drain_once(self) -> int:
+        """Отправка одной порции, возвращает число захваченных записей"""
+        now = datetime.utcnow()
+        batch = await self.db.claim_outbox(now, now + timedelta(seconds=self.lease), self.batch_size)
+        if not batch:
+            return 0
+
+        sent, skipped = [], []
+        for message in batch:
+            settings = await user_settings.get(message.user_id)
+            if not settings.notifications:
+                skipped.append(message.id)
+                continue
+            if await self._deliver(message):
+                sent.append(message.id)
+
+        now = datetime.utcnow()
+        if sent:
+            await self.db.complete_outbox(sent, OutboxStatus.SENT, now)
+        if skipped:
+            await self.db.complete_outbox(skipped, OutboxStatus.SKIPPED, now)
+        return len(batch)
+
+    async def _deliver(self, message) -> bool:
+        """Отправка одного уведомления; при неудаче запись переносится или закрывается"""
+        attempts = message.attempts + 1
+        await self.bucket.acquire()
+        try:
+            await self.bot.send_message(message.user_id, message.text)
+            return True
+        except TelegramRetryAfter as e:
+            # 429 не считается попыткой: ждем, сколько просит Telegram
+            self.bucket.pause(e.retry_after)
+            await self.db.update_outbox_message(
+                message.id,
+                next_attempt_at=datetime.utcnow() + timedelta(seconds=e.retry_after),
+                last_error=str(e)
+            )
+        except (TelegramForbiddenError, TelegramBadRequest) as e:
+            # Бот заблокирован или запрос некорректен — повтор не поможет
+            await self.db.update_outbox_message(
+                message.id, status=OutboxStatus.FAILED, attempts=attempts, last_error=str(e)
+            )
+        except Exception as e:
+            if attempts >= self.max_attempts:
+                logging.error(f"Уведомление {message.id} не доставлено после {attempts} попыток: {e}")
+                await self.db.update_outbox_message(
+                    message.id, status=OutboxStatus.FAILED, attempts=attempts, last_error=str(e)
+                )
+            else:
+                delay = self.retry_delay * 2 ** (attempts - 1)
+                await self.db.update_outbox_message(
+                    message.id,
+                    attempts=attempts,
+                    next_attempt_at=datetime.utcnow() + timedelta(seconds=delay),
+                    last_error=str(e)
+                )
+        return False
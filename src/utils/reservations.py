@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+
+from ..database.database import Database
+
+
+class _Hold:
+    """Резерв одного пользователя: {product_id: quantity} и срок действия"""
+    __slots__ = ('items', 'expires_at')
+
+    def __init__(self, items: Dict[int, int], expires_at: float):
+        self.items = items
+        self.expires_at = expires_at
+
+
+class ReservationManager:
+    """Резервирование товаров на время оплаты.
+
+    Доступность считается в памяти: остаток со склада минус действующие резервы.
+    Таблица reservations хранит резервы на случай перезапуска; остатки
+    периодически перечитываются фоновой задачей, которая же снимает
+    просроченные резервы.
+
+    В webhook-режиме с несколькими воркерами резерв мог быть создан другим
+    процессом: extend() при промахе в памяти берет его из таблицы. Продажу
+    сверх остатка в любом случае отклоняет условный UPDATE в Database.checkout.
+    """
+
+    def __init__(self, db: Database, ttl: float = 600.0, sweep_interval: float = 30.0):
+        self.db = db
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self._stock: Dict[int, int] = {}
+        self._held: Dict[int, int] = {}
+        self._holds: Dict[int, _Hold] = {}
+        # Пользователи, чьи продленные резервы еще не записаны в базу
+        self._extended: set = set()
+        # Товары, проданные во время идущих чтений остатков (по одному множеству на чтение)
+        self._sold_during_reads: List[Set[int]] = []
+        self._sweeper: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Загрузка остатков и действующих резервов, запуск очистки"""
+        now = datetime.utcnow()
+        await self.db.delete_expired_reservations(now)
+        self._stock = await self._read_stock()
+
+        monotonic_now = time.monotonic()
+        for reservation in await self.db.get_active_reservations(now):
+            hold = self._holds.get(reservation.user_id)
+            if hold is None:
+                remaining = (reservation.expires_at - now).total_seconds()
+                hold = self._holds[reservation.user_id] = _Hold({}, monotonic_now + remaining)
+            hold.items[reservation.product_id] = reservation.quantity
+            self._held[reservation.product_id] = (
+                self._held.get(reservation.product_id, 0) + reservation.quantity
+            )
+
+        self._sweeper = asyncio.create_task(self._sweep_forever())
+        logging.info(f"Резервы восстановлены: {len(self._holds)} пользователей")
+
+    async def stop(self):
+        """Остановка фоновой очистки"""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+        await self._flush_extended()
+
+    def available(self, product_id: int) -> int:
+        """Свободный остаток товара: склад минус действующие резервы"""
+        return self._stock.get(product_id, 0) - self._held.get(product_id, 0)
+
+    async def hold(self, user_id: int, items: Dict[int, int]) -> bool:
+        """Резервирование товаров корзины. False, если чего-то не хватает"""
+        missing = [product_id for product_id in items if product_id not in self._stock]
+        if missing:
+            # Товар добавлен после загрузки остатков
+            self._stock.update(await self._read_stock(missing))
+
+        # Проверка и резервирование без await между ними: атомарно для event loop
+        had_hold = self._drop(user_id)
+        if any(self.available(product_id) < quantity for product_id, quantity in items.items()):
+            if had_hold:
+                await self.db.delete_reservations(user_id)
+            return False
+        self._holds[user_id] = _Hold(dict(items), time.monotonic() + self.ttl)
+        for product_id, quantity in items.items():
+            self._held[product_id] = self._held.get(product_id, 0) + quantity
+
+        await self.db.replace_reservations(user_id, items, self._expires_at())
+        return True
+
+    async def extend(self, user_id: int) -> bool:
+        """Проверка и продление резерва (pre_checkout_query).
+
+        Резерв из памяти продлевается без ожидания базы; в базу продление
+        попадет при следующей очистке.
+        """
+        if self._extend_held(user_id):
+            return True
+        # Резерв мог создать другой воркер (или процесс до перезапуска)
+        rows = await self.db.get_active_reservations(datetime.utcnow(), user_id=user_id)
+        if self._extend_held(user_id):
+            # Пока шел запрос, резерв создан в этом процессе
+            return True
+        if not rows:
+            return False
+        self._drop(user_id)
+        items = {row.product_id: row.quantity for row in rows}
+        self._holds[user_id] = _Hold(items, time.monotonic() + self.ttl)
+        for product_id, quantity in items.items():
+            self._held[product_id] = self._held.get(product_id, 0) + quantity
+        self._extended.add(user_id)
+        return True
+
+    def _extend_held(self, user_id: int) -> bool:
+        hold = self._holds.get(user_id)
+        if hold is None or hold.expires_at <= time.monotonic():
+            return False
+        hold.expires_at = time.monotonic() + self.ttl
+        self._extended.add(user_id)
+        return True
+
+    async def release(self, user_id: int):
+        """Снятие резерва (отмена или ошибка оплаты)"""
+        if self._drop(user_id):
+            await self.db.delete_reservations(user_id)
+
+    async def confirm(self, user_id: int):
+        """Резерв оплачен: строки уже удалены в Database.checkout, обновляем остатки"""
+        hold = self._holds.get(user_id)
+        if hold is not None:
+            # Проданное списывается со склада в памяти до снятия резерва, без await
+            # между ними: иначе на время обновления остатков оно выглядит свободным
+            self._deduct(hold.items)
+        self._drop(user_id)
+        if hold is not None:
+            self._stock.update(await self._read_stock(list(hold.items)))
+
+    def _deduct(self, items: Dict[int, int]):
+        for product_id, quantity in items.items():
+            self._stock[product_id] = self._stock.get(product_id, 0) - quantity
+        for sold in self._sold_during_reads:
+            sold.update(items)
+
+    async def _read_stock(self, product_ids: Optional[list] = None) -> Dict[int, int]:
+        """Остатки из базы для записи в _stock.
+
+        Продажа, подтвержденная во время чтения, могла не попасть в снимок:
+        для таких товаров остается значение из памяти, где она уже списана.
+        """
+        sold: Set[int] = set()
+        self._sold_during_reads.append(sold)
+        try:
+            stock = await self.db.get_stock_levels(product_ids)
+        finally:
+            self._sold_during_reads.remove(sold)
+        for product_id in sold:
+            if product_id in stock and product_id in self._stock:
+                stock[product_id] = self._stock[product_id]
+        return stock
+
+    def _drop(self, user_id: int) -> bool:
+        self._extended.discard(user_id)
+        hold = self._holds.pop(user_id, None)
+        if hold is None:
+            return False
+        for product_id, quantity in hold.items.items():
+            self._held[product_id] = self._held.get(product_id, 0) - quantity
+            if self._held[product_id] <= 0:
+                del self._held[product_id]
+        return True
+
+    def _expires_at(self) -> datetime:
+        return datetime.utcnow() + timedelta(seconds=self.ttl)
+
+    async def _flush_extended(self):
+        extended, self._extended = self._extended, set()
+        for user_id in extended:
+            hold = self._holds.get(user_id)
+            if hold is not None:
+                remaining = hold.expires_at - time.monotonic()
+                await self.db.extend_reservations(
+                    user_id, datetime.utcnow() + timedelta(seconds=remaining)
+                )
+
+    async def sweep(self):
+        """Снятие просроченных резервов и обновление остатков"""
+        now = time.monotonic()
+        expired = [user_id for user_id, hold in self._holds.items() if hold.expires_at <= now]
+        for user_id in expired:
+            self._drop(user_id)
+        await self._flush_extended()
+        await self.db.delete_expired_reservations(datetime.utcnow())
+        # Остатки могли измениться через админку
+        stock = await self._read_stock()
+        if stock:
+            self._stock = stock
+        if expired:
+            logging.info(f"Снято просроченных резервов: {len(expired)}")
+
+    async def _sweep_forever(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logging.error(f"Ошибка при очистке резервов: {e}")
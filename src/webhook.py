@@ -0,0 +1,67 @@
+"""Прием апдейтов через webhook (aiohttp) вместо long polling.
+
+Telegram (или балансировщик) присылает апдейты POST-запросами на
+webhook_path с заголовком X-Telegram-Bot-Api-Secret-Token. Ответ 200
+отправляется сразу, обработка идет в фоне. GET /healthz — для проверок
+балансировщика. Локально можно отправлять записанные апдейты скриптом
+benchmarks/replay_updates.py.
+
+За балансировщиком может стоять несколько воркеров. Состояние в памяти
+каждого из них сверяется с базой: кэш FSM по умолчанию выключен
+(FSM_CACHE_SIZE), каталог и настройки пользователей перечитываются через
+CACHE_TTL, список администраторов — через ADMIN_CACHE_TTL, а резерв,
+созданный другим воркером, берется из таблицы reservations при оплате.
+"""
+import asyncio
+import logging
+
+from aiohttp import web
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+
+from .config import Config
+
+
+async def healthz(request: web.Request) -> web.Response:
+    return web.json_response({'status': 'ok'})
+
+
+def create_app(dp: Dispatcher, bot: Bot, config: Config) -> web.Application:
+    """aiohttp-приложение с обработчиком webhook"""
+    app = web.Application()
+    SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        handle_in_background=True,  # 200 сразу, хендлеры — в фоне
+        secret_token=config.webhook_secret
+    ).register(app, path=config.webhook_path)
+    app.router.add_get('/healthz', healthz)
+    # Запуск и остановка диспетчера (startup/shutdown) вместе с приложением
+    setup_application(app, dp, bot=bot)
+    return app
+
+
+async def run_webhook(dp: Dispatcher, bot: Bot, config: Config):
+    """Запуск HTTP-сервера; работает до отмены задачи"""
+    app = create_app(dp, bot, config)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, config.webhook_host, config.webhook_port)
+    await site.start()
+    logging.info(
+        f"Webhook слушает {config.webhook_host}:{config.webhook_port}{config.webhook_path}"
+    )
+
+    if config.webhook_url:
+        # Без WEBHOOK_URL webhook регистрируется снаружи (или апдейты шлются вручную)
+        await bot.set_webhook(
+            url=config.webhook_url.rstrip('/') + config.webhook_path,
+            secret_token=config.webhook_secret,
+            allowed_updates=dp.resolve_used_update_types()
+        )
+        logging.info("Webhook зарегистрирован в Telegram")
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()